@@ -0,0 +1,238 @@
+"""
+CLI commands for the scale benchmark suite.
+
+This module provides command - line interfaces for:
+- Running benchmarks against generated synthetic repositories
+- Comparing two benchmark runs and flagging regressions
+- Listing the available benchmark cases
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..core.monitoring_analytics import benchmark_suite
+
+
+def add_bench_commands(subparsers) -> None:
+    """Add benchmark suite commands to the CLI."""
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Run reproducible scale benchmarks on synthetic repositories"
+    )
+    bench_sub = bench_parser.add_subparsers(dest="bench_cmd", required=True)
+
+    # Run the suite
+    run_parser = bench_sub.add_parser("run", help="Generate repositories and time")
+    run_parser.add_argument(
+        "--size",
+        action="append",
+        help="Repository sizes, comma-separated: 1k, 10k, 100k or a file count "
+        "(default: 1k)",
+    )
+    run_parser.add_argument(
+        "--import-density",
+        type=float,
+        default=3.0,
+        help="Average project imports per module (default: 3.0)",
+    )
+    run_parser.add_argument(
+        "--duplicate-ratio",
+        type=float,
+        default=0.1,
+        help="Share of modules repeating another module's body (default: 0.1)",
+    )
+    run_parser.add_argument(
+        "--seed", type=int, default=0, help="Generator seed (default: 0)"
+    )
+    run_parser.add_argument(
+        "--telemetry-records",
+        type=int,
+        default=10_000,
+        help="Length of the synthetic telemetry history (default: 10000)",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed samples per case (default: 3)"
+    )
+    run_parser.add_argument(
+        "--warmup", type=int, default=1, help="Untimed runs per case (default: 1)"
+    )
+    run_parser.add_argument(
+        "--only",
+        action="append",
+        help="Run only these comma-separated cases (see 'bench cases')",
+    )
+    run_parser.add_argument(
+        "--skip", action="append", help="Skip these comma-separated cases"
+    )
+    run_parser.add_argument(
+        "--workdir",
+        help="Where synthetic repositories are generated and reused "
+        f"(default: {benchmark_suite.DEFAULT_WORKDIR})",
+    )
+    run_parser.add_argument(
+        "--output",
+        help="Results file (default: .ai_onboard/benchmarks/bench_<time>.json)",
+    )
+    run_parser.add_argument(
+        "--baseline", help="Compare the new results against this results file"
+    )
+    run_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=benchmark_suite.DEFAULT_THRESHOLD,
+        help="Minimum slowdown flagged as a regression (default: 0.10 = 10%%)",
+    )
+
+    # Compare two runs
+    compare_parser = bench_sub.add_parser(
+        "compare", help="Compare two results files and flag regressions"
+    )
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument(
+        "current",
+        nargs="?",
+        help="Results to check (default: the latest in .ai_onboard/benchmarks)",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=benchmark_suite.DEFAULT_THRESHOLD,
+        help="Minimum slowdown flagged as a regression (default: 0.10 = 10%%)",
+    )
+
+    # List cases
+    bench_sub.add_parser("cases", help="List benchmark cases")
+
+
+def _names(values) -> List[str]:
+    return [n.strip() for v in values or [] for n in v.split(",") if n.strip()]
+
+
+def _print_result(key: str, result: Dict[str, Any]) -> None:
+    if result["status"] != "ok":
+        print(f"  ❌ {key}: {result.get('error')}")
+        return
+    line = (
+        f"  {key}: {result['median_ms']:.1f} ms "
+        f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f})"
+    )
+    if "per_op_ms" in result:
+        line += f", {result['per_op_ms']:.3f} ms/op"
+    print(line)
+
+
+def _print_comparison(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> int:
+    """Print a comparison; returns the number of regressions."""
+    for note in benchmark_suite.environment_differences(baseline, current):
+        print(f"⚠️  Environment differs: {note}")
+
+    comparisons = benchmark_suite.compare_results(baseline, current, threshold)
+    icons = {
+        "regression": "🔴",
+        "improvement": "🟢",
+        "unchanged": "⚪",
+        "failed": "❌",
+        "new": "🆕",
+        "missing": "➖",
+    }
+    print(f"\n📊 Comparison (noise threshold {threshold:.0%}):")
+    for entry in comparisons:
+        icon = icons.get(entry["status"], "•")
+        if "change" in entry:
+            print(
+                f"  {icon} {entry['case']}: {entry['baseline_ms']:.1f} -> "
+                f"{entry['current_ms']:.1f} ms ({entry['change']:+.1%}, "
+                f"noise {entry['noise']:.0%})"
+            )
+        else:
+            detail = f": {entry['error']}" if entry.get("error") else ""
+            print(f"  {icon} {entry['case']}: {entry['status']}{detail}")
+
+    regressions = [e for e in comparisons if e["status"] in ("regression", "failed")]
+    if regressions:
+        print(f"\n🔴 {len(regressions)} regression(s) beyond the noise threshold")
+    else:
+        print("\n✅ No regressions beyond the noise threshold")
+    return len(regressions)
+
+
+def handle_bench_commands(args, root: Path) -> int:
+    """Handle benchmark suite commands; returns 1 when regressions are found."""
+    results_dir = root / ".ai_onboard" / "benchmarks"
+
+    if args.bench_cmd == "cases":
+        print("🧪 Benchmark cases:")
+        for case in benchmark_suite.CASES:
+            optional = "" if case.default else " (opt-in)"
+            print(f"  • {case.name}{optional}: {case.description}")
+        return 0
+
+    if args.bench_cmd == "compare":
+        baseline_path = Path(args.baseline)
+        current_path = (
+            Path(args.current)
+            if args.current
+            else benchmark_suite.latest_results(results_dir, exclude=baseline_path)
+        )
+        if current_path is None:
+            print(f"❌ No results in {results_dir}; run 'ai_onboard bench run' first")
+            return 1
+        try:
+            baseline = benchmark_suite.load_results(baseline_path)
+            current = benchmark_suite.load_results(current_path)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"Comparing {current_path} against {baseline_path}")
+        return 1 if _print_comparison(baseline, current, args.threshold) else 0
+
+    if args.bench_cmd == "run":
+        try:
+            sizes = [benchmark_suite.parse_size(s) for s in _names(args.size)]
+            specs = [
+                benchmark_suite.RepoSpec(
+                    files=files,
+                    import_density=args.import_density,
+                    duplicate_ratio=args.duplicate_ratio,
+                    seed=args.seed,
+                )
+                for files in sizes or [benchmark_suite.SIZES["1k"]]
+            ]
+            baseline = (
+                benchmark_suite.load_results(Path(args.baseline))
+                if args.baseline
+                else None
+            )
+            workdir = (
+                Path(args.workdir) if args.workdir else benchmark_suite.DEFAULT_WORKDIR
+            )
+            print(f"🧪 Benchmarking {', '.join(s.name for s in specs)} in {workdir}")
+            report = benchmark_suite.run_suite(
+                workdir,
+                specs,
+                telemetry_records=args.telemetry_records,
+                repeat=args.repeat,
+                warmup=args.warmup,
+                only=_names(args.only),
+                skip=_names(args.skip),
+                progress=_print_result,
+            )
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+
+        output = (
+            Path(args.output)
+            if args.output
+            else results_dir / time.strftime("bench_%Y%m%d_%H%M%S.json")
+        )
+        benchmark_suite.save_results(report, output)
+        print(f"💾 Results written to {output}")
+        if baseline is not None:
+            return 1 if _print_comparison(baseline, report, args.threshold) else 0
+        return 0
+
+    return 0
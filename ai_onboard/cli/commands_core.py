@@ -85,6 +85,20 @@ def add_core_commands(subparsers):
         action="store_true",
         help="Write .ai_onboard / report.md and versioned copy",
     )
+    s_v.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="STAGES",
+        help="Run only these comma-separated stages (and their dependencies)",
+    )
+    s_v.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        metavar="STAGES",
+        help="Skip these comma-separated stages (and stages that depend on them)",
+    )
 
     # Kaizen
     s_k = subparsers.add_parser(
@@ -1008,8 +1022,6 @@ def handle_core_commands(args, root: Path):
 
         # progress_dashboard removed - was deprecated shim
         # alignment module moved to vision package, charter
-        from ..core.base import telemetry
-
         validation_runtime = importlib.import_module(
             "ai_onboard.core.validation_runtime"
         )
@@ -1029,11 +1041,28 @@ def handle_core_commands(args, root: Path):
             )
             return
 
-        res = validation_runtime.run(root)
+        def _stage_names(values):
+            return [n.strip() for v in values or [] for n in v.split(",") if n.strip()]
+
+        try:
+            # run() records the run, including per-stage timings, in telemetry
+            res = validation_runtime.run(
+                root,
+                only=_stage_names(getattr(args, "only", None)),
+                skip=_stage_names(getattr(args, "skip", None)),
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
         if args.report:
             # progress_tracker.write_report removed - was deprecated functionality
             print("Report generation temporarily disabled (progress_dashboard removed)")
-        telemetry.record_run(root, res)
+        for name, stage in res.get("stages", {}).items():
+            detail = f" ({stage['error']})" if stage.get("error") else ""
+            print(
+                f"  {name}: {stage['status']} in {stage['wall_ms']:.0f} ms "
+                f"(cpu {stage['cpu_ms']:.0f} ms){detail}"
+            )
         print("Validation complete.")
 
         # Learn from successful validation
@@ -17,6 +17,7 @@ from ..core.quality_safety.syntax_validator import validate_python_syntax
 
 # from ..plugins import example_policy  # ensure example plugin registers on import
 from .commands_aaol import add_aaol_commands, handle_aaol_commands
+from .commands_bench import add_bench_commands, handle_bench_commands
 
 # Removed: commands_advanced_test_reporting (redundant with continuous_improvement)
 # Removed: commands_ai_agent (redundant with ai_agent_collaboration)
@@ -302,6 +303,9 @@ def main(argv=None):
     # Add core commands
     add_core_commands(sub)
 
+    # Add scale benchmark commands
+    add_bench_commands(sub)
+
     # Add onboarding helpers (quickstart, doctor)
     add_onboarding_commands(sub)
 
@@ -404,6 +408,11 @@ def main(argv=None):
             ensure_unicode_safe(f"Next step: {guidance.next_command}")
         return 1
 
+    # Benchmarks run on their own synthetic repositories; keep consultation
+    # and middleware out of the process being measured
+    if args.cmd == "bench":
+        return handle_bench_commands(args, root)
+
     # Fast path for simple commands - avoid heavy initialization
     if args.cmd in ["version", "help"]:
         # Handle these directly without middleware overhead
@@ -5,7 +5,6 @@ This module provides the core functionality for monitoring what AI agents are do
 tracking their progress, and detecting their current state for the oversight dashboard.
 """
 
-import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -14,6 +13,7 @@ from typing import Any, Dict, List, Optional
 import psutil  # type: ignore[import-untyped]
 
 from ..base import utils
+from ..base.background_scheduler import get_background_scheduler
 from .ai_gate_mediator import get_ai_gate_mediator
 
 
@@ -73,7 +73,7 @@ class AgentActivityMonitor:
 
         # Monitoring state
         self.monitoring_active = False
-        self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_job_id: Optional[str] = None
         self.last_scan_time = 0.0
         self.scan_interval = 5.0  # seconds
 
@@ -89,18 +89,21 @@ class AgentActivityMonitor:
             return
 
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitoring_loop, daemon=True
+        self.monitor_job_id = get_background_scheduler().schedule_periodic(
+            f"agent_activity_monitor:{id(self)}",
+            self._monitoring_tick,
+            self.scan_interval,
+            initial_delay=0.0,
         )
-        self.monitor_thread.start()
 
         print("🤖 Agent Activity Monitor started")
 
     def stop_monitoring(self) -> None:
         """Stop agent activity monitoring."""
         self.monitoring_active = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=5.0)
+        if self.monitor_job_id:
+            get_background_scheduler().cancel(self.monitor_job_id)
+            self.monitor_job_id = None
 
         self._save_activity_cache()
         print("⏹️ Agent Activity Monitor stopped")
@@ -252,15 +255,12 @@ class AgentActivityMonitor:
             "generated_at": time.time(),
         }
 
-    def _monitoring_loop(self) -> None:
-        """Main monitoring loop running in background thread."""
-        while self.monitoring_active:
-            try:
-                self._scan_for_agent_activity()
-                time.sleep(self.scan_interval)
-            except Exception as e:
-                print(f"Warning: Agent activity monitoring error: {e}")
-                time.sleep(self.scan_interval)
+    def _monitoring_tick(self) -> None:
+        """Single activity scan, run periodically by the scheduler."""
+        try:
+            self._scan_for_agent_activity()
+        except Exception as e:
+            print(f"Warning: Agent activity monitoring error: {e}")
 
     def _scan_for_agent_activity(self) -> None:
         """Scan for current agent activities and update tracking."""
@@ -12,7 +12,6 @@ The system provides early warning and automatic intervention.
 """
 
 import json
-import threading
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
@@ -21,6 +20,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ..base import utils
+from ..base.background_scheduler import get_background_scheduler
 from .agent_activity_monitor import AgentActivityMonitor
 
 
@@ -126,7 +126,7 @@ class ChaosDetectionSystem:
 
         # Monitoring state
         self.monitoring_active = False
-        self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_job_id: Optional[str] = None
 
         # Ensure directories exist
         self.ai_onboard_dir.mkdir(exist_ok=True)
@@ -143,18 +143,21 @@ class ChaosDetectionSystem:
             return
 
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitoring_loop, daemon=True
+        self.monitor_job_id = get_background_scheduler().schedule_periodic(
+            f"chaos_detection:{id(self)}",
+            self._monitoring_tick,
+            self.scan_interval,
+            initial_delay=0.0,
         )
-        self.monitor_thread.start()
 
         print("🔍 Chaos Detection System started")
 
     def stop_monitoring(self) -> None:
         """Stop chaos detection monitoring."""
         self.monitoring_active = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=5.0)
+        if self.monitor_job_id:
+            get_background_scheduler().cancel(self.monitor_job_id)
+            self.monitor_job_id = None
 
         self._save_chaos_events()
         print("⏹️ Chaos Detection System stopped")
@@ -213,30 +216,26 @@ class ChaosDetectionSystem:
 
         return events
 
-    def _monitoring_loop(self) -> None:
-        """Main chaos detection monitoring loop."""
-        while self.monitoring_active:
-            try:
-                # Update metrics for all active agents
-                self._update_all_agent_metrics()
-
-                # Detect chaos for each agent
-                for agent_id in list(self.agent_metrics.keys()):
-                    chaos_events = self.detect_chaos_for_agent(agent_id)
-
-                    # Log significant chaos events
-                    for event in chaos_events:
-                        if event.severity in [
-                            ChaosSeverity.HIGH,
-                            ChaosSeverity.CRITICAL,
-                        ]:
-                            self._log_chaos_event(event)
-
-                time.sleep(self.scan_interval)
-
-            except Exception as e:
-                print(f"Warning: Chaos detection error: {e}")
-                time.sleep(self.scan_interval)
+    def _monitoring_tick(self) -> None:
+        """Single chaos detection pass, run periodically by the scheduler."""
+        try:
+            # Update metrics for all active agents
+            self._update_all_agent_metrics()
+
+            # Detect chaos for each agent
+            for agent_id in list(self.agent_metrics.keys()):
+                chaos_events = self.detect_chaos_for_agent(agent_id)
+
+                # Log significant chaos events
+                for event in chaos_events:
+                    if event.severity in [
+                        ChaosSeverity.HIGH,
+                        ChaosSeverity.CRITICAL,
+                    ]:
+                        self._log_chaos_event(event)
+
+        except Exception as e:
+            print(f"Warning: Chaos detection error: {e}")
 
     def _update_all_agent_metrics(self) -> None:
         """Update chaos metrics for all monitored agents."""
@@ -5,17 +5,86 @@ This module provides sophisticated conversation memory management that prevents
 context window drift by maintaining critical information across long AI agent
 conversations. It implements sliding window memory, importance-based retention,
 and progressive context building.
+
+Per-message work is independent of conversation length: segments are indexed
+in heaps and sorted lists keyed by importance and relevance, keyword matchers
+are compiled once, and saves are coalesced by a write-behind flush on the
+shared background scheduler.
 """
 
+import atexit
+import bisect
+import heapq
+import re
+import threading
 import time
+import weakref
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from ..base import utils
+from ..base.background_scheduler import get_background_scheduler
 from ..base.shared_types import MemorySegment
 
 
+def _keyword_matcher(keywords: Iterable[str]) -> "re.Pattern[str]":
+    """Compile keywords into one pattern with substring semantics.
+
+    The lookahead makes ``finditer`` report overlapping matches too, so
+    "would like" yields both "would like" and "like" like the ``in`` checks
+    this replaces.
+    """
+    alternatives = "|".join(
+        re.escape(k) for k in sorted(set(keywords), key=len, reverse=True)
+    )
+    return re.compile(f"(?=({alternatives}))")
+
+
+def _matches(pattern: "re.Pattern[str]", text: str) -> Set[str]:
+    return {m.group(1) for m in pattern.finditer(text)}
+
+
+DECISION_KEYWORDS = ["decide", "choose", "select", "go with", "settle on"]
+DECISION_INDICATORS = DECISION_KEYWORDS + ["agree to"]
+PREFERENCE_KEYWORDS = ["prefer", "like", "want", "need", "must have"]
+PREFERENCE_INDICATORS = ["prefer", "like", "want", "need", "would like", "should be"]
+TECHNICAL_KEYWORDS = ["technology", "platform", "database", "api", "integration"]
+CRITICAL_KEYWORDS = ["must", "critical", "essential", "never forget"]
+HIGH_PRIORITY_KEYWORDS = ["important", "key", "main", "primary"]
+TOPIC_KEYWORDS = [
+    "project",
+    "feature",
+    "design",
+    "technology",
+    "user",
+    "data",
+    "security",
+    "performance",
+    "budget",
+    "timeline",
+    "scope",
+]
+FACT_INDICATORS = ["is", "are", "will", "should", "must"]
+STAGE_INDICATORS = {
+    "planning": ["plan", "design", "architecture", "structure"],
+    "implementation": ["build", "create", "develop", "code", "implement"],
+    "review": ["review", "test", "check", "validate", "feedback"],
+    "completion": ["done", "finished", "complete", "ready", "launch"],
+}
+
+_DECISION_RE = _keyword_matcher(DECISION_KEYWORDS)
+_DECISION_INDICATOR_RE = _keyword_matcher(DECISION_INDICATORS)
+_PREFERENCE_RE = _keyword_matcher(PREFERENCE_KEYWORDS)
+_PREFERENCE_INDICATOR_RE = _keyword_matcher(PREFERENCE_INDICATORS)
+_TECHNICAL_RE = _keyword_matcher(TECHNICAL_KEYWORDS)
+_CRITICAL_RE = _keyword_matcher(CRITICAL_KEYWORDS)
+_HIGH_PRIORITY_RE = _keyword_matcher(HIGH_PRIORITY_KEYWORDS)
+_TOPIC_RE = _keyword_matcher(TOPIC_KEYWORDS)
+_FACT_RE = _keyword_matcher(FACT_INDICATORS)
+_STAGE_RES = [(stage, _keyword_matcher(kw)) for stage, kw in STAGE_INDICATORS.items()]
+
+
 # Note: MemorySegment now imported from shared_types
 @dataclass
 class ConversationContext:
@@ -51,6 +120,96 @@ class ConversationContext:
     memory_accesses: int = 0
 
 
+class MemorySegmentIndex:
+    """Bounded index over a conversation's memory segments.
+
+    - Retention: a min-heap on (importance, sequence); once over capacity the
+      least important (oldest on ties) segment is evicted in O(log n)
+    - Relevance: a sorted list on (relevance, last_accessed, sequence) that
+      yields the most relevant segments without sorting
+    - Expiry: a min-heap over segments that have ``expires_at`` set
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._next_seq = 0
+        self._seq_of: Dict[int, int] = {}  # id(segment) -> sequence
+        self._segments: Dict[int, MemorySegment] = {}  # sequence -> segment
+        self._keys: Dict[int, Tuple[float, float, int]] = {}
+        self._retention: List[Tuple[float, int]] = []
+        self._relevance: List[Tuple[float, float, int]] = []
+        self._expiry: List[Tuple[float, int]] = []
+
+    @classmethod
+    def build(
+        cls, segments: Iterable[MemorySegment], capacity: int
+    ) -> "MemorySegmentIndex":
+        index = cls(capacity)
+        for segment in segments:
+            index.add(segment)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def __contains__(self, segment: MemorySegment) -> bool:
+        return id(segment) in self._seq_of
+
+    def add(self, segment: MemorySegment) -> List[MemorySegment]:
+        """Index ``segment``; returns the segments evicted to stay in capacity."""
+        self._next_seq += 1
+        seq = self._next_seq
+        self._seq_of[id(segment)] = seq
+        self._segments[seq] = segment
+        key = (segment.relevance_to_current_context, segment.last_accessed, seq)
+        self._keys[seq] = key
+        bisect.insort(self._relevance, key)
+        heapq.heappush(self._retention, (segment.importance_score, seq))
+        if segment.expires_at:
+            heapq.heappush(self._expiry, (segment.expires_at, seq))
+
+        evicted = []
+        while len(self._segments) > self.capacity:
+            _, seq = heapq.heappop(self._retention)
+            if seq in self._segments:
+                evicted.append(self._remove(seq))
+        return evicted
+
+    def expire(self, now: float) -> List[MemorySegment]:
+        """Drop segments whose ``expires_at`` has passed."""
+        expired = []
+        while self._expiry and self._expiry[0][0] < now:
+            _, seq = heapq.heappop(self._expiry)
+            if seq in self._segments:
+                expired.append(self._remove(seq))
+        return expired
+
+    def _remove(self, seq: int) -> MemorySegment:
+        # Retention and expiry heap entries are skipped lazily when popped
+        segment = self._segments.pop(seq)
+        del self._seq_of[id(segment)]
+        key = self._keys.pop(seq)
+        del self._relevance[bisect.bisect_left(self._relevance, key)]
+        return segment
+
+    def touch(self, segment: MemorySegment, accessed_at: float) -> None:
+        """Record an access, re-positioning the segment in the relevance order."""
+        seq = self._seq_of.get(id(segment))
+        segment.last_accessed = accessed_at
+        if seq is None:
+            return
+        del self._relevance[bisect.bisect_left(self._relevance, self._keys[seq])]
+        key = (segment.relevance_to_current_context, accessed_at, seq)
+        self._keys[seq] = key
+        bisect.insort(self._relevance, key)
+
+    def most_relevant(self, limit: int) -> List[MemorySegment]:
+        """Segments ordered by (relevance, last access), most relevant first."""
+        if limit <= 0:
+            return []
+        return [self._segments[key[2]] for key in reversed(self._relevance[-limit:])]
+
+
 class ConversationMemoryManager:
     """Advanced memory management for long conversations."""
 
@@ -62,6 +221,7 @@ class ConversationMemoryManager:
         self.max_context_window_size = 20
         self.critical_memory_threshold = 0.8
         self.memory_expiry_hours = 24
+        self.save_delay = 2.0  # seconds to coalesce saves; 0 saves immediately
 
         # Storage systems
         self.storage_dir = root / ".ai_onboard" / "conversation_memory"
@@ -72,6 +232,15 @@ class ConversationMemoryManager:
 
         # Memory cache for performance
         self._memory_cache: Dict[str, List[MemorySegment]] = {}
+        self._segment_indexes: Dict[str, MemorySegmentIndex] = {}
+
+        # Write-behind persistence: conversations marked dirty are written by
+        # one flush job rather than on every message
+        self._lock = threading.RLock()
+        self._dirty: Set[str] = set()
+        self._flush_job_id = f"conversation-memory-flush:{id(self)}"
+        self._flush_pending = False
+        _managers.add(self)
 
     def start_conversation(
         self, user_id: str, initial_request: str, session_id: Optional[str] = None
@@ -102,8 +271,6 @@ class ConversationMemoryManager:
             project_context={},
         )
 
-        self.active_conversations[conversation_id] = conversation
-
         # Create initial memory segment
         initial_segment = MemorySegment(
             segment_id=f"{conversation_id}_initial",
@@ -124,8 +291,14 @@ class ConversationMemoryManager:
         conversation.memory_segments.append(initial_segment)
         conversation.critical_memory_items.append(initial_request)
 
-        # Save to persistent storage
-        self._save_conversation_context(conversation)
+        with self._lock:
+            self.active_conversations[conversation_id] = conversation
+            self._segment_indexes[conversation_id] = MemorySegmentIndex.build(
+                conversation.memory_segments, self.max_memory_segments
+            )
+
+            # Save to persistent storage
+            self._save_conversation_context(conversation)
 
         return conversation_id
 
@@ -148,7 +321,28 @@ class ConversationMemoryManager:
         if conversation_id not in self.active_conversations:
             raise ValueError(f"Conversation {conversation_id} not found")
 
-        conversation = self.active_conversations[conversation_id]
+        # Extract memory-relevant information
+        key_topics = self._extract_key_topics(message)
+        important_facts = self._extract_important_facts(message)
+        decisions = self._extract_decisions(message)
+        preferences = self._extract_user_preferences(message)
+
+        with self._lock:
+            conversation = self.active_conversations[conversation_id]
+            self._add_message_segment(
+                conversation, message, key_topics, important_facts, decisions, preferences
+            )
+
+    def _add_message_segment(
+        self,
+        conversation: ConversationContext,
+        message: str,
+        key_topics: List[str],
+        important_facts: List[str],
+        decisions: List[str],
+        preferences: Dict[str, Any],
+    ) -> None:
+        conversation_id = conversation.conversation_id
         conversation.message_count += 1
         conversation.last_updated = time.time()
 
@@ -157,12 +351,6 @@ class ConversationMemoryManager:
             message, conversation.conversation_stage
         )
 
-        # Extract memory-relevant information
-        key_topics = self._extract_key_topics(message)
-        important_facts = self._extract_important_facts(message)
-        decisions = self._extract_decisions(message)
-        preferences = self._extract_user_preferences(message)
-
         # Create memory segment for this message
         segment = MemorySegment(
             segment_id=f"{conversation_id}_msg_{conversation.message_count}",
@@ -184,14 +372,16 @@ class ConversationMemoryManager:
             ),
         )
 
+        index = self._segment_index(conversation)
         conversation.memory_segments.append(segment)
+        evicted = index.add(segment)
+
+        # Manage memory retention
+        self._manage_memory_retention(conversation, evicted)
 
         # Update context window
         self._update_context_window(conversation)
 
-        # Manage memory retention
-        self._manage_memory_retention(conversation)
-
         # Save updates
         self._save_conversation_context(conversation)
 
@@ -234,9 +424,12 @@ class ConversationMemoryManager:
         }
 
         # Update access tracking
-        for segment in relevant_segments:
-            segment.access_count += 1
-            segment.last_accessed = time.time()
+        with self._lock:
+            index = self._segment_index(conversation)
+            now = time.time()
+            for segment in relevant_segments:
+                segment.access_count += 1
+                index.touch(segment, now)
 
         return context_summary
 
@@ -272,20 +465,32 @@ class ConversationMemoryManager:
 
         conversation.stage_transitions.append(transition_record)
 
-        self._save_conversation_context(conversation)
+        with self._lock:
+            self._save_conversation_context(conversation)
+
+    def _segment_index(self, conversation: ConversationContext) -> MemorySegmentIndex:
+        """Index for ``conversation``, rebuilt if its segments changed outside it."""
+        index = self._segment_indexes.get(conversation.conversation_id)
+        segments = conversation.memory_segments
+        if (
+            index is None
+            or index.capacity != self.max_memory_segments
+            or len(index) != len(segments)
+            or (segments and segments[-1] not in index)
+        ):
+            index = MemorySegmentIndex.build(segments, self.max_memory_segments)
+            self._segment_indexes[conversation.conversation_id] = index
+            if len(index) != len(segments):
+                conversation.memory_segments = [s for s in segments if s in index]
+        return index
 
     def _update_context_window(self, conversation: ConversationContext) -> None:
         """Update the active context window with most relevant information."""
-        # Get segments sorted by relevance and recency
-        sorted_segments = sorted(
-            conversation.memory_segments,
-            key=lambda s: (s.relevance_to_current_context, s.last_accessed),
-            reverse=True,
-        )
-
-        # Build context window from most relevant segments
-        context_window = []
-        for segment in sorted_segments[: self.max_context_window_size]:
+        # Build context window from most relevant (then most recent) segments
+        context_window: List[str] = []
+        for segment in self._segment_index(conversation).most_relevant(
+            self.max_context_window_size
+        ):
             # Add important facts from this segment
             context_window.extend(segment.important_facts)
             context_window.extend(segment.key_topics)
@@ -294,29 +499,28 @@ class ConversationMemoryManager:
         context_window.extend(conversation.critical_memory_items)
 
         # Remove duplicates and limit size
-        conversation.active_memory_window = list(set(context_window))[
+        conversation.active_memory_window = list(dict.fromkeys(context_window))[
             : self.max_context_window_size
         ]
 
-    def _manage_memory_retention(self, conversation: ConversationContext) -> None:
-        """Manage memory retention based on importance and age."""
-        current_time = time.time()
-
-        # Remove expired segments
-        active_segments = []
-        for segment in conversation.memory_segments:
-            if segment.expires_at and current_time > segment.expires_at:
-                continue  # Expired, don't retain
-
-            if len(active_segments) < self.max_memory_segments:
-                active_segments.append(segment)
-            else:
-                # Keep only the most important segments
-                active_segments.sort(key=lambda s: s.importance_score, reverse=True)
-                if segment.importance_score > active_segments[-1].importance_score:
-                    active_segments[-1] = segment
+    def _manage_memory_retention(
+        self,
+        conversation: ConversationContext,
+        evicted: Iterable[MemorySegment] = (),
+    ) -> None:
+        """Manage memory retention based on importance and age.
 
-        conversation.memory_segments = active_segments
+        The segment index already evicted the least important segments beyond
+        ``max_memory_segments``; this drops those and any expired segments.
+        """
+        index = self._segment_indexes.get(conversation.conversation_id)
+        if index is None:
+            index = self._segment_index(conversation)
+        removed = list(evicted) + index.expire(time.time())
+        if removed:
+            conversation.memory_segments = [
+                s for s in conversation.memory_segments if s in index
+            ]
 
     def _get_most_relevant_segments(
         self, conversation: ConversationContext, max_segments: int
@@ -348,34 +552,26 @@ class ConversationMemoryManager:
             scored_segments.append((total_score, segment))
 
         # Return top segments
-        scored_segments.sort(key=lambda x: x[0], reverse=True)
-        return [segment for _, segment in scored_segments[:max_segments]]
+        top = heapq.nlargest(max_segments, scored_segments, key=lambda x: x[0])
+        return [segment for _, segment in top]
 
     def _calculate_importance_score(
         self, message: str, conversation: ConversationContext
     ) -> float:
         """Calculate importance score for a message."""
         score = 0.5  # Base score
+        message_lower = message.lower()
 
         # Boost for messages containing decisions
-        decision_keywords = ["decide", "choose", "select", "go with", "settle on"]
-        if any(keyword in message.lower() for keyword in decision_keywords):
+        if _DECISION_RE.search(message_lower):
             score += 0.3
 
         # Boost for messages containing preferences
-        preference_keywords = ["prefer", "like", "want", "need", "must have"]
-        if any(keyword in message.lower() for keyword in preference_keywords):
+        if _PREFERENCE_RE.search(message_lower):
             score += 0.2
 
         # Boost for messages containing technical requirements
-        technical_keywords = [
-            "technology",
-            "platform",
-            "database",
-            "api",
-            "integration",
-        ]
-        if any(keyword in message.lower() for keyword in technical_keywords):
+        if _TECHNICAL_RE.search(message_lower):
             score += 0.2
 
         # Boost based on conversation stage
@@ -402,18 +598,14 @@ class ConversationMemoryManager:
         self, message: str, conversation: ConversationContext
     ) -> str:
         """Determine retention priority for a message."""
+        message_lower = message.lower()
+
         # Critical messages
-        if any(
-            keyword in message.lower()
-            for keyword in ["must", "critical", "essential", "never forget"]
-        ):
+        if _CRITICAL_RE.search(message_lower):
             return "critical"
 
         # High priority messages
-        if any(
-            keyword in message.lower()
-            for keyword in ["important", "key", "main", "primary"]
-        ):
+        if _HIGH_PRIORITY_RE.search(message_lower):
             return "high"
 
         # Normal priority (default)
@@ -421,29 +613,9 @@ class ConversationMemoryManager:
 
     def _extract_key_topics(self, message: str) -> List[str]:
         """Extract key topics from a message."""
-        # Simple keyword extraction
-        topic_keywords = [
-            "project",
-            "feature",
-            "design",
-            "technology",
-            "user",
-            "data",
-            "security",
-            "performance",
-            "budget",
-            "timeline",
-            "scope",
-        ]
-
-        topics = []
-        message_lower = message.lower()
-
-        for keyword in topic_keywords:
-            if keyword in message_lower:
-                topics.append(keyword)
-
-        return topics
+        # Simple keyword extraction, in TOPIC_KEYWORDS order
+        found = _matches(_TOPIC_RE, message.lower())
+        return [keyword for keyword in TOPIC_KEYWORDS if keyword in found]
 
     def _extract_important_facts(self, message: str) -> List[str]:
         """Extract important facts from a message."""
@@ -456,73 +628,43 @@ class ConversationMemoryManager:
             sentence = sentence.strip()
             if len(sentence) > 20:  # Substantial sentences
                 # Check for factual indicators
-                if any(
-                    indicator in sentence.lower()
-                    for indicator in ["is", "are", "will", "should", "must"]
-                ):
+                if _FACT_RE.search(sentence.lower()):
                     facts.append(sentence)
+                    if len(facts) == 3:  # Limit to 3 facts
+                        break
 
-        return facts[:3]  # Limit to 3 facts
+        return facts
 
     def _extract_decisions(self, message: str) -> List[str]:
         """Extract decisions made in a message."""
-        decisions = []
-
-        decision_indicators = [
-            "decide",
-            "choose",
-            "select",
-            "go with",
-            "settle on",
-            "agree to",
-        ]
-        message_lower = message.lower()
+        decisions: List[str] = []
+        if not _DECISION_INDICATOR_RE.search(message.lower()):
+            return decisions
 
-        for indicator in decision_indicators:
-            if indicator in message_lower:
-                # Extract the decision part
-                sentences = message.split(".")
-                for sentence in sentences:
-                    if indicator in sentence.lower():
-                        decisions.append(sentence.strip())
+        # Extract the decision part, once per matching indicator
+        for sentence in message.split("."):
+            found = _matches(_DECISION_INDICATOR_RE, sentence.lower())
+            decisions.extend([sentence.strip()] * len(found))
 
         return decisions
 
     def _extract_user_preferences(self, message: str) -> Dict[str, Any]:
         """Extract user preferences from a message."""
-        preferences = {}
-
-        preference_indicators = [
-            "prefer",
-            "like",
-            "want",
-            "need",
-            "would like",
-            "should be",
-        ]
-        message_lower = message.lower()
-
-        for indicator in preference_indicators:
-            if indicator in message_lower:
-                # Simple extraction - could be enhanced with NLP
-                preferences[indicator] = True
-
-        return preferences
+        # Simple extraction - could be enhanced with NLP
+        found = _matches(_PREFERENCE_INDICATOR_RE, message.lower())
+        return {
+            indicator: True
+            for indicator in PREFERENCE_INDICATORS
+            if indicator in found
+        }
 
     def _determine_conversation_stage(self, message: str, current_stage: str) -> str:
         """Determine the current conversation stage based on message content."""
         message_lower = message.lower()
 
-        # Stage progression indicators
-        stage_indicators = {
-            "planning": ["plan", "design", "architecture", "structure"],
-            "implementation": ["build", "create", "develop", "code", "implement"],
-            "review": ["review", "test", "check", "validate", "feedback"],
-            "completion": ["done", "finished", "complete", "ready", "launch"],
-        }
-
-        for stage, keywords in stage_indicators.items():
-            if any(keyword in message_lower for keyword in keywords):
+        # Stage progression indicators, checked in STAGE_INDICATORS order
+        for stage, pattern in _STAGE_RES:
+            if pattern.search(message_lower):
                 return stage
 
         return current_stage
@@ -539,40 +681,84 @@ class ConversationMemoryManager:
             return "User has a project request"
 
     def _save_conversation_context(self, conversation: ConversationContext) -> None:
-        """Save conversation context to persistent storage."""
-        try:
-            # Save to simple file storage
-            context_file = self.storage_dir / f"{conversation.conversation_id}.json"
-
-            context_data = {
-                "conversation_id": conversation.conversation_id,
-                "user_id": conversation.user_id,
-                "session_id": conversation.session_id,
-                "created_at": conversation.created_at,
-                "last_updated": conversation.last_updated,
-                "current_stage": conversation.conversation_stage,
-                "user_intent": conversation.user_intent_summary,
-                "project_context": conversation.project_context,
-                "memory_segments": [
-                    {
-                        "segment_id": seg.segment_id,
-                        "timestamp": seg.timestamp,
-                        "key_topics": seg.key_topics,
-                        "important_facts": seg.important_facts,
-                        "decisions": seg.decisions_made,
-                        "importance": seg.importance_score,
-                        "retention_priority": seg.retention_priority,
-                    }
-                    for seg in conversation.memory_segments[-5:]  # Save last 5 segments
-                ],
-                "critical_memory": conversation.critical_memory_items,
-                "clarification_questions": conversation.clarification_questions_asked,
-            }
-
-            utils.write_json(context_file, context_data)
-        except Exception as e:
-            # Log error but don't fail the operation
-            print(f"Warning: Failed to save conversation context: {e}")
+        """Queue conversation context to be saved by the write-behind flush."""
+        with self._lock:
+            self._dirty.add(conversation.conversation_id)
+            if self.save_delay <= 0:
+                pending = False
+            elif not self._flush_pending:
+                self._flush_pending = pending = True
+            else:
+                return
+
+        if pending:
+            get_background_scheduler().schedule_once(
+                self._flush_job_id, self.flush, self.save_delay
+            )
+        else:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every conversation changed since the last flush.
+
+        Returns the number of conversations written.
+        """
+        with self._lock:
+            self._flush_pending = False
+            dirty, self._dirty = self._dirty, set()
+            snapshots = [
+                self._conversation_snapshot(self.active_conversations[cid])
+                for cid in dirty
+                if cid in self.active_conversations
+            ]
+
+        written = 0
+        for conversation_id, context_data in snapshots:
+            try:
+                # Save to simple file storage
+                context_file = self.storage_dir / f"{conversation_id}.json"
+                utils.write_json(context_file, context_data)
+                written += 1
+            except Exception as e:
+                # Log error but don't fail the operation
+                print(f"Warning: Failed to save conversation context: {e}")
+        return written
+
+    def close(self) -> None:
+        """Cancel any scheduled flush and write pending changes now."""
+        get_background_scheduler().cancel(self._flush_job_id)
+        self.flush()
+
+    def _conversation_snapshot(
+        self, conversation: ConversationContext
+    ) -> Tuple[str, Dict[str, Any]]:
+        context_data = {
+            "conversation_id": conversation.conversation_id,
+            "user_id": conversation.user_id,
+            "session_id": conversation.session_id,
+            "created_at": conversation.created_at,
+            "last_updated": conversation.last_updated,
+            "current_stage": conversation.conversation_stage,
+            "user_intent": conversation.user_intent_summary,
+            "project_context": dict(conversation.project_context),
+            "memory_segments": [
+                {
+                    "segment_id": seg.segment_id,
+                    "timestamp": seg.timestamp,
+                    "key_topics": seg.key_topics,
+                    "important_facts": seg.important_facts,
+                    "decisions": seg.decisions_made,
+                    "importance": seg.importance_score,
+                    "retention_priority": seg.retention_priority,
+                }
+                for seg in conversation.memory_segments[-5:]  # Save last 5 segments
+            ],
+            "critical_memory": list(conversation.critical_memory_items),
+            "clarification_questions": list(
+                conversation.clarification_questions_asked
+            ),
+        }
+        return conversation.conversation_id, context_data
 
     def get_conversation_summary(self, conversation_id: str) -> Dict[str, Any]:
         """Get a summary of the conversation with memory statistics."""
@@ -607,12 +793,26 @@ class ConversationMemoryManager:
                 expired_conversations.append(conversation_id)
 
         # Remove expired conversations
-        for conversation_id in expired_conversations:
-            del self.active_conversations[conversation_id]
+        with self._lock:
+            for conversation_id in expired_conversations:
+                del self.active_conversations[conversation_id]
+                self._segment_indexes.pop(conversation_id, None)
 
         return len(expired_conversations)
 
 
+# Managers with unsaved changes are flushed at interpreter exit
+_managers: "weakref.WeakSet[ConversationMemoryManager]" = weakref.WeakSet()
+
+
+def _flush_all_managers() -> None:
+    for manager in list(_managers):
+        manager.flush()
+
+
+atexit.register(_flush_all_managers)
+
+
 def get_conversation_memory_manager(root: Path) -> ConversationMemoryManager:
     """Get conversation memory manager instance."""
     return ConversationMemoryManager(root)
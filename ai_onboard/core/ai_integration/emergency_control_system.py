@@ -12,7 +12,6 @@ and can intervene immediately when agents exhibit problematic behavior.
 """
 
 import json
-import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
@@ -20,6 +19,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 from ..base import utils
+from ..base.background_scheduler import get_background_scheduler
 from .agent_activity_monitor import AgentActivityMonitor
 
 
@@ -117,10 +117,11 @@ class EmergencyControlSystem:
         # Configuration
         self.auto_pause_threshold = 3  # Number of chaos events before auto-pause
         self.emergency_timeout = 300.0  # 5 minutes emergency mode timeout
+        self.scan_interval = 10.0  # seconds
 
         # Monitoring state
         self.monitoring_active = False
-        self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_job_id: Optional[str] = None
 
         # Ensure directories exist
         self.ai_onboard_dir.mkdir(exist_ok=True)
@@ -137,18 +138,21 @@ class EmergencyControlSystem:
             return
 
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitoring_loop, daemon=True
+        self.monitor_job_id = get_background_scheduler().schedule_periodic(
+            f"emergency_control:{id(self)}",
+            self._monitoring_tick,
+            self.scan_interval,
+            initial_delay=0.0,
         )
-        self.monitor_thread.start()
 
         print("🚨 Emergency Control System started")
 
     def stop_monitoring(self) -> None:
         """Stop emergency control monitoring."""
         self.monitoring_active = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=5.0)
+        if self.monitor_job_id:
+            get_background_scheduler().cancel(self.monitor_job_id)
+            self.monitor_job_id = None
 
         self._save_emergency_state()
         print("⏹️ Emergency Control System stopped")
@@ -326,21 +330,17 @@ class EmergencyControlSystem:
             return False
         return self.agent_states[agent_id].is_stopped
 
-    def _monitoring_loop(self) -> None:
-        """Main emergency control monitoring loop."""
-        while self.monitoring_active:
-            try:
-                # Check for automatic emergency actions
-                self._check_auto_emergency_actions()
-
-                # Clean up expired emergency states
-                self._cleanup_expired_states()
+    def _monitoring_tick(self) -> None:
+        """Single emergency control pass, run periodically by the scheduler."""
+        try:
+            # Check for automatic emergency actions
+            self._check_auto_emergency_actions()
 
-                time.sleep(10.0)  # Check every 10 seconds
+            # Clean up expired emergency states
+            self._cleanup_expired_states()
 
-            except Exception as e:
-                print(f"Warning: Emergency control monitoring error: {e}")
-                time.sleep(10.0)
+        except Exception as e:
+            print(f"Warning: Emergency control monitoring error: {e}")
 
     def _check_auto_emergency_actions(self) -> None:
         """Check for conditions that require automatic emergency actions."""
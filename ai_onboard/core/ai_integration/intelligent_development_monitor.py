@@ -5,12 +5,12 @@ Proactively monitors development activities and automatically applies appropriat
 based on detected patterns, changes, and development context.
 """
 
-import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from ..base.background_scheduler import get_background_scheduler
 from ..orchestration.tool_usage_tracker import get_tool_tracker
 from ..orchestration.unified_tool_orchestrator import (
     ToolExecutionContext,
@@ -61,7 +61,8 @@ class IntelligentDevelopmentMonitor:
         # Activity monitoring
         self.activity_history: List[DevelopmentActivity] = []
         self.monitoring_active = False
-        self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_job_id: Optional[str] = None
+        self.scan_interval = 30.0  # seconds
 
         # Proactive trigger rules
         self.trigger_rules = self._initialize_trigger_rules()
@@ -148,10 +149,12 @@ class IntelligentDevelopmentMonitor:
             return
 
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitoring_loop, daemon=True
+        self.monitor_job_id = get_background_scheduler().schedule_periodic(
+            f"intelligent_development_monitor:{id(self)}",
+            self._monitoring_tick,
+            self.scan_interval,
+            initial_delay=0.0,
         )
-        self.monitor_thread.start()
 
         ensure_unicode_safe("🧠 Intelligent Development Monitor started")
         ensure_unicode_safe("   📊 Monitoring for automatic tool application...")
@@ -159,31 +162,28 @@ class IntelligentDevelopmentMonitor:
     def stop_monitoring(self):
         """Stop the intelligent development monitoring."""
         self.monitoring_active = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5.0)
+        if self.monitor_job_id:
+            get_background_scheduler().cancel(self.monitor_job_id)
+            self.monitor_job_id = None
         ensure_unicode_safe("🧠 Intelligent Development Monitor stopped")
 
-    def _monitoring_loop(self):
-        """Main monitoring loop."""
-        while self.monitoring_active:
-            try:
-                # Check for new activities
-                activities = self._detect_activities()
-
-                for activity in activities:
-                    self._process_activity(activity)
+    def _monitoring_tick(self):
+        """Single monitoring pass, run every scan_interval by the scheduler."""
+        try:
+            # Check for new activities
+            activities = self._detect_activities()
 
-                # Clean up old activities (keep last 24 hours)
-                cutoff_time = time.time() - (24 * 3600)
-                self.activity_history = [
-                    act for act in self.activity_history if act.timestamp > cutoff_time
-                ]
+            for activity in activities:
+                self._process_activity(activity)
 
-            except Exception as e:
-                print(f"⚠️ Development monitor error: {e}")
+            # Clean up old activities (keep last 24 hours)
+            cutoff_time = time.time() - (24 * 3600)
+            self.activity_history = [
+                act for act in self.activity_history if act.timestamp > cutoff_time
+            ]
 
-            # Check every 30 seconds
-            time.sleep(30)
+        except Exception as e:
+            print(f"⚠️ Development monitor error: {e}")
 
     def _detect_activities(self) -> List[DevelopmentActivity]:
         """Detect new development activities."""
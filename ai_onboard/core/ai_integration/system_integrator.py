@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ..base import utils
+from ..base.tracing import span, traced
 from ..onboarding import BootstrapGuard, OnboardingStage
 from .agent_activity_monitor import AgentActivityMonitor, get_agent_activity_monitor
 from .chaos_detection_system import ChaosDetectionSystem, get_chaos_detection_system
@@ -137,6 +138,7 @@ class SystemIntegrator:
 
         print("⏹️ System Integrator health monitoring stopped")
 
+    @traced("system_integrator.process_agent_operation")
     def process_agent_operation(
         self, agent_id: str, operation: str, context: Dict[str, Any]
     ) -> AgentOversightContext:
@@ -153,7 +155,8 @@ class SystemIntegrator:
         )
 
         # Pre-flight onboarding gate: require charter → state → plan before proceeds
-        stage = self.bootstrap_guard.get_stage()
+        with span("onboarding_gate"):
+            stage = self.bootstrap_guard.get_stage()
         if stage is not OnboardingStage.READY:
             requirements = self.bootstrap_guard.get_requirements_status()
             if any(requirements.values()):
@@ -193,11 +196,12 @@ class SystemIntegrator:
 
         # Step 2: Check hard limits
         if self.hard_limits_enforcer:
-            limits_allowed, limits_reason, limit_violation = (
-                self.hard_limits_enforcer.check_operation_allowed(
-                    agent_id, operation, context
+            with span("hard_limits"):
+                limits_allowed, limits_reason, limit_violation = (
+                    self.hard_limits_enforcer.check_operation_allowed(
+                        agent_id, operation, context
+                    )
                 )
-            )
             if not limits_allowed:
                 oversight_context.approved = False
                 oversight_context.limits_exceeded = True
@@ -212,11 +216,12 @@ class SystemIntegrator:
 
         # Step 3: Check hard gate enforcement
         if self.hard_gate_enforcer:
-            should_block, block_id, block_reason = (
-                self.hard_gate_enforcer.should_block_operation(
-                    agent_id, operation, context
+            with span("hard_gate"):
+                should_block, block_id, block_reason = (
+                    self.hard_gate_enforcer.should_block_operation(
+                        agent_id, operation, context
+                    )
                 )
-            )
             if should_block:
                 oversight_context.approved = False
                 oversight_context.gate_status = "blocked"
@@ -230,11 +235,12 @@ class SystemIntegrator:
         # Step 4: Process through decision enforcer (gates and preferences)
         if self.decision_enforcer:
             try:
-                decision_result = self.decision_enforcer.enforce_decision(
-                    decision_name=f"{agent_id}_{operation}",
-                    context=context,
-                    agent_id=agent_id,
-                )
+                with span("decision_enforcer"):
+                    decision_result = self.decision_enforcer.enforce_decision(
+                        decision_name=f"{agent_id}_{operation}",
+                        context=context,
+                        agent_id=agent_id,
+                    )
 
                 if not decision_result.proceed:
                     oversight_context.approved = False
@@ -256,7 +262,8 @@ class SystemIntegrator:
         # Step 5: Check chaos detection
         if self.chaos_detector:
             try:
-                chaos_events = self.chaos_detector.get_recent_chaos_events(limit=5)
+                with span("chaos_detection"):
+                    chaos_events = self.chaos_detector.get_recent_chaos_events(limit=5)
                 recent_chaos = [
                     event
                     for event in chaos_events
@@ -288,9 +295,10 @@ class SystemIntegrator:
         # Step 6: Check vision alignment
         if self.vision_drift_alerting:
             try:
-                alignment_score = self.vision_drift_alerting.get_agent_alignment_score(
-                    agent_id
-                )
+                with span("vision_alignment"):
+                    alignment_score = (
+                        self.vision_drift_alerting.get_agent_alignment_score(agent_id)
+                    )
                 oversight_context.vision_alignment = alignment_score
 
                 if alignment_score < 0.3:  # Poor alignment
@@ -304,13 +312,14 @@ class SystemIntegrator:
         # Step 7: Update activity monitoring
         if self.activity_monitor:
             try:
-                self.activity_monitor.log_agent_action(
-                    agent_id=agent_id,
-                    action_type=operation,
-                    description=f"Operation: {operation}",
-                    confidence=1.0 if oversight_context.approved else 0.0,
-                    metadata=context,
-                )
+                with span("activity_monitor"):
+                    self.activity_monitor.log_agent_action(
+                        agent_id=agent_id,
+                        action_type=operation,
+                        description=f"Operation: {operation}",
+                        confidence=1.0 if oversight_context.approved else 0.0,
+                        metadata=context,
+                    )
             except Exception as e:
                 print(f"Warning: Activity logging error for {agent_id}: {e}")
 
@@ -12,16 +12,22 @@ This module provides intelligent user preference learning that:
 
 import json
 import statistics
+import threading
 import time
-from collections import defaultdict, deque
+import weakref
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from itertools import islice
 from pathlib import Path
 from typing import Any, Deque, Dict, List, Optional, Union
 
 from ..base import telemetry, utils
+from ..base.background_scheduler import get_background_scheduler
 from ..continuous_improvement import continuous_improvement_system
+from .user_preference_store import UserPreferenceStore, create_user_preference_store
+from .user_preference_streams import DecayedCounter, RunningStats, UserStreamState
 
 
 class InteractionType(Enum):
@@ -123,6 +129,7 @@ class UserPreference:
     )
     confidence: Union[float, PreferenceConfidence] = 0.5
     evidence_count: int = 1
+    evidence_weight: float = 1.0  # Exponentially decayed evidence_count
     last_updated: datetime = field(default_factory=datetime.now)
     created_at: datetime = field(default_factory=datetime.now)  # Backward compatibility
     preference_type: PreferenceType = PreferenceType.SELECTION  # Backward compatibility
@@ -157,6 +164,8 @@ class UserProfile:
     behavior_patterns: List[UserBehaviorPattern] = field(default_factory=list)
     interaction_history: deque = field(default_factory=lambda: deque(maxlen=1000))
     satisfaction_scores: deque = field(default_factory=lambda: deque(maxlen=100))
+    # Every score ever given, unlike the bounded satisfaction_scores
+    satisfaction_stats: RunningStats = field(default_factory=RunningStats)
     feedback_history: List[Dict[str, Any]] = field(default_factory=list)
     last_activity: datetime = field(default_factory=datetime.now)
     total_interactions: int = 0
@@ -187,6 +196,9 @@ class UserPreferenceLearningSystem:
             "min_interactions_for_learning": 5,
             "confidence_threshold": 0.7,
             "max_preferences_per_category": 10,
+            "storage_backend": "sqlite",  # or "json" for user_profiles.json
+            "evidence_half_life_days": 30.0,
+            "compaction_interval": 900.0,  # seconds; 0 disables
         }
 
         # Initialize subsystems
@@ -202,6 +214,18 @@ class UserPreferenceLearningSystem:
         # Ensure directories exist
         self._ensure_directories()
 
+        # Storage backend and what has already been persisted per user, so
+        # interactions only write what changed
+        self.store: UserPreferenceStore = create_user_preference_store(
+            root, self.config["storage_backend"]
+        )
+        self._persisted: Dict[str, Dict[str, Any]] = {}
+
+        # Streaming learner state per user, kept in step with each profile's
+        # bounded history so learning costs O(1) per interaction
+        self._stream_states: Dict[str, UserStreamState] = {}
+        self._learning_lock = threading.RLock()
+
         # Load existing data
         self._load_user_profiles()
         self._load_preference_learning_rules()
@@ -211,6 +235,9 @@ class UserPreferenceLearningSystem:
         if not self.preference_learning_rules:
             self._initialize_default_learning_rules()
 
+        self.compact_learning_state()
+        self._schedule_compaction()
+
     # Backward compatibility methods
     def _load_user_data(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Alias for backward compatibility - return dict format."""
@@ -573,10 +600,7 @@ class UserPreferenceLearningSystem:
 
     def _load_user_profiles(self) -> None:
         """Load user profiles from storage."""
-        if not self.user_profiles_path.exists():
-            return
-
-        data = utils.read_json(self.user_profiles_path, default={})
+        data = self.store.load_profiles()
 
         for user_id, profile_data in data.items():
             # Convert preferences
@@ -590,6 +614,9 @@ class UserPreferenceLearningSystem:
                     preference_value=pref_data["preference_value"],
                     confidence=pref_data["confidence"],
                     evidence_count=pref_data["evidence_count"],
+                    evidence_weight=pref_data.get(
+                        "evidence_weight", pref_data["evidence_count"]
+                    ),
                     last_updated=datetime.fromisoformat(pref_data["last_updated"]),
                     sources=pref_data.get("sources", []),
                     context_conditions=pref_data.get("context_conditions", {}),
@@ -673,6 +700,12 @@ class UserPreferenceLearningSystem:
             satisfaction_scores: Deque[float] = deque(maxlen=100)
             for score in profile_data.get("satisfaction_scores", []):
                 satisfaction_scores.append(score)
+            stats_data = profile_data.get("satisfaction_stats")
+            if isinstance(stats_data, dict):
+                satisfaction_stats = RunningStats.from_dict(stats_data)
+            else:
+                # Profiles saved before the stats were kept: the best estimate
+                satisfaction_stats = RunningStats.from_values(satisfaction_scores)
 
             self.user_profiles[user_id] = UserProfile(
                 user_id=user_id,
@@ -681,12 +714,14 @@ class UserPreferenceLearningSystem:
                 behavior_patterns=behavior_patterns,
                 interaction_history=interaction_history,
                 satisfaction_scores=satisfaction_scores,
+                satisfaction_stats=satisfaction_stats,
                 feedback_history=profile_data.get("feedback_history", []),
                 last_activity=datetime.fromisoformat(profile_data["last_activity"]),
                 total_interactions=profile_data.get("total_interactions", 0),
                 average_satisfaction=profile_data.get("average_satisfaction", 0.0),
                 created_at=datetime.fromisoformat(profile_data["created_at"]),
             )
+            self._mark_persisted(self.user_profiles[user_id])
 
     def _load_preference_learning_rules(self) -> None:
         """Load preference learning rules from storage."""
@@ -731,49 +766,58 @@ class UserPreferenceLearningSystem:
             feedback=feedback,
         )
 
-        # Get or create user profile
-        if user_id not in self.user_profiles:
-            self.user_profiles[user_id] = UserProfile(
-                user_id=user_id, experience_level=UserExperienceLevel.BEGINNER
-            )
-
-        profile = self.user_profiles[user_id]
-
-        # Add interaction to profile
-        profile.interaction_history.append(interaction)
-        profile.total_interactions += 1
-        profile.last_activity = datetime.now()
-
-        # Update satisfaction scores
-        if satisfaction_score is not None:
-            profile.satisfaction_scores.append(satisfaction_score)
-            profile.average_satisfaction = statistics.mean(profile.satisfaction_scores)
+        with self._learning_lock:
+            # Get or create user profile
+            if user_id not in self.user_profiles:
+                self.user_profiles[user_id] = UserProfile(
+                    user_id=user_id, experience_level=UserExperienceLevel.BEGINNER
+                )
 
-        # Add feedback to history
-        if feedback:
-            profile.feedback_history.append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "interaction_id": interaction_id,
-                    "feedback": feedback,
-                    "satisfaction_score": satisfaction_score,
-                }
-            )
+            profile = self.user_profiles[user_id]
+            state = self._stream_state(profile)
+
+            # Add interaction to profile, retiring whatever the bounded history
+            # evicts from the streaming counters
+            history = profile.interaction_history
+            evicted = history[0] if len(history) == history.maxlen else None
+            history.append(interaction)
+            state.interactions.add(interaction, evicted)
+            profile.total_interactions += 1
+            profile.last_activity = datetime.now()
+
+            # Update satisfaction scores
+            if satisfaction_score is not None:
+                scores = profile.satisfaction_scores
+                evicted_score = scores[0] if len(scores) == scores.maxlen else None
+                scores.append(satisfaction_score)
+                state.add_satisfaction(satisfaction_score, evicted_score)
+                profile.average_satisfaction = state.satisfaction_window_mean
+
+            # Add feedback to history
+            if feedback:
+                profile.feedback_history.append(
+                    {
+                        "timestamp": datetime.now().isoformat(),
+                        "interaction_id": interaction_id,
+                        "feedback": feedback,
+                        "satisfaction_score": satisfaction_score,
+                    }
+                )
 
-        # Log the interaction
-        self._log_user_interaction(interaction)
+            # Log the interaction
+            self._log_user_interaction(interaction)
 
-        # Trigger preference learning
-        self._trigger_preference_learning(profile, interaction)
+            # Trigger preference learning
+            self._trigger_preference_learning(profile, interaction)
 
-        # Detect behavior patterns
-        self._detect_behavior_patterns(profile)
+            # Detect behavior patterns
+            self._detect_behavior_patterns(profile)
 
-        # Update experience level
-        self._update_experience_level(profile)
+            # Update experience level
+            self._update_experience_level(profile)
 
-        # Save user profiles
-        self._save_user_profiles()
+            # Persist this interaction and what it changed
+            self._persist_interaction(profile, interaction)
 
         # Record learning event
         self.continuous_improvement.record_learning_event(
@@ -796,6 +840,77 @@ class UserPreferenceLearningSystem:
 
         return interaction_id
 
+    def _stream_state(self, profile: UserProfile) -> UserStreamState:
+        """Streaming state for ``profile``, rebuilt if it fell out of step."""
+        state = self._stream_states.get(profile.user_id)
+        if state is None or not state.in_sync_with(
+            profile.interaction_history, profile.satisfaction_scores
+        ):
+            state = UserStreamState.rebuild(
+                profile.interaction_history,
+                profile.satisfaction_scores,
+                profile.satisfaction_stats,
+            )
+            self._stream_states[profile.user_id] = state
+        return state
+
+    def compact_learning_state(self, user_id: Optional[str] = None) -> None:
+        """Rebuild streaming state from history and collapse duplicate patterns.
+
+        Per-interaction updates are incremental; this full recomputation only
+        runs on load and from the periodic background compaction job, and
+        clears any floating-point drift in the running sums.
+        """
+        user_ids = [user_id] if user_id is not None else list(self.user_profiles)
+        for uid in user_ids:
+            with self._learning_lock:
+                self._compact_profile(uid)
+
+    def _compact_profile(self, uid: str) -> None:
+        profile = self.user_profiles.get(uid)
+        if profile is None:
+            return
+
+        state = UserStreamState.rebuild(
+            profile.interaction_history,
+            profile.satisfaction_scores,
+            profile.satisfaction_stats,
+        )
+        self._stream_states[uid] = state
+        if profile.satisfaction_scores:
+            profile.average_satisfaction = state.satisfaction_window_mean
+
+        # Keep only the latest pattern of each type
+        latest: Dict[str, UserBehaviorPattern] = {}
+        for pattern in profile.behavior_patterns:
+            current = latest.get(pattern.pattern_type)
+            if current is None or pattern.detected_at >= current.detected_at:
+                latest[pattern.pattern_type] = pattern
+        if len(latest) != len(profile.behavior_patterns):
+            profile.behavior_patterns = list(latest.values())
+
+        for pref in profile.preferences.values():
+            pref.sources = list(dict.fromkeys(pref.sources))
+
+    def _schedule_compaction(self) -> None:
+        interval = float(self.config.get("compaction_interval", 0) or 0)
+        if interval <= 0:
+            return
+
+        # The job holds only a weak reference so it never keeps a discarded
+        # system alive; it cancels itself once the system is collected.
+        ref = weakref.ref(self)
+        job_id = f"user-preference-compaction:{id(self)}"
+
+        def compact() -> None:
+            system = ref()
+            if system is None:
+                get_background_scheduler().cancel(job_id)
+                return
+            system.compact_learning_state()
+
+        get_background_scheduler().schedule_periodic(job_id, compact, interval)
+
     def _trigger_preference_learning(
         self, profile: UserProfile, interaction: UserInteraction
     ) -> None:
@@ -817,13 +932,8 @@ class UserPreferenceLearningSystem:
 
         # Check minimum interactions
         if "min_interactions" in conditions:
-            interaction_count = sum(
-                1
-                for i in profile.interaction_history
-                if i.interaction_type.value
-                == conditions.get(
-                    "interaction_type", interaction.interaction_type.value
-                )
+            interaction_count = self._stream_state(profile).interactions.count(
+                conditions.get("interaction_type", interaction.interaction_type.value)
             )
             if interaction_count < conditions["min_interactions"]:
                 return False
@@ -888,21 +998,13 @@ class UserPreferenceLearningSystem:
         if interaction.duration is None:
             return
 
-        # Get recent gate interactions
-        gate_interactions = [
-            i
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.GATE_INTERACTION
-            and i.duration is not None
-        ]
-
-        if len(gate_interactions) < 3:
+        # Gate interactions with a duration in the history window
+        stats = self._stream_state(profile).interactions
+        if stats.flag("gate_duration") < 3:
             return
 
         # Calculate average response time
-        avg_response_time = statistics.mean(
-            [i.duration for i in gate_interactions[-10:]]
-        )
+        avg_response_time = statistics.mean(stats.recent_gate_durations())
 
         # Determine preferred timeout based on response time
         if avg_response_time < 2.0:
@@ -937,28 +1039,14 @@ class UserPreferenceLearningSystem:
         key: str,
     ) -> None:
         """Analyze user error handling preferences."""
-        # Get recent error handling interactions
-        error_interactions = [
-            i
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.ERROR_HANDLING
-        ]
-
-        if len(error_interactions) < 1:  # Reduced for testing
+        # Error handling interactions in the history window
+        stats = self._stream_state(profile).interactions
+        if stats.count(InteractionType.ERROR_HANDLING.value) < 1:  # Reduced for testing
             return
 
         # Analyze error handling patterns
-        auto_recovery_count = sum(
-            1
-            for i in error_interactions
-            if i.outcome and i.outcome.get("auto_recovery", False)
-        )
-
-        manual_intervention_count = sum(
-            1
-            for i in error_interactions
-            if i.outcome and i.outcome.get("manual_intervention", False)
-        )
+        auto_recovery_count = stats.flag("auto_recovery")
+        manual_intervention_count = stats.flag("manual_intervention")
 
         # Determine preferred safety level
         if auto_recovery_count > manual_intervention_count * 2:
@@ -990,30 +1078,14 @@ class UserPreferenceLearningSystem:
         key: str,
     ) -> None:
         """Analyze user approval pattern preferences."""
-        # Get recent approval decisions
-        approval_interactions = [
-            i
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.APPROVAL_DECISION
-        ]
-
-        if len(approval_interactions) < 5:
+        # Approval decisions in the history window
+        stats = self._stream_state(profile).interactions
+        total_decisions = stats.count(InteractionType.APPROVAL_DECISION.value)
+        if total_decisions < 5:
             return
 
         # Analyze approval patterns
-        approval_count = sum(
-            1
-            for i in approval_interactions
-            if i.outcome and i.outcome.get("approved", False)
-        )
-
-        sum(
-            1
-            for i in approval_interactions
-            if i.outcome and i.outcome.get("rejected", False)
-        )
-
-        total_decisions = len(approval_interactions)
+        approval_count = stats.flag("approved")
         approval_rate = approval_count / total_decisions
 
         # Determine preferred collaboration mode
@@ -1046,25 +1118,17 @@ class UserPreferenceLearningSystem:
         key: str,
     ) -> None:
         """Analyze user command pattern preferences."""
-        # Get recent command executions
-        command_interactions = [
-            i
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.COMMAND_EXECUTION
-        ]
-
-        if len(command_interactions) < 10:
+        # Command executions in the history window
+        stats = self._stream_state(profile).interactions
+        if stats.count(InteractionType.COMMAND_EXECUTION.value) < 10:
             return
 
-        # Analyze command patterns
-        command_types: Dict[str, int] = defaultdict(int)
-        for interaction in command_interactions[-20:]:
-            command_type = interaction.context.get("command_type", "unknown")
-            command_types[command_type] += 1
+        # Analyze the last 20 command types
+        command_types = stats.command_type_counts
 
         # Determine workflow style preference
         most_common = max(command_types.items(), key=lambda x: x[1])
-        total_commands = sum(command_types.values())
+        total_commands = len(stats.recent_command_types)
 
         if most_common[1] / total_commands > 0.6:
             preferred_style = "specialized"
@@ -1136,11 +1200,8 @@ class UserPreferenceLearningSystem:
     ) -> None:
         """Analyze user preference for system transparency."""
         # Count repeated requests for tool usage information
-        tool_usage_requests = sum(
-            1
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.REPEATED_PATTERN
-            and "tool_usage" in str(i.context)
+        tool_usage_requests = self._stream_state(profile).interactions.flag(
+            "tool_usage"
         )
 
         # Determine transparency preference based on frequency
@@ -1172,19 +1233,13 @@ class UserPreferenceLearningSystem:
         key: str,
     ) -> None:
         """Analyze user preference for communication style."""
+        stats = self._stream_state(profile).interactions
+
         # Count requests for simpler explanations
-        clarity_requests = sum(
-            1
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.CLARITY_REQUEST
-        )
+        clarity_requests = stats.count(InteractionType.CLARITY_REQUEST.value)
 
         # Look for explicit preference expressions in context
-        simple_requests = sum(
-            1
-            for i in profile.interaction_history
-            if "simple" in str(i.context).lower() or "explain" in str(i.context).lower()
-        )
+        simple_requests = stats.flag("simple_or_explain")
 
         # Determine communication preference
         if clarity_requests >= 3 or simple_requests >= 3:
@@ -1215,20 +1270,13 @@ class UserPreferenceLearningSystem:
         key: str,
     ) -> None:
         """Analyze user preference for system organization."""
+        stats = self._stream_state(profile).interactions
+
         # Count organization/cleanup focused interactions
-        organization_requests = sum(
-            1
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.ORGANIZATION_FOCUS
-        )
+        organization_requests = stats.count(InteractionType.ORGANIZATION_FOCUS.value)
 
         # Look for cleanup/organization keywords in context
-        cleanup_keywords = ["clean", "tidy", "organize", "cleanup", "remove"]
-        cleanup_mentions = sum(
-            1
-            for i in profile.interaction_history
-            if any(keyword in str(i.context).lower() for keyword in cleanup_keywords)
-        )
+        cleanup_mentions = stats.flag("cleanup_mention")
 
         # Determine organization preference
         if organization_requests >= 3 or cleanup_mentions >= 5:
@@ -1259,21 +1307,13 @@ class UserPreferenceLearningSystem:
         key: str,
     ) -> None:
         """Analyze user learning style preference."""
+        stats = self._stream_state(profile).interactions
+
         # Count requests for feature explanations
-        explanation_requests = sum(
-            1
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.CONVERSATIONAL_REQUEST
-            and ("how" in str(i.context).lower() or "explain" in str(i.context).lower())
-        )
+        explanation_requests = stats.flag("explanation_request")
 
         # Look for patterns in learning requests
-        simple_explanation_requests = sum(
-            1
-            for i in profile.interaction_history
-            if "simple" in str(i.context).lower()
-            and "explain" in str(i.context).lower()
-        )
+        simple_explanation_requests = stats.flag("simple_explanation")
 
         # Determine learning style preference
         if simple_explanation_requests >= 3:
@@ -1324,12 +1364,23 @@ class UserPreferenceLearningSystem:
                 break
 
         if existing_pref:
-            # Update existing preference
+            # Update existing preference; evidence_weight decays so that old
+            # evidence counts for less than recent evidence
+            now = datetime.now()
+            half_life = float(self.config.get("evidence_half_life_days", 0)) * 86400
+            weight = DecayedCounter(
+                half_life,
+                existing_pref.evidence_weight,
+                existing_pref.last_updated.timestamp(),
+            )
+            existing_pref.evidence_weight = weight.add(1.0, now.timestamp())
             existing_pref.preference_value = value
             existing_pref.confidence = confidence  # Keep original confidence value
             existing_pref.evidence_count += 1
-            existing_pref.last_updated = datetime.now()
-            existing_pref.sources.extend(sources)
+            existing_pref.last_updated = now
+            for source in sources:
+                if source not in existing_pref.sources:
+                    existing_pref.sources.append(source)
         else:
             # Create new preference
             preference = UserPreference(
@@ -1341,7 +1392,7 @@ class UserPreferenceLearningSystem:
                 confidence=confidence,  # Keep original confidence value
                 evidence_count=1,
                 last_updated=datetime.now(),
-                sources=sources,
+                sources=list(dict.fromkeys(sources)),
                 preference_type=preference_type,
             )
 
@@ -1369,23 +1420,30 @@ class UserPreferenceLearningSystem:
         self._detect_error_patterns(profile)
         self._detect_satisfaction_patterns(profile)
 
+    def _record_behavior_pattern(
+        self, profile: UserProfile, pattern: UserBehaviorPattern
+    ) -> None:
+        """Record ``pattern``, replacing the earlier detection of its type."""
+        for index, existing in enumerate(profile.behavior_patterns):
+            if existing.pattern_type == pattern.pattern_type:
+                pattern.pattern_id = existing.pattern_id
+                profile.behavior_patterns[index] = pattern
+                return
+        profile.behavior_patterns.append(pattern)
+
     def _detect_timing_patterns(self, profile: UserProfile) -> None:
         """Detect timing - related behavior patterns."""
-        interactions = list(profile.interaction_history)
+        interactions = profile.interaction_history
 
         # Analyze interaction timing
         if len(interactions) < 5:
             return
 
-        # Calculate time between interactions
-        time_diffs = []
-        for i in range(1, len(interactions)):
-            diff = (
-                interactions[i].timestamp - interactions[i - 1].timestamp
-            ).total_seconds()
-            time_diffs.append(diff)
-
-        avg_time_diff = statistics.mean(time_diffs)
+        # The mean gap between consecutive interactions telescopes to the
+        # span of the window divided by the number of gaps
+        avg_time_diff = (
+            interactions[-1].timestamp - interactions[0].timestamp
+        ).total_seconds() / (len(interactions) - 1)
 
         # Detect patterns
         if avg_time_diff < 60:  # Less than 1 minute
@@ -1403,67 +1461,45 @@ class UserPreferenceLearningSystem:
                 ],
                 recommendations=["Reduce gate timeout", "Enable quick mode"],
             )
-            profile.behavior_patterns.append(pattern)
+            self._record_behavior_pattern(profile, pattern)
 
     def _detect_workflow_patterns(self, profile: UserProfile) -> None:
         """Detect workflow - related behavior patterns."""
-        interactions = list(profile.interaction_history)
-
-        # Analyze command sequences
-        command_sequences = []
-        current_sequence = []
-
-        for interaction in interactions:
-            if interaction.interaction_type == InteractionType.COMMAND_EXECUTION:
-                current_sequence.append(interaction.context.get("command", "unknown"))
-            else:
-                if len(current_sequence) > 1:
-                    command_sequences.append(tuple(current_sequence))
-                current_sequence = []
+        # Completed command sequences in the history window
+        stats = self._stream_state(profile).interactions
+        most_common = stats.most_common_sequence()
 
         # Detect common sequences
-        if command_sequences:
-            sequence_counts: Dict[str, int] = defaultdict(int)
-            for seq in command_sequences:
-                sequence_counts[str(seq)] += 1
-
-            most_common = max(sequence_counts.items(), key=lambda x: x[1])
-            if most_common[1] > 2:  # Appears more than twice
-                pattern = UserBehaviorPattern(
-                    pattern_id=f"pattern_{int(time.time())}_{utils.random_string(8)}",
-                    user_id=profile.user_id,
-                    pattern_type="command_sequence",
-                    description=f"User frequently executes command sequence: {' -> '.join(most_common[0])}",
-                    frequency=most_common[1] / len(command_sequences),
-                    confidence=0.8,
-                    conditions={
-                        "sequence": most_common[0],
-                        "frequency": most_common[1],
-                    },
-                    implications=[
-                        "Has preferred workflow",
-                        "Could benefit from automation",
-                    ],
-                    recommendations=["Create workflow macro", "Suggest automation"],
-                )
-                profile.behavior_patterns.append(pattern)
+        if most_common is not None and most_common[1] > 2:  # More than twice
+            pattern = UserBehaviorPattern(
+                pattern_id=f"pattern_{int(time.time())}_{utils.random_string(8)}",
+                user_id=profile.user_id,
+                pattern_type="command_sequence",
+                description=f"User frequently executes command sequence: {' -> '.join(most_common[0])}",
+                frequency=most_common[1] / len(stats.sequences),
+                confidence=0.8,
+                conditions={
+                    "sequence": list(most_common[0]),
+                    "frequency": most_common[1],
+                },
+                implications=[
+                    "Has preferred workflow",
+                    "Could benefit from automation",
+                ],
+                recommendations=["Create workflow macro", "Suggest automation"],
+            )
+            self._record_behavior_pattern(profile, pattern)
 
     def _detect_error_patterns(self, profile: UserProfile) -> None:
         """Detect error - related behavior patterns."""
-        error_interactions = [
-            i
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.ERROR_HANDLING
-        ]
+        stats = self._stream_state(profile).interactions
+        error_count = stats.count(InteractionType.ERROR_HANDLING.value)
 
-        if len(error_interactions) < 3:
+        if error_count < 3:
             return
 
         # Analyze error patterns
-        error_types: Dict[str, int] = defaultdict(int)
-        for interaction in error_interactions:
-            error_type = interaction.context.get("error_type", "unknown")
-            error_types[error_type] += 1
+        error_types = stats.error_types
 
         most_common_error = max(error_types.items(), key=lambda x: x[1])
 
@@ -1473,7 +1509,7 @@ class UserPreferenceLearningSystem:
                 user_id=profile.user_id,
                 pattern_type="error_prone",
                 description=f"User frequently encounters {most_common_error[0]} errors",
-                frequency=most_common_error[1] / len(error_interactions),
+                frequency=most_common_error[1] / error_count,
                 confidence=0.7,
                 conditions={
                     "error_type": most_common_error[0],
@@ -1488,20 +1524,18 @@ class UserPreferenceLearningSystem:
                     "Provide error prevention tips",
                 ],
             )
-            profile.behavior_patterns.append(pattern)
+            self._record_behavior_pattern(profile, pattern)
 
     def _detect_satisfaction_patterns(self, profile: UserProfile) -> None:
         """Detect satisfaction - related behavior patterns."""
         if len(profile.satisfaction_scores) < 5:
             return
 
-        scores = list(profile.satisfaction_scores)
-        statistics.mean(scores)
-
         # Detect satisfaction trends
-        if len(scores) >= 10:
-            recent_avg = statistics.mean(scores[-5:])
-            older_avg = statistics.mean(scores[-10:-5])
+        if len(profile.satisfaction_scores) >= 10:
+            scores = list(islice(reversed(profile.satisfaction_scores), 10))
+            recent_avg = statistics.mean(scores[:5])
+            older_avg = statistics.mean(scores[5:])
 
             if recent_avg > older_avg + 0.2:
                 pattern = UserBehaviorPattern(
@@ -1521,7 +1555,7 @@ class UserPreferenceLearningSystem:
                         "Consider advanced features",
                     ],
                 )
-                profile.behavior_patterns.append(pattern)
+                self._record_behavior_pattern(profile, pattern)
 
     def _update_experience_level(self, profile: UserProfile) -> None:
         """Update user experience level based on interactions and patterns."""
@@ -1554,10 +1588,8 @@ class UserPreferenceLearningSystem:
 
     def _calculate_error_rate(self, profile: UserProfile) -> float:
         """Calculate user error rate."""
-        error_interactions = sum(
-            1
-            for i in profile.interaction_history
-            if i.interaction_type == InteractionType.ERROR_HANDLING
+        error_interactions = self._stream_state(profile).interactions.count(
+            InteractionType.ERROR_HANDLING.value
         )
 
         if profile.total_interactions == 0:
@@ -1665,6 +1697,7 @@ class UserPreferenceLearningSystem:
             "behavior_patterns_count": len(profile.behavior_patterns),
             "feedback_count": len(profile.feedback_history),
             "error_rate": self._calculate_error_rate(profile),
+            "satisfaction_stats": self._stream_state(profile).satisfaction.to_dict(),
             "top_preferences": [
                 {
                     "key": pref.preference_key,
@@ -1737,85 +1770,176 @@ class UserPreferenceLearningSystem:
             json.dump(learning_data, f, ensure_ascii=False, separators=(",", ":"))
             f.write("\n")
 
-    def _save_user_profiles(self) -> None:
-        """Save user profiles to storage."""
-        data = {}
-        for user_id, profile in self.user_profiles.items():
-            # Convert preferences
-            preferences_data = {}
-            for pref_key, preference in profile.preferences.items():
-                preferences_data[pref_key] = {
-                    "preference_id": preference.preference_id,
-                    "category": preference.category.value,
-                    "preference_key": preference.preference_key,
-                    "preference_value": preference.preference_value,
-                    "confidence": preference.confidence,
-                    "evidence_count": preference.evidence_count,
-                    "last_updated": preference.last_updated.isoformat(),
-                    "sources": preference.sources,
-                    "context_conditions": preference.context_conditions,
-                }
+    def _serialize_preference(self, preference: UserPreference) -> Dict[str, Any]:
+        return {
+            "preference_id": preference.preference_id,
+            "category": preference.category.value,
+            "preference_key": preference.preference_key,
+            "preference_value": preference.preference_value,
+            "confidence": preference.confidence,
+            "evidence_count": preference.evidence_count,
+            "evidence_weight": preference.evidence_weight,
+            "last_updated": preference.last_updated.isoformat(),
+            "sources": list(preference.sources),
+            "context_conditions": preference.context_conditions,
+        }
 
-            # Convert behavior patterns
-            behavior_patterns_data = []
-            for pattern in profile.behavior_patterns:
-                behavior_patterns_data.append(
-                    {
-                        "pattern_id": pattern.pattern_id,
-                        "pattern_type": pattern.pattern_type,
-                        "description": pattern.description,
-                        "frequency": pattern.frequency,
-                        "confidence": pattern.confidence,
-                        "conditions": pattern.conditions,
-                        "implications": pattern.implications,
-                        "recommendations": pattern.recommendations,
-                        "detected_at": pattern.detected_at.isoformat(),
-                    }
-                )
+    def _serialize_behavior_pattern(
+        self, pattern: UserBehaviorPattern
+    ) -> Dict[str, Any]:
+        return {
+            "pattern_id": pattern.pattern_id,
+            "pattern_type": pattern.pattern_type,
+            "description": pattern.description,
+            "frequency": pattern.frequency,
+            "confidence": pattern.confidence,
+            "conditions": pattern.conditions,
+            "implications": pattern.implications,
+            "recommendations": pattern.recommendations,
+            "detected_at": pattern.detected_at.isoformat(),
+        }
 
-            # Convert interaction history
-            interaction_history_data = []
-            for interaction in profile.interaction_history:
-                interaction_history_data.append(
-                    {
-                        "interaction_id": interaction.interaction_id,
-                        "interaction_type": interaction.interaction_type.value,
-                        "timestamp": interaction.timestamp.isoformat(),
-                        "context": interaction.context,
-                        "duration": interaction.duration,
-                        "outcome": interaction.outcome,
-                        "satisfaction_score": interaction.satisfaction_score,
-                        "feedback": interaction.feedback,
-                    }
-                )
+    def _serialize_interaction(self, interaction: UserInteraction) -> Dict[str, Any]:
+        return {
+            "interaction_id": interaction.interaction_id,
+            "interaction_type": interaction.interaction_type.value,
+            "timestamp": interaction.timestamp.isoformat(),
+            "context": interaction.context,
+            "duration": interaction.duration,
+            "outcome": interaction.outcome,
+            "satisfaction_score": interaction.satisfaction_score,
+            "feedback": interaction.feedback,
+        }
 
-            data[user_id] = {
-                "experience_level": profile.experience_level.value,
-                "preferences": preferences_data,
-                "behavior_patterns": behavior_patterns_data,
-                "interaction_history": interaction_history_data,
-                "satisfaction_scores": list(profile.satisfaction_scores),
+    def _serialize_user_state(self, profile: UserProfile) -> Dict[str, Any]:
+        return {
+            "experience_level": profile.experience_level.value,
+            "satisfaction_scores": list(profile.satisfaction_scores),
+            "satisfaction_stats": profile.satisfaction_stats.to_dict(),
+            "last_activity": profile.last_activity.isoformat(),
+            "total_interactions": profile.total_interactions,
+            "average_satisfaction": profile.average_satisfaction,
+            "created_at": profile.created_at.isoformat(),
+        }
+
+    def _serialize_profile(self, profile: UserProfile) -> Dict[str, Any]:
+        data = self._serialize_user_state(profile)
+        data.update(
+            {
+                "preferences": {
+                    pref_key: self._serialize_preference(preference)
+                    for pref_key, preference in profile.preferences.items()
+                },
+                "behavior_patterns": [
+                    self._serialize_behavior_pattern(pattern)
+                    for pattern in profile.behavior_patterns
+                ],
+                "interaction_history": [
+                    self._serialize_interaction(interaction)
+                    for interaction in profile.interaction_history
+                ],
                 "feedback_history": profile.feedback_history,
-                "last_activity": profile.last_activity.isoformat(),
-                "total_interactions": profile.total_interactions,
-                "average_satisfaction": profile.average_satisfaction,
-                "created_at": profile.created_at.isoformat(),
             }
+        )
+        return data
+
+    def _mark_persisted(self, profile: UserProfile) -> None:
+        """Remember what has been written for ``profile``."""
+        self._persisted[profile.user_id] = {
+            "preferences": {
+                key: self._serialize_preference(pref)
+                for key, pref in profile.preferences.items()
+            },
+            "behavior_patterns": [
+                self._serialize_behavior_pattern(p) for p in profile.behavior_patterns
+            ],
+            "feedback_history": len(profile.feedback_history),
+        }
+
+    def _persist_interaction(
+        self, profile: UserProfile, interaction: UserInteraction
+    ) -> None:
+        """Write one interaction plus only the profile state it changed."""
+        if not self.store.incremental:
+            self._save_user_profiles()
+            return
+
+        persisted = self._persisted.get(profile.user_id) or {
+            "preferences": {},
+            "behavior_patterns": [],
+            "feedback_history": 0,
+        }
+
+        persisted_prefs = persisted["preferences"]
+        changed_prefs = {}
+        for key, pref in profile.preferences.items():
+            serialized = self._serialize_preference(pref)
+            if persisted_prefs.get(key) != serialized:
+                changed_prefs[key] = serialized
+
+        # Patterns are upserted per type, so write from the first changed
+        # position (or everything if the list shrank)
+        persisted_patterns = persisted["behavior_patterns"]
+        patterns = [
+            self._serialize_behavior_pattern(p) for p in profile.behavior_patterns
+        ]
+        pattern_offset = 0
+        if len(patterns) >= len(persisted_patterns):
+            while (
+                pattern_offset < len(persisted_patterns)
+                and patterns[pattern_offset] == persisted_patterns[pattern_offset]
+            ):
+                pattern_offset += 1
+
+        # Feedback is append-only in practice; rewrite it if it shrank
+        feedback_offset = persisted["feedback_history"]
+        if feedback_offset > len(profile.feedback_history):
+            feedback_offset = 0
+
+        try:
+            self.store.record_interaction(
+                profile.user_id,
+                self._serialize_user_state(profile),
+                self._serialize_interaction(interaction),
+                changed_prefs,
+                patterns[pattern_offset:],
+                pattern_offset,
+                profile.feedback_history[feedback_offset:],
+                feedback_offset,
+            )
+        except Exception as e:
+            print(f"Warning: Failed to save user interaction: {e}")
+            return
+
+        persisted_prefs.update(changed_prefs)
+        persisted["behavior_patterns"] = patterns
+        persisted["feedback_history"] = len(profile.feedback_history)
+        self._persisted[profile.user_id] = persisted
+
+    def _save_user_profiles(self) -> None:
+        """Save user profiles to storage."""
+        data = {
+            user_id: self._serialize_profile(profile)
+            for user_id, profile in self.user_profiles.items()
+        }
 
         try:
-            utils.write_json(self.user_profiles_path, data)
-        except (OSError, IOError) as e:
+            self.store.save_all(data)
+        except Exception as e:
             # Handle disk space or I/O errors gracefully
             print(f"Warning: Failed to save user profiles: {e}")
             # Continue without saving - data will be lost but system won't crash
+            return
+
+        for profile in self.user_profiles.values():
+            self._mark_persisted(profile)
 
     def _load_all_user_profiles(self) -> Dict[str, UserProfile]:
         """Load all user profiles from storage."""
         try:
-            if not self.user_profiles_path.exists():
-                return {}
-
-            data = utils.read_json(self.user_profiles_path, default={})
+            # Whichever backend is configured; the SQLite store never writes
+            # user_profiles.json
+            data = self.store.load_profiles()
             profiles = {}
 
             for user_id, profile_data in data.items():
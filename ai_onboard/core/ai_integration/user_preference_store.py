@@ -0,0 +1,463 @@
+"""
+User Preference Store - Storage backends for user preference learning.
+
+Profiles used to be persisted by re-serializing every user's preferences,
+behavior patterns and interaction history into one JSON file on each
+interaction. This module provides pluggable backends instead:
+
+- JsonUserPreferenceStore: the original single-file format
+- SqliteUserPreferenceStore: standard library sqlite3 in WAL mode with one row
+  per user, an append-only interactions table indexed by user and time, and
+  per-row upserts for preferences, behavior patterns and feedback, so
+  recording an interaction is one small transaction regardless of history size
+
+Both backends exchange profiles in the JSON file's shape, so the learning
+system's (de)serialization code is shared, and the SQLite store imports an
+existing JSON file the first time it is opened.
+"""
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..base import utils
+
+SCHEMA_VERSION = 2
+
+# Matches the interaction_history deque on UserProfile
+DEFAULT_HISTORY_LIMIT = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    experience_level TEXT NOT NULL,
+    last_activity TEXT,
+    total_interactions INTEGER NOT NULL DEFAULT 0,
+    average_satisfaction REAL NOT NULL DEFAULT 0.0,
+    created_at TEXT,
+    satisfaction_scores TEXT NOT NULL DEFAULT '[]',
+    satisfaction_stats TEXT
+);
+CREATE TABLE IF NOT EXISTS interactions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    interaction_id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    timestamp TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_user_time
+    ON interactions (user_id, timestamp);
+CREATE TABLE IF NOT EXISTS preferences (
+    user_id TEXT NOT NULL,
+    preference_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, preference_key)
+);
+CREATE TABLE IF NOT EXISTS behavior_patterns (
+    user_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, position)
+);
+CREATE TABLE IF NOT EXISTS feedback (
+    user_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, position)
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class UserPreferenceStore(ABC):
+    """Abstract base class for user profile storage.
+
+    Profiles are exchanged as dicts in the ``user_profiles.json`` shape
+    (``experience_level``, ``preferences``, ``behavior_patterns``,
+    ``interaction_history``, ``satisfaction_scores``, ``satisfaction_stats``,
+    ``feedback_history``, ``last_activity``, ``total_interactions``,
+    ``average_satisfaction``, ``created_at``).
+    """
+
+    # Whether record_interaction writes only the change; otherwise callers
+    # that hold every profile save_all instead
+    incremental = False
+
+    @abstractmethod
+    def load_profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Return every stored profile keyed by user ID."""
+
+    @abstractmethod
+    def save_all(self, profiles: Dict[str, Dict[str, Any]]) -> None:
+        """Persist a full set of profiles."""
+
+    @abstractmethod
+    def record_interaction(
+        self,
+        user_id: str,
+        user_state: Dict[str, Any],
+        interaction: Dict[str, Any],
+        preferences: Dict[str, Dict[str, Any]],
+        new_patterns: List[Dict[str, Any]],
+        pattern_offset: int,
+        new_feedback: List[Dict[str, Any]],
+        feedback_offset: int,
+    ) -> None:
+        """Persist one interaction and the profile changes it caused.
+
+        ``user_state`` holds the profile's scalar fields, ``preferences`` only
+        the preferences that changed, and ``new_patterns``/``new_feedback`` the
+        entries written from ``pattern_offset``/``feedback_offset`` on (an
+        offset of 0 replaces the stored list).
+        """
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class JsonUserPreferenceStore(UserPreferenceStore):
+    """Single JSON file holding every profile (the original format)."""
+
+    def __init__(self, path: Path, history_limit: int = DEFAULT_HISTORY_LIMIT):
+        self.path = path
+        self.history_limit = history_limit
+        self._lock = threading.Lock()
+
+    def load_profiles(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        return dict(utils.read_json(self.path, default={}) or {})
+
+    def save_all(self, profiles: Dict[str, Dict[str, Any]]) -> None:
+        utils.write_json(self.path, profiles)
+
+    def record_interaction(
+        self,
+        user_id: str,
+        user_state: Dict[str, Any],
+        interaction: Dict[str, Any],
+        preferences: Dict[str, Dict[str, Any]],
+        new_patterns: List[Dict[str, Any]],
+        pattern_offset: int,
+        new_feedback: List[Dict[str, Any]],
+        feedback_offset: int,
+    ) -> None:
+        # The single file is only ever rewritten whole: load, apply, save
+        with self._lock:
+            profiles = self.load_profiles()
+            profile = {**profiles.get(user_id, {}), **user_state}
+            history = list(profile.get("interaction_history", [])) + [interaction]
+            profile["interaction_history"] = history[-self.history_limit :]
+            profile["preferences"] = {**profile.get("preferences", {}), **preferences}
+            for key, entries, offset in (
+                ("behavior_patterns", new_patterns, pattern_offset),
+                ("feedback_history", new_feedback, feedback_offset),
+            ):
+                stored = list(profile.get(key, [])) if offset else []
+                stored[offset : offset + len(entries)] = entries
+                profile[key] = stored
+            profiles[user_id] = profile
+            self.save_all(profiles)
+
+
+class SqliteUserPreferenceStore(UserPreferenceStore):
+    """SQLite-backed profile store (WAL mode, incremental writes)."""
+
+    incremental = True
+
+    def __init__(
+        self,
+        db_path: Path,
+        legacy_json_path: Optional[Path] = None,
+        history_limit: int = DEFAULT_HISTORY_LIMIT,
+    ):
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self.history_limit = history_limit
+        self._lock = threading.Lock()
+
+        utils.ensure_dir(db_path.parent)
+        self._conn = sqlite3.connect(
+            str(db_path), timeout=30.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate_schema()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        self._conn.commit()
+        self._migrate_legacy_json()
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def _migrate_schema(self) -> None:
+        """Add columns introduced after a database was created."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(users)")}
+        if "satisfaction_stats" not in columns:
+            # Version 2: all-time satisfaction statistics
+            self._conn.execute("ALTER TABLE users ADD COLUMN satisfaction_stats TEXT")
+
+    def _migrate_legacy_json(self) -> None:
+        """Import the legacy JSON file once, on first open."""
+        if self.legacy_json_path is None:
+            return
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'json_migrated'"
+            ).fetchone()
+        if row is not None:
+            return
+
+        imported = 0
+        if self.legacy_json_path.exists():
+            try:
+                data = json.loads(self.legacy_json_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read legacy user profiles: {e}")
+                data = {}
+            if isinstance(data, dict):
+                profiles = {
+                    user_id: profile
+                    for user_id, profile in data.items()
+                    if isinstance(profile, dict) and "experience_level" in profile
+                }
+                self.save_all(profiles)
+                imported = len(profiles)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (str(imported),),
+            )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def load_profiles(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            conn = self._conn
+            profiles: Dict[str, Dict[str, Any]] = {}
+            for row in conn.execute(
+                "SELECT user_id, experience_level, last_activity, total_interactions,"
+                " average_satisfaction, created_at, satisfaction_scores,"
+                " satisfaction_stats FROM users"
+            ):
+                profiles[row[0]] = {
+                    "experience_level": row[1],
+                    "last_activity": row[2],
+                    "total_interactions": row[3],
+                    "average_satisfaction": row[4],
+                    "created_at": row[5],
+                    "satisfaction_scores": json.loads(row[6] or "[]"),
+                    "preferences": {},
+                    "behavior_patterns": [],
+                    "interaction_history": [],
+                    "feedback_history": [],
+                }
+                if row[7]:
+                    profiles[row[0]]["satisfaction_stats"] = json.loads(row[7])
+
+            for user_id, key, data in conn.execute(
+                "SELECT user_id, preference_key, data FROM preferences"
+            ):
+                if user_id in profiles:
+                    profiles[user_id]["preferences"][key] = json.loads(data)
+            for user_id, data in conn.execute(
+                "SELECT user_id, data FROM behavior_patterns ORDER BY user_id, position"
+            ):
+                if user_id in profiles:
+                    profiles[user_id]["behavior_patterns"].append(json.loads(data))
+            for user_id, data in conn.execute(
+                "SELECT user_id, data FROM feedback ORDER BY user_id, position"
+            ):
+                if user_id in profiles:
+                    profiles[user_id]["feedback_history"].append(json.loads(data))
+
+            for user_id, profile in profiles.items():
+                rows = conn.execute(
+                    "SELECT data FROM interactions WHERE user_id = ?"
+                    " ORDER BY seq DESC LIMIT ?",
+                    (user_id, self.history_limit),
+                ).fetchall()
+                profile["interaction_history"] = [
+                    json.loads(data) for (data,) in reversed(rows)
+                ]
+            return profiles
+
+    def count_interactions(self, user_id: Optional[str] = None) -> int:
+        with self._lock:
+            if user_id is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM interactions").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM interactions WHERE user_id = ?", (user_id,)
+                ).fetchone()
+            return int(row[0])
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _upsert_user(conn: sqlite3.Connection, user_id: str, state: Dict[str, Any]):
+        conn.execute(
+            "INSERT INTO users (user_id, experience_level, last_activity,"
+            " total_interactions, average_satisfaction, created_at,"
+            " satisfaction_scores, satisfaction_stats)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(user_id) DO UPDATE SET"
+            " experience_level = excluded.experience_level,"
+            " last_activity = excluded.last_activity,"
+            " total_interactions = excluded.total_interactions,"
+            " average_satisfaction = excluded.average_satisfaction,"
+            " satisfaction_scores = excluded.satisfaction_scores,"
+            " satisfaction_stats = excluded.satisfaction_stats",
+            (
+                user_id,
+                state.get("experience_level", "beginner"),
+                state.get("last_activity"),
+                int(state.get("total_interactions", 0) or 0),
+                float(state.get("average_satisfaction", 0.0) or 0.0),
+                state.get("created_at"),
+                _dumps(list(state.get("satisfaction_scores", []))),
+                (
+                    _dumps(state["satisfaction_stats"])
+                    if state.get("satisfaction_stats")
+                    else None
+                ),
+            ),
+        )
+
+    @staticmethod
+    def _upsert_preferences(
+        conn: sqlite3.Connection, user_id: str, preferences: Dict[str, Dict[str, Any]]
+    ) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO preferences (user_id, preference_key, data)"
+            " VALUES (?, ?, ?)",
+            [(user_id, key, _dumps(data)) for key, data in preferences.items()],
+        )
+
+    @staticmethod
+    def _write_positional(
+        conn: sqlite3.Connection,
+        table: str,
+        user_id: str,
+        entries: List[Dict[str, Any]],
+        offset: int,
+    ) -> None:
+        if offset == 0:
+            conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} (user_id, position, data)"
+            " VALUES (?, ?, ?)",
+            [(user_id, offset + i, _dumps(e)) for i, e in enumerate(entries)],
+        )
+
+    @staticmethod
+    def _insert_interactions(
+        conn: sqlite3.Connection, user_id: str, interactions: List[Dict[str, Any]]
+    ) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO interactions"
+            " (interaction_id, user_id, timestamp, data) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    i.get("interaction_id") or f"{user_id}_{n}",
+                    user_id,
+                    i.get("timestamp"),
+                    _dumps(i),
+                )
+                for n, i in enumerate(interactions)
+            ],
+        )
+
+    def save_all(self, profiles: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock, self._conn as conn:
+            for user_id, profile in profiles.items():
+                self._upsert_user(conn, user_id, profile)
+                conn.execute("DELETE FROM preferences WHERE user_id = ?", (user_id,))
+                self._upsert_preferences(
+                    conn, user_id, profile.get("preferences", {}) or {}
+                )
+                self._write_positional(
+                    conn,
+                    "behavior_patterns",
+                    user_id,
+                    profile.get("behavior_patterns", []) or [],
+                    0,
+                )
+                self._write_positional(
+                    conn,
+                    "feedback",
+                    user_id,
+                    profile.get("feedback_history", []) or [],
+                    0,
+                )
+                self._insert_interactions(
+                    conn, user_id, profile.get("interaction_history", []) or []
+                )
+
+    def record_interaction(
+        self,
+        user_id: str,
+        user_state: Dict[str, Any],
+        interaction: Dict[str, Any],
+        preferences: Dict[str, Dict[str, Any]],
+        new_patterns: List[Dict[str, Any]],
+        pattern_offset: int,
+        new_feedback: List[Dict[str, Any]],
+        feedback_offset: int,
+    ) -> None:
+        with self._lock, self._conn as conn:
+            self._insert_interactions(conn, user_id, [interaction])
+            self._upsert_user(conn, user_id, user_state)
+            if preferences:
+                self._upsert_preferences(conn, user_id, preferences)
+            if new_patterns or pattern_offset == 0:
+                self._write_positional(
+                    conn, "behavior_patterns", user_id, new_patterns, pattern_offset
+                )
+            if new_feedback or feedback_offset == 0:
+                self._write_positional(
+                    conn, "feedback", user_id, new_feedback, feedback_offset
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_user_preference_store(
+    root: Path, backend: str = "sqlite"
+) -> UserPreferenceStore:
+    """Create the configured store for a project root.
+
+    Falls back to the JSON file if SQLite cannot be opened.
+    """
+    json_path = root / ".ai_onboard" / "user_profiles.json"
+    if backend == "sqlite":
+        try:
+            return SqliteUserPreferenceStore(
+                root / ".ai_onboard" / "user_preferences.db",
+                legacy_json_path=json_path,
+            )
+        except sqlite3.Error as e:
+            print(f"Warning: SQLite preference store unavailable, using JSON: {e}")
+    return JsonUserPreferenceStore(json_path)
@@ -0,0 +1,314 @@
+"""
+User Preference Streams - Constant-time learners for interaction streams.
+
+Preference learning and behavior pattern detection used to rescan a user's
+whole interaction history on every interaction. The primitives here let the
+learning system update its evidence incrementally instead:
+
+- RunningStats: Welford running mean and variance over every score a user
+  has given; it is persisted with the profile, since the bounded score deque
+  cannot reproduce it
+- DecayedCounter: exponentially decayed evidence weight
+- InteractionWindowStats: counters that mirror the bounded
+  ``interaction_history`` deque, adding each new interaction and subtracting
+  the one it evicts, plus sliding-window command sequence counts
+- UserStreamState: the per-user bundle of the above, including a windowed
+  satisfaction mean over the ``satisfaction_scores`` deque
+
+Everything else is rebuildable from the history deques, which the learning
+system does only on load, when the state is out of sync, or in periodic
+compaction.
+"""
+
+import math
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+# Keywords used by the learners; matched against str(context).lower()
+CLEANUP_KEYWORDS = ("clean", "tidy", "organize", "cleanup", "remove")
+
+# Longest command run tracked as one sequence
+MAX_SEQUENCE_LENGTH = 50
+
+
+class RunningStats:
+    """Welford running mean and variance."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "mean": self.mean, "variance": self.variance}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Restore stats saved with ``to_dict``."""
+        stats = cls()
+        stats.count = int(data.get("count", 0))
+        stats.mean = float(data.get("mean", 0.0))
+        stats._m2 = float(data.get("variance", 0.0)) * max(0, stats.count - 1)
+        return stats
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        stats = cls()
+        for value in values:
+            stats.add(value)
+        return stats
+
+
+class DecayedCounter:
+    """Evidence weight that halves every ``half_life`` seconds."""
+
+    __slots__ = ("half_life", "value", "updated_at")
+
+    def __init__(self, half_life: float, value: float = 0.0, updated_at: float = 0.0):
+        self.half_life = half_life
+        self.value = value
+        self.updated_at = updated_at
+
+    def value_at(self, now: float) -> float:
+        elapsed = max(0.0, now - self.updated_at)
+        if self.half_life <= 0:
+            return self.value
+        return self.value * math.pow(0.5, elapsed / self.half_life)
+
+    def add(self, amount: float, now: float) -> float:
+        self.value = self.value_at(now) + amount
+        self.updated_at = now
+        return self.value
+
+
+def interaction_features(interaction: Any) -> Tuple[str, List[str]]:
+    """Return an interaction's type value and the learner flags it sets."""
+    itype = interaction.interaction_type.value
+    context = interaction.context or {}
+    outcome = interaction.outcome or {}
+    text = str(context).lower()
+    flags = []
+
+    if itype == "gate_interaction" and interaction.duration is not None:
+        flags.append("gate_duration")
+    elif itype == "error_handling":
+        if outcome.get("auto_recovery", False):
+            flags.append("auto_recovery")
+        if outcome.get("manual_intervention", False):
+            flags.append("manual_intervention")
+    elif itype == "approval_decision" and outcome.get("approved", False):
+        flags.append("approved")
+    elif itype == "repeated_pattern" and "tool_usage" in str(context):
+        flags.append("tool_usage")
+
+    has_simple = "simple" in text
+    has_explain = "explain" in text
+    if has_simple or has_explain:
+        flags.append("simple_or_explain")
+    if has_simple and has_explain:
+        flags.append("simple_explanation")
+    if itype == "conversational_request" and ("how" in text or has_explain):
+        flags.append("explanation_request")
+    if any(keyword in text for keyword in CLEANUP_KEYWORDS):
+        flags.append("cleanup_mention")
+    return itype, flags
+
+
+class InteractionWindowStats:
+    """Learner evidence over a sliding window of interactions."""
+
+    def __init__(self, window: Optional[int] = 1000):
+        self.window = window
+        self.size = 0
+        self.position = 0
+        self.last_interaction_id: Optional[str] = None
+
+        self.type_counts: Counter = Counter()
+        self.flag_counts: Counter = Counter()
+        self.error_types: Counter = Counter()
+        self.gate_durations: Deque[float] = deque(maxlen=10)
+
+        self.recent_command_types: Deque[str] = deque(maxlen=20)
+        self.command_type_counts: Counter = Counter()
+
+        self._run: List[str] = []
+        self._run_start = 0
+        self.sequences: Deque[Tuple[int, Tuple[str, ...]]] = deque()
+        self.sequence_counts: Counter = Counter()
+        self._best_sequence: Optional[Tuple[Tuple[str, ...], int]] = None
+
+    @classmethod
+    def rebuild(
+        cls, history: Iterable[Any], window: Optional[int] = 1000
+    ) -> "InteractionWindowStats":
+        """Full recomputation from an interaction history."""
+        stats = cls(window)
+        for interaction in history:
+            stats.add(interaction)
+        return stats
+
+    def in_sync_with(self, history: Deque[Any]) -> bool:
+        if self.size != len(history):
+            return False
+        if not history:
+            return True
+        return self.last_interaction_id == history[-1].interaction_id
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _apply(self, interaction: Any, sign: int) -> None:
+        itype, flags = interaction_features(interaction)
+        self.type_counts[itype] += sign
+        for flag in flags:
+            self.flag_counts[flag] += sign
+        if itype == "error_handling":
+            error_type = (interaction.context or {}).get("error_type", "unknown")
+            self.error_types[error_type] += sign
+            if self.error_types[error_type] <= 0:
+                del self.error_types[error_type]
+
+    def add(self, interaction: Any, evicted: Optional[Any] = None) -> None:
+        """Add ``interaction``; ``evicted`` is the one that fell out of the window."""
+        self.position += 1
+        self._apply(interaction, 1)
+        if evicted is not None:
+            self._apply(evicted, -1)
+        else:
+            self.size += 1
+        self.last_interaction_id = interaction.interaction_id
+
+        itype = interaction.interaction_type.value
+        context = interaction.context or {}
+
+        if itype == "gate_interaction" and interaction.duration is not None:
+            self.gate_durations.append(interaction.duration)
+
+        if itype == "command_execution":
+            if len(self.recent_command_types) == self.recent_command_types.maxlen:
+                old = self.recent_command_types[0]
+                self.command_type_counts[old] -= 1
+                if self.command_type_counts[old] <= 0:
+                    del self.command_type_counts[old]
+            command_type = context.get("command_type", "unknown")
+            self.recent_command_types.append(command_type)
+            self.command_type_counts[command_type] += 1
+
+            if not self._run:
+                self._run_start = self.position
+            if len(self._run) < MAX_SEQUENCE_LENGTH:
+                self._run.append(context.get("command", "unknown"))
+        else:
+            if len(self._run) > 1:
+                key = tuple(self._run)
+                self.sequences.append((self._run_start, key))
+                self.sequence_counts[key] += 1
+                self._best_sequence = None
+            self._run = []
+
+        # Sequences that started before the window are forgotten
+        if self.window is not None:
+            while self.sequences and self.sequences[0][0] <= self.position - self.window:
+                _, key = self.sequences.popleft()
+                self.sequence_counts[key] -= 1
+                if self.sequence_counts[key] <= 0:
+                    del self.sequence_counts[key]
+                self._best_sequence = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def count(self, interaction_type: str) -> int:
+        return self.type_counts.get(interaction_type, 0)
+
+    def flag(self, name: str) -> int:
+        return self.flag_counts.get(name, 0)
+
+    def recent_gate_durations(self) -> List[float]:
+        """Durations of the (up to 10) latest gate interactions in the window."""
+        n = min(len(self.gate_durations), self.flag("gate_duration"))
+        return list(self.gate_durations)[len(self.gate_durations) - n :]
+
+    def most_common_sequence(self) -> Optional[Tuple[Tuple[str, ...], int]]:
+        if self._best_sequence is None and self.sequence_counts:
+            self._best_sequence = max(self.sequence_counts.items(), key=lambda x: x[1])
+        return self._best_sequence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "type_counts": dict(self.type_counts),
+            "flag_counts": dict(self.flag_counts),
+            "sequences": len(self.sequences),
+        }
+
+
+class UserStreamState:
+    """Streaming learner state for one user profile."""
+
+    def __init__(self, window: Optional[int] = 1000):
+        self.interactions = InteractionWindowStats(window)
+        self.satisfaction = RunningStats()
+        self.satisfaction_window_sum = 0.0
+        self.satisfaction_window_size = 0
+
+    @classmethod
+    def rebuild(
+        cls,
+        history: Deque[Any],
+        satisfaction_scores: Deque[float],
+        satisfaction: Optional[RunningStats] = None,
+    ) -> "UserStreamState":
+        """Full recomputation from a profile's bounded history deques.
+
+        ``satisfaction`` is the profile's all-time score statistics, which are
+        carried over rather than recomputed from the deque.
+        """
+        state = cls(history.maxlen)
+        state.interactions = InteractionWindowStats.rebuild(history, history.maxlen)
+        if satisfaction is None:
+            satisfaction = RunningStats.from_values(satisfaction_scores)
+        state.satisfaction = satisfaction
+        state.satisfaction_window_sum = float(sum(satisfaction_scores))
+        state.satisfaction_window_size = len(satisfaction_scores)
+        return state
+
+    def in_sync_with(
+        self, history: Deque[Any], satisfaction_scores: Deque[float]
+    ) -> bool:
+        return (
+            self.interactions.in_sync_with(history)
+            and self.satisfaction_window_size == len(satisfaction_scores)
+        )
+
+    def add_satisfaction(self, score: float, evicted: Optional[float] = None) -> None:
+        self.satisfaction.add(score)
+        self.satisfaction_window_sum += score
+        if evicted is not None:
+            self.satisfaction_window_sum -= evicted
+        else:
+            self.satisfaction_window_size += 1
+
+    @property
+    def satisfaction_window_mean(self) -> float:
+        if not self.satisfaction_window_size:
+            return 0.0
+        return self.satisfaction_window_sum / self.satisfaction_window_size
@@ -9,7 +9,6 @@ This module provides sophisticated vision alignment monitoring that:
 """
 
 import json
-import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
@@ -17,6 +16,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from ..base import utils
+from ..base.background_scheduler import get_background_scheduler
 from .agent_activity_monitor import AgentActivityMonitor
 
 
@@ -130,7 +130,7 @@ class VisionDriftAlertingSystem:
 
         # Monitoring state
         self.monitoring_active = False
-        self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_job_id: Optional[str] = None
 
         # Ensure directories exist
         self.ai_onboard_dir.mkdir(exist_ok=True)
@@ -147,18 +147,21 @@ class VisionDriftAlertingSystem:
             return
 
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitoring_loop, daemon=True
+        self.monitor_job_id = get_background_scheduler().schedule_periodic(
+            f"vision_drift_alerting:{id(self)}",
+            self._monitoring_tick,
+            self.scan_interval,
+            initial_delay=0.0,
         )
-        self.monitor_thread.start()
 
         print("🎯 Vision Drift Alerting System started")
 
     def stop_monitoring(self) -> None:
         """Stop vision drift monitoring."""
         self.monitoring_active = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=5.0)
+        if self.monitor_job_id:
+            get_background_scheduler().cancel(self.monitor_job_id)
+            self.monitor_job_id = None
 
         self._save_alerts()
         print("⏹️ Vision Drift Alerting System stopped")
@@ -270,33 +273,29 @@ class VisionDriftAlertingSystem:
 
         return True
 
-    def _monitoring_loop(self) -> None:
-        """Main vision drift monitoring loop."""
-        while self.monitoring_active:
-            try:
-                # Update metrics for all active agents
-                self._update_all_agent_metrics()
-
-                # Check for drift in each agent
-                for agent_id in list(self.agent_metrics.keys()):
-                    drift_alerts = self.detect_drift_for_agent(agent_id)
-
-                    # Log significant alerts
-                    for alert in drift_alerts:
-                        if alert.severity in [
-                            DriftSeverity.SERIOUS,
-                            DriftSeverity.CRITICAL,
-                        ]:
-                            self._log_drift_alert(alert)
-
-                    # Auto-escalate unresolved alerts
-                    self._auto_escalate_alerts(agent_id)
-
-                time.sleep(self.scan_interval)
-
-            except Exception as e:
-                print(f"Warning: Vision drift monitoring error: {e}")
-                time.sleep(self.scan_interval)
+    def _monitoring_tick(self) -> None:
+        """Single vision drift pass, run periodically by the scheduler."""
+        try:
+            # Update metrics for all active agents
+            self._update_all_agent_metrics()
+
+            # Check for drift in each agent
+            for agent_id in list(self.agent_metrics.keys()):
+                drift_alerts = self.detect_drift_for_agent(agent_id)
+
+                # Log significant alerts
+                for alert in drift_alerts:
+                    if alert.severity in [
+                        DriftSeverity.SERIOUS,
+                        DriftSeverity.CRITICAL,
+                    ]:
+                        self._log_drift_alert(alert)
+
+                # Auto-escalate unresolved alerts
+                self._auto_escalate_alerts(agent_id)
+
+        except Exception as e:
+            print(f"Warning: Vision drift monitoring error: {e}")
 
     def _update_all_agent_metrics(self) -> None:
         """Update alignment metrics for all monitored agents."""
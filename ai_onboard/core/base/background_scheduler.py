@@ -0,0 +1,321 @@
+"""
+Background Scheduler - Shared timer service for periodic monitoring work.
+
+Long-lived processes used to run one daemon thread per monitoring subsystem,
+each sleeping in its own loop. This module replaces those loops with a single
+heap-based scheduler thread that all subsystems register jobs with:
+
+- Periodic and one-shot jobs ordered by due time in a min-heap
+- Random jitter so jobs with equal intervals do not wake in lockstep
+- Coalescing of overdue runs (a late job runs once, not once per missed tick)
+- Per-job timing statistics for observing background load
+- A global throttle factor that stretches every interval
+- Clean shutdown that stops the worker and drops pending jobs
+"""
+
+import atexit
+import heapq
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class JobStats:
+    """Timing statistics collected for a scheduled job."""
+
+    runs: int = 0
+    failures: int = 0
+    coalesced_runs: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_duration: float = 0.0
+    last_run_at: Optional[float] = None
+    last_error: Optional[str] = None
+
+    @property
+    def avg_time(self) -> float:
+        """Average wall time per run in seconds."""
+        return self.total_time / self.runs if self.runs else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "coalesced_runs": self.coalesced_runs,
+            "avg_time": self.avg_time,
+            "max_time": self.max_time,
+            "last_duration": self.last_duration,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class ScheduledJob:
+    """A job registered with the background scheduler."""
+
+    job_id: str
+    func: Callable[[], Any]
+    interval: Optional[float]  # None for one-shot jobs
+    jitter: float = 0.0  # Fraction of the interval, e.g. 0.1 == +/-10%
+    next_run: float = 0.0
+    cancelled: bool = False
+    stats: JobStats = field(default_factory=JobStats)
+
+    @property
+    def one_shot(self) -> bool:
+        return self.interval is None
+
+
+class BackgroundScheduler:
+    """Single-threaded timer service shared by monitoring subsystems."""
+
+    def __init__(self, name: str = "ai-onboard-scheduler"):
+        self.name = name
+        self._heap: List[Tuple[float, int, str]] = []
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Bumped by shutdown; a worker exits once its generation is stale, so
+        # one still finishing a job never runs next to its replacement
+        self._generation = 0
+        self._throttle = 1.0
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def schedule_periodic(
+        self,
+        job_id: str,
+        func: Callable[[], Any],
+        interval: float,
+        jitter: float = 0.1,
+        initial_delay: Optional[float] = None,
+    ) -> str:
+        """Register ``func`` to run every ``interval`` seconds.
+
+        Re-registering an existing ``job_id`` replaces the previous job.
+        The first run happens after ``initial_delay`` (defaults to one
+        interval, matching the sleep-after-work loops this replaces).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        delay = interval if initial_delay is None else max(0.0, initial_delay)
+        job = ScheduledJob(
+            job_id=job_id, func=func, interval=interval, jitter=max(0.0, jitter)
+        )
+        self._add(job, delay)
+        return job_id
+
+    def schedule_once(self, job_id: str, func: Callable[[], Any], delay: float) -> str:
+        """Register ``func`` to run a single time after ``delay`` seconds."""
+        job = ScheduledJob(job_id=job_id, func=func, interval=None)
+        self._add(job, max(0.0, delay))
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job. Returns False if the job was not registered."""
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            job.cancelled = True
+            self._cond.notify()
+            return True
+
+    def has_job(self, job_id: str) -> bool:
+        with self._cond:
+            return job_id in self._jobs
+
+    # ------------------------------------------------------------------
+    # Observation and throttling
+    # ------------------------------------------------------------------
+
+    def set_throttle(self, factor: float) -> None:
+        """Stretch (factor > 1) or compress (factor < 1) all periodic intervals."""
+        if factor <= 0:
+            raise ValueError("throttle factor must be positive")
+        with self._cond:
+            self._throttle = factor
+            self._cond.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return scheduler state and per-job timing statistics."""
+        with self._cond:
+            now = time.monotonic()
+            jobs = {
+                job_id: {
+                    "interval": job.interval,
+                    "one_shot": job.one_shot,
+                    "due_in": max(0.0, job.next_run - now),
+                    **job.stats.to_dict(),
+                }
+                for job_id, job in self._jobs.items()
+            }
+            return {
+                "running": self._running,
+                "throttle": self._throttle,
+                "job_count": len(jobs),
+                "jobs": jobs,
+            }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0) -> None:
+        """Stop the worker thread and drop every pending job."""
+        with self._cond:
+            self._running = False
+            self._generation += 1
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._jobs.clear()
+            self._heap.clear()
+            thread = self._thread
+            self._thread = None
+            self._cond.notify_all()
+
+        if (
+            wait
+            and thread is not None
+            and thread.is_alive()
+            and thread is not threading.current_thread()
+        ):
+            thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _add(self, job: ScheduledJob, delay: float) -> None:
+        with self._cond:
+            previous = self._jobs.get(job.job_id)
+            if previous is not None:
+                previous.cancelled = True
+            job.next_run = time.monotonic() + delay
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._heap, (job.next_run, next(self._counter), job.job_id))
+            self._ensure_worker()
+            self._cond.notify()
+
+    def _ensure_worker(self) -> None:
+        # Caller holds self._cond
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, args=(self._generation,), name=self.name, daemon=True
+        )
+        self._thread.start()
+
+    def _next_delay(self, job: ScheduledJob) -> float:
+        interval = (job.interval or 0.0) * self._throttle
+        if job.jitter:
+            interval += random.uniform(-job.jitter, job.jitter) * interval
+        return max(0.001, interval)
+
+    def _pop_due_job(self, generation: int) -> Optional[ScheduledJob]:
+        """Block until a job is due, returning None when shutting down."""
+        with self._cond:
+            while self._running and generation == self._generation:
+                # Drop stale heap entries for cancelled or replaced jobs
+                while self._heap:
+                    due, _, job_id = self._heap[0]
+                    job = self._jobs.get(job_id)
+                    if job is None or job.cancelled or job.next_run != due:
+                        heapq.heappop(self._heap)
+                        continue
+                    break
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                due, _, job_id = self._heap[0]
+                wait_for = due - time.monotonic()
+                if wait_for > 0:
+                    self._cond.wait(timeout=wait_for)
+                    continue
+
+                heapq.heappop(self._heap)
+                return self._jobs[job_id]
+        return None
+
+    def _run(self, generation: int) -> None:
+        while True:
+            job = self._pop_due_job(generation)
+            if job is None:
+                return
+            self._execute(job)
+
+    def _execute(self, job: ScheduledJob) -> None:
+        started_at = time.monotonic()
+        late_by = started_at - job.next_run
+        stats = job.stats
+        try:
+            job.func()
+        except Exception as e:
+            stats.failures += 1
+            stats.last_error = f"{type(e).__name__}: {e}"
+        finally:
+            duration = time.monotonic() - started_at
+            stats.runs += 1
+            stats.total_time += duration
+            stats.max_time = max(stats.max_time, duration)
+            stats.last_duration = duration
+            stats.last_run_at = time.time()
+
+        with self._cond:
+            if job.cancelled or self._jobs.get(job.job_id) is not job:
+                return
+            if job.one_shot:
+                del self._jobs[job.job_id]
+                return
+
+            # Coalesce overdue runs: schedule from "now" rather than replaying
+            # every tick that was missed while the process was busy.
+            interval = (job.interval or 0.0) * self._throttle
+            if interval and late_by > interval:
+                stats.coalesced_runs += int(late_by // interval)
+            job.next_run = time.monotonic() + self._next_delay(job)
+            heapq.heappush(self._heap, (job.next_run, next(self._counter), job.job_id))
+            self._cond.notify()
+
+
+# Global scheduler instance
+_scheduler: Optional[BackgroundScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_background_scheduler() -> BackgroundScheduler:
+    """Get the process-wide background scheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BackgroundScheduler()
+        return _scheduler
+
+
+def shutdown_background_scheduler(wait: bool = True) -> None:
+    """Shut down the process-wide scheduler if it was started."""
+    global _scheduler
+    with _scheduler_lock:
+        scheduler = _scheduler
+        _scheduler = None
+    if scheduler is not None:
+        scheduler.shutdown(wait=wait)
+
+
+atexit.register(shutdown_background_scheduler, False)
@@ -1,14 +1,46 @@
+"""
+Content-addressed project checkpoints.
+
+Each checkpoint is a small manifest mapping relative paths to content hashes.
+File contents live once in a shared blob store keyed by SHA-256
+(``.ai_onboard/checkpoints/objects/ab/cdef...``), so repeated checkpoints of a
+mostly unchanged tree cost only the new content. A stat cache keyed by
+(size, mtime_ns) lets unchanged files skip re-hashing entirely.
+
+Blobs are materialized with a copy-on-write reflink where the filesystem
+supports it, optionally with hardlinks, and otherwise with a streamed copy.
+Restore only writes files whose content differs, and ``gc`` reclaims blobs
+that no checkpoint references. Checkpoints written by the older layout (a full
+``files/`` copy per checkpoint) can still be listed and restored.
+"""
+
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import shutil
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from . import utils
 
 INDEX = "index.jsonl"
+MANIFEST = "manifest.json"
+OBJECTS = "objects"
+STAT_CACHE = "stat_cache.json"
+CHUNK_SIZE = 1024 * 1024
+
+# Linux FICLONE ioctl: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+# Materialization modes:
+#   "auto"     - reflink when possible, otherwise streamed copy (safe default)
+#   "hardlink" - reflink, then hardlink, then copy. Hardlinked files share the
+#                blob inode, so they must be replaced rather than edited in place.
+#   "copy"     - always stream a full copy
+LINK_MODES = ("auto", "hardlink", "copy")
 
 
 def _ckpt_dir(root: Path) -> Path:
@@ -17,6 +49,14 @@ def _ckpt_dir(root: Path) -> Path:
     return p
 
 
+def _objects_dir(root: Path) -> Path:
+    return _ckpt_dir(root) / OBJECTS
+
+
+def _blob_path(root: Path, digest: str) -> Path:
+    return _objects_dir(root) / digest[:2] / digest[2:]
+
+
 def _normalize_scope(root: Path, scope: Iterable[str]) -> List[Path]:
     # Convert globs to concrete paths, ignore protected internals by convention
     out: List[Path] = []
@@ -41,26 +81,172 @@ def _normalize_scope(root: Path, scope: Iterable[str]) -> List[Path]:
     return uniq
 
 
+def _expand_files(root: Path, items: Iterable[Path]) -> List[Path]:
+    """Expand scope entries to regular files, walking directories."""
+    files: List[Path] = []
+    seen: Set[str] = set()
+    for rel in items:
+        src = root / rel
+        if src.is_file():
+            candidates = [rel]
+        elif src.is_dir():
+            candidates = []
+            for dirpath, dirnames, filenames in os.walk(src):
+                dirnames[:] = [d for d in dirnames if d not in (".git", ".ai_onboard")]
+                base = Path(dirpath)
+                for name in filenames:
+                    candidates.append((base / name).relative_to(root))
+        else:
+            continue
+        for cand in candidates:
+            key = cand.as_posix()
+            if key not in seen and (root / cand).is_file():
+                seen.add(key)
+                files.append(cand)
+    return files
+
+
+# ----------------------------------------------------------------------------
+# Hashing and the stat cache
+# ----------------------------------------------------------------------------
+
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_stat_cache(root: Path) -> Dict[str, List[Any]]:
+    # Read directly: the cache is rewritten with os.replace, which bypasses the
+    # utils.read_json memo.
+    try:
+        data = json.loads((_ckpt_dir(root) / STAT_CACHE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return dict(data) if isinstance(data, dict) else {}
+
+
+def _save_stat_cache(root: Path, cache: Dict[str, List[Any]]) -> None:
+    path = _ckpt_dir(root) / STAT_CACHE
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _cached_hash(
+    path: Path, key: str, cache: Dict[str, List[Any]], st: Optional[os.stat_result]
+) -> str:
+    """Return the content hash, re-hashing only when size or mtime changed."""
+    if st is None:
+        st = path.stat()
+    entry = cache.get(key)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+    digest = _hash_file(path)
+    cache[key] = [st.st_size, st.st_mtime_ns, digest]
+    return digest
+
+
+# ----------------------------------------------------------------------------
+# Materialization
+# ----------------------------------------------------------------------------
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone ``src`` to ``dst`` with the FICLONE ioctl; False if unsupported."""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        try:
+            dst.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def _materialize(src: Path, dst: Path, link_mode: str = "auto") -> str:
+    """Place a copy of ``src`` at ``dst`` atomically; return the method used."""
+    utils.ensure_dir(dst.parent)
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+    method = "copy"
+    try:
+        if link_mode != "copy" and _reflink(src, tmp):
+            method = "reflink"
+        elif link_mode == "hardlink":
+            try:
+                os.link(src, tmp)
+                method = "hardlink"
+            except OSError:
+                shutil.copyfile(src, tmp)
+        else:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return method
+
+
+def _store_blob(root: Path, src: Path, digest: str) -> bool:
+    """Add ``src`` to the blob store unless present. Returns True if written."""
+    blob = _blob_path(root, digest)
+    if blob.exists():
+        return False
+    # Never hardlink the working tree into the store: later in-place edits of
+    # the source would silently change the stored content.
+    _materialize(src, blob, link_mode="auto")
+    return True
+
+
+# ----------------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------------
+
+
 def create(root: Path, scope: Iterable[str], reason: str = "") -> Dict[str, Any]:
     items = _normalize_scope(root, scope)
     ckid = f"ckpt_{uuid.uuid4().hex[:8]}"
     based = _ckpt_dir(root) / ckid
-    filesd = based / "files"
-    utils.ensure_dir(filesd)
-    # Copy files preserving relative structure
-    for rel in items:
+    utils.ensure_dir(based)
+
+    cache = _load_stat_cache(root)
+    files: Dict[str, Dict[str, Any]] = {}
+    new_blobs = 0
+    for rel in _expand_files(root, items):
         src = root / rel
-        dst = filesd / rel
-        utils.ensure_dir(dst.parent)
-        if src.is_dir():
-            # Skip directories; only snapshot regular files
+        key = rel.as_posix()
+        try:
+            st = src.stat()
+            digest = _cached_hash(src, key, cache, st)
+            if _store_blob(root, src, digest):
+                new_blobs += 1
+        except OSError:
             continue
-        shutil.copy2(src, dst)
+        files[key] = {"hash": digest, "size": st.st_size, "mode": st.st_mode & 0o777}
+    _save_stat_cache(root, cache)
+
+    manifest = {"id": ckid, "version": 2, "files": files}
+    (based / MANIFEST).write_text(
+        json.dumps(manifest, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
     rec = {
         "ts": utils.now_iso(),
         "id": ckid,
         "scope": [str(p) for p in items],
         "reason": reason,
+        "files": len(files),
+        "new_blobs": new_blobs,
     }
     with open(_ckpt_dir(root) / INDEX, "a", encoding="utf - 8") as f:
         f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
@@ -84,7 +270,57 @@ def list(root: Path) -> List[Dict[str, Any]]:
     return out
 
 
-def restore(root: Path, ckpt_id: str) -> Dict[str, Any]:
+def _read_manifest(root: Path, ckpt_id: str) -> Optional[Dict[str, Any]]:
+    path = _ckpt_dir(root) / ckpt_id / MANIFEST
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def restore(root: Path, ckpt_id: str, link_mode: str = "auto") -> Dict[str, Any]:
+    manifest = _read_manifest(root, ckpt_id)
+    if manifest is None:
+        return _restore_legacy(root, ckpt_id)
+
+    cache = _load_stat_cache(root)
+    restored = 0
+    unchanged = 0
+    errors: List[str] = []
+    for key, entry in manifest.get("files", {}).items():
+        dst = root / key
+        digest = entry["hash"]
+        try:
+            st = dst.stat() if dst.is_file() else None
+            if (
+                st is not None
+                and st.st_size == entry.get("size")
+                and _cached_hash(dst, key, cache, st) == digest
+            ):
+                unchanged += 1
+                continue
+            blob = _blob_path(root, digest)
+            if not blob.exists():
+                errors.append(f"{key}: missing blob {digest}")
+                continue
+            method = _materialize(blob, dst, link_mode=link_mode)
+            if "mode" in entry and method != "hardlink":
+                # A hardlink shares the blob's inode; leave its mode alone
+                os.chmod(dst, entry["mode"])
+            new_st = dst.stat()
+            cache[key] = [new_st.st_size, new_st.st_mtime_ns, digest]
+            restored += 1
+        except Exception as e:
+            errors.append(f"{key}: {e}")
+    _save_stat_cache(root, cache)
+    return {"restored": restored, "unchanged": unchanged, "errors": errors}
+
+
+def _restore_legacy(root: Path, ckpt_id: str) -> Dict[str, Any]:
+    """Restore a checkpoint written by the full-copy ``files/`` layout."""
     based = _ckpt_dir(root) / ckpt_id
     filesd = based / "files"
     if not filesd.exists():
@@ -103,3 +339,50 @@ def restore(root: Path, ckpt_id: str) -> Dict[str, Any]:
         except Exception as e:
             errors.append(f"{rel}: {e}")
     return {"restored": restored, "errors": errors}
+
+
+def delete(root: Path, ckpt_id: str) -> bool:
+    """Remove a checkpoint's manifest and index entry. Blobs are left to ``gc``."""
+    based = _ckpt_dir(root) / ckpt_id
+    entries = list(root)
+    remaining = [e for e in entries if e.get("id") != ckpt_id]
+    if not based.exists() and len(remaining) == len(entries):
+        return False
+    shutil.rmtree(based, ignore_errors=True)
+    idxp = _ckpt_dir(root) / INDEX
+    tmp = idxp.with_suffix(".tmp")
+    tmp.write_text(
+        "".join(
+            json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for e in remaining
+        ),
+        encoding="utf-8",
+    )
+    os.replace(tmp, idxp)
+    return True
+
+
+def gc(root: Path) -> Dict[str, Any]:
+    """Delete blobs that no checkpoint manifest references."""
+    ckdir = _ckpt_dir(root)
+    referenced: Set[str] = set()
+    for manifest_path in ckdir.glob(f"*/{MANIFEST}"):
+        manifest = _read_manifest(root, manifest_path.parent.name)
+        if manifest:
+            referenced.update(e["hash"] for e in manifest.get("files", {}).values())
+
+    removed = 0
+    freed = 0
+    objects = _objects_dir(root)
+    if objects.exists():
+        for blob in objects.glob("*/*"):
+            digest = blob.parent.name + blob.name
+            if digest in referenced or not blob.is_file():
+                continue
+            try:
+                freed += blob.stat().st_size
+                blob.unlink()
+                removed += 1
+            except OSError:
+                continue
+    return {"removed": removed, "freed_bytes": freed, "referenced": len(referenced)}
@@ -1,10 +1,11 @@
 """Append - only run log (.ai_onboard / log.jsonl)."""
 
-import json
 import time
 from pathlib import Path
 from typing import Any, Dict
 
+from .state_store import get_state_store
+
 
 def _path(root: Path) -> Path:
     d = root / ".ai_onboard"
@@ -18,6 +19,4 @@ def write_event(root: Path, kind: str, payload: Dict[str, Any]) -> None:
         "kind": kind,
         "data": payload,
     }
-    p = _path(root)
-    with p.open("a", encoding="utf - 8") as f:
-        f.write(json.dumps(rec) + "\n")
+    get_state_store().append_jsonl(root / ".ai_onboard" / "log.jsonl", rec)
@@ -0,0 +1,426 @@
+"""
+Serialization - Fast, compact encoding for machine-only .ai_onboard files.
+
+Most .ai_onboard artifacts are read only by the system itself, yet they were
+pretty-printed with the standard library encoder after converting
+dataclasses to dicts by hand. This module provides one encoding layer:
+
+- Compact JSON via ``orjson`` when it is installed, with a standard library
+  fallback that produces equivalent output; numbers orjson cannot represent
+  (NaN, infinities, integers beyond 64 bits) go through the standard library,
+  so files round-trip exactly as they did before
+- Dataclasses, enums, datetimes, paths and sets are encoded directly,
+  through per-type encoders that are built once and cached
+- ``structure`` rebuilds dataclasses (including nested dataclasses, enums,
+  datetimes, lists and dicts) from decoded data, again with cached per-type
+  decoders
+- Large payloads are decoded with the cyclic garbage collector paused
+- An optional length-prefixed binary record format for the largest stores:
+  each top-level key and value is stored as its own record, so a load can
+  decode only the keys it needs
+"""
+
+import dataclasses
+import gc
+import json
+import math
+import struct
+import sys
+import typing
+from contextlib import contextmanager
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# orjson is optional; the standard library encoder is used without it
+try:  # pragma: no cover - environment - dependent
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - fallback when not installed
+    orjson = None  # type: ignore
+
+# Binary stores start with this magic, followed by length-prefixed records
+BINARY_MAGIC = b"AIOB\x01\n"
+_LENGTH = struct.Struct(">I")
+
+# Payloads above this size are decoded with the cyclic garbage collector
+# paused; decoding allocates many containers, none of them in cycles, and
+# would otherwise trigger repeated collections
+GC_PAUSE_THRESHOLD = 256 * 1024
+
+# Integers orjson would decode as floats (below -2**63 or above 2**64 - 1)
+# are found by masking digits to "0" and searching for long runs, which keeps
+# the scan in C. False positives (digits inside strings) only cost the slower
+# decoder.
+_DIGIT_MASK = bytes.maketrans(b"123456789", b"000000000")
+_DIGIT_RUN = b"0" * 19
+
+_encoders: Dict[type, Callable[[Any], Any]] = {}
+_decoders: Dict[Any, Callable[[Any], Any]] = {}
+
+
+def _dataclass_encoder(cls: type) -> Callable[[Any], Any]:
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    return lambda obj: {name: getattr(obj, name) for name in names}
+
+
+def _encoder_for(cls: type) -> Callable[[Any], Any]:
+    encoder = _encoders.get(cls)
+    if encoder is None:
+        if dataclasses.is_dataclass(cls):
+            encoder = _dataclass_encoder(cls)
+        elif issubclass(cls, Enum):
+            encoder = _enum_value
+        elif issubclass(cls, (datetime, date)):
+            encoder = _isoformat
+        elif issubclass(cls, PurePath):
+            encoder = str
+        elif issubclass(cls, (set, frozenset)):
+            encoder = list
+        elif issubclass(cls, bytes):
+            encoder = _decode_bytes
+        else:
+            raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+        _encoders[cls] = encoder
+    return encoder
+
+
+def _enum_value(obj: Enum) -> Any:
+    return obj.value
+
+
+def _isoformat(obj: Any) -> str:
+    return obj.isoformat()
+
+
+def _decode_bytes(obj: bytes) -> str:
+    return obj.decode("utf-8", "replace")
+
+
+def _default(obj: Any) -> Any:
+    return _encoder_for(type(obj))(obj)
+
+
+def to_builtin(obj: Any) -> Any:
+    """Convert ``obj`` to plain JSON types (dicts, lists, str, numbers)."""
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if isinstance(obj, dict):
+        return {
+            (k if isinstance(k, str) else str(to_builtin(k))): to_builtin(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [to_builtin(v) for v in obj]
+    return to_builtin(_default(obj))
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether ``obj`` contains a NaN or infinite float."""
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            pending.extend(value)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            pending.extend(getattr(value, f.name) for f in dataclasses.fields(value))
+    return False
+
+
+def _may_have_wide_int(data: Any) -> bool:
+    """Whether encoded JSON may hold an integer orjson cannot decode exactly."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    digits = bytes(data).translate(_DIGIT_MASK)
+    start = digits.find(_DIGIT_RUN)
+    while start != -1:
+        end = start + len(_DIGIT_RUN)
+        while end < len(digits) and digits[end] == ord("0"):
+            end += 1
+        # The digits of a fraction can run on without limit
+        before = digits[start - 1] if start else None
+        if before != ord(".") and (before == ord("-") or end - start > 19):
+            return True
+        start = digits.find(_DIGIT_RUN, end)
+    return False
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON, compact unless ``indent`` is given."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            payload = orjson.dumps(obj, default=_default, option=option)
+            # orjson writes NaN and infinities as null; only documents with
+            # a null can contain one
+            if b"null" not in payload or not _has_non_finite(obj):
+                return payload
+        except TypeError:
+            # Values orjson rejects (enum keys, integers over 64 bits) are
+            # left to the standard library encoder below
+            pass
+    try:
+        text = json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=indent,
+            separators=None if indent else (",", ":"),
+            default=_default,
+        )
+    except TypeError:
+        text = json.dumps(
+            to_builtin(obj),
+            ensure_ascii=False,
+            indent=indent,
+            separators=None if indent else (",", ":"),
+        )
+    return text.encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str."""
+    return _loads(data, orjson is not None and _may_have_wide_int(data))
+
+
+def _loads(data: Any, wide_int: bool) -> Any:
+    # ``wide_int`` lets callers scan a whole buffer once for many records
+    if orjson is not None:
+        if not wide_int:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Possibly NaN or Infinity, which the standard library accepts
+                pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+# ---------------------------------------------------------------------------
+# Length-prefixed binary records
+# ---------------------------------------------------------------------------
+
+
+def dumps_records(mapping: Mapping[str, Any]) -> bytes:
+    """Encode a mapping as magic + (key length, key, value length, value)*."""
+    parts = [BINARY_MAGIC]
+    for key, value in mapping.items():
+        key_bytes = str(key).encode("utf-8")
+        value_bytes = dumps(value)
+        parts.append(_LENGTH.pack(len(key_bytes)))
+        parts.append(key_bytes)
+        parts.append(_LENGTH.pack(len(value_bytes)))
+        parts.append(value_bytes)
+    return b"".join(parts)
+
+
+def iter_records(data: bytes) -> Iterator[Tuple[str, memoryview]]:
+    """Yield (key, encoded value) pairs without decoding the values."""
+    if not data.startswith(BINARY_MAGIC):
+        raise ValueError("Not a binary record store")
+    view = memoryview(data)
+    offset = len(BINARY_MAGIC)
+    end = len(data)
+    while offset < end:
+        if offset + _LENGTH.size > end:
+            raise ValueError("Truncated binary record store")
+        (key_length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        key = bytes(view[offset : offset + key_length]).decode("utf-8")
+        offset += key_length
+        if offset + _LENGTH.size > end:
+            raise ValueError("Truncated binary record store")
+        (value_length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if offset + value_length > end:
+            raise ValueError("Truncated binary record store")
+        yield key, view[offset : offset + value_length]
+        offset += value_length
+
+
+def loads_records(data: bytes, keys: Optional[typing.Iterable[str]] = None) -> Dict:
+    """Decode a binary record store, optionally only some of its keys."""
+    wanted = None if keys is None else set(keys)
+    wide_int = orjson is not None and _may_have_wide_int(data)
+    result = {}
+    for key, value in iter_records(data):
+        if wanted is None or key in wanted:
+            result[key] = _loads(value, wide_int)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Files
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _gc_paused(size: int) -> Iterator[None]:
+    if size < GC_PAUSE_THRESHOLD or not gc.isenabled():
+        yield
+        return
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def load_bytes(data: bytes) -> Any:
+    """Decode file contents in either the JSON or the binary record format."""
+    with _gc_paused(len(data)):
+        if data.startswith(BINARY_MAGIC):
+            return loads_records(data)
+        return loads(data)
+
+
+def load_lines(data: bytes) -> List[Any]:
+    """Decode JSON lines, skipping blank lines and lines that do not parse."""
+    records = []
+    wide_int = orjson is not None and _may_have_wide_int(data)
+    with _gc_paused(len(data)):
+        for line in data.splitlines():
+            if line.strip():
+                try:
+                    records.append(_loads(line, wide_int))
+                except ValueError:
+                    continue
+    return records
+
+
+def dump_file(
+    path: Path, data: Any, binary: bool = False, indent: Optional[int] = None
+) -> None:
+    """Atomically write ``data`` as compact JSON or as binary records."""
+    from .state_store import write_atomic
+
+    if binary:
+        if not isinstance(data, Mapping):
+            raise TypeError("Binary record stores hold a mapping")
+        payload = dumps_records(data)
+    else:
+        payload = dumps(data, indent=indent)
+    write_atomic(path, payload)
+
+
+def load_file(path: Path, default: Any = None) -> Any:
+    """Read a file written by ``dump_file`` (either format)."""
+    try:
+        return load_bytes(path.read_bytes())
+    except FileNotFoundError:
+        return default
+    except (ValueError, UnicodeDecodeError):
+        return default
+
+
+# ---------------------------------------------------------------------------
+# Rebuilding dataclasses
+# ---------------------------------------------------------------------------
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _decoder_for(annotation: Any) -> Callable[[Any], Any]:
+    decoder = _decoders.get(annotation)
+    if decoder is not None:
+        return decoder
+
+    origin = getattr(annotation, "__origin__", None)
+    args = getattr(annotation, "__args__", ()) or ()
+    if annotation is Any or isinstance(annotation, typing.TypeVar):
+        decoder = _identity
+    elif origin is typing.Union:
+        non_none = [a for a in args if a is not type(None)]
+        inner = _decoder_for(non_none[0]) if len(non_none) == 1 else _identity
+
+        def decoder(value: Any, inner: Callable[[Any], Any] = inner) -> Any:
+            return None if value is None else inner(value)
+
+    elif origin in (list, typing.List, set, typing.Set, frozenset):
+        item = _decoder_for(args[0]) if args else _identity
+        container = list if origin in (list, typing.List) else set
+        if item is _identity:
+            # Decoded lists need no conversion
+            decoder = _identity if container is list else container
+        else:
+
+            def decoder(value: Any, item=item, container=container) -> Any:
+                return container(item(v) for v in value)
+
+    elif origin in (tuple, typing.Tuple):
+        items = [_decoder_for(a) for a in args if a is not Ellipsis]
+        if all(item is _identity for item in items):
+            decoder = tuple
+        elif len(items) == 1 and Ellipsis in args:
+
+            def decoder(value: Any, item=items[0]) -> Any:
+                return tuple(item(v) for v in value)
+
+        else:
+
+            def decoder(value: Any, items=items) -> Any:
+                return tuple(d(v) for d, v in zip(items, value))
+
+    elif origin in (dict, typing.Dict):
+        key = _decoder_for(args[0]) if args else _identity
+        val = _decoder_for(args[1]) if len(args) > 1 else _identity
+        if key is _identity and val is _identity:
+            decoder = _identity
+        else:
+
+            def decoder(value: Any, key=key, val=val) -> Any:
+                return {key(k): val(v) for k, v in value.items()}
+
+    elif isinstance(annotation, type) and dataclasses.is_dataclass(annotation):
+        decoder = _dataclass_decoder(annotation)
+    elif isinstance(annotation, type) and issubclass(annotation, Enum):
+        decoder = annotation
+    elif annotation is datetime:
+        decoder = datetime.fromisoformat
+    elif annotation is date:
+        decoder = date.fromisoformat
+    elif isinstance(annotation, type) and issubclass(annotation, PurePath):
+        decoder = annotation
+    else:
+        decoder = _identity
+
+    _decoders[annotation] = decoder
+    return decoder
+
+
+def _dataclass_decoder(cls: type) -> Callable[[Any], Any]:
+    module = sys.modules.get(cls.__module__)
+    hints = typing.get_type_hints(cls, vars(module) if module else None)
+    fields = [
+        (f.name, _decoder_for(hints.get(f.name, Any)))
+        for f in dataclasses.fields(cls)
+        if f.init
+    ]
+    # Fields that decode to themselves are passed through without a call
+    plain = tuple(name for name, decode in fields if decode is _identity)
+    converted = tuple((name, d) for name, d in fields if d is not _identity)
+
+    def decoder(value: Any) -> Any:
+        if isinstance(value, cls):
+            return value
+        kwargs = {name: value[name] for name in plain if name in value}
+        for name, decode in converted:
+            if name in value:
+                kwargs[name] = decode(value[name])
+        return cls(**kwargs)
+
+    return decoder
+
+
+def structure(cls: Any, data: Any) -> Any:
+    """Build an instance of ``cls`` (usually a dataclass) from decoded data."""
+    return _decoder_for(cls)(data)
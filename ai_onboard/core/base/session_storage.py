@@ -3,18 +3,49 @@ Session Storage Manager for AAOL - Persists sessions across CLI invocations.
 
 This module provides persistent storage for AI Agent Orchestration Layer sessions,
 allowing them to survive across different CLI command executions.
+
+Storage layout under ``.ai_onboard/sessions``:
+
+- ``sessions_index.json``: index snapshot (session_id -> summary)
+- ``sessions_index.journal.jsonl``: append-only index changes since the
+  snapshot, folded into it once the journal outgrows the index (and at least
+  ``journal_compact_threshold`` entries)
+- ``<session_id>.json``: compact session body, replaced atomically
+- ``<session_id>.delta.jsonl``: changed fields appended by later saves, folded
+  into the body every ``delta_compact_threshold`` saves. Body and deltas carry
+  a generation stamp, so deltas left behind by an interrupted fold (written
+  before the body they were folded into) are never replayed
+
+The index is held in memory, ordered by user and last activity, and catches
+up on entries other processes appended by reading only the journal tail.
 """
 
+import bisect
 import json
 import time
+import uuid
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .state_store import write_atomic
 
 if TYPE_CHECKING:
     from ..orchestration.orchestration_compatibility import ConversationContext
 
 
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+# Field stamping session bodies and deltas with the body they apply to
+GENERATION_FIELD = "_generation"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    write_atomic(path, text.encode("utf-8"))
+
+
 @dataclass
 class StoredSession:
     """Serializable session data for storage."""
@@ -50,6 +81,9 @@ class StoredSession:
 class SessionStorageManager:
     """Manages persistent storage of AAOL sessions."""
 
+    journal_compact_threshold = 1000
+    delta_compact_threshold = 20
+
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.sessions_dir = project_root / ".ai_onboard" / "sessions"
@@ -57,25 +91,167 @@ class SessionStorageManager:
 
         # Create a sessions index file for quick lookups
         self.index_file = self.sessions_dir / "sessions_index.json"
+        self.journal_file = self.sessions_dir / "sessions_index.journal.jsonl"
+
+        # In-memory index plus orderings by last activity, overall and per user
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._by_activity: List[Tuple[float, str]] = []
+        self._by_user: Dict[str, List[Tuple[float, str]]] = {}
+        self._snapshot_signature: Optional[Tuple[int, int]] = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+        # Encoded fields of each session as last written, for delta saves
+        self._saved_fields: Dict[str, Dict[str, str]] = {}
+        self._delta_counts: Dict[str, int] = {}
+        self._generations: Dict[str, Optional[str]] = {}
+
         self._ensure_index_exists()
+        self._reload_index()
 
     def _ensure_index_exists(self):
         """Ensure the sessions index file exists."""
         if not self.index_file.exists():
             self._save_index({})
 
+    # ------------------------------------------------------------------
+    # Index: snapshot + journal
+    # ------------------------------------------------------------------
+
     def _load_index(self) -> Dict[str, Dict[str, Any]]:
-        """Load the sessions index."""
+        """Return the sessions index, catching up with other writers first."""
+        self._refresh_index()
+        return dict(self._index)
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]):
+        """Write ``index`` as the snapshot and empty the journal."""
+        _write_atomic(self.index_file, _dumps(index))
+        with open(self.journal_file, "w", encoding="utf-8"):
+            pass
+        self._snapshot_signature = self._signature(self.index_file)
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _reload_index(self) -> None:
+        """Rebuild the in-memory index from the snapshot and the journal."""
         try:
             with open(self.index_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                snapshot = json.load(f)
+            if not isinstance(snapshot, dict):
+                snapshot = {}
         except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+            snapshot = {}
+
+        self._index = {}
+        self._by_activity = []
+        self._by_user = {}
+        for session_id, info in snapshot.items():
+            if isinstance(info, dict):
+                self._put(session_id, info)
+        self._snapshot_signature = self._signature(self.index_file)
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._replay_journal()
+
+    def _refresh_index(self) -> None:
+        """Apply journal entries appended since the last read."""
+        if self._signature(self.index_file) != self._snapshot_signature:
+            self._reload_index()
+            return
+        try:
+            size = self.journal_file.stat().st_size
+        except OSError:
+            size = 0
+        if size < self._journal_offset:
+            self._reload_index()
+        elif size > self._journal_offset:
+            self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        try:
+            with open(self.journal_file, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only complete lines; a torn final line is picked up once finished
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self._apply_journal_entry(entry)
+            self._journal_entries += 1
+        self._journal_offset += end
+
+    def _apply_journal_entry(self, entry: Dict[str, Any]) -> None:
+        session_id = entry.get("id")
+        if not session_id:
+            return
+        if entry.get("op") == "put":
+            self._put(session_id, entry.get("info") or {})
+        elif entry.get("op") == "del":
+            self._discard(session_id)
+
+    def _append_journal(self, entry: Dict[str, Any]) -> None:
+        self._refresh_index()
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(_dumps(entry) + "\n")
+        self._apply_journal_entry(entry)
+        self._journal_entries += 1
+        self._journal_offset = self.journal_file.stat().st_size
+        # Compacting once the journal outgrows the index keeps it amortized O(1)
+        threshold = max(self.journal_compact_threshold, len(self._index))
+        if self._journal_entries >= threshold:
+            self.compact_index()
+
+    def compact_index(self) -> None:
+        """Fold the journal into the index snapshot."""
+        self._refresh_index()
+        self._save_index(self._index)
 
-    def _save_index(self, index: Dict[str, Dict[str, Any]]):
-        """Save the sessions index."""
-        with open(self.index_file, "w", encoding="utf-8") as f:
-            json.dump(index, f, indent=2, default=str)
+    @staticmethod
+    def _activity(info: Dict[str, Any]) -> float:
+        try:
+            return float(info.get("last_activity") or 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _put(self, session_id: str, info: Dict[str, Any]) -> None:
+        self._discard(session_id)
+        self._index[session_id] = info
+        key = (self._activity(info), session_id)
+        bisect.insort(self._by_activity, key)
+        bisect.insort(self._by_user.setdefault(str(info.get("user_id")), []), key)
+
+    def _discard(self, session_id: str) -> None:
+        info = self._index.pop(session_id, None)
+        if info is None:
+            return
+        key = (self._activity(info), session_id)
+        user_id = str(info.get("user_id"))
+        for ordered in (self._by_activity, self._by_user.get(user_id)):
+            if not ordered:
+                continue
+            i = bisect.bisect_left(ordered, key)
+            if i < len(ordered) and ordered[i] == key:
+                del ordered[i]
+        if not self._by_user.get(user_id, True):
+            del self._by_user[user_id]
+
+    # ------------------------------------------------------------------
+    # Session bodies
+    # ------------------------------------------------------------------
 
     @staticmethod
     def _enum_value(value: Any) -> str:
@@ -87,8 +263,52 @@ class SessionStorageManager:
         """Get the file path for a specific session."""
         return self.sessions_dir / f"{session_id}.json"
 
+    def _get_delta_file(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.delta.jsonl"
+
+    def _write_session_body(self, session_id: str, fields: Dict[str, str]) -> None:
+        generation = uuid.uuid4().hex
+        stamped = {GENERATION_FIELD: _dumps(generation), **fields}
+        body = "{" + ",".join(f"{_dumps(k)}:{v}" for k, v in stamped.items()) + "}"
+        _write_atomic(self._get_session_file(session_id), body)
+        self._generations[session_id] = generation
+        # Deltas of the previous body are stale now, even if this unlink is
+        # interrupted
+        delta_file = self._get_delta_file(session_id)
+        if delta_file.exists():
+            delta_file.unlink()
+        self._delta_counts[session_id] = 0
+
+    def _read_session_data(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session body with its deltas applied, or None if missing."""
+        session_file = self._get_session_file(session_id)
+        if not session_file.exists():
+            return None
+        with open(session_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        generation = data.pop(GENERATION_FIELD, None)
+
+        deltas = 0
+        delta_file = self._get_delta_file(session_id)
+        if delta_file.exists():
+            with open(delta_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write from an interrupted save
+                    if delta.pop(GENERATION_FIELD, None) != generation:
+                        continue  # Already folded into the body
+                    data.update(delta)
+                    deltas += 1
+
+        self._saved_fields[session_id] = {k: _dumps(v) for k, v in data.items()}
+        self._delta_counts[session_id] = deltas
+        self._generations[session_id] = generation
+        return data
+
     def save_session(self, context: "ConversationContext") -> bool:
-        """Save a session to disk."""
+        """Save a session to disk, writing only the fields that changed."""
         try:
             # Convert to serializable format
             stored_session = StoredSession(
@@ -111,39 +331,55 @@ class SessionStorageManager:
                 safety_violations=context.safety_violations,
                 intervention_triggers=context.intervention_triggers,
             )
+            session_id = context.session_id
+            fields = {k: _dumps(v) for k, v in asdict(stored_session).items()}
 
-            # Save session file
-            session_file = self._get_session_file(context.session_id)
-            with open(session_file, "w", encoding="utf-8") as f:
-                json.dump(asdict(stored_session), f, indent=2, default=str)
+            # Save session body, or just the changed fields
+            saved = self._saved_fields.get(session_id)
+            session_file = self._get_session_file(session_id)
+            if saved is None or not session_file.exists():
+                self._write_session_body(session_id, fields)
+            else:
+                changed = {k: v for k, v in fields.items() if saved.get(k) != v}
+                if changed:
+                    deltas = self._delta_counts.get(session_id, 0) + 1
+                    if deltas >= self.delta_compact_threshold:
+                        self._write_session_body(session_id, fields)
+                    else:
+                        stamp = _dumps(self._generations.get(session_id))
+                        changed = {GENERATION_FIELD: stamp, **changed}
+                        line = ",".join(f"{_dumps(k)}:{v}" for k, v in changed.items())
+                        with open(
+                            self._get_delta_file(session_id), "a", encoding="utf-8"
+                        ) as f:
+                            f.write("{" + line + "}\n")
+                        self._delta_counts[session_id] = deltas
+            self._saved_fields[session_id] = fields
 
             # Update index
-            index = self._load_index()
-            index[context.session_id] = {
+            info = {
                 "user_id": context.user_id,
                 "created_at": context.created_at,
                 "last_activity": context.last_activity,
                 "state": self._enum_value(context.state),
                 "project_root": str(context.project_root),
             }
-            self._save_index(index)
+            if self._index.get(session_id) != info:
+                self._append_journal({"op": "put", "id": session_id, "info": info})
 
             return True
 
-        except (ValueError, TypeError, AttributeError) as e:
+        except (ValueError, TypeError, AttributeError, OSError) as e:
             print(f"Error: {e}")
             return False
 
     def load_session(self, session_id: str) -> Optional["ConversationContext"]:
         """Load a session from disk."""
         try:
-            session_file = self._get_session_file(session_id)
-            if not session_file.exists():
+            data = self._read_session_data(session_id)
+            if data is None:
                 return None
 
-            with open(session_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
             # Import here to avoid circular import
             from ..orchestration.orchestration_compatibility import ConversationContext
 
@@ -177,28 +413,30 @@ class SessionStorageManager:
             print(f"Error: {e}")
             return None
 
-    def list_sessions(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List all sessions, optionally filtered by user."""
-        index = self._load_index()
-        sessions = []
-
-        for session_id, info in index.items():
-            if user_id is None or info["user_id"] == user_id:
-                sessions.append({"session_id": session_id, **info})
-
-        return sessions
+    def list_sessions(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List sessions, most recently active first, optionally filtered by user."""
+        self._refresh_index()
+        if user_id is None:
+            ordered = self._by_activity
+        else:
+            ordered = self._by_user.get(user_id, [])
+
+        selected = ordered if limit is None else ordered[len(ordered) - limit :]
+        return [
+            {"session_id": session_id, **self._index[session_id]}
+            for _, session_id in reversed(selected)
+        ]
 
     def get_user_sessions(self, user_id: str) -> List[Any]:
         """Get all sessions for a specific user as ConversationContext objects."""
-
-        index = self._load_index()
         sessions = []
 
-        for session_id, info in index.items():
-            if info["user_id"] == user_id:
-                session = self.load_session(session_id)
-                if session:
-                    sessions.append(session)
+        for info in self.list_sessions(user_id):
+            session = self.load_session(info["session_id"])
+            if session:
+                sessions.append(session)
 
         return sessions
 
@@ -285,34 +523,37 @@ class SessionStorageManager:
     def delete_session(self, session_id: str) -> bool:
         """Delete a session from disk."""
         try:
-            # Remove session file
-            session_file = self._get_session_file(session_id)
-            if session_file.exists():
-                session_file.unlink()
+            # Remove session file and its deltas
+            for path in (
+                self._get_session_file(session_id),
+                self._get_delta_file(session_id),
+            ):
+                if path.exists():
+                    path.unlink()
+            self._saved_fields.pop(session_id, None)
+            self._delta_counts.pop(session_id, None)
+            self._generations.pop(session_id, None)
 
             # Remove from index
-            index = self._load_index()
-            if session_id in index:
-                del index[session_id]
-                self._save_index(index)
+            self._refresh_index()
+            if session_id in self._index:
+                self._append_journal({"op": "del", "id": session_id})
 
             return True
 
-        except (ValueError, TypeError, AttributeError) as e:
+        except (ValueError, TypeError, AttributeError, OSError) as e:
             print(f"Error: {e}")
             return False
 
     def cleanup_expired_sessions(self, max_age_hours: int = 24) -> int:
         """Clean up sessions older than specified age. Returns count of deleted sessions."""
         cutoff_time = time.time() - (max_age_hours * 3600)
-        index = self._load_index()
+        self._refresh_index()
         deleted_count = 0
 
-        expired_sessions = [
-            session_id
-            for session_id, info in index.items()
-            if info["last_activity"] < cutoff_time
-        ]
+        # Sessions are ordered by last activity, so the expired ones lead
+        end = bisect.bisect_left(self._by_activity, (cutoff_time, ""))
+        expired_sessions = [session_id for _, session_id in self._by_activity[:end]]
 
         for session_id in expired_sessions:
             if self.delete_session(session_id):
@@ -323,10 +564,10 @@ class SessionStorageManager:
     def update_session_activity(self, session_id: str) -> bool:
         """Update the last activity timestamp for a session."""
         try:
-            index = self._load_index()
-            if session_id in index:
-                index[session_id]["last_activity"] = time.time()
-                self._save_index(index)
+            self._refresh_index()
+            if session_id in self._index:
+                info = dict(self._index[session_id], last_activity=time.time())
+                self._append_journal({"op": "put", "id": session_id, "info": info})
                 return True
             return False
         except Exception:
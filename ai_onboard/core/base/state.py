@@ -46,11 +46,13 @@ def save(root: Path, state: Dict[str, Any]) -> None:
     """
     Save the project state to disk.
 
+    The write is coalesced by the state store; ``load`` sees it at once.
+
     Args:
         root: Project root directory
         state: State dictionary to save
     """
-    utils.write_json(root / ".ai_onboard" / "state.json", state)
+    utils.write_json_deferred(root / ".ai_onboard" / "state.json", state)
 
 
 def advance(root: Path, state: Dict[str, Any], target: str) -> None:
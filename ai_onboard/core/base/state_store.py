@@ -0,0 +1,279 @@
+"""
+State Store - Process-wide write coalescing for small .ai_onboard files.
+
+State saves, run log events, telemetry records and similar bookkeeping used
+to open, write and close their own file on every call, so a busy session
+issued hundreds of small synchronous writes per second. This module gives
+them one shared storage service:
+
+- JSON documents are replaced atomically (temporary file + ``os.replace``),
+  so readers and crashes only ever see a complete old or new version
+- Per-file dirty tracking: a document written many times between flushes
+  is written once, and appended lines are written with one ``open`` per file
+- A flush policy by interval (``flush_interval`` seconds after the first
+  pending change, on the shared background scheduler) or by count
+  (``max_pending`` buffered changes)
+- An explicit durability mode:
+  ``none``  - coalesce writes; a crash can lose changes made since the last
+  flush, but never tears a document
+  ``flush`` - write every change through to the OS before returning, which
+  survives a process crash
+  ``fsync`` - like ``flush`` and also fsync files and directories, which
+  survives power loss
+- A synchronous ``flush_all()`` that runs at interpreter exit
+
+The default mode is ``none``; set ``AI_ONBOARD_DURABILITY`` or call
+``configure`` to choose another.
+"""
+
+import atexit
+import json
+import os
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from . import serialization
+from .background_scheduler import get_background_scheduler
+
+
+class Durability(Enum):
+    """How far a write must get before the call returns."""
+
+    NONE = "none"
+    FLUSH = "flush"
+    FSYNC = "fsync"
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on some platforms
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, payload: bytes, fsync: bool = False) -> None:
+    """Replace ``path`` with ``payload`` through a temporary file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(str(path.parent))
+
+
+def _append(path: Path, payload: bytes, fsync: bool = False) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(payload)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class StateStore:
+    """Coalesces JSON document replacements and JSONL appends per file."""
+
+    def __init__(
+        self,
+        durability: Union[Durability, str] = Durability.NONE,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+    ):
+        self.durability = Durability(durability)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._documents: Dict[str, bytes] = {}
+        self._appends: Dict[str, List[bytes]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Serializes writers so an older snapshot never lands after a newer one
+        self._flush_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._flush_job_id = f"state-store-flush:{id(self)}"
+        self.stats = {"changes": 0, "flushes": 0, "files_written": 0}
+
+    def configure(
+        self,
+        durability: Optional[Union[Durability, str]] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """Change the flush policy; pending changes are flushed first."""
+        self.flush_all()
+        if durability is not None:
+            self.durability = Durability(durability)
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        if max_pending is not None:
+            self.max_pending = max_pending
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    def write_json(self, path: Path, data: Any, indent: Optional[int] = None) -> bytes:
+        """Replace a JSON document; the latest write before a flush wins.
+
+        Returns the encoded document.
+        """
+        payload = serialization.dumps(data, indent=indent)
+        with self._lock:
+            key = self._key(path)
+            if key not in self._documents:
+                self._pending += 1
+            self._documents[key] = payload
+        self._changed()
+        return payload
+
+    def append_jsonl(self, path: Path, record: Any, **dumps_kwargs: Any) -> None:
+        """Append one JSON record as a line."""
+        line = json.dumps(record, ensure_ascii=False, **dumps_kwargs) + "\n"
+        with self._lock:
+            self._appends.setdefault(self._key(path), []).append(line.encode("utf-8"))
+            self._pending += 1
+        self._changed()
+
+    def pending_document(self, path: Path) -> Optional[bytes]:
+        """The unflushed contents of a document, if any."""
+        with self._lock:
+            return self._documents.get(self._key(path))
+
+    def has_pending(self, path: Optional[Path] = None) -> bool:
+        with self._lock:
+            if path is None:
+                return bool(self._pending)
+            key = self._key(path)
+            return key in self._documents or key in self._appends
+
+    def _changed(self) -> None:
+        with self._lock:
+            self.stats["changes"] += 1
+            write_through = self.durability is not Durability.NONE
+            if write_through or self._pending >= self.max_pending:
+                schedule = False
+                flush_now = True
+            else:
+                schedule = not self._flush_scheduled
+                self._flush_scheduled = True
+                flush_now = False
+
+        if flush_now:
+            self.flush_all()
+        elif schedule:
+            get_background_scheduler().schedule_once(
+                self._flush_job_id, self._scheduled_flush, self.flush_interval
+            )
+
+    def _scheduled_flush(self) -> None:
+        with self._lock:
+            self._flush_scheduled = False
+        self.flush_all()
+
+    def flush(self, path: Path) -> bool:
+        """Write pending changes for one file; returns whether any were."""
+        with self._flush_lock:
+            with self._lock:
+                key = self._key(path)
+                document = self._documents.pop(key, None)
+                lines = self._appends.pop(key, None)
+                self._pending -= (document is not None) + len(lines or ())
+            if document is None and not lines:
+                return False
+            documents = {key: document} if document is not None else {}
+            self._write(documents, {key: lines} if lines else {})
+            return True
+
+    def discard_document(self, path: Path) -> None:
+        """Drop an unflushed document, e.g. after writing it synchronously."""
+        with self._lock:
+            if self._documents.pop(self._key(path), None) is not None:
+                self._pending -= 1
+
+    def replace_document(self, path: Path, payload: bytes) -> None:
+        """Write a document synchronously, superseding any queued version.
+
+        Runs under the flush lock, so a flush that already took the queued
+        version cannot land it after this write.
+        """
+        with self._flush_lock:
+            self.discard_document(path)
+            write_atomic(path, payload, fsync=self.durability is Durability.FSYNC)
+
+    def flush_all(self) -> int:
+        """Write every pending change now; returns the number of files written."""
+        with self._flush_lock:
+            with self._lock:
+                documents, self._documents = self._documents, {}
+                appends, self._appends = self._appends, {}
+                self._pending = 0
+            return self._write(documents, appends)
+
+    def _write(
+        self, documents: Dict[str, bytes], appends: Dict[str, List[bytes]]
+    ) -> int:
+        fsync = self.durability is Durability.FSYNC
+        written = 0
+        for key, payload in documents.items():
+            try:
+                write_atomic(Path(key), payload, fsync=fsync)
+                written += 1
+            except OSError as e:
+                print(f"Warning: Failed to write {key}: {e}")
+        for key, lines in appends.items():
+            try:
+                _append(Path(key), b"".join(lines), fsync=fsync)
+                written += 1
+            except OSError as e:
+                print(f"Warning: Failed to append to {key}: {e}")
+        if written:
+            with self._lock:
+                self.stats["flushes"] += 1
+                self.stats["files_written"] += written
+        return written
+
+
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """Get the process-wide state store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                mode = os.environ.get("AI_ONBOARD_DURABILITY", "none")
+                try:
+                    durability = Durability(mode.lower())
+                except ValueError:
+                    print(f"Warning: Unknown AI_ONBOARD_DURABILITY {mode!r}")
+                    durability = Durability.NONE
+                _store = StateStore(durability=durability)
+    return _store
+
+
+def flush_all() -> int:
+    """Write every pending change of the process-wide store."""
+    return _store.flush_all() if _store is not None else 0
+
+
+atexit.register(flush_all)
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
 from . import utils
+from .state_store import get_state_store
 
 
 def _safe_components(results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -57,9 +58,9 @@ def record_run(root: Path, res: Dict[str, Any]) -> None:
     - ts: ISO8601 timestamp
     - pass: bool (overall pass / fail)
     - components: list of { name, score, issue_count }
+    - stages: optional { name: { status, wall_ms, cpu_ms } } from staged runs
     """
     metrics_path = root / ".ai_onboard" / "metrics.jsonl"
-    utils.ensure_dir(metrics_path.parent)
 
     summary = (res or {}).get("summary", {}) or {}
     rec: Dict[str, Any] = {
@@ -67,15 +68,25 @@ def record_run(root: Path, res: Dict[str, Any]) -> None:
         "pass": bool(summary.get("pass", False)),
         "components": _safe_components((res or {}).get("results", []) or []),
     }
+    stages = (res or {}).get("stages")
+    if isinstance(stages, dict) and stages:
+        rec["stages"] = {
+            name: {
+                key: stage.get(key)
+                for key in ("status", "wall_ms", "cpu_ms")
+                if key in stage
+            }
+            for name, stage in stages.items()
+            if isinstance(stage, dict)
+        }
 
     try:
-        with open(metrics_path, "a", encoding="utf - 8") as f:
-            json.dump(rec, f, ensure_ascii=False, separators=(",", ":"))
-            f.write("\n")
+        get_state_store().append_jsonl(metrics_path, rec, separators=(",", ":"))
     except Exception as e:
         # Best - effort: capture minimal error info without crashing the CLI.
         err_path = metrics_path.with_suffix(".errors.log")
         try:
+            utils.ensure_dir(err_path.parent)
             with open(err_path, "a", encoding="utf - 8") as ef:
                 ef.write(
                     f"{utils.now_iso()} | telemetry_write_error | {type(e).__name__}: {e}\n"
@@ -88,6 +99,7 @@ def record_run(root: Path, res: Dict[str, Any]) -> None:
 def read_metrics(root: Path) -> List[Dict[str, Any]]:
     """Read all metrics records from JSONL, newest last. Returns [] if missing."""
     metrics_path = root / ".ai_onboard" / "metrics.jsonl"
+    get_state_store().flush(metrics_path)
     if not metrics_path.exists():
         return []
     out: List[Dict[str, Any]] = []
@@ -114,15 +126,11 @@ def last_run(root: Path) -> Dict[str, Any] | None:
 
 
 def log_event(event: str, **fields: Any) -> None:
-    logs_dir = Path(".ai_onboard") / "logs"
-    utils.ensure_dir(logs_dir)
     rec = {"ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "event": event}
     rec.update(fields or {})
-    path = logs_dir / "events.jsonl"
+    path = Path(".ai_onboard") / "logs" / "events.jsonl"
     try:
-        with open(path, "a", encoding="utf - 8") as f:
-            json.dump(rec, f, ensure_ascii=False, separators=(",", ":"))
-            f.write("\n")
+        get_state_store().append_jsonl(path, rec, separators=(",", ":"))
     except Exception:
         # Best - effort; do not raise from telemetry
         pass
@@ -0,0 +1,316 @@
+"""
+Tracing - Hierarchical spans exported as Chrome trace events.
+
+``utils.timer`` and ``telemetry.log_event`` give flat, single-level timings,
+which cannot show where time goes inside a pipeline. Spans nest:
+
+- ``span(name, **args)`` is a context manager and ``traced(name)`` a
+  decorator (for plain and ``async`` functions)
+- The current span lives in a ``contextvars`` variable, so every thread and
+  asyncio task has its own stack; a thread started through
+  ``contextvars.copy_context().run`` continues its parent's trace
+- Disabled (the default), ``span`` returns a shared no-op after one global
+  check and ``traced`` functions call straight through
+- Sampling is decided once per root span; everything under an unsampled
+  root is skipped as cheaply as when tracing is off
+- Finished spans are buffered in memory and written at exit, or by
+  ``flush``, in the Chrome/Perfetto trace-event JSON format to
+  ``.ai_onboard/traces/trace_<time>_<pid>.json``; open the file in
+  ``chrome://tracing`` or https://ui.perfetto.dev
+
+Set ``AI_ONBOARD_TRACE=1`` (or a sample rate such as ``0.1``) or call
+``configure`` to enable tracing.
+"""
+
+import atexit
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from . import serialization
+from .state_store import write_atomic
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_CATEGORY = "ai_onboard"
+# Bounds memory in long-running processes; later spans are counted as dropped
+DEFAULT_MAX_EVENTS = 50_000
+
+# Marks the context below an unsampled root span
+_UNSAMPLED = object()
+_current: ContextVar[Any] = ContextVar("ai_onboard_span", default=None)
+
+
+class _NoopSpan:
+    """Stands in for a span when nothing is recorded."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _UnsampledRoot(_NoopSpan):
+    """Root of an unsampled trace: hides its subtree from the tracer."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> "_UnsampledRoot":
+        self._token = _current.set(_UNSAMPLED)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current.reset(self._token)
+        return False
+
+
+class Span:
+    """A timed region; recorded with its thread time when it ends."""
+
+    __slots__ = (
+        "_tracer",
+        "name",
+        "category",
+        "args",
+        "_token",
+        "_start_ns",
+        "_cpu_start_ns",
+    )
+
+    def __init__(
+        self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **args: Any) -> None:
+        """Attach attributes, e.g. results known only at the end."""
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        self._cpu_start_ns = time.thread_time_ns()
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end_ns = time.perf_counter_ns()
+        cpu_ns = time.thread_time_ns() - self._cpu_start_ns
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer._record(self, self._start_ns, end_ns, cpu_ns)
+        return False
+
+
+class Tracer:
+    """Buffers finished spans of this process and writes them as one trace."""
+
+    def __init__(
+        self,
+        root: Path,
+        sample_rate: float = 1.0,
+        max_events: int = DEFAULT_MAX_EVENTS,
+    ):
+        self.trace_dir = root / ".ai_onboard" / "traces"
+        self.sample_rate = sample_rate
+        self.max_events = max_events
+        self.pid = os.getpid()
+        self.path = self.trace_dir / (
+            f"trace_{time.strftime('%Y%m%d_%H%M%S')}_{self.pid}.json"
+        )
+        self._epoch_ns = time.perf_counter_ns()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.stats = {"recorded": 0, "dropped": 0, "unsampled": 0}
+
+    def span(self, name: str, category: str = DEFAULT_CATEGORY, **args: Any) -> Any:
+        parent = _current.get()
+        if parent is _UNSAMPLED:
+            return _NOOP
+        if parent is None and self.sample_rate < 1.0:
+            if random.random() >= self.sample_rate:
+                self.stats["unsampled"] += 1
+                return _UnsampledRoot()
+        return Span(self, name, category, args)
+
+    def _record(self, span: Span, start_ns: int, end_ns: int, cpu_ns: int) -> None:
+        tid = threading.get_native_id()
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (start_ns - self._epoch_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "tdur": cpu_ns / 1000,
+            "pid": self.pid,
+            "tid": tid,
+        }
+        if span.args:
+            event["args"] = span.args
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.stats["dropped"] += 1
+                return
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self._events.append(event)
+            self.stats["recorded"] += 1
+            self._dirty = True
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Trace events recorded so far, thread names first."""
+        with self._lock:
+            metadata = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            ]
+            return metadata + list(self._events)
+
+    def flush(self) -> Optional[Path]:
+        """Write the trace if spans were recorded since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            self._dirty = False
+        document = {
+            "traceEvents": self.events(),
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "sample_rate": self.sample_rate,
+                "dropped": self.stats["dropped"],
+            },
+        }
+        try:
+            write_atomic(self.path, serialization.dumps(document))
+        except OSError as e:
+            print(f"Warning: Could not write trace {self.path}: {e}")
+            return None
+        return self.path
+
+
+# Readers take one snapshot of this, so configure() may swap it at any time
+_tracer: Optional[Tracer] = None
+
+
+def configure(
+    root: Optional[Path] = None,
+    enabled: bool = True,
+    sample_rate: float = 1.0,
+    max_events: int = DEFAULT_MAX_EVENTS,
+) -> Optional[Tracer]:
+    """Turn tracing on (writing under ``root``, the working directory by
+    default) or off. Spans recorded by a previous tracer are flushed first.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.flush()
+    if not enabled or sample_rate <= 0:
+        _tracer = None
+        return None
+    _tracer = Tracer(
+        Path(root) if root is not None else Path.cwd(),
+        sample_rate=min(sample_rate, 1.0),
+        max_events=max_events,
+    )
+    return _tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The active tracer, or None while tracing is disabled."""
+    return _tracer
+
+
+def span(name: str, category: str = DEFAULT_CATEGORY, **args: Any) -> Any:
+    """Context manager timing the enclosed block as a child of the current span."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return tracer.span(name, category, **args)
+
+
+def traced(
+    name: Optional[str] = None, category: str = DEFAULT_CATEGORY
+) -> Callable[[F], F]:
+    """Decorator recording each call as a span (named after the function)."""
+
+    def decorate(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                tracer = _tracer
+                if tracer is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name, category):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def current_span() -> Optional[Span]:
+    """The innermost recorded span of this context, if any."""
+    value = _current.get()
+    return value if isinstance(value, Span) else None
+
+
+def flush() -> Optional[Path]:
+    """Write the active tracer's trace; returns its path if written."""
+    tracer = _tracer
+    return tracer.flush() if tracer is not None else None
+
+
+def _configure_from_env() -> None:
+    value = os.environ.get("AI_ONBOARD_TRACE", "").strip().lower()
+    if value in ("", "0", "false", "off", "no"):
+        return
+    if value in ("1", "true", "on", "yes"):
+        configure()
+        return
+    try:
+        configure(sample_rate=float(value))
+    except ValueError:
+        print(f"Warning: Unknown AI_ONBOARD_TRACE {value!r}")
+
+
+_configure_from_env()
+atexit.register(flush)
@@ -25,6 +25,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Protocol, Tuple
 
+from . import serialization
+from .state_store import get_state_store
+
 
 def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
@@ -36,33 +39,58 @@ def generate_id(length: int = 8) -> str:
     return "".join(random.choice(chars) for _ in range(length))
 
 
-def write_json(path: Path, data):
-    ensure_dir(path.parent)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf - 8")
+def write_json(path: Path, data, compact: bool = False, binary: bool = False):
+    """Atomically write ``data`` as JSON.
+
+    Files are indented for people by default. Machine-only files can pass
+    ``compact=True`` for a compact encoding, or ``binary=True`` for the
+    length-prefixed record format of the largest stores; ``read_json`` reads
+    all three. Dataclasses, enums, datetimes and paths are encoded directly.
+    """
+    store = get_state_store()
+    if binary:
+        payload = serialization.dumps_records(data)
+    else:
+        payload = serialization.dumps(data, indent=None if compact else 2)
+    # Replace atomically; a queued deferred write would now be stale
+    store.replace_document(path, payload)
     # Invalidate cache entry to ensure subsequent reads get fresh data
     cache_key = str(path.resolve())
-    if cache_key in _json_cache:
-        del _json_cache[cache_key]
-    if cache_key in _json_cache_access:
-        del _json_cache_access[cache_key]
+    _json_cache.pop(cache_key, None)
+    _json_cache_access.pop(cache_key, None)
+
+
+def write_json_deferred(path: Path, data):
+    """Queue a compact JSON write through the process-wide state store.
+
+    The file is replaced atomically when the store flushes; ``read_json``
+    returns the new contents immediately.
+    """
+    payload = get_state_store().write_json(path, data)
+    cache_key = str(path.resolve())
+    _json_cache[cache_key] = serialization.loads(payload)
+    _json_cache_access[cache_key] = time.time()
+    _cleanup_json_cache()
 
 
 # Global cache for JSON files
 _json_cache: Dict[str, Any] = {}
 _json_cache_access: Dict[str, float] = {}
 _JSON_CACHE_MAX_SIZE = 128
+_MISSING = object()
 
 
 def _cleanup_json_cache():
     """Remove oldest entries if cache is too large."""
     if len(_json_cache) > _JSON_CACHE_MAX_SIZE:
-        # Remove oldest entries
-        oldest_keys = sorted(_json_cache_access.items(), key=lambda x: x[1])[
+        # Remove oldest entries; pop() tolerates another thread evicting the
+        # same key concurrently
+        oldest_keys = sorted(list(_json_cache_access.items()), key=lambda x: x[1])[
             : len(_json_cache) - _JSON_CACHE_MAX_SIZE
         ]
         for key, _ in oldest_keys:
-            del _json_cache[key]
-            del _json_cache_access[key]
+            _json_cache.pop(key, None)
+            _json_cache_access.pop(key, None)
 
 
 def read_json_cached(path: Path, default=None) -> Any:
@@ -70,21 +98,26 @@ def read_json_cached(path: Path, default=None) -> Any:
     cache_key = str(path.resolve())
 
     # Check cache first
-    if cache_key in _json_cache:
+    cached = _json_cache.get(cache_key, _MISSING)
+    if cached is not _MISSING:
         _json_cache_access[cache_key] = time.time()  # Update access time
-        return _json_cache[cache_key]
+        return cached
 
-    if not path.exists():
+    # A deferred write that has not been flushed yet is the current content
+    pending = get_state_store().pending_document(path)
+    if pending is None and not path.exists():
         return default
 
     try:
-        content = json.loads(path.read_text(encoding="utf - 8"))
+        content = serialization.load_bytes(
+            pending if pending is not None else path.read_bytes()
+        )
         # Cache the result
         _json_cache[cache_key] = content
         _json_cache_access[cache_key] = time.time()
         _cleanup_json_cache()
         return content
-    except (json.JSONDecodeError, OSError):
+    except (ValueError, OSError):
         return default
 
 
@@ -95,13 +128,13 @@ async def read_json_async(path: Path, default=None) -> Any:
     try:
         # Use asyncio.to_thread (Python 3.9+) with fallback for Python 3.8
         if hasattr(asyncio, 'to_thread'):
-            content = await asyncio.to_thread(path.read_text, encoding="utf - 8")
+            content = await asyncio.to_thread(path.read_bytes)
         else:
             # Fallback for Python 3.8: use run_in_executor
             loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(None, path.read_text, "utf - 8")
-        return json.loads(content)
-    except (json.JSONDecodeError, OSError):
+            content = await loop.run_in_executor(None, path.read_bytes)
+        return serialization.load_bytes(content)
+    except (ValueError, OSError):
         return default
 
 
@@ -311,8 +344,7 @@ def record_agent_event(root: Path, rec: Dict[str, Any]) -> None:
     }
     out.update(rec or {})
     try:
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(out, ensure_ascii=False, default=str) + "\n")
+        get_state_store().append_jsonl(path, out, default=str)
     except Exception:
         pass  # Best effort - don't fail if telemetry fails
 
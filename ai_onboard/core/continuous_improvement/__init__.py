@@ -31,6 +31,12 @@ from .knowledge_base_evolution import (
 )
 from .learning_persistence import LearningPersistenceManager
 
+from .operation_profiler import (
+    LatencyHistogram,
+    OperationProfiler,
+    get_operation_profiler,
+)
+
 # optimizer and optimizer_state modules contain only functions, no classes
 from .performance_optimizer import (
     PerformanceOptimizer,
@@ -60,6 +66,9 @@ __all__ = [
     # Performance Optimization
     "PerformanceOptimizer",
     "get_performance_optimizer",
+    "OperationProfiler",
+    "LatencyHistogram",
+    "get_operation_profiler",
     # Learning & Persistence
     "LearningPersistenceManager",
     "KnowledgeBaseEvolution",
@@ -11,20 +11,29 @@ This module provides comprehensive analytics and \
 - Real - time monitoring and alerts
 """
 
+import atexit
+import bisect
 import csv
 import io
 import json
 import statistics
+import threading
 import time
+import weakref
 from collections import Counter, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
-from ..base import telemetry, utils
+from ..base import serialization, telemetry, utils
+from ..base.background_scheduler import get_background_scheduler
 from . import continuous_improvement_system
+from .kpi_aggregates import WindowedAggregate
+
+# Distinct metric names whose KPI routes are cached
+MAX_METRIC_ROUTES = 10000
 
 
 class ReportType(Enum):
@@ -149,11 +158,28 @@ class ContinuousImprovementAnalytics:
         self.analytics_config = self._load_analytics_config()
         self.kpi_definitions = self._get_kpi_definitions()
 
+        # Incremental KPI state: one windowed aggregate per KPI, metric name ->
+        # (alerting KPI ids, fed KPI ids) routes, and write-behind KPI saves
+        self.kpi_save_delay = 2.0  # seconds to coalesce saves; 0 saves immediately
+        # KPI history is kept for its analysis window, at most this many values
+        self.kpi_history_limit = 500
+        self._kpi_aggregates: Dict[str, WindowedAggregate] = {
+            kpi_id: WindowedAggregate(kpi_def["window_hours"] * 3600)
+            for kpi_id, kpi_def in self.kpi_definitions.items()
+        }
+        self._metric_routes: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._lock = threading.RLock()
+        self._kpis_dirty = False
+        self._kpi_flush_pending = False
+        self._kpi_flush_job_id = f"analytics-kpi-flush:{id(self)}"
+        _analytics.add(self)
+
         # Ensure directories exist
         self._ensure_directories()
 
         # Load existing data
         self._load_metrics()
+        self._rebuild_kpi_aggregates()
         self._load_kpis()
         self._load_reports()
         self._load_alerts()
@@ -205,13 +231,22 @@ class ContinuousImprovementAnalytics:
         )
 
     def _get_kpi_definitions(self) -> Dict[str, Dict[str, Any]]:
-        """Get KPI definitions and calculations."""
+        """Get KPI definitions and calculations.
+
+        Each KPI is a windowed aggregate: metrics whose lowercased name
+        contains ``source`` feed a ``count``, ``sum`` or ``mean`` over the
+        last ``window_hours``. Mean KPIs report ``default`` until a metric
+        arrives.
+        """
         return {
             "learning_rate": {
                 "name": "Learning Rate",
                 "description": "Rate of new learning events per day",
                 "unit": "events / day",
                 "target": 10.0,
+                "source": "learning",
+                "aggregate": "count",
+                "window_hours": 24,
                 "calculation": self._calculate_learning_rate,
             },
             "recommendation_acceptance_rate": {
@@ -219,6 +254,10 @@ class ContinuousImprovementAnalytics:
                 "description": "Percentage of recommendations that are accepted",
                 "unit": "%",
                 "target": 80.0,
+                "source": "recommendation acceptance rate",
+                "aggregate": "mean",
+                "window_hours": 24,
+                "default": 75.0,
                 "calculation": self._calculate_recommendation_acceptance_rate,
             },
             "system_health_score": {
@@ -226,6 +265,10 @@ class ContinuousImprovementAnalytics:
                 "description": "Overall system health score",
                 "unit": "score",
                 "target": 90.0,
+                "source": "system health score",
+                "aggregate": "mean",
+                "window_hours": 24,
+                "default": 85.0,
                 "calculation": self._calculate_system_health_score,
             },
             "user_satisfaction": {
@@ -233,6 +276,10 @@ class ContinuousImprovementAnalytics:
                 "description": "Average user satisfaction score",
                 "unit": "score",
                 "target": 85.0,
+                "source": "user satisfaction",
+                "aggregate": "mean",
+                "window_hours": 24,
+                "default": 82.0,
                 "calculation": self._calculate_user_satisfaction,
             },
             "knowledge_growth_rate": {
@@ -240,6 +287,9 @@ class ContinuousImprovementAnalytics:
                 "description": "Rate of knowledge base growth",
                 "unit": "items / day",
                 "target": 5.0,
+                "source": "knowledge",
+                "aggregate": "count",
+                "window_hours": 24,
                 "calculation": self._calculate_knowledge_growth_rate,
             },
             "error_resolution_time": {
@@ -247,6 +297,10 @@ class ContinuousImprovementAnalytics:
                 "description": "Average time to resolve errors",
                 "unit": "minutes",
                 "target": 30.0,
+                "source": "error resolution time",
+                "aggregate": "mean",
+                "window_hours": 24,
+                "default": 25.0,
                 "calculation": self._calculate_error_resolution_time,
             },
             "performance_improvement": {
@@ -254,6 +308,10 @@ class ContinuousImprovementAnalytics:
                 "description": "Percentage improvement in system performance",
                 "unit": "%",
                 "target": 15.0,
+                "source": "performance improvement",
+                "aggregate": "mean",
+                "window_hours": 24,
+                "default": 12.0,
                 "calculation": self._calculate_performance_improvement,
             },
         }
@@ -267,31 +325,14 @@ class ContinuousImprovementAnalytics:
             days=self.analytics_config["metrics_retention_days"]
         )
 
-        with open(self.metrics_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    metric_timestamp = datetime.fromisoformat(data["timestamp"])
-
-                    # Skip old metrics
-                    if metric_timestamp < cutoff_date:
-                        continue
-
-                    metric = Metric(
-                        metric_id=data["metric_id"],
-                        metric_type=MetricType(data["metric_type"]),
-                        name=data["name"],
-                        value=data["value"],
-                        timestamp=metric_timestamp,
-                        tags=data.get("tags", {}),
-                        metadata=data.get("metadata", {}),
-                    )
-                    self.metrics.append(metric)
-                except (json.JSONDecodeError, KeyError, ValueError):
-                    continue
+        for data in serialization.load_lines(self.metrics_path.read_bytes()):
+            try:
+                metric = serialization.structure(Metric, data)
+            except (KeyError, TypeError, ValueError):
+                continue
+            # Skip old metrics
+            if metric.timestamp >= cutoff_date:
+                self.metrics.append(metric)
 
     def _load_kpis(self) -> None:
         """Load KPIs from storage."""
@@ -301,23 +342,8 @@ class ContinuousImprovementAnalytics:
         data = utils.read_json(self.kpis_path, default={})
 
         for kpi_id, kpi_data in data.items():
-            historical_values = [
-                (datetime.fromisoformat(timestamp), value)
-                for timestamp, value in kpi_data.get("historical_values", [])
-            ]
-
-            kpi = KPI(
-                kpi_id=kpi_id,
-                name=kpi_data["name"],
-                description=kpi_data["description"],
-                current_value=kpi_data["current_value"],
-                target_value=kpi_data["target_value"],
-                unit=kpi_data["unit"],
-                trend=kpi_data["trend"],
-                last_updated=datetime.fromisoformat(kpi_data["last_updated"]),
-                historical_values=historical_values,
-                alerts=kpi_data.get("alerts", []),
-            )
+            kpi = serialization.structure(KPI, {**kpi_data, "kpi_id": kpi_id})
+            self._trim_history(kpi, datetime.now())
             self.kpis[kpi_id] = kpi
 
     def _load_reports(self) -> None:
@@ -425,19 +451,8 @@ class ContinuousImprovementAnalytics:
 
     def _save_metric(self, metric: Metric) -> None:
         """Save a metric to storage."""
-        data = {
-            "metric_id": metric.metric_id,
-            "metric_type": metric.metric_type.value,
-            "name": metric.name,
-            "value": metric.value,
-            "timestamp": metric.timestamp.isoformat(),
-            "tags": metric.tags,
-            "metadata": metric.metadata,
-        }
-
-        with open(self.metrics_path, "a", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
-            f.write("\n")
+        with open(self.metrics_path, "ab") as f:
+            f.write(serialization.dumps(metric) + b"\n")
 
     def _check_metric_alerts(self, metric: Metric) -> None:
         """Check if a metric triggers any alerts."""
@@ -445,27 +460,28 @@ class ContinuousImprovementAnalytics:
             return
 
         # Check KPI thresholds
-        for kpi_id, kpi_def in self.kpi_definitions.items():
-            if kpi_def["name"].lower() in metric.name.lower():
-                thresholds = self.analytics_config["kpi_thresholds"].get(kpi_id, {})
-
-                for level, threshold in thresholds.items():
-                    if metric.value <= threshold:
-                        self._create_alert(
-                            alert_level=(
-                                AlertLevel.WARNING
-                                if level == "warning"
-                                else AlertLevel.CRITICAL
-                            ),
-                            title=f"{kpi_def['name']} Alert",
-                            description=(
-                                f"{kpi_def['name']} is {metric.value:.2f}, "
-                                f"below {level} threshold of {threshold}"
-                            ),
-                            metric_name=metric.name,
-                            current_value=metric.value,
-                            threshold_value=threshold,
-                        )
+        alerting_kpis, _ = self._route_metric(metric.name)
+        for kpi_id in alerting_kpis:
+            kpi_def = self.kpi_definitions[kpi_id]
+            thresholds = self.analytics_config["kpi_thresholds"].get(kpi_id, {})
+
+            for level, threshold in thresholds.items():
+                if metric.value <= threshold:
+                    self._create_alert(
+                        alert_level=(
+                            AlertLevel.WARNING
+                            if level == "warning"
+                            else AlertLevel.CRITICAL
+                        ),
+                        title=f"{kpi_def['name']} Alert",
+                        description=(
+                            f"{kpi_def['name']} is {metric.value:.2f}, "
+                            f"below {level} threshold of {threshold}"
+                        ),
+                        metric_name=metric.name,
+                        current_value=metric.value,
+                        threshold_value=threshold,
+                    )
 
     def _create_alert(
         self,
@@ -525,118 +541,184 @@ class ContinuousImprovementAnalytics:
             json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
             f.write("\n")
 
+    def _route_metric(self, name: str) -> Tuple[List[str], List[str]]:
+        """Return (alerting KPI ids, fed KPI ids) for a metric name.
+
+        Routes are matched once per distinct name and cached.
+        """
+        routes = self._metric_routes.get(name)
+        if routes is None:
+            lowered = name.lower()
+            alerting = [
+                kpi_id
+                for kpi_id, kpi_def in self.kpi_definitions.items()
+                if kpi_def["name"].lower() in lowered
+            ]
+            fed = [
+                kpi_id
+                for kpi_id, kpi_def in self.kpi_definitions.items()
+                if kpi_def["source"] in lowered
+            ]
+            if len(self._metric_routes) >= MAX_METRIC_ROUTES:
+                self._metric_routes.clear()
+            routes = self._metric_routes[name] = (alerting, fed)
+        return routes
+
+    def _rebuild_kpi_aggregates(self) -> None:
+        """Feed loaded metrics into the KPI aggregates."""
+        for metric in self.metrics:
+            timestamp = metric.timestamp.timestamp()
+            for kpi_id in self._route_metric(metric.name)[1]:
+                self._kpi_aggregates[kpi_id].add(metric.value, timestamp)
+
+    def _kpi_value(self, kpi_id: str) -> float:
+        """Read a KPI from its windowed aggregate."""
+        kpi_def = self.kpi_definitions[kpi_id]
+        aggregate = self._kpi_aggregates[kpi_id]
+        now = time.time()
+        if "default" in kpi_def and not aggregate.value("count", now):
+            return float(kpi_def["default"])
+        return aggregate.value(kpi_def["aggregate"], now)
+
     def _update_related_kpis(self, metric: Metric) -> None:
         """Update KPIs related to a metric."""
-        for kpi_id, kpi_def in self.kpi_definitions.items():
-            if kpi_def["name"].lower() in metric.name.lower():
-                # Calculate new KPI value
-                new_value = kpi_def["calculation"](self)
-
-                if kpi_id in self.kpis:
-                    kpi = self.kpis[kpi_id]
-                    kpi.historical_values.append((datetime.now(), new_value))
-                    kpi.current_value = new_value
-                    kpi.last_updated = datetime.now()
-
-                    # Calculate trend
-                    if len(kpi.historical_values) >= 2:
-                        recent_values = [v for _, v in kpi.historical_values[-5:]]
-                        if len(recent_values) >= 2:
-                            if recent_values[-1] > recent_values[0]:
-                                kpi.trend = "up"
-                            elif recent_values[-1] < recent_values[0]:
-                                kpi.trend = "down"
-                            else:
-                                kpi.trend = "stable"
+        _, kpi_ids = self._route_metric(metric.name)
+        if not kpi_ids:
+            return
+
+        timestamp = metric.timestamp.timestamp()
+        with self._lock:
+            for kpi_id in kpi_ids:
+                self._kpi_aggregates[kpi_id].add(metric.value, timestamp)
+                self._refresh_kpi(kpi_id)
+        self._save_kpis()
+
+    def _refresh_kpi(self, kpi_id: str) -> None:
+        """Record the current value of a KPI and its trend."""
+        kpi_def = self.kpi_definitions[kpi_id]
+        new_value = kpi_def["calculation"]()
+        now = datetime.now()
+
+        if kpi_id in self.kpis:
+            kpi = self.kpis[kpi_id]
+            kpi.historical_values.append((now, new_value))
+            self._trim_history(kpi, now)
+            kpi.current_value = new_value
+            kpi.last_updated = now
+
+            # Calculate trend
+            recent_values = [v for _, v in kpi.historical_values[-5:]]
+            if len(recent_values) >= 2:
+                if recent_values[-1] > recent_values[0]:
+                    kpi.trend = "up"
+                elif recent_values[-1] < recent_values[0]:
+                    kpi.trend = "down"
                 else:
-                    # Create new KPI
-                    kpi = KPI(
-                        kpi_id=kpi_id,
-                        name=kpi_def["name"],
-                        description=kpi_def["description"],
-                        current_value=new_value,
-                        target_value=kpi_def["target"],
-                        unit=kpi_def["unit"],
-                        trend="stable",
-                        last_updated=datetime.now(),
-                        historical_values=[(datetime.now(), new_value)],
-                    )
-                    self.kpis[kpi_id] = kpi
+                    kpi.trend = "stable"
+        else:
+            # Create new KPI
+            self.kpis[kpi_id] = KPI(
+                kpi_id=kpi_id,
+                name=kpi_def["name"],
+                description=kpi_def["description"],
+                current_value=new_value,
+                target_value=kpi_def["target"],
+                unit=kpi_def["unit"],
+                trend="stable",
+                last_updated=now,
+                historical_values=[(now, new_value)],
+            )
 
-                self._save_kpis()
+    def _trim_history(self, kpi: KPI, now: datetime) -> None:
+        """Drop KPI values older than its window or beyond the history limit."""
+        kpi_def = self.kpi_definitions.get(kpi.kpi_id)
+        history = kpi.historical_values
+        stale = len(history) - self.kpi_history_limit
+        if kpi_def is not None:
+            cutoff = now - timedelta(hours=kpi_def["window_hours"])
+            stale = max(stale, bisect.bisect_left(history, (cutoff,)))
+        if stale > 0:
+            del history[:stale]
 
     def _calculate_learning_rate(self) -> float:
         """Calculate learning rate KPI."""
-        # Count learning events in the last 24 hours
-        cutoff = datetime.now() - timedelta(hours=24)
-        learning_events = [
-            metric
-            for metric in self.metrics
-            if "learning" in metric.name.lower() and metric.timestamp >= cutoff
-        ]
-        return len(learning_events)
+        # Learning events in the last 24 hours
+        return self._kpi_value("learning_rate")
 
     def _calculate_recommendation_acceptance_rate(self) -> float:
         """Calculate recommendation acceptance rate KPI."""
-        # This would analyze recommendation acceptance data
-        # For now, return a simulated value
-        return 75.0
+        return self._kpi_value("recommendation_acceptance_rate")
 
     def _calculate_system_health_score(self) -> float:
         """Calculate system health score KPI."""
-        # This would integrate with the health monitoring system
-        # For now, return a simulated value
-        return 85.0
+        return self._kpi_value("system_health_score")
 
     def _calculate_user_satisfaction(self) -> float:
         """Calculate user satisfaction KPI."""
-        # This would analyze user satisfaction data
-        # For now, return a simulated value
-        return 82.0
+        return self._kpi_value("user_satisfaction")
 
     def _calculate_knowledge_growth_rate(self) -> float:
         """Calculate knowledge growth rate KPI."""
-        # Count knowledge additions in the last 24 hours
-        cutoff = datetime.now() - timedelta(hours=24)
-        knowledge_metrics = [
-            metric
-            for metric in self.metrics
-            if "knowledge" in metric.name.lower() and metric.timestamp >= cutoff
-        ]
-        return len(knowledge_metrics)
+        # Knowledge additions in the last 24 hours
+        return self._kpi_value("knowledge_growth_rate")
 
     def _calculate_error_resolution_time(self) -> float:
         """Calculate error resolution time KPI."""
-        # This would analyze error resolution data
-        # For now, return a simulated value
-        return 25.0
+        return self._kpi_value("error_resolution_time")
 
     def _calculate_performance_improvement(self) -> float:
         """Calculate performance improvement KPI."""
-        # This would analyze performance metrics over time
-        # For now, return a simulated value
-        return 12.0
+        return self._kpi_value("performance_improvement")
 
     def _save_kpis(self) -> None:
-        """Save KPIs to storage."""
-        data = {}
-        for kpi_id, kpi in self.kpis.items():
-            data[kpi_id] = {
-                "name": kpi.name,
-                "description": kpi.description,
-                "current_value": kpi.current_value,
-                "target_value": kpi.target_value,
-                "unit": kpi.unit,
-                "trend": kpi.trend,
-                "last_updated": kpi.last_updated.isoformat(),
-                "historical_values": [
-                    (timestamp.isoformat(), value)
-                    for timestamp, value in kpi.historical_values
-                ],
-                "alerts": kpi.alerts,
+        """Queue KPIs to be saved by the write-behind flush."""
+        with self._lock:
+            self._kpis_dirty = True
+            if self.kpi_save_delay <= 0:
+                pending = False
+            elif not self._kpi_flush_pending:
+                self._kpi_flush_pending = pending = True
+            else:
+                return
+
+        if pending:
+            get_background_scheduler().schedule_once(
+                self._kpi_flush_job_id, self.flush, self.kpi_save_delay
+            )
+        else:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write KPIs if they changed since the last flush.
+
+        Returns whether anything was written.
+        """
+        with self._lock:
+            self._kpi_flush_pending = False
+            if not self._kpis_dirty:
+                return False
+            self._kpis_dirty = False
+            # Snapshot the lists that updates append to; the rest is immutable
+            data = {
+                kpi_id: replace(
+                    kpi,
+                    historical_values=list(kpi.historical_values),
+                    alerts=list(kpi.alerts),
+                )
+                for kpi_id, kpi in self.kpis.items()
             }
 
-        utils.write_json(self.kpis_path, data)
+        try:
+            utils.write_json(self.kpis_path, data, compact=True)
+        except Exception as e:
+            print(f"Warning: Failed to save KPIs: {e}")
+            return False
+        return True
+
+    def close(self) -> None:
+        """Cancel any scheduled flush and write pending KPI changes now."""
+        get_background_scheduler().cancel(self._kpi_flush_job_id)
+        self.flush()
 
     def generate_report(
         self,
@@ -1079,3 +1161,15 @@ class ContinuousImprovementAnalytics:
 def get_continuous_improvement_analytics(root: Path) -> ContinuousImprovementAnalytics:
     """Get continuous improvement analytics system instance."""
     return ContinuousImprovementAnalytics(root)
+
+
+# Analytics instances with unsaved KPIs are flushed at interpreter exit
+_analytics: "weakref.WeakSet[ContinuousImprovementAnalytics]" = weakref.WeakSet()
+
+
+def _flush_all_analytics() -> None:
+    for analytics in list(_analytics):
+        analytics.flush()
+
+
+atexit.register(_flush_all_analytics)
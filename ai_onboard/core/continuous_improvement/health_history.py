@@ -0,0 +1,232 @@
+"""
+Health History - Bounded, downsampled health snapshot history.
+
+The health monitor records a health score and status every few seconds.
+Keeping every sample and filtering all of them for each summary made both
+memory and query cost grow with uptime. Samples are instead kept in a
+round-robin layout of three tiers:
+
+- Raw samples for the last hour
+- One-minute rollups for the last day
+- Hourly rollups for the last month
+
+Each rollup holds precomputed count, min, max, mean, status counts and issue
+totals. A summary since any point in time merges at most one partial minute of
+raw samples, under an hour of minute rollups and the hourly rollups after
+that, so its cost is bounded by the tier sizes rather than the number of
+samples. Where the finer tier no longer covers the start of the window, the
+window is widened to the enclosing minute or hour.
+
+Also provides CpuSampler, a non-blocking CPU usage reading based on the
+change in CPU times between successive calls.
+"""
+
+import bisect
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Raw samples are (timestamp, score, status, issue_count)
+Sample = Tuple[float, float, str, int]
+
+
+class HealthRollup:
+    """Aggregate of the health samples in a time range."""
+
+    __slots__ = (
+        "count",
+        "score_sum",
+        "score_min",
+        "score_max",
+        "status_counts",
+        "issue_count",
+        "last_timestamp",
+        "last_score",
+        "last_status",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.score_sum = 0.0
+        self.score_min = math.inf
+        self.score_max = -math.inf
+        self.status_counts: Dict[str, int] = {}
+        self.issue_count = 0
+        self.last_timestamp = -math.inf
+        self.last_score = 0.0
+        self.last_status = "unknown"
+
+    def add(self, timestamp: float, score: float, status: str, issues: int) -> None:
+        self.count += 1
+        self.score_sum += score
+        self.score_min = min(self.score_min, score)
+        self.score_max = max(self.score_max, score)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.issue_count += issues
+        if timestamp >= self.last_timestamp:
+            self.last_timestamp = timestamp
+            self.last_score = score
+            self.last_status = status
+
+    def merge(self, other: "HealthRollup") -> None:
+        if not other.count:
+            return
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.score_min = min(self.score_min, other.score_min)
+        self.score_max = max(self.score_max, other.score_max)
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+        self.issue_count += other.issue_count
+        if other.last_timestamp >= self.last_timestamp:
+            self.last_timestamp = other.last_timestamp
+            self.last_score = other.last_score
+            self.last_status = other.last_status
+
+    @property
+    def mean(self) -> float:
+        return self.score_sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.score_min if self.count else 0.0,
+            "max": self.score_max if self.count else 0.0,
+            "status_counts": dict(self.status_counts),
+            "issue_count": self.issue_count,
+        }
+
+
+class RollupTier:
+    """Ring of ``slots`` rollups, each covering ``resolution`` seconds."""
+
+    __slots__ = ("resolution", "slots", "_ids", "_rollups", "newest")
+
+    def __init__(self, resolution: float, slots: int):
+        self.resolution = resolution
+        self.slots = slots
+        self._ids: List[int] = [-1] * slots
+        self._rollups: List[Optional[HealthRollup]] = [None] * slots
+        self.newest = -1
+
+    def bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
+
+    def covers(self, bucket: int) -> bool:
+        """Whether ``bucket`` has not yet been overwritten."""
+        return bucket > self.newest - self.slots
+
+    def add(self, timestamp: float, score: float, status: str, issues: int) -> None:
+        bucket = self.bucket(timestamp)
+        if not self.covers(bucket):
+            return
+        slot = bucket % self.slots
+        rollup = self._rollups[slot]
+        if rollup is None or self._ids[slot] != bucket:
+            rollup = self._rollups[slot] = HealthRollup()
+            self._ids[slot] = bucket
+        rollup.add(timestamp, score, status, issues)
+        self.newest = max(self.newest, bucket)
+
+    def merge_into(self, result: HealthRollup, first: int, last: int) -> None:
+        """Merge buckets ``first`` through ``last`` (inclusive) into ``result``."""
+        first = max(first, self.newest - self.slots + 1)
+        for bucket in range(first, min(last, self.newest) + 1):
+            slot = bucket % self.slots
+            rollup = self._rollups[slot]
+            if rollup is not None and self._ids[slot] == bucket:
+                result.merge(rollup)
+
+
+class HealthHistory:
+    """Raw, minute and hourly tiers of health samples."""
+
+    def __init__(
+        self,
+        raw_seconds: float = 3600.0,
+        minute_slots: int = 24 * 60,
+        hour_slots: int = 30 * 24,
+    ):
+        self.raw_seconds = raw_seconds
+        self.raw: Deque[Sample] = deque()
+        self.minutes = RollupTier(60.0, minute_slots)
+        self.hours = RollupTier(3600.0, hour_slots)
+        self.total_samples = 0
+
+    def add(self, timestamp: float, score: float, status: str, issues: int = 0) -> None:
+        if not self.raw or timestamp >= self.raw[-1][0]:
+            self.raw.append((timestamp, score, status, issues))
+        else:
+            self.raw.insert(
+                bisect.bisect_right(self.raw, (timestamp, math.inf)),
+                (timestamp, score, status, issues),
+            )
+        horizon = self.raw[-1][0] - self.raw_seconds
+        while self.raw[0][0] < horizon:
+            self.raw.popleft()
+        self.minutes.add(timestamp, score, status, issues)
+        self.hours.add(timestamp, score, status, issues)
+        self.total_samples += 1
+
+    def summarize(self, since: float) -> HealthRollup:
+        """Aggregate every sample recorded at or after ``since``."""
+        result = HealthRollup()
+        if not self.raw:
+            return result
+
+        # Raw samples up to the first whole minute
+        minute_start = math.ceil(since / 60.0) * 60.0
+        if since >= self.raw[-1][0] - self.raw_seconds:
+            index = bisect.bisect_left(self.raw, (since,))
+            while index < len(self.raw) and self.raw[index][0] < minute_start:
+                result.add(*self.raw[index])
+                index += 1
+        else:
+            minute_start = math.floor(since / 60.0) * 60.0
+
+        # Minute rollups up to the first whole hour
+        hour_start = math.ceil(minute_start / 3600.0) * 3600.0
+        if self.minutes.covers(self.minutes.bucket(minute_start)):
+            self.minutes.merge_into(
+                result,
+                self.minutes.bucket(minute_start),
+                self.minutes.bucket(hour_start) - 1,
+            )
+        else:
+            # Raw samples are within the widened hour, so start over
+            result = HealthRollup()
+            hour_start = math.floor(minute_start / 3600.0) * 3600.0
+
+        # Hourly rollups for the rest
+        self.hours.merge_into(result, self.hours.bucket(hour_start), self.hours.newest)
+        return result
+
+
+class CpuSampler:
+    """Non-blocking system CPU usage from successive ``psutil.cpu_times``.
+
+    Each call reports the share of CPU time spent busy since the previous
+    call; the first call reports the average since boot.
+    """
+
+    def __init__(self, psutil_module: Any):
+        self._psutil = psutil_module
+        self._last: Optional[Tuple[float, float]] = None
+
+    def _read(self) -> Tuple[float, float]:
+        times = self._psutil.cpu_times()
+        total = sum(times)
+        # Guest time is already counted in user time on Linux
+        total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+        idle = times.idle + getattr(times, "iowait", 0.0)
+        return total, total - idle
+
+    def sample(self) -> float:
+        total, busy = self._read()
+        last_total, last_busy = self._last or (0.0, 0.0)
+        self._last = (total, busy)
+        elapsed = total - last_total
+        if elapsed <= 0:
+            return 0.0
+        return max(0.0, min(100.0, (busy - last_busy) / elapsed * 100.0))
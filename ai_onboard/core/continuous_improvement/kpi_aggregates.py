@@ -0,0 +1,105 @@
+"""
+KPI Aggregates - Sliding-window aggregates for incremental KPIs.
+
+KPIs used to be recalculated by scanning every stored metric whenever a
+related metric arrived. Each KPI is now declared as a windowed aggregate
+(count, sum or mean of the metrics routed to it over a sliding window) and
+maintained in a ring of time buckets:
+
+- Adding a value and reading the aggregate are O(1) amortized; advancing the
+  window clears only the buckets that fell out of it
+- Memory is fixed at ``buckets`` slots per KPI regardless of metric volume
+- Expiry is bucket-granular: a value leaves the window up to one bucket
+  width (``window / buckets``) after it is older than ``window``
+"""
+
+from typing import Dict, List
+
+AGGREGATES = ("count", "sum", "mean")
+
+
+class WindowedAggregate:
+    """Count, sum and mean of the values seen in the last ``window`` seconds."""
+
+    __slots__ = (
+        "window",
+        "buckets",
+        "width",
+        "_ids",
+        "_counts",
+        "_sums",
+        "_newest",
+        "count",
+        "total",
+    )
+
+    def __init__(self, window: float, buckets: int = 60):
+        if window <= 0 or buckets <= 0:
+            raise ValueError("window and buckets must be positive")
+        self.window = float(window)
+        self.buckets = buckets
+        self.width = self.window / buckets
+        self._ids: List[int] = [-1] * buckets
+        self._counts: List[int] = [0] * buckets
+        self._sums: List[float] = [0.0] * buckets
+        self._newest = -1
+        self.count = 0
+        self.total = 0.0
+
+    def _advance(self, bucket: int) -> None:
+        """Move the head of the ring to ``bucket``, clearing expired slots."""
+        if bucket <= self._newest:
+            return
+        start = max(self._newest + 1, bucket - self.buckets + 1)
+        for current in range(start, bucket + 1):
+            slot = current % self.buckets
+            self.count -= self._counts[slot]
+            self.total -= self._sums[slot]
+            self._ids[slot] = current
+            self._counts[slot] = 0
+            self._sums[slot] = 0.0
+        self._newest = bucket
+        if self.count == 0:
+            # Drop floating point residue left by subtraction
+            self.total = 0.0
+
+    def add(self, value: float, timestamp: float) -> bool:
+        """Record ``value`` at ``timestamp`` (seconds since the epoch).
+
+        Values older than the window are ignored; returns whether the value
+        was recorded.
+        """
+        bucket = int(timestamp // self.width)
+        self._advance(bucket)
+        slot = bucket % self.buckets
+        if self._ids[slot] != bucket:
+            return False
+        self._counts[slot] += 1
+        self._sums[slot] += value
+        self.count += 1
+        self.total += value
+        return True
+
+    def expire(self, now: float) -> None:
+        """Drop the buckets that are outside the window at ``now``."""
+        self._advance(int(now // self.width))
+
+    def value(self, aggregate: str, now: float) -> float:
+        """Return the ``count``, ``sum`` or ``mean`` of the window at ``now``."""
+        self.expire(now)
+        if aggregate == "count":
+            return float(self.count)
+        if aggregate == "sum":
+            return self.total
+        if aggregate == "mean":
+            return self.total / self.count if self.count else 0.0
+        raise ValueError(f"Unknown aggregate: {aggregate}")
+
+    def to_dict(self, now: float) -> Dict[str, float]:
+        self.expire(now)
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "window_seconds": self.window,
+        }
@@ -0,0 +1,264 @@
+"""
+Learning History - Time-partitioned, append-only event segments.
+
+Learning events used to live in a single JSONL file that was parsed and
+sorted in full to return the newest events, and rewritten in full to apply
+retention. Events are now appended to one segment file per UTC day:
+
+    learning/history/learning_history-20250101.jsonl
+
+- Newest-first reads stream each segment backward from its tail, so reading
+  the last ``limit`` events costs O(limit) regardless of history size
+- Retention deletes whole segments that are entirely older than the cutoff
+- A small sidecar ``index.json`` records, per segment, the line count and
+  byte size once the segment is sealed (a newer segment was started) and
+  whether events were appended out of timestamp order; such segments are
+  sorted in memory when read
+"""
+
+import calendar
+import json
+import time
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from ..base import utils
+
+# Bytes read per step when streaming a segment backward
+READ_BLOCK_SIZE = 64 * 1024
+
+# Events buffered per write when migrating or importing
+EXTEND_CHUNK_SIZE = 10000
+
+
+def _timestamp(event: Dict[str, Any]) -> float:
+    try:
+        return float(event.get("timestamp", 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _count_lines(path: Path) -> int:
+    count = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            count += block.count(b"\n")
+    return count
+
+
+def _read_backward(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON lines of ``path`` from last to first.
+
+    Blank lines and lines that do not parse (such as a torn final write)
+    are skipped.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(0, 2)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            size = min(READ_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # The first piece may be the end of a line in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        if remainder.strip():
+            try:
+                yield json.loads(remainder)
+            except ValueError:
+                pass
+
+
+class SegmentedHistory:
+    """Append-only event history partitioned into daily segment files."""
+
+    def __init__(self, directory: Path, prefix: str = "learning_history"):
+        self.directory = directory
+        self.prefix = prefix
+        self.index_file = directory / "index.json"
+        utils.ensure_dir(directory)
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+        # Newest timestamp appended to each segment, to detect disorder
+        self._last_timestamps: Dict[str, float] = {}
+        # Segments known to exist, so appends do not list the directory
+        self._known: Optional[Set[str]] = None
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+            return dict(data.get("segments", {}))
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_index(self) -> None:
+        utils.write_json(self.index_file, {"segments": self._index})
+
+    def segment_key(self, timestamp: float) -> str:
+        return time.strftime("%Y%m%d", time.gmtime(max(timestamp, 0.0)))
+
+    def segment_path(self, key: str) -> Path:
+        return self.directory / f"{self.prefix}-{key}.jsonl"
+
+    def segments(self) -> List[str]:
+        """Segment keys on disk, oldest first."""
+        start = len(self.prefix) + 1
+        return sorted(
+            path.stem[start:]
+            for path in self.directory.glob(f"{self.prefix}-*.jsonl")
+        )
+
+    def _segment_end(self, key: str) -> float:
+        return calendar.timegm(time.strptime(key, "%Y%m%d")) + 86400.0
+
+    def _last_timestamp(self, key: str) -> float:
+        if key not in self._last_timestamps:
+            newest = next(_read_backward(self.segment_path(key)), None)
+            self._last_timestamps[key] = _timestamp(newest) if newest else 0.0
+        return self._last_timestamps[key]
+
+    def _seal(self, keys: Iterable[str]) -> None:
+        """Record line counts and sizes for segments that stopped growing."""
+        for key in keys:
+            entry = self._index.get(key, {})
+            path = self.segment_path(key)
+            if "count" not in entry and path.exists():
+                entry["count"] = _count_lines(path)
+                entry["bytes"] = path.stat().st_size
+                self._index[key] = entry
+
+    def append(self, event: Dict[str, Any]) -> None:
+        self.extend([event])
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Append events to their day's segment; returns the number written."""
+        written = 0
+        chunk: List[Dict[str, Any]] = []
+        for event in events:
+            chunk.append(event)
+            if len(chunk) >= EXTEND_CHUNK_SIZE:
+                written += self._write_chunk(chunk)
+                chunk = []
+        if chunk:
+            written += self._write_chunk(chunk)
+        return written
+
+    def _write_chunk(self, events: List[Dict[str, Any]]) -> int:
+        index_changed = False
+        if self._known is None:
+            self._known = set(self.segments())
+        known = self._known
+        by_segment = groupby(events, key=lambda e: self.segment_key(_timestamp(e)))
+        for key, group in by_segment:
+            group_events = list(group)
+            is_new = key not in known and not self.segment_path(key).exists()
+            last = 0.0 if is_new else self._last_timestamp(key)
+            entry = self._index.get(key, {})
+
+            with open(self.segment_path(key), "a", encoding="utf-8") as f:
+                for event in group_events:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                    timestamp = _timestamp(event)
+                    if timestamp < last and not entry.get("unsorted"):
+                        entry["unsorted"] = True
+                        index_changed = True
+                    last = max(last, timestamp)
+            self._last_timestamps[key] = last
+
+            if "count" in entry:
+                # Appending to a sealed segment; recount when next needed
+                entry.pop("count")
+                entry.pop("bytes", None)
+                index_changed = True
+            if entry:
+                self._index[key] = entry
+            known.add(key)
+            if is_new and key == max(known):
+                older = [k for k in known if k < key]
+                if older:
+                    self._seal(older)
+                    index_changed = True
+        if index_changed:
+            self._save_index()
+        return len(events)
+
+    def iter_newest(self) -> Iterator[Dict[str, Any]]:
+        """Yield events newest first, reading segments from their tails."""
+        for key in reversed(self.segments()):
+            path = self.segment_path(key)
+            if self._index.get(key, {}).get("unsorted"):
+                events = list(_read_backward(path))
+                events.sort(key=_timestamp, reverse=True)
+                yield from events
+            else:
+                yield from _read_backward(path)
+
+    def newest(self, limit: int) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return events
+        for event in self.iter_newest():
+            events.append(event)
+            if len(events) >= limit:
+                break
+        return events
+
+    def segment_count(self, key: str) -> int:
+        """Line count of a segment, from the index when it is up to date."""
+        path = self.segment_path(key)
+        entry = self._index.get(key, {})
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        if "count" in entry and entry.get("bytes") == size:
+            return int(entry["count"])
+        return _count_lines(path)
+
+    def drop_before(self, cutoff: float) -> int:
+        """Delete segments whose whole day is before ``cutoff``.
+
+        Returns the number of events dropped.
+        """
+        dropped = 0
+        for key in self.segments():
+            if self._segment_end(key) > cutoff:
+                break
+            dropped += self.segment_count(key)
+            self.segment_path(key).unlink()
+            self._index.pop(key, None)
+            self._last_timestamps.pop(key, None)
+            if self._known is not None:
+                self._known.discard(key)
+        if dropped:
+            self._save_index()
+        return dropped
+
+    def migrate(self, legacy_file: Path) -> Optional[int]:
+        """Move events from a single-file history into segments."""
+        if not legacy_file.exists():
+            return None
+
+        def events() -> Iterator[Dict[str, Any]]:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+
+        migrated = self.extend(events())
+        legacy_file.unlink()
+        return migrated
@@ -10,13 +10,14 @@ This module provides persistent storage for learned patterns that:
 - Ensures learning continuity between AI agent sessions
 """
 
-import json
 import time
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-from ..base import utils
+from ..base import serialization, utils
 from ..orchestration.tool_usage_tracker import track_tool_usage
+from .learning_history import SegmentedHistory
 
 # Type checking imports removed - PatternRecognitionSystem not used
 
@@ -28,7 +29,9 @@ class LearningPersistenceManager:
         self.root = root
         self.learning_dir = root / ".ai_onboard" / "learning"
         self.patterns_backup_file = self.learning_dir / "patterns_backup.json"
+        # Single-file history from before segments; migrated on startup
         self.learning_history_file = self.learning_dir / "learning_history.jsonl"
+        self.learning_history_dir = self.learning_dir / "history"
         self.learning_stats_file = self.learning_dir / "learning_stats.json"
 
         # Learning statistics
@@ -44,6 +47,12 @@ class LearningPersistenceManager:
         self._ensure_directories()
         self._load_stats()
 
+        self.history = SegmentedHistory(self.learning_history_dir)
+        try:
+            self.history.migrate(self.learning_history_file)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to migrate learning history: {e}")
+
     def _ensure_directories(self) -> None:
         """Ensure learning directories exist."""
         self.learning_dir.mkdir(parents=True, exist_ok=True)
@@ -61,7 +70,7 @@ class LearningPersistenceManager:
     def _save_stats(self) -> None:
         """Save learning statistics to disk."""
         try:
-            utils.write_json(self.learning_stats_file, self.stats)
+            utils.write_json_deferred(self.learning_stats_file, self.stats)
         except (ValueError, TypeError, AttributeError) as e:
             print(f"Error: {e}")
 
@@ -76,52 +85,13 @@ class LearningPersistenceManager:
             True if backup successful, False otherwise
         """
         try:
-            # Get all patterns as serializable data
-            patterns_data = {}
-            for pattern_id, pattern in pattern_system.patterns.items():
-                patterns_data[pattern_id] = {
-                    "pattern_id": pattern.pattern_id,
-                    "pattern_type": pattern.pattern_type,
-                    "signature": pattern.signature,
-                    "description": pattern.description,
-                    "examples": pattern.examples[-5:],  # Keep only recent examples
-                    "frequency": pattern.frequency,
-                    "first_seen": pattern.first_seen,
-                    "last_seen": pattern.last_seen,
-                    "confidence": pattern.confidence,
-                    "prevention_rules": pattern.prevention_rules,
-                    "related_patterns": list(pattern.related_patterns),
-                }
-
-            # Get CLI patterns
-            cli_patterns_data: Dict[str, Any] = {}
-            for pattern_id, pattern in pattern_system.cli_patterns.items():
-                cli_patterns_data[pattern_id] = {
-                    "pattern_id": pattern.pattern_id,
-                    "command_sequence": pattern.command_sequence,
-                    "success_rate": pattern.success_rate,
-                    "frequency": pattern.frequency,
-                    "context": pattern.context,
-                    "first_seen": pattern.first_seen,
-                    "last_seen": pattern.last_seen,
-                    "recommendations": pattern.recommendations,
-                }
-
-            # Get behavior patterns
-            behavior_patterns_data: Dict[str, Any] = {}
-            for pattern_id, pattern in pattern_system.behavior_patterns.items():
-                behavior_patterns_data[pattern_id] = {
-                    "pattern_id": pattern.pattern_id,
-                    "pattern_type": pattern.pattern_type,
-                    "description": pattern.description,
-                    "frequency": pattern.frequency,
-                    "confidence": pattern.confidence,
-                    "triggers": pattern.triggers,
-                    "outcomes": pattern.outcomes,
-                    "recommendations": pattern.recommendations,
-                    "first_seen": pattern.first_seen,
-                    "last_seen": pattern.last_seen,
-                }
+            # Patterns are encoded directly; keep only recent examples
+            patterns_data = {
+                pattern_id: replace(pattern, examples=pattern.examples[-5:])
+                for pattern_id, pattern in pattern_system.patterns.items()
+            }
+            cli_patterns_data = pattern_system.cli_patterns
+            behavior_patterns_data = pattern_system.behavior_patterns
 
             backup_data = {
                 "timestamp": time.time(),
@@ -135,7 +105,7 @@ class LearningPersistenceManager:
                 "stats": self.stats.copy(),
             }
 
-            utils.write_json(self.patterns_backup_file, backup_data)
+            utils.write_json(self.patterns_backup_file, backup_data, compact=True)
 
             # Update stats
             self.stats["last_learning_update"] = time.time()
@@ -183,36 +153,34 @@ class LearningPersistenceManager:
             cli_patterns_restored = 0
             behavior_patterns_restored = 0
 
-            # Restore error patterns
-            if "patterns" in backup_data:
-                for pattern_id, pattern_data in backup_data["patterns"].items():
-                    from ..orchestration.pattern_recognition_system import ErrorPattern
+            from ..orchestration.pattern_recognition_system import (
+                BehaviorPattern,
+                CLIPattern,
+                ErrorPattern,
+            )
 
-                    pattern = ErrorPattern(**pattern_data)
-                    pattern_system.patterns[pattern_id] = pattern
-                    patterns_restored += 1
+            # Restore error patterns
+            for pattern_id, pattern_data in backup_data["patterns"].items():
+                pattern_system.patterns[pattern_id] = serialization.structure(
+                    ErrorPattern, pattern_data
+                )
+                patterns_restored += 1
 
             # Restore CLI patterns
-            if "cli_patterns" in backup_data:
-                for pattern_id, pattern_data in backup_data["cli_patterns"].items():
-                    from ..orchestration.pattern_recognition_system import CLIPattern
-
-                    pattern = CLIPattern(**pattern_data)  # type: ignore[assignment]
-                    pattern_system.cli_patterns[pattern_id] = pattern
-                    cli_patterns_restored += 1
+            for pattern_id, pattern_data in backup_data.get("cli_patterns", {}).items():
+                pattern_system.cli_patterns[pattern_id] = serialization.structure(
+                    CLIPattern, pattern_data
+                )
+                cli_patterns_restored += 1
 
             # Restore behavior patterns
-            if "behavior_patterns" in backup_data:
-                for pattern_id, pattern_data in backup_data[
-                    "behavior_patterns"
-                ].items():
-                    from ..orchestration.pattern_recognition_system import (
-                        BehaviorPattern,
-                    )
-
-                    pattern = BehaviorPattern(**pattern_data)  # type: ignore[assignment]
-                    pattern_system.behavior_patterns[pattern_id] = pattern
-                    behavior_patterns_restored += 1
+            for pattern_id, pattern_data in backup_data.get(
+                "behavior_patterns", {}
+            ).items():
+                pattern_system.behavior_patterns[pattern_id] = serialization.structure(
+                    BehaviorPattern, pattern_data
+                )
+                behavior_patterns_restored += 1
 
             # Restore command history
             if "command_history" in backup_data:
@@ -272,9 +240,8 @@ class LearningPersistenceManager:
                 "event_data": event_data,
             }
 
-            # Append to history file
-            with open(self.learning_history_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event_record, ensure_ascii=False) + "\n")
+            # Append to today's history segment
+            self.history.append(event_record)
 
             # Update stats
             self.stats["total_learning_events"] += 1
@@ -308,16 +275,8 @@ class LearningPersistenceManager:
             List of learning events (newest first)
         """
         try:
-            events = []
-            if self.learning_history_file.exists():
-                with open(self.learning_history_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if line.strip():
-                            events.append(json.loads(line.strip()))
-
-            # Sort by timestamp (newest first) and limit
-            events.sort(key=lambda x: x["timestamp"], reverse=True)
-            return events[:limit]
+            # Stream segments backward from the newest event
+            return self.history.newest(limit)
 
         except (ValueError, TypeError, AttributeError) as e:
             print(f"Error: {e}")
@@ -475,9 +434,7 @@ class LearningPersistenceManager:
 
             # Import history events
             if "learning_history" in import_data:
-                with open(self.learning_history_file, "a", encoding="utf-8") as f:
-                    for event in import_data["learning_history"]:
-                        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                self.history.extend(import_data["learning_history"])
 
             self._save_stats()
             return True
@@ -490,6 +447,9 @@ class LearningPersistenceManager:
         """
         Clean up old learning data to prevent disk bloat.
 
+        History is dropped a whole day's segment at a time, so events up to
+        a day older than ``max_age_days`` may be kept.
+
         Args:
             max_age_days: Maximum age of data to keep
 
@@ -498,26 +458,7 @@ class LearningPersistenceManager:
         """
         try:
             cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
-            cleaned_count = 0
-
-            # Clean up learning history
-            if self.learning_history_file.exists():
-                temp_file = self.learning_history_file.with_suffix(".tmp")
-
-                with open(self.learning_history_file, "r", encoding="utf-8") as f_in:
-                    with open(temp_file, "w", encoding="utf-8") as f_out:
-                        for line in f_in:
-                            if line.strip():
-                                event = json.loads(line.strip())
-                                if event["timestamp"] > cutoff_time:
-                                    f_out.write(line)
-                                else:
-                                    cleaned_count += 1
-
-                # Replace original file
-                temp_file.replace(self.learning_history_file)
-
-            return cleaned_count
+            return self.history.drop_before(cutoff_time)
 
         except (ValueError, TypeError, AttributeError) as e:
             print(f"Error: {e}")
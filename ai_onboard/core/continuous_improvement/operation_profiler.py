@@ -0,0 +1,315 @@
+"""
+Operation Profiler - Low-overhead timing for hot operations.
+
+Wrapping an operation in full system snapshots (CPU sampling, process
+enumeration, disk stats) costs hundreds of milliseconds per call. This
+profiler measures only what the operation itself consumed and aggregates it
+in memory, so instrumentation costs microseconds:
+
+- Wall time from ``time.perf_counter_ns`` and thread CPU time from
+  ``time.thread_time_ns``
+- Optional allocation deltas from ``tracemalloc`` (opt-in; tracing slows
+  down every allocation in the process)
+- Per-operation log-linear (HDR-style) histograms with bounded relative error
+  and cheap percentile queries
+- Asynchronous flushing to ``.ai_onboard/operation_profiles.json`` through the
+  shared background scheduler
+"""
+
+import math
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..base import telemetry, utils
+from ..base.background_scheduler import get_background_scheduler
+
+
+class LatencyHistogram:
+    """Sparse log-linear histogram of non-negative integer values.
+
+    Values below ``2 ** significant_bits`` are recorded exactly; larger values
+    keep their top ``significant_bits`` bits, bounding the relative error to
+    ``2 ** -significant_bits`` (about 1.6% with the default of 6).
+    """
+
+    __slots__ = ("significant_bits", "counts", "count", "total", "min", "max")
+
+    def __init__(self, significant_bits: int = 6):
+        self.significant_bits = significant_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _bucket(self, value: int) -> int:
+        shift = value.bit_length() - self.significant_bits
+        if shift <= 0:
+            return value
+        return (value >> shift) << shift
+
+    def _bucket_midpoint(self, bucket: int) -> float:
+        shift = bucket.bit_length() - self.significant_bits
+        if shift <= 0:
+            return float(bucket)
+        return bucket + ((1 << shift) - 1) / 2.0
+
+    def record(self, value: int) -> None:
+        value = max(0, int(value))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, n in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Approximate value at percentile ``q`` (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, min(self.count, math.ceil(q / 100.0 * self.count)))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                value = self._bucket_midpoint(bucket)
+                return float(min(max(value, self.min or 0), self.max or value))
+        return float(self.max or 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": {str(k): v for k, v in sorted(self.counts.items())},
+        }
+
+
+class OperationStats:
+    """Aggregated measurements for one operation name."""
+
+    __slots__ = ("errors", "wall_ns", "cpu_ns", "alloc_bytes")
+
+    def __init__(self) -> None:
+        self.errors = 0
+        self.wall_ns = LatencyHistogram()
+        self.cpu_ns = LatencyHistogram()
+        self.alloc_bytes: Optional[LatencyHistogram] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "count": self.wall_ns.count,
+            "errors": self.errors,
+            "wall_ns": self.wall_ns.to_dict(),
+            "cpu_ns": self.cpu_ns.to_dict(),
+        }
+        if self.alloc_bytes is not None:
+            data["alloc_bytes"] = self.alloc_bytes.to_dict()
+        return data
+
+
+class ProfileScope:
+    """Context manager measuring a single operation."""
+
+    __slots__ = (
+        "_profiler",
+        "operation_name",
+        "wall_ns",
+        "cpu_ns",
+        "alloc_bytes",
+        "_wall_start",
+        "_cpu_start",
+        "_mem_start",
+    )
+
+    def __init__(self, profiler: "OperationProfiler", operation_name: str):
+        self._profiler = profiler
+        self.operation_name = operation_name
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.alloc_bytes: Optional[int] = None
+        self._mem_start: Optional[int] = None
+
+    def __enter__(self) -> "ProfileScope":
+        if self._profiler.trace_memory:
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+        self._cpu_start = time.thread_time_ns()
+        self._wall_start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.wall_ns = time.perf_counter_ns() - self._wall_start
+        self.cpu_ns = time.thread_time_ns() - self._cpu_start
+        if self._mem_start is not None and tracemalloc.is_tracing():
+            self.alloc_bytes = max(
+                0, tracemalloc.get_traced_memory()[0] - self._mem_start
+            )
+        self._profiler.record(
+            self.operation_name,
+            self.wall_ns,
+            self.cpu_ns,
+            alloc_bytes=self.alloc_bytes,
+            failed=exc_type is not None,
+        )
+        return False
+
+
+class OperationProfiler:
+    """Aggregates per-operation timings and flushes them in the background."""
+
+    def __init__(
+        self,
+        root: Path,
+        flush_interval: float = 30.0,
+        trace_memory: bool = False,
+    ):
+        self.root = root
+        self.output_path = root / ".ai_onboard" / "operation_profiles.json"
+        self.flush_interval = flush_interval
+        self.trace_memory = False
+        self._stats: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_job_id: Optional[str] = None
+        self._started_tracemalloc = False
+        if trace_memory:
+            self.enable_memory_tracing()
+
+    def enable_memory_tracing(self) -> None:
+        """Record allocation deltas (starts ``tracemalloc`` if needed)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.trace_memory = True
+
+    def disable_memory_tracing(self) -> None:
+        self.trace_memory = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def profile(self, operation_name: str) -> ProfileScope:
+        """Return a context manager that measures ``operation_name``."""
+        return ProfileScope(self, operation_name)
+
+    def record(
+        self,
+        operation_name: str,
+        wall_ns: int,
+        cpu_ns: int,
+        alloc_bytes: Optional[int] = None,
+        failed: bool = False,
+    ) -> None:
+        """Add one measurement to the operation's histograms."""
+        with self._lock:
+            stats = self._stats.get(operation_name)
+            if stats is None:
+                stats = self._stats[operation_name] = OperationStats()
+            stats.wall_ns.record(wall_ns)
+            stats.cpu_ns.record(cpu_ns)
+            if alloc_bytes is not None:
+                if stats.alloc_bytes is None:
+                    stats.alloc_bytes = LatencyHistogram()
+                stats.alloc_bytes.record(alloc_bytes)
+            if failed:
+                stats.errors += 1
+            self._dirty = True
+            if self._flush_job_id is None and self.flush_interval > 0:
+                self._flush_job_id = f"operation-profiler:{id(self)}"
+                get_background_scheduler().schedule_periodic(
+                    self._flush_job_id, self.flush, self.flush_interval
+                )
+
+    def get_stats(self, operation_name: Optional[str] = None) -> Dict[str, Any]:
+        """Return aggregated stats for one operation or all of them."""
+        with self._lock:
+            if operation_name is not None:
+                stats = self._stats.get(operation_name)
+                return stats.to_dict() if stats else {}
+            return {name: s.to_dict() for name, s in self._stats.items()}
+
+    def operation_names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._dirty = False
+
+    def flush(self) -> bool:
+        """Write aggregated stats to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            snapshot = {name: s.to_dict() for name, s in self._stats.items()}
+            self._dirty = False
+
+        try:
+            utils.write_json(
+                self.output_path,
+                {"updated_at": utils.now_iso(), "operations": snapshot},
+            )
+            return True
+        except Exception as e:
+            with self._lock:
+                self._dirty = True
+            telemetry.log_event("operation_profile_flush_error", error=str(e))
+            return False
+
+    def close(self) -> None:
+        """Cancel background flushing and write any pending stats."""
+        with self._lock:
+            job_id = self._flush_job_id
+            self._flush_job_id = None
+        if job_id is not None:
+            get_background_scheduler().cancel(job_id)
+        self.flush()
+        self.disable_memory_tracing()
+
+
+# Profilers are shared per project root so repeated optimizer instances
+# aggregate into the same histograms.
+_profilers: Dict[str, OperationProfiler] = {}
+_profilers_lock = threading.Lock()
+
+
+def get_operation_profiler(
+    root: Path, flush_interval: float = 30.0, trace_memory: bool = False
+) -> OperationProfiler:
+    """Get the operation profiler for a project root."""
+    key = str(Path(root).resolve())
+    with _profilers_lock:
+        profiler = _profilers.get(key)
+        if profiler is None:
+            profiler = OperationProfiler(
+                root, flush_interval=flush_interval, trace_memory=trace_memory
+            )
+            _profilers[key] = profiler
+        elif trace_memory and not profiler.trace_memory:
+            profiler.enable_memory_tracing()
+        return profiler
@@ -28,6 +28,7 @@ except Exception:  # pragma: no cover - fallback when not installed
 
 from ..base import telemetry, utils
 from . import continuous_improvement_system
+from .operation_profiler import get_operation_profiler
 
 
 class OptimizationType(Enum):
@@ -161,6 +162,15 @@ class PerformanceOptimizer:
         self._load_performance_profiles()
         self._load_optimization_opportunities()
 
+        # Per-operation profiling
+        profiling = self.optimization_config.get("operation_profiling", {})
+        self.operation_profiling_mode = profiling.get("mode", "lightweight")
+        self.operation_profiler = get_operation_profiler(
+            root,
+            flush_interval=profiling.get("flush_interval", 30.0),
+            trace_memory=profiling.get("trace_memory", False),
+        )
+
     def _ensure_directories(self) -> None:
         """Ensure all required directories exist."""
         for path in [
@@ -191,6 +201,13 @@ class PerformanceOptimizer:
                     "cache_hit_rate",
                     "error_rate",
                 ],
+                # "lightweight" aggregates per-call timings in memory;
+                # "snapshot" captures full system snapshots around each call
+                "operation_profiling": {
+                    "mode": "lightweight",
+                    "trace_memory": False,
+                    "flush_interval": 30.0,
+                },
                 "optimization_priorities": {
                     "memory_optimization": 8,
                     "cpu_optimization": 7,
@@ -514,7 +531,40 @@ class PerformanceOptimizer:
     def monitor_operation(
         self, operation_name: str, operation_id: Optional[str] = None
     ) -> Generator[None, None, None]:
-        """Context manager for monitoring specific operations."""
+        """Context manager for monitoring specific operations.
+
+        In the default lightweight mode only the operation's own wall time,
+        thread CPU time and (if enabled) allocations are measured and
+        aggregated by ``operation_profiler``; set ``operation_profiling.mode``
+        to ``"snapshot"`` for full system snapshots around each call.
+        """
+        if self.operation_profiling_mode == "snapshot":
+            with self._monitor_operation_with_snapshots(operation_name, operation_id):
+                yield
+            return
+
+        scope = self.operation_profiler.profile(operation_name)
+        try:
+            with scope:
+                yield
+        finally:
+            metrics = {
+                PerformanceMetric.EXECUTION_TIME: scope.wall_ns / 1e9,
+                PerformanceMetric.CPU_USAGE: (
+                    scope.cpu_ns / scope.wall_ns * 100.0 if scope.wall_ns else 0.0
+                ),
+            }
+            if scope.alloc_bytes is not None:
+                metrics[PerformanceMetric.MEMORY_USAGE] = scope.alloc_bytes / (
+                    1024 * 1024
+                )
+            self._update_operation_profile(operation_name, metrics)
+
+    @contextmanager
+    def _monitor_operation_with_snapshots(
+        self, operation_name: str, operation_id: Optional[str] = None
+    ) -> Generator[None, None, None]:
+        """Monitor an operation with full system snapshots before and after."""
         start_time = time.time()
         start_snapshot = self._capture_performance_snapshot()
         start_snapshot.operation_id = operation_id
@@ -558,6 +608,12 @@ class PerformanceOptimizer:
                 cpu_delta=cpu_delta,
             )
 
+    def get_operation_stats(
+        self, operation_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Latency/CPU histograms collected by ``monitor_operation``."""
+        return self.operation_profiler.get_stats(operation_name)
+
     def _update_operation_profile(
         self, operation_name: str, metrics: Dict[PerformanceMetric, float]
     ) -> None:
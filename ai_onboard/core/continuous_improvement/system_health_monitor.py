@@ -11,7 +11,6 @@ This module provides intelligent system health monitoring that:
 """
 
 import json
-import statistics
 import threading
 import time
 from collections import deque
@@ -29,6 +28,7 @@ except Exception:  # pragma: no cover - fallback when not installed
 
 from ..base import telemetry, utils
 from . import continuous_improvement_system
+from .health_history import CpuSampler, HealthHistory
 
 
 class HealthStatus(Enum):
@@ -172,6 +172,11 @@ class SystemHealthMonitor:
         self.health_config = self._load_health_config()
         self.health_thresholds = self._get_health_thresholds()
 
+        # Tiered health history for summaries (raw hour, minute day, hour month)
+        # and non-blocking CPU sampling
+        self.health_history = HealthHistory()
+        self._cpu_sampler = CpuSampler(psutil)
+
         # Component health tracking
         self.component_health: Dict[str, float] = {}
         self.component_last_check: Dict[str, datetime] = {}
@@ -328,7 +333,7 @@ class SystemHealthMonitor:
             try:
                 # Capture health snapshot
                 snapshot = self._capture_health_snapshot()
-                self.health_snapshots.append(snapshot)
+                self._record_snapshot(snapshot)
 
                 # Analyze health
                 self._analyze_health(snapshot)
@@ -346,6 +351,22 @@ class SystemHealthMonitor:
                 telemetry.log_event("health_monitoring_error", error=str(e))
                 time.sleep(self.health_config["monitoring_interval"])
 
+    def _record_snapshot(self, snapshot: SystemHealthSnapshot) -> None:
+        """Add a snapshot to the recent snapshots and the health history."""
+        timestamp = snapshot.timestamp.timestamp()
+        self.health_history.add(
+            timestamp,
+            snapshot.health_score,
+            snapshot.overall_status.value,
+            len(snapshot.active_issues),
+        )
+
+        # Full snapshots are only kept for the raw tier's window
+        self.health_snapshots.append(snapshot)
+        horizon = timestamp - self.health_history.raw_seconds
+        while self.health_snapshots[0].timestamp.timestamp() < horizon:
+            self.health_snapshots.popleft()
+
     def _capture_health_snapshot(self) -> SystemHealthSnapshot:
         """Capture a comprehensive system health snapshot."""
         timestamp = datetime.now()
@@ -353,8 +374,8 @@ class SystemHealthMonitor:
 
         # System resource metrics
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous capture, without blocking
+            cpu_percent = self._cpu_sampler.sample()
             metrics[HealthMetric.CPU_USAGE] = HealthMetricValue(
                 metric=HealthMetric.CPU_USAGE,
                 value=cpu_percent,
@@ -905,28 +926,17 @@ class SystemHealthMonitor:
         """Get system health summary for the last N hours."""
         cutoff_time = datetime.now() - timedelta(hours=hours)
 
-        # Filter recent snapshots
-        recent_snapshots = [
-            snapshot
-            for snapshot in self.health_snapshots
-            if snapshot.timestamp >= cutoff_time
-        ]
+        # Aggregate from the health history rollups
+        rollup = self.health_history.summarize(cutoff_time.timestamp())
 
-        if not recent_snapshots:
+        if not rollup.count:
             return {
                 "status": "no_data",
                 "message": f"No health data for the last {hours} hours",
             }
 
-        # Calculate summary statistics
-        health_scores = [snapshot.health_score for snapshot in recent_snapshots]
-        status_counts: Dict[str, int] = {}
-        for snapshot in recent_snapshots:
-            status = snapshot.overall_status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
-
         # Count issues
-        total_issues = sum(len(snapshot.active_issues) for snapshot in recent_snapshots)
+        total_issues = rollup.issue_count
         resolved_issues = sum(
             1
             for issue in self.active_issues
@@ -944,11 +954,11 @@ class SystemHealthMonitor:
         return {
             "status": "success",
             "period_hours": hours,
-            "total_snapshots": len(recent_snapshots),
-            "avg_health_score": statistics.mean(health_scores),
-            "min_health_score": min(health_scores),
-            "max_health_score": max(health_scores),
-            "status_distribution": status_counts,
+            "total_snapshots": rollup.count,
+            "avg_health_score": rollup.mean,
+            "min_health_score": rollup.score_min,
+            "max_health_score": rollup.score_max,
+            "status_distribution": dict(rollup.status_counts),
             "total_issues": total_issues,
             "resolved_issues": resolved_issues,
             "self_healing_actions": len(recent_actions),
@@ -956,14 +966,8 @@ class SystemHealthMonitor:
             "healing_success_rate": (
                 successful_actions / len(recent_actions) if recent_actions else 0
             ),
-            "current_health_score": (
-                recent_snapshots[-1].health_score if recent_snapshots else 0
-            ),
-            "current_status": (
-                recent_snapshots[-1].overall_status.value
-                if recent_snapshots
-                else "unknown"
-            ),
+            "current_health_score": rollup.last_score,
+            "current_status": rollup.last_status,
         }
 
     def get_active_issues(self) -> List[Dict[str, Any]]:
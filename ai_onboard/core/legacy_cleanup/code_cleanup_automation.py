@@ -6,18 +6,23 @@ with comprehensive validation and rollback capabilities.
 """
 
 import ast
+import os
 import re
-import subprocess
-import sys
+import shutil
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ..quality_safety.code_quality_analyzer import (
     CodeQualityAnalysisResult,
     CodeQualityAnalyzer,
     CodeQualityIssue,
 )
+from ..quality_safety.incremental_validator import (
+    IncrementalValidator,
+    ValidationReport,
+)
 
 
 @dataclass
@@ -30,6 +35,8 @@ class CleanupResult:
     backups_created: List[str] = field(default_factory=list)
     validation_passed: bool = False
     errors: List[str] = field(default_factory=list)
+    validation_errors: List[str] = field(default_factory=list)
+    modules_validated: List[str] = field(default_factory=list)
     rollback_available: bool = True
 
 
@@ -43,6 +50,7 @@ class ImportStatement:
     module_name: str
     imported_names: List[str] = field(default_factory=list)
     alias: Optional[str] = None
+    end_line_number: Optional[int] = None
 
 
 class AutomatedCodeCleanup:
@@ -50,12 +58,16 @@ class AutomatedCodeCleanup:
     Automated system for safe removal of dead code and unused imports.
 
     Uses risk-based approach with comprehensive validation and rollback.
+    Edits are planned in memory, compiled before they are written, applied
+    as one batch and validated incrementally: only the modified files and
+    the modules that import them are checked.
     """
 
-    def __init__(self, root_path: Path):
+    def __init__(self, root_path: Path, deep_validation: bool = False):
         self.root_path = root_path
         self.backup_dir = root_path / ".ai_onboard" / "backups" / "code_cleanup"
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.validator = IncrementalValidator(root_path, deep=deep_validation)
 
     def remove_unused_imports(
         self, analysis_result: CodeQualityAnalysisResult, dry_run: bool = True
@@ -92,7 +104,8 @@ class AutomatedCodeCleanup:
                 issues_by_file[issue.file_path] = []
             issues_by_file[issue.file_path].append(issue)
 
-        # Process each file
+        # Plan every rewrite in memory first: path -> (original, new source)
+        rewrites: Dict[Path, Tuple[str, str]] = {}
         for file_path_str, file_issues in issues_by_file.items():
             try:
                 file_path = Path(file_path_str)
@@ -100,13 +113,12 @@ class AutomatedCodeCleanup:
                     result.errors.append(f"File not found: {file_path}")
                     continue
 
-                # Create backup if not dry run
-                if not dry_run:
-                    backup_path = self._create_backup(file_path)
-                    result.backups_created.append(str(backup_path))
+                source = file_path.read_text(encoding="utf-8")
 
                 # Parse the file and extract import statements
-                import_statements = self._extract_import_statements(file_path)
+                import_statements = self._extract_import_statements(
+                    file_path, source
+                )
 
                 # Find unused imports in this file
                 unused_in_file = []
@@ -120,25 +132,41 @@ class AutomatedCodeCleanup:
                             unused_in_file.append(import_stmt)
                             break
 
-                # Count files that would be modified (for both dry run and actual run)
-                if unused_in_file:
-                    result.files_modified += 1
-                    print(
-                        f"  📄 {file_path.name}: {len(unused_in_file)} unused imports"
-                    )
+                if not unused_in_file:
+                    continue
 
-                    if not dry_run:
-                        # Remove the unused imports
-                        self._remove_unused_imports_from_file(file_path, unused_in_file)
+                new_source = self._without_imports(source, unused_in_file)
+                error = self.validator.check_source(file_path, new_source)
+                if error is not None:
+                    # Leave files alone when the edit would not compile
+                    result.errors.append(f"Skipped {file_path}: {error}")
+                    continue
 
-                    result.issues_resolved += len(unused_in_file)
+                # Count files that would be modified (for both dry run and actual run)
+                result.files_modified += 1
+                result.issues_resolved += len(unused_in_file)
+                print(f"  📄 {file_path.name}: {len(unused_in_file)} unused imports")
+                rewrites[file_path] = (source, new_source)
 
             except Exception as e:
                 result.errors.append(f"Error processing {file_path_str}: {str(e)}")
 
-        # Validate changes if not dry run
-        if not dry_run and result.files_modified > 0:
-            result.validation_passed = self._validate_changes()
+        # Apply and validate changes if not dry run
+        if not dry_run and rewrites:
+            try:
+                result.backups_created = [
+                    str(path) for path in self._create_batch_backup(list(rewrites))
+                ]
+                self._apply_rewrites(rewrites)
+            except OSError as e:
+                result.errors.append(f"Error applying changes: {e}")
+                result.files_modified = 0
+                result.issues_resolved = 0
+            else:
+                report = self._validate_changes(list(rewrites))
+                result.validation_passed = report.passed
+                result.validation_errors = report.errors
+                result.modules_validated = report.modules_checked
         else:
             result.validation_passed = True  # Dry run always "passes"
 
@@ -146,18 +174,20 @@ class AutomatedCodeCleanup:
 
         return result
 
-    def _extract_import_statements(self, file_path: Path) -> List[ImportStatement]:
+    def _extract_import_statements(
+        self, file_path: Path, source: Optional[str] = None
+    ) -> List[ImportStatement]:
         """Extract all import statements from a Python file."""
 
         statements = []
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            if source is None:
+                source = file_path.read_text(encoding="utf-8")
+            lines = source.splitlines(keepends=True)
 
             # Parse the AST to find import statements
-            source_code = "".join(lines)
-            tree = ast.parse(source_code, filename=str(file_path))
+            tree = ast.parse(source, filename=str(file_path))
 
             for node in ast.walk(tree):
                 if isinstance(node, ast.Import):
@@ -169,6 +199,7 @@ class AutomatedCodeCleanup:
                             import_type="import",
                             module_name=alias.name,
                             alias=alias.asname,
+                            end_line_number=getattr(node, "end_lineno", None),
                         )
                         statements.append(stmt)
 
@@ -181,6 +212,7 @@ class AutomatedCodeCleanup:
                         import_type="from",
                         module_name=node.module or "",
                         imported_names=imported_names,
+                        end_line_number=getattr(node, "end_lineno", None),
                     )
                     statements.append(stmt)
 
@@ -264,63 +296,97 @@ class AutomatedCodeCleanup:
             )
             return module_match or name_match
 
+    def _without_imports(
+        self, source: str, unused_imports: List[ImportStatement]
+    ) -> str:
+        """Source with the lines of unused import statements removed."""
+
+        lines = source.splitlines(keepends=True)
+
+        # Statements on the same line are removed once; multi-line imports
+        # are removed through their last line
+        removed = set()
+        for import_stmt in unused_imports:
+            end = import_stmt.end_line_number or import_stmt.line_number
+            removed.update(range(import_stmt.line_number - 1, end))
+
+        return "".join(line for i, line in enumerate(lines) if i not in removed)
+
     def _remove_unused_imports_from_file(
         self, file_path: Path, unused_imports: List[ImportStatement]
     ) -> None:
         """Remove unused import statements from a file."""
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        source = file_path.read_text(encoding="utf-8")
+        new_source = self._without_imports(source, unused_imports)
+        self._apply_rewrites({file_path: (source, new_source)})
 
-        # Sort by line number in reverse order to avoid index shifting
-        unused_imports.sort(key=lambda x: x.line_number, reverse=True)
+    def _apply_rewrites(self, rewrites: Dict[Path, Tuple[str, str]]) -> None:
+        """
+        Write a batch of rewrites all or nothing.
 
-        for import_stmt in unused_imports:
-            line_idx = import_stmt.line_number - 1  # Convert to 0-based indexing
-            if 0 <= line_idx < len(lines):
-                # Remove the line
-                lines.pop(line_idx)
+        Every new version is staged next to its file before any file is
+        replaced, so a failure while writing leaves all files untouched; a
+        failure while replacing restores the files already replaced.
+        """
 
-        # Write back the file
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+        staged: List[Tuple[Path, Path]] = []
+        try:
+            for file_path, (_, new_source) in rewrites.items():
+                tmp = file_path.with_name(f".{file_path.name}.{os.getpid()}.cleanup")
+                with open(tmp, "w", encoding="utf-8", newline="") as f:
+                    f.write(new_source)
+                shutil.copymode(file_path, tmp)
+                staged.append((file_path, tmp))
+        except OSError:
+            for _, tmp in staged:
+                tmp.unlink(missing_ok=True)
+            raise
+
+        replaced: List[Path] = []
+        try:
+            for file_path, tmp in staged:
+                os.replace(tmp, file_path)
+                replaced.append(file_path)
+        except OSError:
+            for file_path in replaced:
+                with open(file_path, "w", encoding="utf-8", newline="") as f:
+                    f.write(rewrites[file_path][0])
+            for _, tmp in staged:
+                tmp.unlink(missing_ok=True)
+            raise
 
     def _create_backup(self, file_path: Path) -> Path:
         """Create a backup of the file before modification."""
 
-        import datetime
-
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self._create_batch_backup([file_path])[0]
 
-        # Create backup filename
-        backup_name = f"{file_path.name}.{timestamp}.backup"
-        backup_path = self.backup_dir / backup_name
+    def _create_batch_backup(self, files: List[Path]) -> List[Path]:
+        """Back up a batch of files into one timestamped directory."""
 
-        # Copy the file
-        import shutil
-
-        shutil.copy2(file_path, backup_path)
-
-        return backup_path
-
-    def _validate_changes(self) -> bool:
+        batch_dir = self.backup_dir / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        root = Path(os.path.abspath(self.root_path))
+        backups = []
+        for file_path in files:
+            # Keep the project layout so files with the same name do not clash
+            absolute = Path(os.path.abspath(file_path))
+            try:
+                relative = absolute.relative_to(root)
+            except ValueError:
+                relative = Path(absolute.name)
+            backup_path = batch_dir / relative
+            backup_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(absolute, backup_path)
+            backups.append(backup_path)
+        return backups
+
+    def _validate_changes(self, modified_files: List[Path]) -> ValidationReport:
         """Validate that changes don't break the codebase."""
 
         try:
-            # Run a basic syntax check on modified Python files
-
-            # Simple validation: try to import the main module
-            result = subprocess.run(
-                [sys.executable, "-c", "import ai_onboard"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            return result.returncode == 0
-
-        except Exception:
-            return False
+            return self.validator.validate(modified_files)
+        except Exception as e:
+            return ValidationReport(passed=False, errors=[f"Validation failed: {e}"])
 
     def remove_simple_dead_functions(
         self, analysis_result: CodeQualityAnalysisResult, dry_run: bool = True
@@ -355,7 +421,10 @@ class AutomatedCodeCleanup:
 
 
 def run_automated_cleanup(
-    root_path: Path, cleanup_type: str = "unused_imports", dry_run: bool = True
+    root_path: Path,
+    cleanup_type: str = "unused_imports",
+    dry_run: bool = True,
+    deep_validation: bool = False,
 ) -> CleanupResult:
     """
     Run automated code cleanup.
@@ -364,6 +433,7 @@ def run_automated_cleanup(
         root_path: Root directory of the project
         cleanup_type: Type of cleanup ('unused_imports', 'dead_functions', 'all')
         dry_run: If True, analyze but don't make changes
+        deep_validation: Also import affected modules in a validation worker
 
     Returns:
         CleanupResult with operation details
@@ -374,7 +444,7 @@ def run_automated_cleanup(
     analysis_result = analyzer.analyze_codebase()
 
     # Initialize cleanup system
-    cleanup = AutomatedCodeCleanup(root_path)
+    cleanup = AutomatedCodeCleanup(root_path, deep_validation=deep_validation)
 
     if cleanup_type == "unused_imports" or cleanup_type == "all":
         print("🧹 Starting automated unused import removal...")
@@ -389,6 +459,12 @@ def run_automated_cleanup(
                 f"✅ Removed {result.issues_resolved} unused imports from {result.files_modified} files"
             )
             print(f"📁 Backups created: {len(result.backups_created)}")
+            print(
+                f"🔎 Validated {len(result.modules_validated)} affected modules: "
+                f"{'passed' if result.validation_passed else 'failed'}"
+            )
+            for error in result.validation_errors:
+                print(f"  • {error}")
 
         return result
 
@@ -423,11 +499,18 @@ if __name__ == "__main__":
     parser.add_argument(
         "--dry-run", action="store_true", help="Analyze but don't make changes"
     )
+    parser.add_argument(
+        "--deep-validation",
+        action="store_true",
+        help="Also import affected modules in a warm validation worker",
+    )
 
     args = parser.parse_args()
 
     root_path = Path(args.path)
-    result = run_automated_cleanup(root_path, args.type, args.dry_run)
+    result = run_automated_cleanup(
+        root_path, args.type, args.dry_run, args.deep_validation
+    )
 
     if result.errors:
         print("❌ Errors during cleanup:")
@@ -2,13 +2,157 @@
 Smart Debugger: Self - improving debugging system that learns from past issues.
 """
 
-import json
+import os
 import re
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Set, Tuple
+
+from ..base import serialization, utils
+
+# Patterns score at most 0.3 + 0.2 + 0.1 without a matching error type, so
+# only patterns of the error's own type can pass the match threshold
+MATCH_THRESHOLD = 0.7
+
+
+@lru_cache(maxsize=4096)
+def _compile_pattern(pattern: str) -> Optional[Pattern[str]]:
+    """Compile a case-insensitive pattern; None when it is not a valid regex."""
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except (re.error, TypeError):
+        return None
+
+
+def _compile_all(patterns: Any) -> Tuple[Pattern[str], ...]:
+    if not isinstance(patterns, list):
+        return ()
+    compiled = (_compile_pattern(p) for p in patterns if isinstance(p, str))
+    return tuple(regex for regex in compiled if regex is not None)
+
+
+class CompiledPatternIndex:
+    """Debugging patterns compiled once and bucketed by error type.
+
+    The patterns file is reloaded when its size or modification time
+    changes; it is checked at most every ``check_interval`` seconds, and
+    immediately after ``invalidate``.
+    """
+
+    def __init__(self, path: Path, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked_at = float("-inf")
+        # error type -> [(pattern, message regexes, context regexes, bonus)]
+        self._buckets: Dict[Any, List[Tuple[Dict[str, Any], tuple, tuple, float]]] = {}
+        self.stats = {"loads": 0, "scored": 0}
+
+    def invalidate(self) -> None:
+        """Check the file again on the next lookup."""
+        with self._lock:
+            self._checked_at = float("-inf")
+
+    def _current_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        signature = self._current_signature()
+        if signature == self._signature and self.stats["loads"]:
+            return
+        self._signature = signature
+        data = serialization.load_file(self.path) if signature else None
+        patterns = data.get("patterns", []) if isinstance(data, dict) else []
+        buckets: Dict[Any, List[Tuple[Dict[str, Any], tuple, tuple, float]]] = {}
+        for pattern in patterns if isinstance(patterns, list) else []:
+            if not isinstance(pattern, dict) or "id" not in pattern:
+                continue
+            error_type = pattern.get("error_type")
+            try:
+                bonus = float(pattern.get("success_rate", 0.5)) * 0.1
+                hash(error_type)
+            except (TypeError, ValueError):
+                continue
+            buckets.setdefault(error_type, []).append(
+                (
+                    pattern,
+                    _compile_all(pattern.get("message_patterns", [])),
+                    _compile_all(pattern.get("context_patterns", [])),
+                    bonus,
+                )
+            )
+        self._buckets = buckets
+        self.stats["loads"] += 1
+
+    def best_match(
+        self, error_type: Any, error_message: Any, threshold: float = MATCH_THRESHOLD
+    ) -> Optional[Dict[str, Any]]:
+        """The highest scoring pattern above ``threshold``, if any."""
+        return self.best_matches([(error_type, error_message)], threshold)[0]
+
+    def best_matches(
+        self,
+        errors: Sequence[Tuple[Any, Any]],
+        threshold: float = MATCH_THRESHOLD,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Score a batch of (error type, message) pairs against one snapshot."""
+        with self._lock:
+            self._refresh()
+            buckets = self._buckets
+        matches: List[Optional[Dict[str, Any]]] = []
+        scored = 0
+        for error_type, error_message in errors:
+            try:
+                bucket = buckets.get(error_type, ())
+            except TypeError:
+                bucket = ()
+            message = str(error_message)
+            best_match = None
+            best_confidence = 0.0
+            for pattern, message_regexes, context_regexes, bonus in bucket:
+                confidence = 0.4 + bonus
+                if any(regex.search(message) for regex in message_regexes):
+                    confidence += 0.3
+                if any(regex.search(message) for regex in context_regexes):
+                    confidence += 0.2
+                confidence = min(confidence, 1.0)
+                if confidence > best_confidence and confidence > threshold:
+                    best_confidence = confidence
+                    best_match = {
+                        "pattern_id": pattern["id"],
+                        "confidence": confidence,
+                        "pattern": pattern,
+                    }
+            scored += len(bucket)
+            matches.append(best_match)
+        self.stats["scored"] += scored
+        return matches
+
 
-from ..base import utils
+_pattern_indexes: Dict[str, CompiledPatternIndex] = {}
+_pattern_indexes_lock = threading.Lock()
+
+
+def get_pattern_index(path: Path) -> CompiledPatternIndex:
+    """Get the shared compiled index of a patterns file."""
+    key = os.path.abspath(path)
+    with _pattern_indexes_lock:
+        index = _pattern_indexes.get(key)
+        if index is None:
+            index = _pattern_indexes[key] = CompiledPatternIndex(path)
+        return index
 
 
 class SmartDebugger:
@@ -20,53 +164,91 @@ class SmartDebugger:
         self.patterns_path = root / ".ai_onboard" / "debug_patterns.json"
         self.solutions_path = root / ".ai_onboard" / "debug_solutions.json"
         self.learning_path = root / ".ai_onboard" / "debug_learning.json"
+        self.learning_sessions_path = (
+            root / ".ai_onboard" / "debug_learning_sessions.jsonl"
+        )
         self.pattern_database_path = root / ".ai_onboard" / "pattern_database.json"
         self.confidence_model_path = root / ".ai_onboard" / "confidence_model.json"
+        self.pattern_index = get_pattern_index(self.patterns_path)
+
+        # Sessions read so far from the append-only session log
+        self._sessions: List[Dict[str, Any]] = []
+        self._sessions_offset = 0
 
         # Initialize enhanced debugging components
         self._initialize_enhanced_debugging()
 
     def analyze_error(self, error_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze an error and provide smart debugging insights."""
-        # Extract error information
-        error_type = error_data.get("type", "unknown")
-        error_message = error_data.get("message", "")
-        error_data.get("context", {})
+        return self.analyze_errors([error_data])[0]
 
+    def analyze_errors(
+        self, errors: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Analyze a batch of errors, logging all of their sessions at once."""
         # Check for known patterns
-        pattern_match = self._find_pattern_match(error_type, error_message)
+        pattern_matches = self.pattern_index.best_matches(
+            [
+                (error_data.get("type", "unknown"), error_data.get("message", ""))
+                for error_data in errors
+            ]
+        )
 
-        if pattern_match:
-            # Use known solution
-            solution = self._get_solution(pattern_match["pattern_id"])
-            confidence = pattern_match["confidence"]
-            approach = "pattern_match"
-        else:
-            # Generate new analysis
-            analysis = self._generate_analysis(error_data)
-            solution = analysis["solution"]
-            confidence = analysis["confidence"]
-            approach = "generated"
+        results = []
+        log_entries = []
+        sessions = []
+        for error_data, pattern_match in zip(errors, pattern_matches):
+            if pattern_match:
+                # Use known solution
+                solution = self._get_solution(pattern_match["pattern_id"])
+                confidence = pattern_match["confidence"]
+                approach = "pattern_match"
+            else:
+                # Generate new analysis
+                analysis = self._generate_analysis(error_data)
+                solution = analysis["solution"]
+                confidence = analysis["confidence"]
+                approach = "generated"
+
+            # Log the debugging session and learn from it
+            log_entries.append(
+                self._debug_log_entry(error_data, solution, confidence, approach)
+            )
+            sessions.append(
+                {
+                    "ts": utils.now_iso(),
+                    "error_data": error_data,
+                    "solution": solution,
+                    "confidence": confidence,
+                    "success": None,  # Will be updated when user provides feedback
+                }
+            )
 
-        # Log the debugging session
-        self._log_debug_session(error_data, solution, confidence, approach)
+            results.append(
+                {
+                    "solution": solution,
+                    "confidence": confidence,
+                    "approach": approach,
+                    "pattern_id": (
+                        pattern_match["pattern_id"] if pattern_match else None
+                    ),
+                    "debugging_steps": self._generate_debugging_steps(
+                        error_data, solution
+                    ),
+                    "prevention_tips": self._generate_prevention_tips(error_data),
+                    "enhanced_analysis": self._perform_enhanced_analysis(error_data),
+                    "alternative_solutions": self._generate_alternative_solutions(
+                        error_data, solution
+                    ),
+                    "contextual_insights": self._extract_contextual_insights(
+                        error_data
+                    ),
+                }
+            )
 
-        # Learn from this session
-        self._learn_from_session(error_data, solution, confidence)
-
-        return {
-            "solution": solution,
-            "confidence": confidence,
-            "approach": approach,
-            "pattern_id": pattern_match["pattern_id"] if pattern_match else None,
-            "debugging_steps": self._generate_debugging_steps(error_data, solution),
-            "prevention_tips": self._generate_prevention_tips(error_data),
-            "enhanced_analysis": self._perform_enhanced_analysis(error_data),
-            "alternative_solutions": self._generate_alternative_solutions(
-                error_data, solution
-            ),
-            "contextual_insights": self._extract_contextual_insights(error_data),
-        }
+        self._append_lines(self.debug_log_path, log_entries)
+        self._append_lines(self.learning_sessions_path, sessions)
+        return results
 
     def improve_patterns(self) -> Dict[str, Any]:
         """Improve debugging patterns based on learning data."""
@@ -148,24 +330,7 @@ class SmartDebugger:
         self, error_type: str, error_message: str
     ) -> Optional[Dict[str, Any]]:
         """Find a matching pattern for the error."""
-        patterns = self._load_patterns()
-
-        best_match = None
-        best_confidence = 0.0
-
-        for pattern in patterns.get("patterns", []):
-            confidence = self._calculate_pattern_confidence(
-                pattern, error_type, error_message
-            )
-            if confidence > best_confidence and confidence > 0.7:  # Threshold
-                best_confidence = confidence
-                best_match = {
-                    "pattern_id": pattern["id"],
-                    "confidence": confidence,
-                    "pattern": pattern,
-                }
-
-        return best_match
+        return self.pattern_index.best_match(error_type, error_message)
 
     def _calculate_pattern_confidence(
         self, pattern: Dict[str, Any], error_type: str, error_message: str
@@ -178,18 +343,15 @@ class SmartDebugger:
             confidence += 0.4
 
         # Message pattern matching
-        message_patterns = pattern.get("message_patterns", [])
-        for msg_pattern in message_patterns:
-            if re.search(msg_pattern, error_message, re.IGNORECASE):
-                confidence += 0.3
-                break
+        message = str(error_message)
+        message_patterns = _compile_all(pattern.get("message_patterns", []))
+        if any(regex.search(message) for regex in message_patterns):
+            confidence += 0.3
 
         # Context matching
-        context_patterns = pattern.get("context_patterns", [])
-        for ctx_pattern in context_patterns:
-            if re.search(ctx_pattern, str(error_message), re.IGNORECASE):
-                confidence += 0.2
-                break
+        context_patterns = _compile_all(pattern.get("context_patterns", []))
+        if any(regex.search(message) for regex in context_patterns):
+            confidence += 0.2
 
         # Historical success rate
         success_rate = pattern.get("success_rate", 0.5)
@@ -316,16 +478,14 @@ class SmartDebugger:
 
         return tips
 
-    def _log_debug_session(
+    def _debug_log_entry(
         self,
         error_data: Dict[str, Any],
         solution: Dict[str, Any],
         confidence: float,
         approach: str,
-    ) -> None:
-        """Log a debugging session for learning."""
-        utils.ensure_dir(self.debug_log_path.parent)
-        entry = {
+    ) -> Dict[str, Any]:
+        return {
             "ts": utils.now_iso(),
             "error_data": error_data,
             "solution": solution,
@@ -333,16 +493,36 @@ class SmartDebugger:
             "approach": approach,
             "success": None,  # Will be updated later
         }
-        with open(self.debug_log_path, "a", encoding="utf-8") as f:
-            json.dump(entry, f)
-            f.write("\n")
+
+    def _append_lines(self, path: Path, records: List[Dict[str, Any]]) -> None:
+        """Append records as JSON lines with a single write."""
+        if not records:
+            return
+        utils.ensure_dir(path.parent)
+        payload = b"".join(serialization.dumps(record) + b"\n" for record in records)
+        try:
+            with open(path, "ab") as f:
+                f.write(payload)
+        except OSError as e:
+            print(f"Warning: Failed to append to {path}: {e}")
+
+    def _log_debug_session(
+        self,
+        error_data: Dict[str, Any],
+        solution: Dict[str, Any],
+        confidence: float,
+        approach: str,
+    ) -> None:
+        """Log a debugging session for learning."""
+        self._append_lines(
+            self.debug_log_path,
+            [self._debug_log_entry(error_data, solution, confidence, approach)],
+        )
 
     def _learn_from_session(
         self, error_data: Dict[str, Any], solution: Dict[str, Any], confidence: float
     ) -> None:
         """Learn from a debugging session."""
-        learning_data = self._load_learning_data()
-
         session = {
             "ts": utils.now_iso(),
             "error_data": error_data,
@@ -350,12 +530,7 @@ class SmartDebugger:
             "confidence": confidence,
             "success": None,  # Will be updated when user provides feedback
         }
-
-        if "sessions" not in learning_data:
-            learning_data["sessions"] = []
-
-        learning_data["sessions"].append(session)
-        self._save_learning_data(learning_data)
+        self._append_lines(self.learning_sessions_path, [session])
 
     def _extract_pattern(
         self, error_data: Dict[str, Any], solution: Dict[str, Any]
@@ -487,7 +662,8 @@ class SmartDebugger:
 
     def _save_patterns(self, patterns: Dict[str, Any]) -> None:
         """Save debugging patterns."""
-        utils.write_json(self.patterns_path, patterns)
+        utils.write_json(self.patterns_path, patterns, compact=True)
+        self.pattern_index.invalidate()
 
     def _load_solutions(self) -> Dict[str, Any]:
         """Load debugging solutions."""
@@ -495,15 +671,52 @@ class SmartDebugger:
         return data if isinstance(data, dict) else {"solutions": {}}
 
     def _load_learning_data(self) -> Dict[str, Any]:
-        """Load learning data."""
+        """Load learning data.
+
+        Sessions stored in the learning file are followed by the sessions
+        appended to the session log since.
+        """
         data = utils.read_json(
             self.learning_path, default={"sessions": [], "improvements": []}
         )
-        return data if isinstance(data, dict) else {"sessions": [], "improvements": []}
+        if not isinstance(data, dict):
+            data = {"sessions": [], "improvements": []}
+        sessions = data.get("sessions", [])
+        appended = self._load_appended_sessions()
+        if appended:
+            sessions = (sessions if isinstance(sessions, list) else []) + appended
+        return {**data, "sessions": sessions}
+
+    def _load_appended_sessions(self) -> List[Dict[str, Any]]:
+        """Sessions from the append-only log, reading only new lines."""
+        try:
+            size = self.learning_sessions_path.stat().st_size
+        except OSError:
+            size = 0
+        if size < self._sessions_offset:
+            # The log was truncated or replaced; read it again
+            self._sessions = []
+            self._sessions_offset = 0
+        if size > self._sessions_offset:
+            try:
+                with open(self.learning_sessions_path, "rb") as f:
+                    f.seek(self._sessions_offset)
+                    chunk = f.read(size - self._sessions_offset)
+            except OSError:
+                chunk = b""
+            # Leave a partially written last line for the next read
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            self._sessions.extend(
+                session
+                for session in serialization.load_lines(complete)
+                if isinstance(session, dict)
+            )
+            self._sessions_offset += len(complete)
+        return list(self._sessions)
 
     def _save_learning_data(self, learning_data: Dict[str, Any]) -> None:
         """Save learning data."""
-        utils.write_json(self.learning_path, learning_data)
+        utils.write_json(self.learning_path, learning_data, compact=True)
 
     def _initialize_enhanced_debugging(self) -> None:
         """Initialize enhanced debugging components."""
@@ -517,12 +730,12 @@ class SmartDebugger:
         # Initialize pattern database if it doesn't exist
         if not self.pattern_database_path.exists():
             initial_patterns = self._create_initial_pattern_database()
-            utils.write_json(self.pattern_database_path, initial_patterns)
+            utils.write_json(self.pattern_database_path, initial_patterns, compact=True)
 
         # Initialize confidence model if it doesn't exist
         if not self.confidence_model_path.exists():
             initial_model = self._create_initial_confidence_model()
-            utils.write_json(self.confidence_model_path, initial_model)
+            utils.write_json(self.confidence_model_path, initial_model, compact=True)
 
     def _create_initial_pattern_database(self) -> Dict[str, Any]:
         """Create initial pattern database with common error patterns."""
@@ -1145,7 +1358,7 @@ class SmartDebugger:
             stats["weight_adjustments"] += 1
 
         stats["last_adaptation"] = utils.now_iso()
-        utils.write_json(self.confidence_model_path, model)
+        utils.write_json(self.confidence_model_path, model, compact=True)
 
     def get_enhanced_debugging_stats(self) -> Dict[str, Any]:
         """Get enhanced debugging statistics including new metrics."""
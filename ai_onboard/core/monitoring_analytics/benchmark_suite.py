@@ -0,0 +1,808 @@
+"""
+Benchmark Suite - Reproducible scale benchmarks on synthetic repositories.
+
+The performance tests time a handful of operations against whatever tree
+they happen to run in, so their numbers cannot be compared between
+machines or over time. The benchmark suite instead:
+
+- Generates deterministic synthetic repositories: a seed, a file count, an
+  import density and a duplicate ratio determine every byte written
+- Generates JSONL telemetry histories of a chosen length
+- Times the main analyzers, ``SystemIntegrator.process_agent_operation``,
+  the metrics collector and CLI startup against them
+- Stores results as JSON and compares two runs, flagging cases that got
+  slower by more than a noise threshold
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from ..base import utils
+
+RESULTS_VERSION = 1
+# Outside any project: the analyzers skip paths containing ".ai_onboard"
+DEFAULT_WORKDIR = Path(tempfile.gettempdir()) / "ai_onboard_bench"
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+REPO_MARKER = Path(".ai_onboard") / "synthetic_repo.json"
+FILES_PER_PACKAGE = 100
+# Bodies that duplicates may copy; bounded so 100k-file repos stay cheap
+BODY_POOL_SIZE = 1024
+# Every generated file and directory gets this mtime (2020-01-01 UTC), so
+# repositories match in metadata too and caches keyed on mtimes are warm
+FIXED_MTIME_NS = 1_577_836_800 * 1_000_000_000
+
+DEFAULT_THRESHOLD = 0.10
+# Differences smaller than this are timer noise whatever their ratio
+MIN_DELTA_MS = 1.0
+
+AGENT_OPERATIONS = 100
+COLLECTED_METRICS = 1_000
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    """Shape of a synthetic repository."""
+
+    files: int = 1_000
+    import_density: float = 3.0  # average project imports per module
+    duplicate_ratio: float = 0.1  # share of modules repeating another's body
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        for label, count in SIZES.items():
+            if count == self.files:
+                return label
+        return str(self.files)
+
+
+def parse_size(value: str) -> int:
+    """File count for ``1k``/``10k``/``100k`` or a plain number."""
+    value = value.strip().lower()
+    if value in SIZES:
+        return SIZES[value]
+    try:
+        files = int(value)
+    except ValueError:
+        raise ValueError(
+            f"Unknown size: {value}; use {', '.join(SIZES)} or a file count"
+        ) from None
+    if files < 1:
+        raise ValueError(f"Size must be positive: {value}")
+    return files
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+
+
+def _function_source(rng: random.Random, name: str) -> str:
+    a = rng.randrange(1, 1000)
+    b = rng.randrange(1, 1000)
+    return (
+        f"def {name}(value):\n"
+        f"    total = value * {a}\n"
+        f"    for step in range({b % 7 + 2}):\n"
+        f"        total += step ^ {b}\n"
+        f"    if total > {a * b}:\n"
+        f"        return total - {b}\n"
+        f"    return total\n"
+    )
+
+
+def _module_body(rng: random.Random, index: int) -> str:
+    functions = [_function_source(rng, f"func_{index}_{n}") for n in range(3)]
+    return (
+        "\n\n".join(functions)
+        + f"\n\nclass Model{index}:\n"
+        + f'    """Synthetic model {index}."""\n\n'
+        + "    def __init__(self, value):\n"
+        + "        self.value = value\n\n"
+        + "    def score(self):\n"
+        + f"        return func_{index}_0(self.value) + func_{index}_1(1)\n"
+    )
+
+
+def _onboard(root: Path) -> None:
+    """Complete onboarding so oversight runs its full path, not the gate."""
+    base = root / ".ai_onboard"
+    utils.write_json(
+        base / "charter.json",
+        {
+            "project_name": "synthetic-benchmark",
+            "vision": "Synthetic repository for reproducible benchmarks",
+            "vision_confirmed": True,
+        },
+    )
+    utils.write_json(base / "state.json", {"state": "aligned"})
+    utils.write_json(base / "plan.json", {"milestones": [], "tasks": []})
+
+
+def generate_repository(root: Path, spec: RepoSpec) -> Dict[str, Any]:
+    """Write a synthetic Python project under ``root``.
+
+    Packages of ``FILES_PER_PACKAGE`` files each hold an ``__init__.py`` and
+    modules importing earlier modules, so the import graph is acyclic. A
+    repository completely generated from the same spec is reused as is;
+    ``root`` must otherwise be empty or hold an earlier synthetic repository.
+    Returns a summary of what was written.
+    """
+    marker = root / REPO_MARKER
+    existing = utils.read_json(marker, default=None) if marker.exists() else None
+    if (
+        isinstance(existing, dict)
+        and existing.get("spec") == asdict(spec)
+        and not existing.get("partial")
+    ):
+        return existing
+    if existing is not None:
+        shutil.rmtree(root)
+    elif root.exists() and any(root.iterdir()):
+        raise ValueError(f"Refusing to generate into non-empty directory: {root}")
+    # Marks the tree as ours, so an interrupted generation is replaced later
+    utils.write_json(marker, {"spec": asdict(spec), "partial": True})
+
+    rng = random.Random(spec.seed)
+    modules: List[str] = []
+    bodies: List[str] = []
+    imports = 0
+    duplicates = 0
+    size = 0
+    for index in range(spec.files):
+        package = f"pkg{index // FILES_PER_PACKAGE:04d}"
+        directory = root / package
+        if index % FILES_PER_PACKAGE == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+            source = f'"""Synthetic package {package}."""\n'
+            path = directory / "__init__.py"
+        else:
+            count = int(spec.import_density)
+            if rng.random() < spec.import_density - count:
+                count += 1
+            chosen = rng.sample(modules, min(count, len(modules)))
+            header = [f'"""Synthetic module {index}."""', ""]
+            header += [f"import {name}" for name in sorted(chosen)]
+            imports += len(chosen)
+
+            if bodies and rng.random() < spec.duplicate_ratio:
+                body = rng.choice(bodies)
+                duplicates += 1
+            else:
+                body = _module_body(rng, index)
+                if len(bodies) < BODY_POOL_SIZE:
+                    bodies.append(body)
+                else:
+                    bodies[rng.randrange(BODY_POOL_SIZE)] = body
+            source = "\n".join(header) + "\n\n\n" + body
+            name = f"mod{index:06d}"
+            modules.append(f"{package}.{name}")
+            path = directory / f"{name}.py"
+        path.write_text(source, encoding="utf-8")
+        os.utime(path, ns=(FIXED_MTIME_NS, FIXED_MTIME_NS))
+        size += len(source)
+
+    _onboard(root)
+    # Directories last: writing their files updated their mtimes
+    for directory in sorted(root.glob("pkg*")) + [root]:
+        os.utime(directory, ns=(FIXED_MTIME_NS, FIXED_MTIME_NS))
+    summary = {
+        "spec": asdict(spec),
+        "files": spec.files,
+        "modules": len(modules),
+        "packages": math.ceil(spec.files / FILES_PER_PACKAGE),
+        "imports": imports,
+        "duplicates": duplicates,
+        "bytes": size,
+    }
+    utils.write_json(marker, summary)
+    return summary
+
+
+def reset_state(root: Path) -> None:
+    """Drop the ``.ai_onboard`` state earlier runs left in a repository.
+
+    Caches, learned patterns and preferences would otherwise accumulate from
+    run to run. The directory itself stays, so the repository root keeps
+    its fixed mtime.
+    """
+    base = root / ".ai_onboard"
+    marker = root / REPO_MARKER
+    for entry in base.iterdir():
+        if entry == marker:
+            continue
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+    _onboard(root)
+
+
+def generate_telemetry(root: Path, records: int, seed: int = 0) -> Dict[str, Any]:
+    """Write ``records`` validation runs and unified metrics under ``root``.
+
+    Contents depend only on ``seed`` except timestamps, which are spread
+    over the six days before now so the metrics collector, which keeps a
+    seven-day window in memory, loads every record.
+    """
+    rng = random.Random(seed)
+    base = root / ".ai_onboard"
+    utils.ensure_dir(base)
+    now = datetime.now()
+    step = timedelta(days=6) / max(records, 1)
+    sources = ("system", "performance", "user")
+    categories = ("health", "timing", "interaction")
+
+    with open(base / "metrics.jsonl", "w", encoding="utf-8") as runs, open(
+        base / "unified_metrics.jsonl", "w", encoding="utf-8"
+    ) as metrics:
+        for n in range(records):
+            ts = now - step * (records - n)
+            components = [
+                {
+                    "name": name,
+                    "score": round(rng.random(), 3),
+                    "issue_count": rng.randrange(5),
+                }
+                for name in ("alignment", "charter", "engine")
+            ]
+            run = {
+                "ts": ts.isoformat(timespec="seconds"),
+                "pass": rng.random() > 0.2,
+                "components": components,
+            }
+            runs.write(json.dumps(run, separators=(",", ":")) + "\n")
+
+            kind = n % 3
+            metric = {
+                "id": f"metric_{seed}_{n}",
+                "name": f"bench_metric_{n % 50}",
+                "value": round(rng.random() * 100, 3),
+                "source": sources[kind],
+                "category": categories[kind],
+                "timestamp": ts.isoformat(),
+                "unit": "ms",
+                "dimensions": {"component": f"component_{n % 10}"},
+                "metadata": {},
+            }
+            metrics.write(json.dumps(metric, separators=(",", ":")) + "\n")
+
+    return {"records": records, "seed": seed}
+
+
+# ----------------------------------------------------------------------
+# Cases
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class BenchmarkCase:
+    """One timed operation.
+
+    ``setup`` is entered once per case, outside the timing, and yields the
+    callable timed for every sample. ``reset`` runs untimed before each
+    sample; cold cases use it to drop caches. ``ops`` is the number of
+    operations one sample performs. Cases that are not ``default`` only run
+    when named explicitly.
+    """
+
+    name: str
+    setup: Callable[[Path], ContextManager[Callable[[], Any]]]
+    reset: Optional[Callable[[Path], None]] = None
+    ops: int = 1
+    description: str = ""
+    default: bool = True
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _simple(factory: Callable[[Path], Callable[[], Any]]):
+    @contextlib.contextmanager
+    def setup(root: Path) -> Iterator[Callable[[], Any]]:
+        yield factory(root)
+
+    return setup
+
+
+def _codebase_analyzer(root: Path) -> Callable[[], Any]:
+    from ..vision.codebase_analyzer import CodebaseAnalyzer
+
+    return lambda: CodebaseAnalyzer(root).analyze_codebase_structure()
+
+
+def _import_graph(root: Path) -> Callable[[], Any]:
+    from ..quality_safety.import_graph import ImportGraph
+
+    def run() -> None:
+        graph = ImportGraph(root)
+        graph.refresh()
+        graph.save()
+
+    return run
+
+
+def _dependency_mapper(root: Path) -> Callable[[], Any]:
+    from ..quality_safety.dependency_mapper import DependencyMapper
+
+    return lambda: DependencyMapper(root).analyze_dependencies()
+
+
+def _duplicate_detector(root: Path) -> Callable[[], Any]:
+    from ..quality_safety.duplicate_detector import DuplicateDetector
+
+    return lambda: DuplicateDetector(root).analyze_duplicates()
+
+
+def _code_quality_analyzer(root: Path) -> Callable[[], Any]:
+    from ..quality_safety.code_quality_analyzer import CodeQualityAnalyzer
+
+    return lambda: CodeQualityAnalyzer(root).analyze_codebase()
+
+
+def _file_organization_analyzer(root: Path) -> Callable[[], Any]:
+    from .file_organization_analyzer import FileOrganizationAnalyzer
+
+    return lambda: FileOrganizationAnalyzer(root).analyze_organization()
+
+
+@contextlib.contextmanager
+def _agent_operations(root: Path) -> Iterator[Callable[[], Any]]:
+    from ..ai_integration.system_integrator import SystemIntegrator
+
+    integrator = SystemIntegrator(root)
+    context = {"files": ["pkg0000/mod000001.py"], "description": "edit module"}
+
+    def run() -> None:
+        for _ in range(AGENT_OPERATIONS):
+            integrator.process_agent_operation("bench-agent", "file_edit", context)
+
+    try:
+        yield run
+    finally:
+        integrator.stop_health_monitoring()
+
+
+def _close_collector(collector: Any) -> None:
+    from ..base.background_scheduler import get_background_scheduler
+
+    collector.executor.shutdown(wait=True)
+    get_background_scheduler().cancel(collector.cleanup_job_id)
+
+
+@contextlib.contextmanager
+def _metrics_load(root: Path) -> Iterator[Callable[[], Any]]:
+    from .unified_metrics_collector import UnifiedMetricsCollector
+
+    collectors: List[Any] = []
+    try:
+        yield lambda: collectors.append(UnifiedMetricsCollector(root))
+    finally:
+        for collector in collectors:
+            _close_collector(collector)
+
+
+@contextlib.contextmanager
+def _metrics_collect(root: Path) -> Iterator[Callable[[], Any]]:
+    from .unified_metrics_collector import (
+        MetricCategory,
+        MetricEvent,
+        MetricSource,
+        UnifiedMetricsCollector,
+    )
+
+    collector = UnifiedMetricsCollector(root)
+
+    def run() -> None:
+        collector.batch_collect(
+            [
+                MetricEvent(
+                    name=f"bench_metric_{n % 50}",
+                    value=float(n),
+                    source=MetricSource.PERFORMANCE,
+                    category=MetricCategory.TIMING,
+                    unit="ms",
+                )
+                for n in range(COLLECTED_METRICS)
+            ]
+        )
+
+    try:
+        yield run
+    finally:
+        _close_collector(collector)
+
+
+def _read_metrics(root: Path) -> Callable[[], Any]:
+    from ..base import telemetry
+
+    return lambda: telemetry.read_metrics(root)
+
+
+def _cli_startup(root: Path) -> Callable[[], Any]:
+    # Import this checkout of ai_onboard, whatever the working directory
+    package_parent = str(Path(__file__).resolve().parents[3])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (package_parent, env.get("PYTHONPATH")) if p
+    )
+    command = [sys.executable, "-m", "ai_onboard", "--help"]
+
+    def run() -> None:
+        proc = subprocess.run(
+            command, cwd=root, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            lines = (proc.stderr or proc.stdout).strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"exit {proc.returncode}")
+
+    return run
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase(
+        "codebase_analyzer.cold",
+        _simple(_codebase_analyzer),
+        reset=lambda root: _unlink(root / ".ai_onboard" / "codebase_analysis.json"),
+        description="Codebase structure analysis without its directory cache",
+    ),
+    BenchmarkCase(
+        "codebase_analyzer.warm",
+        _simple(_codebase_analyzer),
+        description="Codebase structure analysis of an unchanged tree",
+    ),
+    BenchmarkCase(
+        "import_graph.cold",
+        _simple(_import_graph),
+        reset=lambda root: _unlink(root / ".ai_onboard" / "import_graph.json"),
+        description="Import graph built from scratch",
+    ),
+    BenchmarkCase(
+        "import_graph.warm",
+        _simple(_import_graph),
+        description="Import graph refreshed from its saved copy",
+    ),
+    BenchmarkCase(
+        "dependency_mapper",
+        _simple(_dependency_mapper),
+        description="Module dependency and cycle analysis",
+    ),
+    BenchmarkCase(
+        "duplicate_detector",
+        _simple(_duplicate_detector),
+        description="Exact, near and structural duplicate detection "
+        "(quadratic in code blocks: minutes at 100 files)",
+        default=False,
+    ),
+    BenchmarkCase(
+        "code_quality_analyzer",
+        _simple(_code_quality_analyzer),
+        description="Unused code and complexity analysis",
+    ),
+    BenchmarkCase(
+        "file_organization_analyzer",
+        _simple(_file_organization_analyzer),
+        description="File organization analysis",
+    ),
+    BenchmarkCase(
+        "system_integrator.process_agent_operation",
+        _agent_operations,
+        ops=AGENT_OPERATIONS,
+        description="Agent operations through every oversight system",
+    ),
+    BenchmarkCase(
+        "metrics_collector.load",
+        _metrics_load,
+        description="Metrics collector start-up over the telemetry history",
+    ),
+    BenchmarkCase(
+        "metrics_collector.batch_collect",
+        _metrics_collect,
+        ops=COLLECTED_METRICS,
+        description="Batch metric collection",
+    ),
+    BenchmarkCase(
+        "telemetry.read_metrics",
+        _simple(_read_metrics),
+        description="Reading the validation run history",
+    ),
+    BenchmarkCase(
+        "cli_startup",
+        _simple(_cli_startup),
+        description="python -m ai_onboard --help in a fresh interpreter",
+    ),
+]
+
+
+def select_cases(
+    only: Optional[List[str]] = None, skip: Optional[List[str]] = None
+) -> List[BenchmarkCase]:
+    """Cases named by ``only`` (default cases if none) minus ``skip``.
+
+    A name also selects its variants: ``import_graph`` matches
+    ``import_graph.cold`` and ``import_graph.warm``.
+    """
+
+    def matches(case: BenchmarkCase, name: str) -> bool:
+        return case.name == name or case.name.startswith(name + ".")
+
+    requested = list(only or []) + list(skip or [])
+    unknown = [n for n in requested if not any(matches(c, n) for c in CASES)]
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmark(s): {', '.join(unknown)}; "
+            f"available: {', '.join(c.name for c in CASES)}"
+        )
+    return [
+        case
+        for case in CASES
+        if (any(matches(case, n) for n in only) if only else case.default)
+        and not any(matches(case, n) for n in skip or [])
+    ]
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+
+
+@contextlib.contextmanager
+def _in_directory(path: Path) -> Iterator[None]:
+    # Several systems resolve .ai_onboard against the working directory
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _summarize(samples: List[float], ops: int) -> Dict[str, Any]:
+    median = statistics.median(samples)
+    result: Dict[str, Any] = {
+        "status": "ok",
+        "samples_ms": [round(s, 3) for s in samples],
+        "median_ms": round(median, 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+    if ops > 1:
+        result["ops"] = ops
+        result["per_op_ms"] = round(median / ops, 4)
+    return result
+
+
+def run_case(
+    case: BenchmarkCase, root: Path, repeat: int = 3, warmup: int = 1
+) -> Dict[str, Any]:
+    """Time ``case`` against ``root``; output of the code under test is muted."""
+    samples: List[float] = []
+    try:
+        with _in_directory(root), contextlib.redirect_stdout(io.StringIO()):
+            with case.setup(root) as func:
+                for n in range(warmup + repeat):
+                    if case.reset:
+                        case.reset(root)
+                    started = time.perf_counter()
+                    func()
+                    elapsed = (time.perf_counter() - started) * 1000
+                    if n >= warmup:
+                        samples.append(elapsed)
+    except Exception as e:
+        return {
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "samples_ms": [round(s, 3) for s in samples],
+        }
+    return _summarize(samples, case.ops)
+
+
+def environment() -> Dict[str, Any]:
+    """The interpreter and machine a run was taken on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _check_workdir(workdir: Path) -> None:
+    """Reject a workdir in which the analyzers would skip every file."""
+    from ..quality_safety.dependency_mapper import DependencyMapper
+
+    # The analyzers match exclusions anywhere in the absolute path
+    probe = str(workdir / "repo" / "pkg0000" / "mod000001.py")
+    if DependencyMapper(workdir)._is_excluded(probe):
+        raise ValueError(
+            f"Analyzers exclude every file under {workdir}; choose a workdir "
+            f"whose path avoids .ai_onboard, build, dist and env"
+        )
+
+
+def run_suite(
+    workdir: Path,
+    specs: List[RepoSpec],
+    telemetry_records: int = 10_000,
+    repeat: int = 3,
+    warmup: int = 1,
+    only: Optional[List[str]] = None,
+    skip: Optional[List[str]] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Generate (or reuse) a repository per spec and time every case on it.
+
+    ``progress`` is called with each result key and result as it finishes.
+    Results are keyed ``case[size]``, e.g. ``duplicate_detector[10k]``.
+    """
+    cases = select_cases(only, skip)
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    workdir = Path(os.path.abspath(workdir))
+    _check_workdir(workdir)
+    report: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "created": utils.now_iso(),
+        "environment": environment(),
+        "config": {
+            "telemetry_records": telemetry_records,
+            "repeat": repeat,
+            "warmup": warmup,
+        },
+        "repos": {},
+        "results": {},
+    }
+    for spec in specs:
+        root = workdir / f"repo_{spec.name}_seed{spec.seed}"
+        started = time.perf_counter()
+        summary = generate_repository(root, spec)
+        reset_state(root)
+        generate_telemetry(root, telemetry_records, seed=spec.seed)
+        report["repos"][spec.name] = dict(
+            summary, generate_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+        for case in cases:
+            key = f"{case.name}[{spec.name}]"
+            result = run_case(case, root, repeat=repeat, warmup=warmup)
+            report["results"][key] = result
+            if progress:
+                progress(key, result)
+    return report
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+
+def save_results(report: Dict[str, Any], path: Path) -> Path:
+    """Write a run's results as indented JSON."""
+    utils.ensure_dir(path.parent)
+    utils.write_json(path, report)
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """Read results written by ``save_results``."""
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if not isinstance(report, dict) or report.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Not a benchmark results file: {path}")
+    return report
+
+
+def latest_results(directory: Path, exclude: Optional[Path] = None) -> Optional[Path]:
+    """Most recently written results file in ``directory``."""
+    if not directory.is_dir():
+        return None
+    candidates = [
+        p
+        for p in directory.glob("*.json")
+        if exclude is None or p.resolve() != exclude.resolve()
+    ]
+    return max(candidates, key=lambda p: p.stat().st_mtime_ns, default=None)
+
+
+def _spread(result: Dict[str, Any]) -> float:
+    """Relative range of a result's samples, its own measure of noise."""
+    samples = result.get("samples_ms") or []
+    median = result.get("median_ms") or 0.0
+    if len(samples) < 2 or median <= 0:
+        return 0.0
+    return (max(samples) - min(samples)) / median
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> List[Dict[str, Any]]:
+    """Compare two runs case by case.
+
+    Cases are compared on their fastest sample: every case is deterministic
+    work, so slower samples measure interference from the rest of the
+    machine. A case regresses when that time grew by more than
+    ``min_delta_ms`` and by a larger fraction than its noise: ``threshold``
+    or, when larger, the relative spread of either run's samples.
+
+    Statuses are ``regression``, ``improvement`` and ``unchanged``;
+    ``failed`` when the current run failed; ``new`` when the baseline has
+    no successful result; ``missing`` when the current run lacks the case.
+    """
+    before = baseline.get("results", {})
+    after = current.get("results", {})
+    comparisons: List[Dict[str, Any]] = []
+    for key in sorted(set(before) | set(after)):
+        old = before.get(key)
+        new = after.get(key)
+        entry: Dict[str, Any] = {"case": key}
+        if new is None:
+            entry["status"] = "missing"
+        elif old is None:
+            entry["status"] = "new"
+        elif new.get("status") != "ok":
+            entry["status"] = "failed"
+            entry["error"] = new.get("error")
+        elif old.get("status") != "ok":
+            entry["status"] = "new"
+        else:
+            old_ms = old["min_ms"]
+            new_ms = new["min_ms"]
+            noise = max(threshold, _spread(old), _spread(new))
+            change = (new_ms - old_ms) / old_ms if old_ms > 0 else 0.0
+            if new_ms - old_ms > min_delta_ms and change > noise:
+                entry["status"] = "regression"
+            elif old_ms - new_ms > min_delta_ms and -change > noise:
+                entry["status"] = "improvement"
+            else:
+                entry["status"] = "unchanged"
+            entry.update(
+                baseline_ms=old_ms,
+                current_ms=new_ms,
+                change=round(change, 4),
+                noise=round(noise, 4),
+            )
+        comparisons.append(entry)
+    return comparisons
+
+
+def environment_differences(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> List[str]:
+    """Describe what differs between the runs' environments and repositories."""
+    notes = []
+    old_env = baseline.get("environment", {})
+    new_env = current.get("environment", {})
+    for key in sorted(set(old_env) | set(new_env)):
+        if old_env.get(key) != new_env.get(key):
+            notes.append(f"{key}: {old_env.get(key)} -> {new_env.get(key)}")
+    old_repos = baseline.get("repos", {})
+    for name, repo in current.get("repos", {}).items():
+        old_spec = old_repos.get(name, {}).get("spec")
+        if old_spec is not None and old_spec != repo.get("spec"):
+            notes.append(f"repository {name}: spec {old_spec} -> {repo.get('spec')}")
+    if baseline.get("config") != current.get("config"):
+        notes.append(f"config: {baseline.get('config')} -> {current.get('config')}")
+    return notes
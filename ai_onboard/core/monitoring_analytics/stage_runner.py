@@ -0,0 +1,218 @@
+"""
+Stage Runner - Concurrent execution of dependent stages with timeouts.
+
+Validation gathers several independent, mostly I/O-bound reports. Running
+them one after another made its latency the sum of every stage. The stage
+runner:
+
+- Starts each stage on its own thread as soon as its dependencies finish
+- Bounds each stage by a timeout; a stage that fails or times out leaves
+  its default value, and stages that depend on it are skipped
+- Records the wall and CPU time of every stage, and a trace span per stage
+  under the caller's span
+- Selects stages with ``only`` (which pulls in their dependencies) and
+  ``skip`` (which also skips their dependents)
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..base.tracing import span
+
+
+@dataclass
+class Stage:
+    """A unit of work; ``func`` receives the values of its dependencies."""
+
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    default: Any = None
+
+
+@dataclass
+class StageResult:
+    """Outcome and timing of one stage."""
+
+    name: str
+    status: str  # "ok", "failed", "timeout" or "skipped"
+    value: Any = None
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "status": self.status,
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+def _execute(stage: Stage, inputs: Dict[str, Any], done: "queue.Queue") -> None:
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        with span(f"stage.{stage.name}", category="stage"):
+            value = stage.func(inputs)
+        status, error = "ok", None
+    except Exception as e:
+        value = stage.default
+        status, error = "failed", f"{type(e).__name__}: {e}"
+    done.put(
+        StageResult(
+            name=stage.name,
+            status=status,
+            value=value,
+            wall_ms=(time.perf_counter() - started) * 1000,
+            cpu_ms=(time.thread_time() - cpu_started) * 1000,
+            error=error,
+        )
+    )
+
+
+class StageRunner:
+    """Runs a set of stages concurrently in dependency order."""
+
+    def __init__(
+        self, stages: Iterable[Stage], default_timeout: Optional[float] = 60.0
+    ):
+        self.default_timeout = default_timeout
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(
+                        f"Stage {stage.name} depends on unknown stage {dependency}"
+                    )
+
+    def _closure(self, names: Iterable[str], edges: Dict[str, Set[str]]) -> Set[str]:
+        closed: Set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in closed:
+                closed.add(name)
+                pending.extend(edges.get(name, ()))
+        return closed
+
+    def select(
+        self,
+        only: Optional[Iterable[str]] = None,
+        skip: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Names of the stages that would run, in declaration order."""
+        only = list(only or [])
+        skip = list(skip or [])
+        unknown = [name for name in only + skip if name not in self.stages]
+        if unknown:
+            raise ValueError(
+                f"Unknown stage(s): {', '.join(unknown)}; "
+                f"available: {', '.join(self.stages)}"
+            )
+
+        dependencies = {name: set(s.depends_on) for name, s in self.stages.items()}
+        dependents: Dict[str, Set[str]] = {name: set() for name in self.stages}
+        for name, stage in self.stages.items():
+            for dependency in stage.depends_on:
+                dependents[dependency].add(name)
+
+        selected = self._closure(only, dependencies) if only else set(self.stages)
+        selected -= self._closure(skip, dependents)
+        return [name for name in self.stages if name in selected]
+
+    def run(
+        self,
+        only: Optional[Iterable[str]] = None,
+        skip: Optional[Iterable[str]] = None,
+    ) -> Dict[str, StageResult]:
+        """Run the selected stages; returns a result for every stage."""
+        selected = self.select(only, skip)
+        results: Dict[str, StageResult] = {
+            name: StageResult(name, "skipped", stage.default)
+            for name, stage in self.stages.items()
+            if name not in selected
+        }
+        pending = list(selected)
+        # Stage name -> (deadline or None, start time)
+        running: Dict[str, Tuple[Optional[float], float]] = {}
+        done: "queue.Queue[StageResult]" = queue.Queue()
+
+        while pending or running:
+            started_any = True
+            while started_any:
+                started_any = False
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(d not in results for d in stage.depends_on):
+                        continue
+                    pending.remove(name)
+                    started_any = True
+                    failed = [
+                        d for d in stage.depends_on if results[d].status != "ok"
+                    ]
+                    if failed:
+                        results[name] = StageResult(
+                            name,
+                            "skipped",
+                            stage.default,
+                            error=f"Dependency {failed[0]} {results[failed[0]].status}",
+                        )
+                        continue
+                    inputs = {d: results[d].value for d in stage.depends_on}
+                    timeout = (
+                        stage.timeout
+                        if stage.timeout is not None
+                        else self.default_timeout
+                    )
+                    now = time.perf_counter()
+                    running[name] = (now + timeout if timeout else None, now)
+                    # Daemon threads: a stage that never returns cannot hold
+                    # up interpreter exit. Each runs in a copy of this context
+                    # so its span nests under the caller's.
+                    threading.Thread(
+                        target=contextvars.copy_context().run,
+                        args=(_execute, stage, inputs, done),
+                        name=f"stage-{name}",
+                        daemon=True,
+                    ).start()
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle among: {', '.join(pending)}")
+                break
+
+            deadlines = [d for d, _ in running.values() if d is not None]
+            wait = max(min(deadlines) - time.perf_counter(), 0) if deadlines else None
+            try:
+                result = done.get(timeout=wait)
+            except queue.Empty:
+                now = time.perf_counter()
+                for name, (deadline, started) in list(running.items()):
+                    if deadline is not None and deadline <= now:
+                        del running[name]
+                        results[name] = StageResult(
+                            name,
+                            "timeout",
+                            self.stages[name].default,
+                            wall_ms=(now - started) * 1000,
+                            error="Stage timed out",
+                        )
+                continue
+            if result.name in running:
+                del running[result.name]
+                results[result.name] = result
+
+        return {name: results[name] for name in self.stages}
@@ -21,6 +21,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from ..base import telemetry, utils
+from ..base.background_scheduler import get_background_scheduler
 
 
 class MetricSource(Enum):
@@ -648,44 +649,43 @@ class UnifiedMetricsCollector:
 
     def _start_background_processing(self):
         """Start background processing tasks."""
+        # Periodic cleanup of old hot storage data (every hour) on the shared
+        # scheduler rather than a dedicated sleeping thread
+        self.cleanup_job_id = get_background_scheduler().schedule_periodic(
+            f"metrics_hot_storage_cleanup:{id(self)}",
+            self._run_hot_storage_cleanup,
+            3600.0,
+        )
 
-        # Periodic cleanup of old hot storage data
+    def _run_hot_storage_cleanup(self):
+        """Scheduler entry point for hot storage cleanup."""
+        try:
+            self._cleanup_hot_storage()
+        except Exception as e:
+            telemetry.log_event("cleanup_error", error=str(e))
 
-        def cleanup_hot_storage():
-            cutoff_time = datetime.now() - timedelta(
-                days=self.config.get("hot_storage_days", 7)
-            )
+    def _cleanup_hot_storage(self):
+        """Drop metrics older than the hot storage window from memory."""
+        cutoff_time = datetime.now() - timedelta(
+            days=self.config.get("hot_storage_days", 7)
+        )
 
-            with self.processing_lock:
-                # Remove old metrics from hot storage
-                self.hot_metrics = deque(
-                    [m for m in self.hot_metrics if m.timestamp > cutoff_time],
-                    maxlen=self.hot_metrics.maxlen,
-                )
+        with self.processing_lock:
+            # Remove old metrics from hot storage
+            self.hot_metrics = deque(
+                [m for m in self.hot_metrics if m.timestamp > cutoff_time],
+                maxlen=self.hot_metrics.maxlen,
+            )
 
-                # Clean up metric index
-                for metric_name in list(self.metric_index.keys()):
-                    self.metric_index[metric_name] = [
-                        m
-                        for m in self.metric_index[metric_name]
-                        if m.timestamp > cutoff_time
-                    ]
-                    if not self.metric_index[metric_name]:
-                        del self.metric_index[metric_name]
-
-        # Schedule periodic cleanup (every hour)
-        import threading
-
-        def periodic_cleanup():
-            while True:
-                time.sleep(3600)  # 1 hour
-                try:
-                    cleanup_hot_storage()
-                except Exception as e:
-                    telemetry.log_event("cleanup_error", error=str(e))
-
-        cleanup_thread = threading.Thread(target=periodic_cleanup, daemon=True)
-        cleanup_thread.start()
+            # Clean up metric index
+            for metric_name in list(self.metric_index.keys()):
+                self.metric_index[metric_name] = [
+                    m
+                    for m in self.metric_index[metric_name]
+                    if m.timestamp > cutoff_time
+                ]
+                if not self.metric_index[metric_name]:
+                    del self.metric_index[metric_name]
 
 
 # Global instance
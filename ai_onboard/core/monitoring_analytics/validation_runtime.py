@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional
 
 from ..base import telemetry
+from ..base.tracing import traced
 from ..legacy_cleanup.charter import load_charter
 
 # Imports moved to vision package
@@ -14,33 +15,77 @@ from ..project_management.unified_project_management import (
     get_unified_project_management_engine,
 )
 from ..vision.alignment import preview
+from .stage_runner import Stage, StageRunner
 
+STAGE_TIMEOUT = 60.0
 
-def run(root: Path) -> Dict[str, Any]:
-    """Run validation, delegating to unified project management engine."""
-    engine = get_unified_project_management_engine(root)
 
-    try:
-        alignment_state = preview(root)
-    except Exception:
-        alignment_state = {}
-    charter_data = load_charter(root)
-    project_status = engine.analytics.get_project_status()
-    wbs_status = engine.wbs.get_status()
-    progress = get_legacy_progress_dashboard(root).generate_dashboard()
+def _stages(root: Path, timeout: Optional[float]) -> List[Stage]:
+    """Validation stages; the report sections only depend on the engine."""
+    return [
+        Stage("alignment", lambda _: preview(root), timeout=timeout, default={}),
+        Stage("charter", lambda _: load_charter(root), timeout=timeout, default={}),
+        Stage(
+            "engine",
+            lambda _: get_unified_project_management_engine(root),
+            timeout=timeout,
+        ),
+        Stage(
+            "project_status",
+            lambda deps: deps["engine"].analytics.get_project_status(),
+            depends_on=("engine",),
+            timeout=timeout,
+            default={},
+        ),
+        Stage(
+            "wbs_status",
+            lambda deps: deps["engine"].wbs.get_status(),
+            depends_on=("engine",),
+            timeout=timeout,
+            default={},
+        ),
+        Stage(
+            "progress",
+            lambda _: get_legacy_progress_dashboard(root).generate_dashboard(),
+            timeout=timeout,
+            default={},
+        ),
+    ]
+
+
+STAGES = ("alignment", "charter", "engine", "project_status", "wbs_status", "progress")
+
+
+@traced("validation_runtime.run")
+def run(
+    root: Path,
+    only: Optional[Iterable[str]] = None,
+    skip: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = STAGE_TIMEOUT,
+) -> Dict[str, Any]:
+    """Run validation, delegating to unified project management engine.
+
+    Independent stages run concurrently; ``only`` and ``skip`` select stages
+    by name (see ``STAGES``). Stages that fail, time out or are not selected
+    leave an empty section in the report.
+    """
+    results = StageRunner(_stages(root, timeout), default_timeout=timeout).run(
+        only=only, skip=skip
+    )
 
     report: Dict[str, Any] = {
-        "alignment": alignment_state,
-        "charter": charter_data,
-        "project_status": project_status,
-        "wbs_status": wbs_status,
-        "progress": progress,
+        "alignment": results["alignment"].value,
+        "charter": results["charter"].value,
+        "project_status": results["project_status"].value,
+        "wbs_status": results["wbs_status"].value,
+        "progress": results["progress"].value,
         "results": [
             {
                 "component": "self_improvement",
                 "prevention_analysis": {"status": "compatibility_mode", "details": []},
             }
         ],
+        "stages": {name: result.to_dict() for name, result in results.items()},
     }
     telemetry.record_run(root, report)
     return report
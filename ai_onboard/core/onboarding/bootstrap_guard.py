@@ -28,7 +28,7 @@ class StageGuidance:
 class BootstrapGuard:
     """Checks onboarding prerequisites and blocks commands until complete."""
 
-    _ALWAYS_ALLOWED: Set[str] = {"help", "version", "quickstart", "doctor"}
+    _ALWAYS_ALLOWED: Set[str] = {"help", "version", "quickstart", "doctor", "bench"}
     _STAGE_ALLOWED: Dict[OnboardingStage, Set[str]] = {
         OnboardingStage.UNINITIALIZED: {
             "charter",
@@ -14,11 +14,11 @@ This module provides intelligent pattern recognition that:
 import re
 import time
 from collections import Counter, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
-from ..base import utils
+from ..base import serialization, utils
 from ..continuous_improvement.learning_persistence import LearningPersistenceManager
 from .tool_usage_tracker import track_tool_usage
 
@@ -192,24 +192,27 @@ class PatternRecognitionSystem:
         if self.patterns_file.exists():
             data = utils.read_json(self.patterns_file, default={})
             for pattern_id, pattern_data in data.items():
-                pattern = ErrorPattern(**pattern_data)
-                self.patterns[pattern_id] = pattern
+                self.patterns[pattern_id] = serialization.structure(
+                    ErrorPattern, pattern_data
+                )
 
     def _load_cli_patterns(self) -> None:
         """Load CLI patterns from file."""
         if self.cli_patterns_file.exists():
             data = utils.read_json(self.cli_patterns_file, default={})
             for pattern_id, pattern_data in data.items():
-                pattern = CLIPattern(**pattern_data)
-                self.cli_patterns[pattern_id] = pattern
+                self.cli_patterns[pattern_id] = serialization.structure(
+                    CLIPattern, pattern_data
+                )
 
     def _load_behavior_patterns(self) -> None:
         """Load behavior patterns from file."""
         if self.behavior_patterns_file.exists():
             data = utils.read_json(self.behavior_patterns_file, default={})
             for pattern_id, pattern_data in data.items():
-                pattern = BehaviorPattern(**pattern_data)
-                self.behavior_patterns[pattern_id] = pattern
+                self.behavior_patterns[pattern_id] = serialization.structure(
+                    BehaviorPattern, pattern_data
+                )
 
     def _save_patterns(self) -> None:
         """Save all patterns (error, CLI, behavior) to disk."""
@@ -236,56 +239,21 @@ class PatternRecognitionSystem:
 
     def _save_error_patterns(self) -> None:
         """Save error patterns to disk."""
-        patterns_data = {}
-        for pattern_id, pattern in self.patterns.items():
-            patterns_data[pattern_id] = {
-                "pattern_id": pattern.pattern_id,
-                "pattern_type": pattern.pattern_type,
-                "signature": pattern.signature,
-                "description": pattern.description,
-                "examples": pattern.examples[-10:],  # Keep last 10 examples
-                "frequency": pattern.frequency,
-                "first_seen": pattern.first_seen,
-                "last_seen": pattern.last_seen,
-                "confidence": pattern.confidence,
-                "prevention_rules": pattern.prevention_rules,
-                "related_patterns": list(pattern.related_patterns),
-            }
-        utils.write_json(self.patterns_file, patterns_data)
+        patterns_data = {
+            pattern_id: replace(pattern, examples=pattern.examples[-10:])
+            for pattern_id, pattern in self.patterns.items()
+        }
+        utils.write_json(self.patterns_file, patterns_data, compact=True)
 
     def _save_cli_patterns(self) -> None:
         """Save CLI patterns to disk."""
-        patterns_data = {}
-        for pattern_id, pattern in self.cli_patterns.items():
-            patterns_data[pattern_id] = {
-                "pattern_id": pattern.pattern_id,
-                "command_sequence": pattern.command_sequence,
-                "success_rate": pattern.success_rate,
-                "frequency": pattern.frequency,
-                "context": pattern.context,
-                "first_seen": pattern.first_seen,
-                "last_seen": pattern.last_seen,
-                "recommendations": pattern.recommendations,
-            }
-        utils.write_json(self.cli_patterns_file, patterns_data)
+        utils.write_json(self.cli_patterns_file, self.cli_patterns, compact=True)
 
     def _save_behavior_patterns(self) -> None:
         """Save behavior patterns to disk."""
-        patterns_data = {}
-        for pattern_id, pattern in self.behavior_patterns.items():
-            patterns_data[pattern_id] = {
-                "pattern_id": pattern.pattern_id,
-                "pattern_type": pattern.pattern_type,
-                "description": pattern.description,
-                "frequency": pattern.frequency,
-                "confidence": pattern.confidence,
-                "triggers": pattern.triggers,
-                "outcomes": pattern.outcomes,
-                "recommendations": pattern.recommendations,
-                "first_seen": pattern.first_seen,
-                "last_seen": pattern.last_seen,
-            }
-        utils.write_json(self.behavior_patterns_file, patterns_data)
+        utils.write_json(
+            self.behavior_patterns_file, self.behavior_patterns, compact=True
+        )
 
     def analyze_error(self, error_data: Dict[str, Any]) -> PatternMatch:
         """
@@ -22,6 +22,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from ..base.tracing import span, traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -742,6 +744,7 @@ class UnifiedToolOrchestrator:
 
         # Background and Optimization triggers
 
+    @traced("orchestrator.orchestrate_tools")
     def orchestrate_tools(
         self,
         user_request: str,
@@ -780,7 +783,8 @@ class UnifiedToolOrchestrator:
         try:
             # Step 1: Initialize tool discovery if needed
             if not self.discovery_result:
-                self.discovery_result = self.discovery.discover_all_tools()
+                with span("orchestrator.discover_tools"):
+                    self.discovery_result = self.discovery.discover_all_tools()
 
             # Step 2: Route to appropriate orchestration approach
             trigger_strategies = [
@@ -796,14 +800,15 @@ class UnifiedToolOrchestrator:
                 UnifiedOrchestrationStrategy.ROLLBACK_SAFE,
             ]
 
-            if strategy in trigger_strategies:
-                result = self._execute_intelligent_orchestration(context)
-            elif strategy in holistic_strategies:
-                result = self._execute_holistic_orchestration(context)
-            elif strategy in session_strategies:
-                result = self._execute_session_orchestration(context)
-            else:  # ADAPTIVE - use intelligent routing
-                result = self._execute_adaptive_orchestration(context)
+            with span("orchestrator.execute", strategy=strategy.value):
+                if strategy in trigger_strategies:
+                    result = self._execute_intelligent_orchestration(context)
+                elif strategy in holistic_strategies:
+                    result = self._execute_holistic_orchestration(context)
+                elif strategy in session_strategies:
+                    result = self._execute_session_orchestration(context)
+                else:  # ADAPTIVE - use intelligent routing
+                    result = self._execute_adaptive_orchestration(context)
 
             result.total_execution_time = time.time() - start_time
             result.success = True
@@ -1164,7 +1169,8 @@ class UnifiedToolOrchestrator:
                 execution_result["error"] = "Handler not implemented"
                 return execution_result
 
-            handler_result = handler(context)
+            with span("orchestrator.tool", tool=tool_name):
+                handler_result = handler(context)
             execution_result["results"] = handler_result
             execution_result["executed"] = True
 
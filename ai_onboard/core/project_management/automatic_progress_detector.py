@@ -6,6 +6,12 @@ This module provides automatic detection of completed work through:
 - File activity monitoring
 - Pattern recognition for task completion
 - Automatic status updates to plan.json
+
+Detection is incremental: the last processed commit is persisted as a
+high-water mark in ``.ai_onboard/progress_detector_state.json`` and only
+``last_sha..HEAD`` is read from git on later runs, streamed line by line.
+Findings from earlier runs are carried forward in the same state file, so the
+cost of a run is proportional to the number of new commits.
 """
 
 import json
@@ -13,17 +19,94 @@ import os
 import re
 import subprocess
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set
 
-from ..base.utils import now_iso
+from ..base.utils import now_iso, read_json, write_json
 from ..orchestration.tool_usage_tracker import track_tool_usage
 
+# Record and field separators for the streamed ``git log`` format
+_RECORD_SEP = "\x1e"
+_FIELD_SEP = "\x1f"
+_GIT_LOG_FORMAT = "--pretty=format:%x1e%H%x1f%s%x1f%an%x1f%ad"
+
+STATE_FILE = "progress_detector_state.json"
+STATE_VERSION = 1
+
+
+def iter_git_log(
+    repo_root: Path, since_sha: Optional[str] = None, with_files: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """Stream commits (newest first) from ``git log``.
+
+    Only ``since_sha..HEAD`` is requested when ``since_sha`` is given. Output
+    is consumed line by line rather than buffered. Raises
+    ``subprocess.CalledProcessError`` if git exits with an error.
+    """
+    cmd = ["git", "log", _GIT_LOG_FORMAT, "--date=iso"]
+    if with_files:
+        cmd.append("--name-only")
+    cmd.append(f"{since_sha}..HEAD" if since_sha else "HEAD")
+
+    proc = subprocess.Popen(
+        cmd,
+        cwd=repo_root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    commit: Optional[Dict[str, Any]] = None
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(_RECORD_SEP):
+                if commit is not None:
+                    yield commit
+                parts = line[1:].split(_FIELD_SEP, 3)
+                if len(parts) != 4:
+                    commit = None
+                    continue
+                commit_hash, subject, author, date = parts
+                commit = {
+                    "hash": commit_hash,
+                    "subject": subject.lower(),
+                    "author": author,
+                    "date": date,
+                    "timestamp": _parse_git_date(date),
+                    "files": [],
+                }
+            elif line.strip() and commit is not None:
+                commit["files"].append(line.strip())
+        if commit is not None:
+            yield commit
+    finally:
+        if proc.stdout is not None:
+            proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def _parse_git_date(date_str: str) -> float:
+    """Parse git date string to timestamp."""
+    try:
+        dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S %z")
+        return dt.timestamp()
+    except ValueError:
+        return time.time()
+
 
 class GitCommitAnalyzer:
     """Analyzes git commits to detect task completion."""
 
+    # Per-commit match cache size (commit subjects never change for a SHA)
+    MATCH_CACHE_SIZE = 4096
+
     def __init__(self, repo_root: Path):
         self.repo_root = repo_root
         self.task_patterns = [
@@ -53,82 +136,70 @@ class GitCommitAnalyzer:
             "update",
             "updated",
         ]
+        self._match_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._compile_patterns()
 
-    def get_recent_commits(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get git commits from the last N hours."""
-        try:
-            # Use a fixed recent date that should capture recent activity
-            # This avoids timezone and date calculation issues
-            recent_date = "2025-10-01"  # Fixed date that should include recent commits
-
-            cmd = [
-                "git",
-                "log",
-                f"--since={recent_date}",
-                "--pretty=format:%H|%s|%an|%ad",
-                "--date=iso",
-            ]
-
-            result = subprocess.run(
-                cmd,
-                cwd=self.repo_root,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            commits = []
-            for line in result.stdout.strip().split("\n"):
-                if "|" in line:
-                    parts = line.split("|", 3)
-                    if len(parts) == 4:
-                        commit_hash, subject, author, date = parts
-                        commits.append(
-                            {
-                                "hash": commit_hash,
-                                "subject": subject.lower(),
-                                "author": author,
-                                "date": date,
-                                "timestamp": self._parse_git_date(date),
-                            }
-                        )
-
-            return commits
+    def _compile_patterns(self) -> None:
+        self._compiled_task_patterns = [
+            re.compile(p, re.IGNORECASE) for p in self.task_patterns
+        ]
+        # Every task pattern needs one of these words; subjects without any
+        # of them skip the per-pattern scans entirely.
+        self._task_prefilter = re.compile(
+            r"task|complete|finish|implement|add", re.IGNORECASE
+        )
+        keywords = sorted(self.completion_keywords, key=len, reverse=True)
+        self._keyword_matcher = re.compile(
+            "|".join(re.escape(k) for k in keywords), re.IGNORECASE
+        )
+        self._task_id_pattern = re.compile(r"(?:task|t)[:_\s]*(\w+)", re.IGNORECASE)
 
+    def get_recent_commits(
+        self, hours: int = 24, since_sha: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get git commits after ``since_sha`` (all reachable commits if None)."""
+        try:
+            return list(iter_git_log(self.repo_root, since_sha, with_files=False))
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            # Debug: print the error for troubleshooting
             print(f"Git log error: {e}")
             return []
 
     def _parse_git_date(self, date_str: str) -> float:
         """Parse git date string to timestamp."""
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S %z")
-            return dt.timestamp()
-        except ValueError:
-            return time.time()
+        return _parse_git_date(date_str)
+
+    def match_commit(self, commit: Dict[str, Any]) -> List[str]:
+        """Return task IDs a single commit marks as completed (cached by SHA)."""
+        commit_hash = commit.get("hash")
+        if commit_hash and commit_hash in self._match_cache:
+            self._match_cache.move_to_end(commit_hash)
+            return self._match_cache[commit_hash]
+
+        subject = commit["subject"]
+        matches: List[str] = []
+
+        # Check for explicit task completion patterns
+        if self._task_prefilter.search(subject):
+            for pattern in self._compiled_task_patterns:
+                matches.extend(pattern.findall(subject))
+
+        # Check for completion keywords that might indicate task completion
+        if self._keyword_matcher.search(subject):
+            # Try to extract task-like identifiers (T1, task_1, etc.)
+            matches.extend(self._task_id_pattern.findall(subject))
+
+        if commit_hash:
+            self._match_cache[commit_hash] = matches
+            if len(self._match_cache) > self.MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        return matches
 
     def detect_task_completions(self, commits: List[Dict[str, Any]]) -> List[str]:
         """Detect task IDs mentioned as completed in commits."""
-        completed_tasks = []
-
+        completed_tasks: Set[str] = set()
         for commit in commits:
-            subject = commit["subject"]
-
-            # Check for explicit task completion patterns
-            for pattern in self.task_patterns:
-                matches = re.findall(pattern, subject, re.IGNORECASE)
-                completed_tasks.extend(matches)
-
-            # Check for completion keywords that might indicate task completion
-            if any(keyword in subject for keyword in self.completion_keywords):
-                # Try to extract task-like identifiers (T1, task_1, etc.)
-                task_matches = re.findall(
-                    r"(?:task|t)[:_\s]*(\w+)", subject, re.IGNORECASE
-                )
-                completed_tasks.extend(task_matches)
-
-        return list(set(completed_tasks))  # Remove duplicates
+            completed_tasks.update(self.match_commit(commit))
+        return list(completed_tasks)
 
 
 class FileActivityMonitor:
@@ -148,64 +219,39 @@ class FileActivityMonitor:
             "T18": ["interface", "ui", "ux"],
             "T19": ["experience", "enhancement"],
         }
+        self._task_matchers = {
+            task_id: re.compile("|".join(re.escape(p) for p in patterns))
+            for task_id, patterns in self.task_file_patterns.items()
+        }
 
-    def get_recent_file_changes(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get recently modified files."""
+    def get_recent_file_changes(
+        self, hours: int = 24, since_sha: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get files changed by commits after ``since_sha``."""
         try:
-            # Use the same fixed recent date
-            recent_date = "2025-10-01"
-            since_timestamp = datetime.now().timestamp()
-
-            changes = []
-            result = subprocess.run(
-                [
-                    "git",
-                    "log",
-                    f"--since={recent_date}",
-                    "--name-only",
-                    "--pretty=format:",
-                ],
-                cwd=self.repo_root,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            current_commit = None
-            for line in result.stdout.strip().split("\n"):
-                if not line.strip():
-                    continue
-
-                # If line looks like a filename, add to current commit
-                if "/" in line or "." in line:
-                    changes.append(
-                        {
-                            "file": line.strip(),
-                            "commit": current_commit,
-                            "timestamp": since_timestamp,
-                        }
-                    )
-                else:
-                    current_commit = line.strip()
-
-            return changes
-
+            return [
+                {"file": f, "commit": commit["hash"], "timestamp": commit["timestamp"]}
+                for commit in iter_git_log(self.repo_root, since_sha)
+                for f in commit["files"]
+            ]
         except (subprocess.CalledProcessError, FileNotFoundError):
             return []
 
+    def match_file(self, filename: str) -> List[str]:
+        """Return the tasks whose patterns match ``filename``."""
+        filename = filename.lower()
+        return [
+            task_id
+            for task_id, matcher in self._task_matchers.items()
+            if matcher.search(filename)
+        ]
+
     def detect_task_activity(self, file_changes: List[Dict[str, Any]]) -> List[str]:
         """Detect which tasks are likely active based on file changes."""
-        active_tasks = []
-
+        active_tasks: Set[str] = set()
         for change in file_changes:
-            filename = change["file"].lower()
-
-            # Check each task's file patterns
-            for task_id, patterns in self.task_file_patterns.items():
-                if any(pattern in filename for pattern in patterns):
-                    active_tasks.append(task_id)
-
-        return list(set(active_tasks))  # Remove duplicates
+            active_tasks.update(self.match_file(change["file"]))
+        return list(active_tasks)
 
 
 class AutomaticProgressDetector:
@@ -216,32 +262,117 @@ class AutomaticProgressDetector:
         self.git_analyzer = GitCommitAnalyzer(repo_root)
         self.file_monitor = FileActivityMonitor(repo_root)
         self.plan_file = repo_root / ".ai_onboard" / "project_plan.json"
+        self.state_file = repo_root / ".ai_onboard" / STATE_FILE
+        self._likely_completed_matcher = re.compile("complete|done|finish|implement")
 
-    def detect_completed_work(self, hours: int = 72) -> Dict[str, Any]:
-        """Detect completed work from git and file activity."""
-        start_time = time.time()
+    def _load_state(self) -> Dict[str, Any]:
+        state = read_json(self.state_file, default=None)
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            return self._empty_state()
+        return state
 
-        # Get recent commits (use longer time range for better detection)
-        commits = self.git_analyzer.get_recent_commits(hours)
+    @staticmethod
+    def _empty_state() -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "last_sha": None,
+            "commits_processed": 0,
+            "files_processed": 0,
+            "commit_completions": [],
+            "active_tasks": [],
+            "completion_keyword_seen": False,
+        }
 
-        # Get recent file changes
-        file_changes = self.file_monitor.get_recent_file_changes(hours)
+    def _scan(self, since_sha: Optional[str]) -> Dict[str, Any]:
+        """Stream commits after ``since_sha`` and collect their findings."""
+        completions: Set[str] = set()
+        active: Set[str] = set()
+        keyword_seen = False
+        head_sha = None
+        commits = files = 0
+
+        for commit in iter_git_log(self.repo_root, since_sha):
+            if head_sha is None:
+                head_sha = commit["hash"]
+            commits += 1
+            completions.update(self.git_analyzer.match_commit(commit))
+            if not keyword_seen and self._likely_completed_matcher.search(
+                commit["subject"]
+            ):
+                keyword_seen = True
+            for filename in commit["files"]:
+                files += 1
+                active.update(self.file_monitor.match_file(filename))
 
-        # Detect completions from commits
-        commit_completions = self.git_analyzer.detect_task_completions(commits)
+        return {
+            "head_sha": head_sha,
+            "commits": commits,
+            "files": files,
+            "completions": completions,
+            "active": active,
+            "keyword_seen": keyword_seen,
+        }
 
-        # Detect active tasks from file changes
-        active_tasks = self.file_monitor.detect_task_activity(file_changes)
+    def detect_completed_work(self, hours: int = 72) -> Dict[str, Any]:
+        """Detect completed work from commits made since the last run."""
+        start_time = time.time()
+
+        state = self._load_state()
+        since_sha = state.get("last_sha")
+        try:
+            scan = self._scan(since_sha)
+        except subprocess.CalledProcessError:
+            if since_sha is None:
+                scan = None
+            else:
+                # High-water mark no longer reachable (history rewritten);
+                # start over from a full scan.
+                state = self._empty_state()
+                try:
+                    scan = self._scan(None)
+                except subprocess.CalledProcessError:
+                    scan = None
+        except FileNotFoundError:
+            scan = None
+
+        if scan is None:
+            scan = {
+                "head_sha": None,
+                "commits": 0,
+                "files": 0,
+                "completions": set(),
+                "active": set(),
+                "keyword_seen": False,
+            }
+
+        # Merge with what earlier runs already found
+        commit_completions = sorted(
+            set(state.get("commit_completions", [])) | scan["completions"]
+        )
+        active_tasks = sorted(set(state.get("active_tasks", [])) | scan["active"])
+        keyword_seen = bool(state.get("completion_keyword_seen")) or scan["keyword_seen"]
 
         # Cross-reference: if a task shows activity and completion keywords, mark as completed
-        likely_completed = []
-        for task_id in active_tasks:
-            commit_text = " ".join(commit["subject"] for commit in commits)
-            if any(
-                keyword in commit_text
-                for keyword in ["complete", "done", "finish", "implement"]
-            ):
-                likely_completed.append(task_id)
+        likely_completed = list(active_tasks) if keyword_seen else []
+
+        if scan["head_sha"] is not None:
+            state.update(
+                {
+                    "last_sha": scan["head_sha"],
+                    "commits_processed": state.get("commits_processed", 0)
+                    + scan["commits"],
+                    "files_processed": state.get("files_processed", 0)
+                    + scan["files"],
+                    "commit_completions": commit_completions,
+                    "active_tasks": active_tasks,
+                    "completion_keyword_seen": keyword_seen,
+                    "updated_at": now_iso(),
+                }
+            )
+            try:
+                write_json(self.state_file, state)
+            except OSError as e:
+                print(f"Warning: Could not save progress detector state: {e}")
 
         duration = time.time() - start_time
 
@@ -251,8 +382,8 @@ class AutomaticProgressDetector:
             {
                 "action": "detect_completed_work",
                 "hours": hours,
-                "commits_analyzed": len(commits),
-                "files_changed": len(file_changes),
+                "commits_analyzed": scan["commits"],
+                "files_changed": scan["files"],
                 "commit_completions": len(commit_completions),
                 "active_tasks": len(active_tasks),
                 "likely_completed": len(likely_completed),
@@ -262,11 +393,12 @@ class AutomaticProgressDetector:
         )
 
         return {
-            "commits_analyzed": len(commits),
-            "files_changed": len(file_changes),
+            "commits_analyzed": scan["commits"],
+            "files_changed": scan["files"],
             "commit_completions": commit_completions,
             "active_tasks": active_tasks,
             "likely_completed": likely_completed,
+            "last_processed_sha": state.get("last_sha"),
             "detection_timestamp": now_iso(),
             "duration_seconds": duration,
         }
@@ -15,6 +15,7 @@ from .code_quality_analyzer import CodeQualityAnalyzer
 from .dependency_checker import DependencyChecker, DependencyCheckResult
 from .dependency_mapper import DependencyMapper
 from .duplicate_detector import DuplicateDetector
+from .incremental_validator import IncrementalValidator, ValidationReport
 from .risk_assessment_framework import (
     RiskAssessmentFramework,
     RiskAssessmentResult,
@@ -37,6 +38,8 @@ __all__ = [
     "CodeQualityAnalyzer",
     "SyntaxValidator",
     "DuplicateDetector",
+    "IncrementalValidator",
+    "ValidationReport",
     # Risk & Assessment
     "RiskAssessmentFramework",
     "RiskAssessmentResult",
@@ -0,0 +1,241 @@
+"""
+Backup Engine - Deduplicated, link-based backups for cleanup operations.
+
+Both cleanup systems back up every target before touching it. Instead of a
+full copy per backup, file contents are stored once in a content-addressed
+object store (``.ai_onboard/backup_objects/ab/cdef...``) shared by all
+backups:
+
+- Content already in the store costs nothing
+- New content is cloned with a FICLONE reflink where the filesystem supports
+  it; when the sources are about to be deleted it may be hardlinked instead;
+  otherwise it is streamed into the store
+- Restore writes only files whose current content differs from the backup
+
+Objects are never linked back into the working tree, so editing a restored
+file can never change a stored object.
+"""
+
+import os
+import shutil
+import stat
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..base.checkpoints import _materialize, _reflink
+from .file_scan import FileHashCache, ScanEntry, scan_tree
+
+OBJECTS_DIR = "backup_objects"
+
+
+class BackupEngine:
+    """Snapshots files into a shared object store and restores them."""
+
+    def __init__(
+        self,
+        root: Path,
+        hash_cache: Optional[FileHashCache] = None,
+        objects_dir: Optional[Path] = None,
+    ):
+        self.root = root
+        self.objects_dir = objects_dir or root / ".ai_onboard" / OBJECTS_DIR
+        self.hash_cache = hash_cache or FileHashCache(
+            root / ".ai_onboard" / "file_hashes.json"
+        )
+        self._store_dev: Optional[int] = None
+        self._reflink_supported = True
+        self.stats = {
+            "reflink": 0,
+            "hardlink": 0,
+            "copy": 0,
+            "deduplicated": 0,
+            "restored": 0,
+            "unchanged": 0,
+        }
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _ensure_parent(self, path: Path, made: Set[str]) -> None:
+        """Create the parent of ``path`` unless done earlier in this call."""
+        parent = str(path.parent)
+        if parent not in made:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            made.add(parent)
+
+    def _clone(self, src: Path, dst: Path) -> str:
+        """Atomically place a reflink clone, or else a copy, of ``src`` at ``dst``."""
+        tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+        method = "copy"
+        try:
+            if self._reflink_supported:
+                if _reflink(src, tmp):
+                    method = "reflink"
+                else:
+                    # A filesystem clones either every file or none, so stop
+                    # probing after the first failure
+                    self._reflink_supported = False
+            if method == "copy":
+                shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return method
+
+    def _store(
+        self, src: Path, st: os.stat_result, obj: Path, hardlink: bool, made: Set[str]
+    ) -> str:
+        """Add ``src`` to the store as ``obj``; returns the method used."""
+        self._ensure_parent(obj, made)
+        if self._store_dev is None:
+            self._store_dev = os.stat(self.objects_dir).st_dev
+
+        # Links only work within one filesystem
+        if hardlink and st.st_dev == self._store_dev:
+            try:
+                os.link(src, obj)
+                return "hardlink"
+            except FileExistsError:
+                return "deduplicated"
+            except OSError:
+                pass
+        return self._clone(src, obj)
+
+    def _key(self, path: Path) -> str:
+        """Project-relative POSIX path, or absolute for paths outside it."""
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _path(self, key: str) -> Path:
+        path = Path(key)
+        return path if path.is_absolute() else self.root / path
+
+    def snapshot(
+        self, paths: Iterable[Path], allow_hardlink: bool = False
+    ) -> Dict[str, Any]:
+        """Store the contents of ``paths`` (files or whole directories).
+
+        ``allow_hardlink`` is only safe when the sources are deleted or
+        replaced afterwards, never edited in place; call ``release_links``
+        for any source that survives the operation.
+        """
+        entries: List[ScanEntry] = []
+        directories: List[str] = []
+        errors: List[str] = []
+        for path in paths:
+            try:
+                if path.is_dir() and not path.is_symlink():
+                    scan = scan_tree(path, pruned=())
+                    directories.append(self._key(path))
+                    directories.extend(self._key(d) for d in scan.directories)
+                    entries.extend(scan.files)
+                elif path.is_file():
+                    st = path.stat()
+                    entries.append(ScanEntry(path, st.st_size, st.st_mtime_ns))
+            except OSError as e:
+                errors.append(f"{path}: {e}")
+
+        hashes = self.hash_cache.hash_files(entries)
+        files: List[Dict[str, Any]] = []
+        made: Set[str] = set()
+        for entry in entries:
+            digest = hashes[entry.path]
+            try:
+                if digest == "unreadable":
+                    raise OSError("unreadable")
+                st = entry.path.stat()
+                obj = self._object_path(digest)
+                if obj.exists():
+                    method = "deduplicated"
+                else:
+                    method = self._store(entry.path, st, obj, allow_hardlink, made)
+                self.stats[method] += 1
+                files.append(
+                    {
+                        "path": self._key(entry.path),
+                        "digest": digest,
+                        "size": entry.size,
+                        "mode": st.st_mode & 0o777,
+                        "mtime_ns": entry.mtime_ns,
+                        "method": method,
+                    }
+                )
+            except OSError as e:
+                errors.append(f"{entry.path}: {e}")
+
+        return {"files": files, "directories": directories, "errors": errors}
+
+    def release_links(self, snapshot: Dict[str, Any]) -> int:
+        """Give surviving hardlinked sources their own object copy.
+
+        Returns the number of objects replaced.
+        """
+        released = 0
+        for entry in snapshot.get("files", []):
+            if entry.get("method") != "hardlink":
+                continue
+            src = self._path(entry["path"])
+            obj = self._object_path(entry["digest"])
+            try:
+                if src.exists() and os.path.samefile(src, obj):
+                    _materialize(src, obj, link_mode="copy")
+                    released += 1
+            except OSError as e:
+                print(f"Warning: Could not detach backup object for {src}: {e}")
+        return released
+
+    def restore(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Restore a snapshot, writing only files whose content differs."""
+        restored = 0
+        unchanged = 0
+        errors: List[str] = []
+        made: Set[str] = set()
+        for key in snapshot.get("directories", []):
+            try:
+                self._path(key).mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                errors.append(f"{key}: {e}")
+
+        for entry in snapshot.get("files", []):
+            dst = self._path(entry["path"])
+            digest = entry["digest"]
+            try:
+                try:
+                    st: Optional[os.stat_result] = os.stat(dst)
+                except FileNotFoundError:
+                    st = None
+                if (
+                    st is not None
+                    and stat.S_ISREG(st.st_mode)
+                    and st.st_size == entry["size"]
+                    and self.hash_cache.hash_path(dst) == digest
+                ):
+                    unchanged += 1
+                    continue
+                obj = self._object_path(digest)
+                self._ensure_parent(dst, made)
+                try:
+                    self._clone(obj, dst)
+                except FileNotFoundError:
+                    if obj.exists():
+                        raise
+                    errors.append(f"{entry['path']}: missing backup object {digest}")
+                    continue
+                if "mode" in entry:
+                    os.chmod(dst, entry["mode"])
+                if "mtime_ns" in entry:
+                    os.utime(dst, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+                restored += 1
+            except OSError as e:
+                errors.append(f"{entry['path']}: {e}")
+
+        self.hash_cache.save()
+        self.stats["restored"] += restored
+        self.stats["unchanged"] += unchanged
+        return {"restored": restored, "unchanged": unchanged, "errors": errors}
@@ -27,6 +27,8 @@ from ..utilities.unicode_utils import (
     safe_print,
 )
 from .dependency_checker import DependencyChecker, DependencyCheckResult
+from .backup_engine import BackupEngine
+from .file_scan import scan_tree
 
 
 class RiskLevel(Enum):
@@ -493,12 +495,39 @@ class HumanConfirmationGate(SafetyGate):
         return f"{secrets.token_hex(4).upper()}-{secrets.randbelow(9999):04d}"
 
 
+def _restore_backup(root: Path, manifest: Dict[str, Any]) -> None:
+    """Restore the files recorded in a backup manifest."""
+    if "snapshot" in manifest:
+        engine = BackupEngine(root)
+        # Targets that survived a failed delete still share their inode with
+        # a hardlinked backup object
+        engine.release_links(manifest["snapshot"])
+        result = engine.restore(manifest["snapshot"])
+        if result["errors"]:
+            raise Exception(f"Rollback incomplete: {'; '.join(result['errors'])}")
+        return
+
+    # Backups written before the shared object store held full copies
+    for file_info in manifest["files"]:
+        original_path = Path(file_info["original"])
+        backup_path = Path(file_info["backup"])
+
+        if file_info["type"] == "file":
+            original_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(backup_path, original_path)
+        elif file_info["type"] == "directory":
+            if original_path.exists():
+                shutil.rmtree(original_path)
+            shutil.copytree(backup_path, original_path)
+
+
 class BackupExecuteGate(SafetyGate):
     """Gate 5: Backup creation and operation execution."""
 
     def __init__(self, root: Path):
         super().__init__("Backup & Execute")
         self.root = root
+        self.backup_engine = BackupEngine(root)
 
     def validate(self, context: SafetyGateContext) -> Tuple[GateResult, str]:
         """Create backup and execute operation."""
@@ -553,35 +582,26 @@ class BackupExecuteGate(SafetyGate):
             "files": [],
         }
 
-        # Backup affected files
-        for target in operation.targets:
-            if target.exists():
-                if target.is_file():
-                    # Backup individual file
-                    backup_path = backup_dir / "files" / target.name
-                    backup_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(target, backup_path)
-
-                    manifest["files"].append(
-                        {
-                            "original": str(target),
-                            "backup": str(backup_path),
-                            "type": "file",
-                        }
-                    )
-
-                elif target.is_dir():
-                    # Backup directory
-                    backup_path = backup_dir / "directories" / target.name
-                    shutil.copytree(target, backup_path)
-
-                    manifest["files"].append(
-                        {
-                            "original": str(target),
-                            "backup": str(backup_path),
-                            "type": "directory",
-                        }
-                    )
+        # Back up affected files into the shared object store. Deleted
+        # targets may be hardlinked; anything else is reflinked or copied.
+        existing = [target for target in operation.targets if target.exists()]
+        snapshot = self.backup_engine.snapshot(
+            existing, allow_hardlink=operation.operation_type == "delete"
+        )
+        if snapshot["errors"]:
+            # Nothing is deleted without a backup; the targets survive, so
+            # they must not share an inode with their backup objects
+            self.backup_engine.release_links(snapshot)
+            shutil.rmtree(backup_dir, ignore_errors=True)
+            raise Exception(f"Backup failed: {'; '.join(snapshot['errors'])}")
+        manifest["snapshot"] = snapshot
+        for target in existing:
+            manifest["files"].append(
+                {
+                    "original": str(target),
+                    "type": "directory" if target.is_dir() else "file",
+                }
+            )
 
         # Save manifest
         manifest_path = backup_dir / "manifest.json"
@@ -623,20 +643,7 @@ class BackupExecuteGate(SafetyGate):
         with open(manifest_path, "r") as f:
             manifest = json.load(f)
 
-        # Restore files
-        for file_info in manifest["files"]:
-            original_path = Path(file_info["original"])
-            backup_path = Path(file_info["backup"])
-
-            if file_info["type"] == "file":
-                # Restore file
-                original_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(backup_path, original_path)
-            elif file_info["type"] == "directory":
-                # Restore directory
-                if original_path.exists():
-                    shutil.rmtree(original_path)
-                shutil.copytree(backup_path, original_path)
+        _restore_backup(self.root, manifest)
 
 
 class PostOperationGate(SafetyGate):
@@ -689,10 +696,7 @@ class PostOperationGate(SafetyGate):
         # Check 3: File system integrity
         try:
             # Check for broken symlinks or orphaned files
-            broken_links = []
-            for path in self.root.rglob("*"):
-                if path.is_symlink() and not path.exists():
-                    broken_links.append(path)
+            broken_links = scan_tree(self.root).broken_symlinks
 
             if broken_links:
                 validation_results.append(
@@ -785,18 +789,7 @@ class PostOperationGate(SafetyGate):
         with open(manifest_path, "r") as f:
             manifest = json.load(f)
 
-        # Restore files
-        for file_info in manifest["files"]:
-            original_path = Path(file_info["original"])
-            backup_path = Path(file_info["backup"])
-
-            if file_info["type"] == "file":
-                original_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(backup_path, original_path)
-            elif file_info["type"] == "directory":
-                if original_path.exists():
-                    shutil.rmtree(original_path)
-                shutil.copytree(backup_path, original_path)
+        _restore_backup(self.root, manifest)
 
         self.log(context, f"Rollback completed using backup {context.backup_id}")
         print_status("Rollback completed successfully", "success")
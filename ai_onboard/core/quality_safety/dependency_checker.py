@@ -8,12 +8,14 @@ were nearly broken.
 """
 
 import ast
+import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from ..base.common_imports import Enum, Path, dataclass
 from ..utilities.unicode_utils import print_content, print_status, safe_print
+from .import_graph import ImportGraph, get_import_graph
 
 
 def _is_relative_to(child: Path, parent: Path) -> bool:
@@ -74,6 +76,7 @@ class DependencyChecker:
         """
         self.root = Path(root)
         self.dependency_cache: Dict[str, Any] = {}
+        self._import_graph: Optional[ImportGraph] = None
 
         # File patterns to scan for dependencies
         self.scannable_patterns = [
@@ -121,6 +124,9 @@ class DependencyChecker:
             f"Checking dependencies for {len(target_files)} files...", "search"
         )
 
+        # Pick up edits since the last check, then answer every target from it
+        self._import_graph = get_import_graph(self.root)
+
         for target_file in target_files:
             result = self._check_single_file_dependencies(target_file)
             results.append(result)
@@ -146,16 +152,22 @@ class DependencyChecker:
             warnings.append(f"File '{target_file.name}' is marked as critical")
             recommendations.append("Consider if this file is truly safe to delete")
 
-        # Scan all files in the project for references
-        for pattern in self.scannable_patterns:
-            for source_file in self.root.glob(pattern):
-                if source_file == target_file or not source_file.is_file():
-                    continue
-
-                file_dependencies = self._scan_file_for_references(
-                    source_file, target_file
-                )
-                dependencies.extend(file_dependencies)
+        # Only files that import the target or mention its name can refer to
+        # it; the import graph finds them without reading the whole tree
+        graph = self._import_graph or get_import_graph(self.root)
+        candidates = graph.references(target_file) | graph.importers(target_file)
+        target_path = os.path.abspath(target_file)
+        suffixes = {p[p.rfind(".") :] for p in self.scannable_patterns}
+        for source_file in sorted(candidates):
+            if source_file.suffix not in suffixes or str(source_file) == target_path:
+                continue
+            if not source_file.is_file():
+                continue
+
+            file_dependencies = self._scan_file_for_references(
+                source_file, target_file
+            )
+            dependencies.extend(file_dependencies)
 
         # Determine risk level and safety
         risk_level, is_safe = self._assess_risk(dependencies, target_file)
@@ -0,0 +1,195 @@
+"""
+File Scan - One pruned directory walk and cached, streamed content hashes.
+
+Cleanup scanning and the post-operation integrity check both need to know
+which files exist under the project, and cleanup proposals record a content
+hash for every target. This module provides:
+
+- ``scan_tree``: a single ``os.scandir`` walk that prunes version-control
+  directories, stats each file once and collects broken symlinks
+- ``FileHashCache``: SHA-256 hashes streamed in fixed-size chunks on a thread
+  pool, persisted by (path, size, mtime) so unchanged files are never read
+  twice
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..base import serialization
+
+# Directories never descended into; their contents are not cleanup targets
+PRUNED_DIRS = frozenset({".git", ".hg", ".svn"})
+CHUNK_SIZE = 1024 * 1024
+# Files modified this recently may change again within the same mtime tick,
+# so their hashes are not persisted
+RACY_WINDOW_NS = 2_000_000_000
+UNREADABLE = "unreadable"
+
+
+@dataclass(frozen=True)
+class ScanEntry:
+    """A regular file found by ``scan_tree``."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class TreeScan:
+    """Result of one walk over a directory tree."""
+
+    root: Path
+    files: List[ScanEntry] = field(default_factory=list)
+    directories: List[Path] = field(default_factory=list)
+    broken_symlinks: List[Path] = field(default_factory=list)
+
+
+def scan_tree(root: Path, pruned: Iterable[str] = PRUNED_DIRS) -> TreeScan:
+    """Walk ``root`` once without following directory symlinks."""
+    pruned = frozenset(pruned)
+    scan = TreeScan(root=root)
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in pruned:
+                        stack.append(entry.path)
+                        scan.directories.append(Path(entry.path))
+                    continue
+                if entry.is_symlink() and not os.path.exists(entry.path):
+                    scan.broken_symlinks.append(Path(entry.path))
+                    continue
+                if entry.is_file():
+                    st = entry.stat()
+                    scan.files.append(
+                        ScanEntry(Path(entry.path), st.st_size, st.st_mtime_ns)
+                    )
+            except OSError:
+                continue
+    return scan
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 of ``path``, read in chunks into a reused buffer."""
+    h = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+class FileHashCache:
+    """Content hashes keyed by (path, size, mtime), optionally persisted."""
+
+    def __init__(self, cache_path: Optional[Path] = None, max_workers: int = 0):
+        self.cache_path = cache_path
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self._entries: Optional[Dict[str, list]] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.stats = {"hits": 0, "hashed": 0, "bytes_read": 0}
+
+    def _load(self) -> Dict[str, list]:
+        if self._entries is None:
+            data = None
+            if self.cache_path is not None:
+                try:
+                    data = serialization.load_file(self.cache_path)
+                except OSError:
+                    pass
+            self._entries = data if isinstance(data, dict) else {}
+        return self._entries
+
+    def _lookup(self, entry: ScanEntry) -> Optional[str]:
+        cached = self._load().get(str(entry.path))
+        if cached and cached[0] == entry.size and cached[1] == entry.mtime_ns:
+            return cached[2]
+        return None
+
+    def _hash(self, entry: ScanEntry) -> str:
+        try:
+            digest = hash_file(entry.path)
+        except OSError:
+            return UNREADABLE
+        with self._lock:
+            self.stats["hashed"] += 1
+            self.stats["bytes_read"] += entry.size
+            if time.time_ns() - entry.mtime_ns >= RACY_WINDOW_NS:
+                self._load()[str(entry.path)] = [entry.size, entry.mtime_ns, digest]
+                self._dirty = True
+        return digest
+
+    def hash_files(
+        self, entries: Iterable[ScanEntry], prune: bool = False
+    ) -> Dict[Path, str]:
+        """Hash ``entries``, reading only files whose size or mtime changed.
+
+        With ``prune`` the persisted cache is reduced to these entries, for
+        callers that pass the complete set of files they track.
+        """
+        entries = list(entries)
+        results: Dict[Path, str] = {}
+        misses: List[ScanEntry] = []
+        for entry in entries:
+            digest = self._lookup(entry)
+            if digest is None:
+                misses.append(entry)
+            else:
+                results[entry.path] = digest
+        self.stats["hits"] += len(entries) - len(misses)
+
+        if len(misses) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="hash"
+            ) as pool:
+                for entry, digest in zip(misses, pool.map(self._hash, misses)):
+                    results[entry.path] = digest
+        else:
+            for entry in misses:
+                results[entry.path] = self._hash(entry)
+
+        if prune:
+            keep = {str(entry.path) for entry in entries}
+            cache = self._load()
+            for key in [k for k in cache if k not in keep]:
+                del cache[key]
+                self._dirty = True
+        self.save()
+        return results
+
+    def hash_path(self, path: Path) -> str:
+        """Hash a single file through the cache."""
+        try:
+            st = path.stat()
+        except OSError:
+            return UNREADABLE
+        entry = ScanEntry(path, st.st_size, st.st_mtime_ns)
+        return self._lookup(entry) or self._hash(entry)
+
+    def save(self) -> None:
+        if not self._dirty or self.cache_path is None:
+            return
+        try:
+            serialization.dump_file(self.cache_path, self._load())
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Failed to save file hash cache: {e}")
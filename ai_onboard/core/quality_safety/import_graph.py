@@ -0,0 +1,464 @@
+"""
+Import Graph - Persistent module import graph for dependency and risk queries.
+
+Risk assessment and dependency checking used to walk the whole tree and
+re-read every source file for each file they were asked about. The import
+graph parses each file once and keeps the result in
+``.ai_onboard/import_graph.json``:
+
+- For Python files, the absolute names of the modules they import (relative
+  imports are resolved against the file's package)
+- For Python and text files, the set of name tokens they contain, so string
+  references to a file name can be answered without reading every file
+
+Forward and reverse adjacency between project modules is rebuilt in memory
+from the stored imports. ``refresh`` re-parses only files whose size or
+modification time changed, and ``update_files`` re-parses specific files
+after an edit.
+
+Queries:
+- ``imports_of(path)``: project files a file imports
+- ``importers(target)``: files that import a module or file
+- ``impact_set(target)``: files that import it directly or transitively
+- ``references(target)``: files that mention the file's name or stem
+"""
+
+import ast
+import os
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from ..base import serialization, utils
+
+GRAPH_VERSION = 1
+
+# File types indexed for string references (Python files are also parsed)
+TEXT_SUFFIXES = {
+    ".py",
+    ".json",
+    ".yaml",
+    ".yml",
+    ".toml",
+    ".md",
+    ".rst",
+    ".txt",
+    ".sh",
+    ".bat",
+    ".ps1",
+}
+
+# Directories that never hold project sources
+EXCLUDED_DIRS = {
+    ".git",
+    ".ai_onboard",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".tox",
+    ".venv",
+    "venv",
+    "node_modules",
+    ".eggs",
+}
+
+# Files larger than this are not indexed for references
+MAX_INDEXED_BYTES = 5 * 1024 * 1024
+
+_TOKEN = re.compile(r"[\w\-]+(?:\.[\w\-]+)*")
+
+Target = Union[str, Path]
+
+
+def _tokens(text: str) -> Set[str]:
+    """Names in ``text``: dotted words and each of their parts."""
+    tokens: Set[str] = set()
+    for match in _TOKEN.findall(text):
+        tokens.add(match)
+        if "." in match:
+            tokens.update(part for part in match.split(".") if part)
+    return tokens
+
+
+def module_name(rel_path: str) -> Optional[str]:
+    """Dotted module name of a root-relative ``.py`` path."""
+    if not rel_path.endswith(".py"):
+        return None
+    parts = rel_path[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) if parts else None
+
+
+def import_base(rel_path: str, node: ast.ImportFrom) -> str:
+    """Absolute module named by a ``from ... import`` in a root-relative file.
+
+    Returns an empty string when a relative import climbs above the root.
+    """
+    if not node.level:
+        return node.module or ""
+    module = module_name(rel_path) or ""
+    package = module if rel_path.endswith("__init__.py") else module.rpartition(".")[0]
+    parts = package.split(".") if package else []
+    if node.level - 1 > len(parts):
+        return ""
+    base_parts = parts[: len(parts) - (node.level - 1)]
+    if node.module:
+        base_parts.append(node.module)
+    return ".".join(base_parts)
+
+
+def _parse_imports(rel_path: str, source: str) -> List[str]:
+    """Absolute names imported by a Python file.
+
+    ``from package import name`` yields ``package.name``; it is resolved to
+    ``package`` later when no such module exists.
+    """
+    tree = ast.parse(source, filename=rel_path)
+
+    imports: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = import_base(rel_path, node)
+            if not base:
+                continue
+            imports.append(base)
+            imports.extend(
+                f"{base}.{alias.name}" for alias in node.names if alias.name != "*"
+            )
+    return sorted(set(imports))
+
+
+class ImportGraph:
+    """Bidirectional module import graph of a project, persisted between runs."""
+
+    def __init__(self, root: Path, cache_path: Optional[Path] = None):
+        self.root = Path(os.path.abspath(root))
+        self.cache_path = cache_path or self.root / ".ai_onboard" / "import_graph.json"
+        self._lock = threading.RLock()
+        # Root-relative posix path -> {"mtime_ns", "size", "imports", "tokens"}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._modules: Dict[str, str] = {}
+        self._forward: Dict[str, Set[str]] = {}
+        self._reverse: Dict[str, Set[str]] = {}
+        self._token_index: Dict[str, Set[str]] = {}
+        self._dirty = False
+        self.stats = {"parsed": 0, "unchanged": 0, "removed": 0}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        # Read directly; the graph keeps its own copy, so skip the JSON cache
+        data = serialization.load_file(self.cache_path)
+        if not isinstance(data, dict) or data.get("version") != GRAPH_VERSION:
+            return
+        files = data.get("files")
+        if isinstance(files, dict):
+            self._files = {
+                rel: entry for rel, entry in files.items() if isinstance(entry, dict)
+            }
+            self._rebuild()
+
+    def save(self) -> bool:
+        """Write the graph if it changed since it was loaded or saved."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {
+                "version": GRAPH_VERSION,
+                "root": str(self.root),
+                "files": self._files,
+            }
+            try:
+                utils.write_json(self.cache_path, data, compact=True)
+            except OSError as e:
+                print(f"Warning: Failed to save import graph: {e}")
+                return False
+            self._dirty = False
+            return True
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _walk(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Indexed files under the root with their stat results."""
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDED_DIRS:
+                            stack.append(Path(entry.path))
+                    elif os.path.splitext(entry.name)[1] in TEXT_SUFFIXES:
+                        rel = Path(entry.path).relative_to(self.root).as_posix()
+                        yield rel, entry.stat()
+                except OSError:
+                    continue
+
+    def _index_file(self, rel: str, stat: os.stat_result) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "imports": [],
+            "tokens": [],
+        }
+        if stat.st_size > MAX_INDEXED_BYTES:
+            return entry
+        try:
+            text = (self.root / rel).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return entry
+        entry["tokens"] = sorted(_tokens(text))
+        if rel.endswith(".py"):
+            try:
+                entry["imports"] = _parse_imports(rel, text)
+            except (SyntaxError, ValueError):
+                entry["parse_error"] = True
+        self.stats["parsed"] += 1
+        return entry
+
+    def refresh(self) -> int:
+        """Re-index files that were added, changed or removed.
+
+        Returns the number of files that changed.
+        """
+        with self._lock:
+            seen: Set[str] = set()
+            changed = 0
+            modules_changed = False
+            for rel, stat in self._walk():
+                seen.add(rel)
+                entry = self._files.get(rel)
+                if (
+                    entry is not None
+                    and entry.get("mtime_ns") == stat.st_mtime_ns
+                    and entry.get("size") == stat.st_size
+                ):
+                    self.stats["unchanged"] += 1
+                    continue
+                modules_changed = modules_changed or entry is None
+                self._replace(rel, self._index_file(rel, stat), rebuild=False)
+                changed += 1
+            for rel in [rel for rel in self._files if rel not in seen]:
+                self._replace(rel, None, rebuild=False)
+                self.stats["removed"] += 1
+                modules_changed = True
+                changed += 1
+            if modules_changed:
+                # New or removed modules can change how any import resolves
+                self._rebuild()
+            return changed
+
+    def update_files(self, paths: Iterable[Target]) -> None:
+        """Re-index specific files after they were edited, created or deleted."""
+        with self._lock:
+            rebuild = False
+            for path in paths:
+                rel = self._rel(path)
+                if rel is None or os.path.splitext(rel)[1] not in TEXT_SUFFIXES:
+                    continue
+                try:
+                    stat = (self.root / rel).stat()
+                except OSError:
+                    rebuild = rebuild or rel in self._files
+                    self._replace(rel, None, rebuild=False)
+                    continue
+                rebuild = rebuild or rel not in self._files
+                self._replace(rel, self._index_file(rel, stat), rebuild=False)
+            if rebuild:
+                self._rebuild()
+
+    def _replace(
+        self, rel: str, entry: Optional[Dict[str, Any]], rebuild: bool = True
+    ) -> None:
+        """Swap the stored entry of a file, updating adjacency incrementally."""
+        old = self._files.pop(rel, None)
+        if old is not None:
+            for token in old.get("tokens", ()):
+                files = self._token_index.get(token)
+                if files is not None:
+                    files.discard(rel)
+                    if not files:
+                        del self._token_index[token]
+            self._unlink(rel)
+        if entry is not None:
+            self._files[rel] = entry
+            module = module_name(rel)
+            if module is not None:
+                self._modules[module] = rel
+            for token in entry.get("tokens", ()):
+                self._token_index.setdefault(token, set()).add(rel)
+            self._link(rel)
+        else:
+            module = module_name(rel)
+            if module is not None and self._modules.get(module) == rel:
+                del self._modules[module]
+        self._dirty = True
+        if rebuild:
+            self._rebuild()
+
+    def _unlink(self, rel: str) -> None:
+        for target in self._forward.pop(rel, ()):
+            importers = self._reverse.get(target)
+            if importers is not None:
+                importers.discard(rel)
+
+    def _link(self, rel: str) -> None:
+        targets = set()
+        for name in self._files[rel].get("imports", ()):
+            target = self._resolve(name)
+            if target is not None and target != rel:
+                targets.add(target)
+        self._forward[rel] = targets
+        for target in targets:
+            self._reverse.setdefault(target, set()).add(rel)
+
+    def _rebuild(self) -> None:
+        """Recompute modules, adjacency and the token index from entries."""
+        self._modules = {}
+        for rel in self._files:
+            module = module_name(rel)
+            if module is not None:
+                self._modules[module] = rel
+        self._forward = {}
+        self._reverse = {}
+        self._token_index = {}
+        for rel, entry in self._files.items():
+            for token in entry.get("tokens", ()):
+                self._token_index.setdefault(token, set()).add(rel)
+            self._link(rel)
+
+    def _resolve(self, name: str) -> Optional[str]:
+        """The project file providing module ``name`` or its nearest parent."""
+        while name:
+            rel = self._modules.get(name)
+            if rel is not None:
+                return rel
+            name = name.rpartition(".")[0]
+        return None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _rel(self, target: Target) -> Optional[str]:
+        path = Path(target)
+        if not path.is_absolute():
+            path = self.root / path
+        try:
+            return Path(os.path.abspath(path)).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def _target_file(self, target: Target) -> Optional[str]:
+        """Root-relative path of a file path or dotted module name."""
+        if isinstance(target, str) and "/" not in target and "\\" not in target:
+            if not target.endswith(".py"):
+                rel = self._modules.get(target)
+                if rel is not None:
+                    return rel
+        rel = self._rel(target)
+        return rel if rel in self._files else None
+
+    def _paths(self, rels: Iterable[str]) -> Set[Path]:
+        return {self.root / rel for rel in rels}
+
+    def resolve(self, name: str) -> Optional[Path]:
+        """The project file that provides module ``name`` (or its parent)."""
+        with self._lock:
+            rel = self._resolve(name)
+            return self.root / rel if rel is not None else None
+
+    def has_module(self, name: str) -> bool:
+        """Whether the project provides module ``name`` itself."""
+        with self._lock:
+            return name in self._modules
+
+    def module_for(self, path: Target) -> Optional[str]:
+        rel = self._rel(path)
+        return module_name(rel) if rel is not None else None
+
+    def raw_imports(self, path: Target) -> List[str]:
+        """Every module name a file imports, project or external."""
+        with self._lock:
+            rel = self._rel(path)
+            entry = self._files.get(rel) if rel is not None else None
+            return list(entry.get("imports", ())) if entry else []
+
+    def imports_of(self, path: Target) -> Set[Path]:
+        """Project files imported by a file."""
+        with self._lock:
+            rel = self._target_file(path)
+            return self._paths(self._forward.get(rel, ())) if rel else set()
+
+    def importers(self, target: Target) -> Set[Path]:
+        """Files that import a module or file directly."""
+        with self._lock:
+            rel = self._target_file(target)
+            return self._paths(self._reverse.get(rel, ())) if rel else set()
+
+    def impact_set(self, target: Target, max_depth: Optional[int] = None) -> Set[Path]:
+        """Files that import a module or file directly or transitively."""
+        with self._lock:
+            start = self._target_file(target)
+            if start is None:
+                return set()
+            seen = {start}
+            queue = deque([(start, 0)])
+            while queue:
+                rel, depth = queue.popleft()
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for importer in self._reverse.get(rel, ()):
+                    if importer not in seen:
+                        seen.add(importer)
+                        queue.append((importer, depth + 1))
+            seen.discard(start)
+            return self._paths(seen)
+
+    def references(self, target: Target) -> Set[Path]:
+        """Indexed files that mention a file's name or stem as a token."""
+        with self._lock:
+            path = Path(target)
+            rel = self._rel(path)
+            candidates = set(self._token_index.get(path.name, ()))
+            candidates.update(self._token_index.get(path.stem, ()))
+            candidates.discard(rel)
+            return self._paths(candidates)
+
+    def files(self) -> List[Path]:
+        with self._lock:
+            return [self.root / rel for rel in self._files]
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+_graphs: Dict[str, ImportGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_import_graph(root: Path, refresh: bool = True) -> ImportGraph:
+    """Get the shared import graph of a project, refreshed and saved."""
+    key = os.path.abspath(root)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = _graphs[key] = ImportGraph(Path(root))
+    if refresh:
+        graph.refresh()
+        graph.save()
+    return graph
@@ -0,0 +1,362 @@
+"""
+Incremental Validator - In-process validation of edited Python files.
+
+Cleanup used to validate each batch of edits by starting a new interpreter
+and importing the top-level package, which paid the full start-up cost every
+time and only exercised that one package. The incremental validator checks
+exactly what an edit can break:
+
+- Each modified file is compiled in process
+- Project imports of each modified file must still resolve: the imported
+  modules exist and names imported from project modules are still defined
+- Files that import a modified module (found through the import graph) must
+  still find the names they import from it
+
+An optional deep check imports the affected modules in a warm validation
+worker: a long-lived interpreter shared between batches that keeps
+third-party modules loaded and reloads only project modules.
+"""
+
+import ast
+import atexit
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .import_graph import ImportGraph, get_import_graph, import_base
+
+# Program run by validation workers: each request is one JSON line naming
+# the modules to import and the top-level packages to reload first
+_WORKER_SOURCE = """
+import importlib, json, sys
+sys.path.insert(0, sys.argv[1])
+out, sys.stdout = sys.stdout, sys.stderr
+for line in sys.stdin:
+    request = json.loads(line)
+    purge = set(request["purge"])
+    for name in [n for n in sys.modules if n.split(".")[0] in purge]:
+        del sys.modules[name]
+    importlib.invalidate_caches()
+    errors = {}
+    for module in request["modules"]:
+        try:
+            importlib.import_module(module)
+        except BaseException as e:
+            errors[module] = type(e).__name__ + ": " + str(e)
+    out.write(json.dumps(errors) + "\\n")
+    out.flush()
+"""
+
+
+@dataclass
+class ValidationReport:
+    """Result of validating a set of edited files."""
+
+    passed: bool = True
+    files_compiled: int = 0
+    modules_checked: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+class ValidationWorker:
+    """A warm interpreter that imports project modules on request."""
+
+    def __init__(self, root: Path, timeout: float = 60.0):
+        self.root = Path(os.path.abspath(root))
+        self.timeout = timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        process = subprocess.Popen(
+            [sys.executable, "-B", "-c", _WORKER_SOURCE, str(self.root)],
+            cwd=str(self.root),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read, args=(process, self._responses), daemon=True
+        ).start()
+        return process
+
+    @staticmethod
+    def _read(process: subprocess.Popen, responses: "queue.Queue") -> None:
+        for line in process.stdout:
+            responses.put(line)
+        responses.put(None)
+
+    def check(self, modules: Iterable[str]) -> Dict[str, str]:
+        """Import ``modules`` afresh; returns the error of each that failed."""
+        modules = sorted(set(modules))
+        if not modules:
+            return {}
+        request = {
+            "modules": modules,
+            "purge": sorted({module.split(".")[0] for module in modules}),
+        }
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._process = self._start()
+            try:
+                self._process.stdin.write(json.dumps(request) + "\n")
+                self._process.stdin.flush()
+                line = self._responses.get(timeout=self.timeout)
+            except (OSError, queue.Empty):
+                line = None
+            if line is None:
+                self._stop()
+                error = "Validation worker did not respond"
+                return {module: error for module in modules}
+            return json.loads(line)
+
+    def _stop(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._process.kill()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self._process = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._stop()
+
+
+_workers: Dict[str, ValidationWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_validation_worker(root: Path) -> ValidationWorker:
+    """Get the shared validation worker of a project."""
+    key = os.path.abspath(root)
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = _workers[key] = ValidationWorker(Path(root))
+        return worker
+
+
+def close_validation_workers() -> None:
+    """Stop all validation workers."""
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.close()
+
+
+atexit.register(close_validation_workers)
+
+
+def _defined_names(tree: ast.Module) -> Optional[Set[str]]:
+    """Top-level names a module defines, or None when they cannot be known."""
+    names: Set[str] = set()
+    pending: List[ast.stmt] = list(tree.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if node.name == "__getattr__":
+                return None  # Module-level __getattr__ can provide any name
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for sub in ast.walk(target):
+                    if isinstance(sub, ast.Name):
+                        names.add(sub.id)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*":
+                    return None
+                names.add(alias.asname or alias.name)
+        elif isinstance(node, (ast.If, ast.Try, ast.With, ast.For, ast.While)):
+            # Names bound in conditional blocks are still module names
+            for attr in ("body", "orelse", "finalbody"):
+                pending.extend(getattr(node, attr, []))
+            for handler in getattr(node, "handlers", []):
+                pending.extend(handler.body)
+            if isinstance(node, ast.For):
+                for sub in ast.walk(node.target):
+                    if isinstance(sub, ast.Name):
+                        names.add(sub.id)
+    return names
+
+
+def _describe(path: Path, error: Exception) -> str:
+    line = getattr(error, "lineno", None)
+    where = f"{path}:{line}" if line else str(path)
+    return f"{where}: {type(error).__name__}: {getattr(error, 'msg', error)}"
+
+
+class IncrementalValidator:
+    """Validates edited files and the modules that import them."""
+
+    def __init__(
+        self, root: Path, graph: Optional[ImportGraph] = None, deep: bool = False
+    ):
+        self.root = Path(os.path.abspath(root))
+        self.deep = deep
+        self._graph = graph
+        # Path -> (mtime_ns, size, defined names)
+        self._names: Dict[Path, Tuple[int, int, Optional[Set[str]]]] = {}
+
+    @property
+    def graph(self) -> ImportGraph:
+        if self._graph is None:
+            self._graph = get_import_graph(self.root)
+        return self._graph
+
+    def check_source(self, path: Path, source: str) -> Optional[str]:
+        """Compile ``source`` as the contents of ``path``; returns the error."""
+        try:
+            compile(source, str(path), "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            return _describe(path, e)
+        return None
+
+    def validate(self, paths: Iterable[Path]) -> ValidationReport:
+        """Validate edited files and the files that import them."""
+        report = ValidationReport()
+        graph = self.graph
+        modified = [
+            Path(os.path.abspath(path))
+            for path in paths
+            if str(path).endswith(".py") and graph.module_for(path) is not None
+        ]
+        graph.update_files(modified)
+
+        modified_modules: Set[str] = set()
+        checked_modules: Set[str] = set()
+        for path in modified:
+            tree = self._compile(path, report)
+            module = graph.module_for(path)
+            if module is not None:
+                modified_modules.add(module)
+                checked_modules.add(module)
+            if tree is not None:
+                self._check_imports(path, tree, None, report)
+
+        importers: Set[Path] = set()
+        for path in modified:
+            importers.update(graph.importers(path))
+        for path in sorted(importers.difference(modified)):
+            tree = self._parse(path)
+            if tree is None:
+                continue
+            module = graph.module_for(path)
+            if module is not None:
+                checked_modules.add(module)
+            self._check_imports(path, tree, modified_modules, report)
+
+        if self.deep and checked_modules:
+            worker = get_validation_worker(self.root)
+            for module, error in sorted(worker.check(checked_modules).items()):
+                report.errors.append(f"{module}: {error}")
+
+        report.modules_checked = sorted(checked_modules)
+        report.passed = not report.errors
+        return report
+
+    def _compile(self, path: Path, report: ValidationReport) -> Optional[ast.Module]:
+        try:
+            source = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            report.errors.append(f"{path}: {e}")
+            return None
+        report.files_compiled += 1
+        try:
+            tree = ast.parse(source, filename=str(path))
+            compile(tree, str(path), "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            report.errors.append(_describe(path, e))
+            return None
+        return tree
+
+    def _parse(self, path: Path) -> Optional[ast.Module]:
+        try:
+            return ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (OSError, UnicodeDecodeError, SyntaxError, ValueError):
+            return None
+
+    def _module_names(self, path: Path) -> Optional[Set[str]]:
+        """Names defined by a project module, cached by size and mtime."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return set()
+        cached = self._names.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        tree = self._parse(path)
+        names = _defined_names(tree) if tree is not None else None
+        self._names[path] = (stat.st_mtime_ns, stat.st_size, names)
+        return names
+
+    def _check_imports(
+        self,
+        path: Path,
+        tree: ast.Module,
+        only: Optional[Set[str]],
+        report: ValidationReport,
+    ) -> None:
+        """Check a file's project imports (only those of ``only`` modules)."""
+        graph = self.graph
+        rel = path.relative_to(self.root).as_posix()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    name = alias.name
+                    if only is not None and name not in only:
+                        continue
+                    if graph.has_module(name.split(".")[0]) and not graph.has_module(
+                        name
+                    ):
+                        report.errors.append(
+                            f"{rel}:{node.lineno}: No module named '{name}'"
+                        )
+            elif isinstance(node, ast.ImportFrom):
+                base = import_base(rel, node)
+                if not base or (only is not None and base not in only):
+                    continue
+                if not graph.has_module(base.split(".")[0]):
+                    continue  # Not a project import
+                if not graph.has_module(base):
+                    report.errors.append(
+                        f"{rel}:{node.lineno}: No module named '{base}'"
+                    )
+                    continue
+                names = self._module_names(graph.resolve(base))
+                for alias in node.names:
+                    if (
+                        alias.name == "*"
+                        or names is None
+                        or alias.name in names
+                        or graph.has_module(f"{base}.{alias.name}")
+                    ):
+                        continue
+                    report.errors.append(
+                        f"{rel}:{node.lineno}: Cannot import name "
+                        f"'{alias.name}' from '{base}'"
+                    )
@@ -1,12 +1,53 @@
+"""
+Policy loading, compilation and evaluation.
+
+``load`` merges the base policy, the bundled rule files and any manifest
+overlays into one dict. Because that means re-reading and deep-merging several
+YAML files, the merged result is memoized in-process and on disk
+(``.ai_onboard/policy_cache.json``), keyed by each source file's stat
+fingerprint and content hash, so files are only re-parsed when they change.
+The resolved source list is kept with the cached policy: between
+revalidations (every ``SOURCE_RECHECK_SECONDS``) a cached policy is reused
+after a single stat of the manifest. Editing the manifest is seen at once,
+editing a rule file within that interval.
+
+``compile_policy`` turns the merged dict into an immutable ``CompiledPolicy``
+with precompiled glob matchers and a dispatch table keyed by change kind, so
+``evaluate`` on the per-operation safety path is a handful of dict lookups and
+regex matches.
+"""
+
+import copy
+import hashlib
+import json
 import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from ..base import utils
 
 # Set up logging for policy loading issues
 logger = logging.getLogger(__name__)
 
+POLICY_CACHE_FILE = "policy_cache.json"
+POLICY_CACHE_VERSION = 1
+
+# How long a cached policy's resolved sources are trusted without re-stating
+# them; the manifest itself is stat'ed on every call
+SOURCE_RECHECK_SECONDS = 2.0
+
+# Decisions ordered from least to most restrictive
+ACTION_ORDER = ("allow", "warn", "require_approval", "block")
+_ACTION_RANK = {a: i for i, a in enumerate(ACTION_ORDER)}
+
+# Change kinds used to dispatch rules; "any" rules apply to every change
+CHANGE_KINDS = ("delete", "modify", "any")
+
 
 def _read_policy_file(path: Path) -> Dict[str, Any]:
     if not path.exists():
@@ -46,47 +87,48 @@ def _read_policy_file(path: Path) -> Dict[str, Any]:
             with open(path, "r", encoding="utf-8") as f:
                 return yaml.safe_load(f) or {}
 
-        # Default JSON handling
-        return utils.read_json(path, default={}) or {}
+        # Default JSON handling. Read fresh rather than through the memoized
+        # utils.read_json: the result is merged in place and the file may have
+        # changed on disk since it was first read.
+        return json.loads(path.read_text(encoding="utf-8")) or {}
     except Exception as e:
         logger.error("Error loading policy file %s: %s", path, e)
         return {}
 
 
-def load(root: Path) -> dict:
-    manifest = utils.read_json(root / "ai_onboard.json", default={"policies": {}}) or {
-        "policies": {}
-    }
+def _policy_sources(root: Path) -> Tuple[Dict[str, Any], List[Path]]:
+    """Return the manifest and the policy files to merge, in merge order."""
+    manifest: Dict[str, Any] = {"policies": {}}
+    manifest_path = root / "ai_onboard.json"
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8")) or manifest
+        except (OSError, ValueError) as e:
+            logger.error("Error reading manifest %s: %s", manifest_path, e)
     base_default = "./ai_onboard/policies/base.yaml"
     base_path = Path(manifest.get("policies", {}).get("base", base_default))
-    base_full = root / base_path
-    # If configured base points to JSON but YAML exists, prefer configured;
-    # otherwise if default and JSON missing, try YAML
-    policy = _read_policy_file(base_full)
-
-    # Load self-preservation policies
-    self_preservation_path = root / "ai_onboard" / "policies" / "self_preservation.yaml"
-    if self_preservation_path.exists():
-        self_preservation_policy = _read_policy_file(self_preservation_path)
-        _merge(policy, self_preservation_policy)
-
-    # Load agent prompt rules
-    agent_rules_path = root / "ai_onboard" / "policies" / "agent_prompt_rules.yaml"
-    if agent_rules_path.exists():
-        agent_rules_policy = _read_policy_file(agent_rules_path)
-        _merge(policy, agent_rules_policy)
-
-    # Load vision interrogation rules
-    vision_interrogation_path = (
-        root / "ai_onboard" / "policies" / "vision_interrogation_rules.yaml"
-    )
-    if vision_interrogation_path.exists():
-        vision_interrogation_policy = _read_policy_file(vision_interrogation_path)
-        _merge(policy, vision_interrogation_policy)
+    sources = [root / base_path]
+
+    # Self-preservation, agent prompt and vision interrogation rules
+    policies_dir = root / "ai_onboard" / "policies"
+    for name in (
+        "self_preservation.yaml",
+        "agent_prompt_rules.yaml",
+        "vision_interrogation_rules.yaml",
+    ):
+        path = policies_dir / name
+        if path.exists():
+            sources.append(path)
 
     for overlay in manifest.get("policies", {}).get("overlays", []):
-        o = _read_policy_file(root / Path(overlay))
-        _merge(policy, o)
+        sources.append(root / overlay)
+    return manifest, sources
+
+
+def _merge_sources(sources: List[Path]) -> Dict[str, Any]:
+    policy = _read_policy_file(sources[0])
+    for path in sources[1:]:
+        _merge(policy, _read_policy_file(path))
     # Ensure scoring defaults present
     policy.setdefault(
         "scoring",
@@ -96,6 +138,150 @@ def load(root: Path) -> dict:
     return policy
 
 
+def _stat_key(paths: List[Path]) -> Tuple[Tuple[str, Optional[int], int], ...]:
+    key = []
+    for path in paths:
+        try:
+            st = path.stat()
+            key.append((str(path), st.st_mtime_ns, st.st_size))
+        except (OSError, TypeError, ValueError):
+            key.append((str(path), None, 0))
+    return tuple(key)
+
+
+def _content_key(paths: List[Path]) -> str:
+    """Hash of every source file's content, in merge order."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(str(path).encode("utf-8"))
+        try:
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+        except (OSError, TypeError, ValueError):
+            h.update(b"<missing>")
+    return h.hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    # The manifest's fingerprint comes first, then the sources' in merge order
+    stat_key: Tuple[Tuple[str, Optional[int], int], ...]
+    content_key: str
+    policy: Dict[str, Any]
+    sources: List[Path]
+    checked_at: float
+    compiled: Optional["CompiledPolicy"] = None
+
+
+_policy_cache: Dict[str, _CacheEntry] = {}
+_policy_cache_lock = threading.Lock()
+
+
+def _disk_cache_path(root: Path) -> Path:
+    return root / ".ai_onboard" / POLICY_CACHE_FILE
+
+
+def _read_disk_cache(root: Path, content_key: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(_disk_cache_path(root).read_text(encoding="utf-8"))
+    except (OSError, ValueError, TypeError):
+        return None
+    if (
+        isinstance(data, dict)
+        and data.get("version") == POLICY_CACHE_VERSION
+        and data.get("content_key") == content_key
+        and isinstance(data.get("policy"), dict)
+    ):
+        return data["policy"]
+    return None
+
+
+def _write_disk_cache(root: Path, content_key: str, policy: Dict[str, Any]) -> None:
+    # Only cache inside an existing .ai_onboard directory; never create one
+    cache_dir = root / ".ai_onboard"
+    try:
+        if not cache_dir.is_dir():
+            return
+        path = _disk_cache_path(root)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "version": POLICY_CACHE_VERSION,
+                    "content_key": content_key,
+                    "policy": policy,
+                },
+                ensure_ascii=False,
+                separators=(",", ":"),
+                default=str,
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write policy cache for %s: %s", root, e)
+
+
+def _load_entry(root: Path) -> _CacheEntry:
+    """Return the memoized merged policy for ``root``, reloading on change."""
+    manifest_path = root / "ai_onboard.json"
+    cache_key = str(root)
+    now = time.monotonic()
+
+    with _policy_cache_lock:
+        entry = _policy_cache.get(cache_key)
+    manifest_key = _stat_key([manifest_path])[0]
+    if entry is not None and manifest_key == entry.stat_key[0]:
+        if now - entry.checked_at < SOURCE_RECHECK_SECONDS:
+            return entry
+        # Only the manifest changes which sources are merged
+        sources = entry.sources
+    else:
+        _, sources = _policy_sources(root)
+    stat_key = _stat_key([manifest_path] + sources)
+    if entry is not None and entry.stat_key == stat_key:
+        entry.checked_at = now
+        return entry
+
+    # Something was touched; only re-parse if the content actually changed
+    content_key = _content_key([manifest_path] + sources)
+    if entry is not None and entry.content_key == content_key:
+        entry.stat_key = stat_key
+        entry.sources = sources
+        entry.checked_at = now
+        return entry
+
+    policy = _read_disk_cache(root, content_key)
+    if policy is None:
+        policy = _merge_sources(sources)
+        _write_disk_cache(root, content_key, policy)
+
+    entry = _CacheEntry(
+        stat_key=stat_key,
+        content_key=content_key,
+        policy=policy,
+        sources=sources,
+        checked_at=now,
+    )
+    with _policy_cache_lock:
+        _policy_cache[cache_key] = entry
+    return entry
+
+
+def clear_cache() -> None:
+    """Drop the in-process policy cache (the on-disk cache is content-keyed)."""
+    with _policy_cache_lock:
+        _policy_cache.clear()
+
+
+def load(root: Path) -> dict:
+    """Load the merged policy for ``root``.
+
+    Returns a private copy so callers may mutate it without affecting the
+    cached policy.
+    """
+    return copy.deepcopy(_load_entry(root).policy)
+
+
 def _merge(dst: dict, src: dict) -> None:
     for k, v in src.items():
         if isinstance(v, list):
@@ -105,3 +291,241 @@ def _merge(dst: dict, src: dict) -> None:
             _merge(dst[k], v)
         else:
             dst[k] = v
+
+
+# ----------------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------------
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a path glob to a regex; ``**/`` matches zero or more dirs."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def _compile_globs(patterns: Any) -> "re.Pattern[str]":
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    alternatives = "|".join(f"(?:{_glob_to_regex(p)})" for p in patterns or [])
+    return re.compile(rf"\A(?:{alternatives})\Z" if alternatives else r"(?!)")
+
+
+def _normalize_path(path: str) -> str:
+    path = str(path).replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+Matcher = Callable[[Dict[str, Any]], bool]
+
+
+def _compile_condition(cond: Any) -> Tuple[Matcher, frozenset]:
+    """Compile one condition node to a matcher and the change kinds it needs.
+
+    Supported leaves: ``deletes_globs``, ``modifies_globs``, ``files_gt``,
+    ``lines_gt``, ``touches_lang_any`` and ``operation``. ``any``/``all``
+    nodes combine children.
+    """
+    if not isinstance(cond, dict) or not cond:
+        return (lambda change: False), frozenset()
+
+    matchers: List[Matcher] = []
+    kinds: set = set()
+    for key, value in cond.items():
+        if key in ("any", "all"):
+            children = [_compile_condition(c) for c in value or []]
+            funcs = [c[0] for c in children]
+            child_kinds = [c[1] for c in children]
+            if key == "any":
+                matchers.append(lambda ch, fs=funcs: any(f(ch) for f in fs))
+                for child in child_kinds:
+                    kinds.update(child)
+            else:
+                matchers.append(lambda ch, fs=funcs: all(f(ch) for f in fs))
+                # An "all" needs every child's kind; dispatch on the narrowest
+                narrowed = [k for k in child_kinds if k and "any" not in k]
+                kinds.update(narrowed[0] if narrowed else {"any"})
+        elif key == "deletes_globs":
+            rx = _compile_globs(value)
+            matchers.append(lambda ch, rx=rx: any(rx.match(p) for p in ch["deletes"]))
+            kinds.add("delete")
+        elif key == "modifies_globs":
+            rx = _compile_globs(value)
+            matchers.append(
+                lambda ch, rx=rx: any(rx.match(p) for p in ch["modifies"])
+            )
+            kinds.add("modify")
+        elif key == "files_gt":
+            limit = int(value)
+            matchers.append(lambda ch, n=limit: ch["files"] > n)
+            kinds.add("any")
+        elif key == "lines_gt":
+            limit = int(value)
+            matchers.append(lambda ch, n=limit: ch["lines"] > n)
+            kinds.add("any")
+        elif key == "touches_lang_any":
+            langs = frozenset(str(v).lower().lstrip(".") for v in value or [])
+            matchers.append(lambda ch, ls=langs: not ls.isdisjoint(ch["languages"]))
+            kinds.add("any")
+        elif key == "operation":
+            ops = frozenset([value] if isinstance(value, str) else value or [])
+            matchers.append(lambda ch, ops=ops: ch["operation"] in ops)
+            kinds.add("any")
+        else:
+            logger.debug("Unknown policy condition %r ignored", key)
+            return (lambda change: False), frozenset()
+
+    if len(matchers) == 1:
+        return matchers[0], frozenset(kinds)
+    return (lambda ch, ms=tuple(matchers): all(m(ch) for m in ms)), frozenset(kinds)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A policy rule with its condition precompiled to a matcher."""
+
+    rule_id: str
+    action: str
+    message: str
+    severity: Optional[str]
+    matcher: Matcher
+    kinds: frozenset
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Immutable, evaluation-ready form of a merged policy."""
+
+    content_key: str
+    rules: Tuple[CompiledRule, ...]
+    dispatch: Mapping[str, Tuple[CompiledRule, ...]]
+    scoring: Mapping[str, Any]
+    defaults: Mapping[str, Any]
+
+
+def compile_rules(policy: Dict[str, Any], content_key: str = "") -> CompiledPolicy:
+    """Compile a merged policy dict into a ``CompiledPolicy``."""
+    rules: List[CompiledRule] = []
+    for raw in policy.get("rules", []) or []:
+        if not isinstance(raw, dict) or "id" not in raw:
+            continue
+        matcher, kinds = _compile_condition(raw.get("conditions") or {})
+        if not kinds:
+            continue
+        rules.append(
+            CompiledRule(
+                rule_id=str(raw["id"]),
+                action=str(raw.get("action", "warn")),
+                message=str(raw.get("message", "")),
+                severity=raw.get("severity"),
+                matcher=matcher,
+                kinds=kinds,
+            )
+        )
+
+    dispatch: Dict[str, Tuple[CompiledRule, ...]] = {}
+    for kind in CHANGE_KINDS:
+        dispatch[kind] = tuple(r for r in rules if kind in r.kinds or "any" in r.kinds)
+
+    return CompiledPolicy(
+        content_key=content_key,
+        rules=tuple(rules),
+        dispatch=MappingProxyType(dispatch),
+        scoring=MappingProxyType(dict(policy.get("scoring") or {})),
+        defaults=MappingProxyType(dict(policy.get("defaults") or {})),
+    )
+
+
+def compile_policy(root: Path) -> CompiledPolicy:
+    """Return the compiled policy for ``root``, recompiling only on change."""
+    entry = _load_entry(root)
+    compiled = entry.compiled
+    if compiled is None or compiled.content_key != entry.content_key:
+        compiled = compile_rules(entry.policy, entry.content_key)
+        entry.compiled = compiled
+    return compiled
+
+
+# ----------------------------------------------------------------------------
+# Evaluation
+# ----------------------------------------------------------------------------
+
+
+def _normalize_change(change: Dict[str, Any]) -> Dict[str, Any]:
+    deletes = [_normalize_path(p) for p in change.get("deletes", []) or []]
+    modifies = [_normalize_path(p) for p in change.get("modifies", []) or []]
+    languages = change.get("languages")
+    if languages is None:
+        languages = {
+            p.rsplit(".", 1)[-1].lower() for p in deletes + modifies if "." in p
+        }
+    return {
+        "operation": change.get("operation", ""),
+        "deletes": deletes,
+        "modifies": modifies,
+        "files": int(change.get("files", len(set(deletes) | set(modifies))) or 0),
+        "lines": int(change.get("lines", 0) or 0),
+        "languages": frozenset(str(lang).lower() for lang in languages),
+    }
+
+
+def evaluate(compiled: CompiledPolicy, change: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate a proposed change against a compiled policy.
+
+    ``change`` keys (all optional): ``operation``, ``deletes`` and ``modifies``
+    (lists of paths relative to the project root), ``files``, ``lines`` and
+    ``languages``. Returns the most restrictive action and the rules that hit.
+    """
+    ch = _normalize_change(change)
+    if ch["deletes"]:
+        candidates = compiled.dispatch["delete"]
+        if ch["modifies"]:
+            seen = set(id(r) for r in candidates)
+            candidates = candidates + tuple(
+                r for r in compiled.dispatch["modify"] if id(r) not in seen
+            )
+    elif ch["modifies"]:
+        candidates = compiled.dispatch["modify"]
+    else:
+        candidates = compiled.dispatch["any"]
+
+    hits = []
+    decision = "allow"
+    for rule in candidates:
+        if rule.matcher(ch):
+            hits.append(
+                {
+                    "rule": rule.rule_id,
+                    "action": rule.action,
+                    "message": rule.message,
+                    "severity": rule.severity,
+                }
+            )
+            if _ACTION_RANK.get(rule.action, 1) > _ACTION_RANK[decision]:
+                decision = rule.action
+    return {"decision": decision, "hits": hits}
+
+
+def check(root: Path, change: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate ``change`` against the (cached) compiled policy for ``root``."""
+    return evaluate(compile_policy(root), change)
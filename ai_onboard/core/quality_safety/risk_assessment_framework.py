@@ -5,12 +5,12 @@ This module provides comprehensive risk assessment capabilities for evaluating
 the safety and impact of codebase organization changes before implementation.
 """
 
-import ast
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional
 
 from ..base.common_imports import Any, Dict, Enum, List, Path, dataclass, field
+from .import_graph import ImportGraph, get_import_graph
 
 # Import moved to function level to avoid circular imports
 
@@ -118,9 +118,8 @@ class RiskAssessmentFramework:
             LikelihoodLevel.VERY_LIKELY: 5,
         }
 
-        # Import analysis cache
-        self._import_cache: Dict[str, Set[str]] = {}
-        self._reverse_import_cache: Dict[str, Set[str]] = {}
+        # Shared import graph, refreshed once per assessment
+        self._import_graph: Optional[ImportGraph] = None
 
     def assess_change_risks(
         self,
@@ -148,6 +147,10 @@ class RiskAssessmentFramework:
 
         tracker = get_tool_tracker(self.root_path)
 
+        if include_dependencies or include_impact_analysis:
+            # One incremental refresh covers every change in the plan
+            self._import_graph = get_import_graph(self.root_path)
+
         for change in changes:
             result = self._assess_single_change(
                 change, include_dependencies, include_impact_analysis
@@ -267,6 +270,7 @@ class RiskAssessmentFramework:
             "reverse_dependencies": [],
             "external_dependencies": [],
             "critical_paths": [],
+            "transitive_dependents": [],
         }
 
         for file_path in change.affected_files:
@@ -278,10 +282,16 @@ class RiskAssessmentFramework:
                 # Find files that import this file
                 reverse_deps = self._find_reverse_dependencies(file_path)
                 analysis["reverse_dependencies"].extend(reverse_deps)
+                analysis["transitive_dependents"].extend(
+                    self._find_transitive_dependents(file_path)
+                )
 
         # Remove duplicates
         analysis["import_dependencies"] = list(set(analysis["import_dependencies"]))
         analysis["reverse_dependencies"] = list(set(analysis["reverse_dependencies"]))
+        analysis["transitive_dependents"] = list(
+            set(analysis["transitive_dependents"])
+        )
 
         # Identify critical paths (files with many dependencies)
         critical_threshold = 5
@@ -342,63 +352,31 @@ class RiskAssessmentFramework:
 
         return impact
 
-    def _analyze_file_imports(self, file_path: str) -> List[str]:
-        """Analyze import statements in a Python file."""
-        if file_path in self._import_cache:
-            return list(self._import_cache[file_path])
-
-        imports = []
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            tree = ast.parse(content, filename=file_path)
+    @property
+    def import_graph(self) -> ImportGraph:
+        if self._import_graph is None:
+            self._import_graph = get_import_graph(self.root_path)
+        return self._import_graph
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name.split(".")[0])
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module.split(".")[0])
-
-        except Exception:
-            pass  # Skip files that can't be parsed
-
-        # Cache the results
-        self._import_cache[file_path] = set(imports)
-
-        return imports
+    def _analyze_file_imports(self, file_path: str) -> List[str]:
+        """Top-level names of the modules a Python file imports."""
+        path = self._graph_path(file_path)
+        imports = self.import_graph.raw_imports(path)
+        return sorted({name.split(".")[0] for name in imports})
 
     def _find_reverse_dependencies(self, file_path: str) -> List[str]:
         """Find files that import the given file."""
-        if file_path in self._reverse_import_cache:
-            return list(self._reverse_import_cache[file_path])
-
-        reverse_deps = []
-        module_name = self._file_to_module_name(file_path)
-
-        # Walk through all Python files
-        for root, dirs, files in os.walk(self.root_path):
-            for file in files:
-                if file.endswith(".py"):
-                    full_path = os.path.join(root, file)
-                    if full_path != file_path:  # Don't check self-imports
-                        imports = self._analyze_file_imports(full_path)
-                        if module_name in imports:
-                            reverse_deps.append(full_path)
-
-        # Cache the results
-        self._reverse_import_cache[file_path] = set(reverse_deps)
-
-        return reverse_deps
-
-    def _file_to_module_name(self, file_path: str) -> str:
-        """Convert file path to Python module name."""
-        rel_path = os.path.relpath(file_path, self.root_path)
-        if rel_path.endswith(".py"):
-            rel_path = rel_path[:-3]
-        return rel_path.replace(os.sep, ".")
+        path = self._graph_path(file_path)
+        return sorted(str(p) for p in self.import_graph.importers(path))
+
+    def _find_transitive_dependents(self, file_path: str) -> List[str]:
+        """Find files that import the given file directly or transitively."""
+        path = self._graph_path(file_path)
+        return sorted(str(p) for p in self.import_graph.impact_set(path))
+
+    def _graph_path(self, file_path: str) -> Path:
+        """Resolve a change path the way the file system would."""
+        return Path(os.path.abspath(file_path))
 
     def _calculate_mitigation_effectiveness(self, change: OrganizationChange) -> float:
         """Calculate how effective the mitigation strategies are."""
@@ -16,7 +16,6 @@ CRITICAL SAFETY PRINCIPLES:
 5. ALWAYS provide clear, unambiguous risk assessments
 """
 
-import hashlib
 import json
 import secrets
 import shutil
@@ -27,6 +26,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from ..utilities.unicode_utils import safe_print
+from .backup_engine import BackupEngine
+from .file_scan import FileHashCache, TreeScan, scan_tree
 
 
 class CleanupRiskLevel(Enum):
@@ -92,6 +93,9 @@ class UltraSafeCleanupEngine:
     def __init__(self, root: Path):
         self.root = root
         self.operation_log = root / ".ai_onboard" / "cleanup_operations.jsonl"
+        self.hash_cache = FileHashCache(root / ".ai_onboard" / "file_hashes.json")
+        self.last_scan: Optional[TreeScan] = None
+        self.backup_engine = BackupEngine(root, hash_cache=self.hash_cache)
 
         # CRITICAL PROTECTION - These files can NEVER be deleted
         self.critical_protections = {
@@ -157,29 +161,50 @@ class UltraSafeCleanupEngine:
         Returns only files that are SAFE to consider for cleanup.
         NEVER returns critical system files.
         """
+        # One pruned walk of the root also covers .ai_onboard/backups and
+        # .ai_onboard/logs, which used to be walked a second time
+        scan = scan_tree(self.root)
+        self.last_scan = scan
+
+        candidates = []
+        for entry in scan.files:
+            target = self._classify_file(entry.path)
+            if target is not None:
+                target.size_bytes = entry.size
+                target.last_modified = datetime.fromtimestamp(entry.mtime_ns / 1e9)
+                candidates.append((target, entry))
+
+        # Hash all targets together: unchanged files come from the cache and
+        # the rest are streamed on a thread pool
+        hashes = self.hash_cache.hash_files(
+            (entry for _, entry in candidates), prune=True
+        )
         targets = []
-
-        # Scan common cleanup locations
-        scan_paths = [
-            self.root,  # Root directory
-            self.root / ".ai_onboard" / "backups",  # Old backups
-            self.root / ".ai_onboard" / "logs",  # Old logs
-        ]
-
-        for scan_path in scan_paths:
-            if not scan_path.exists():
-                continue
-
-            for path in scan_path.rglob("*"):
-                if path.is_file():
-                    target = self._analyze_file_for_cleanup(path)
-                    if target and target.risk_level != CleanupRiskLevel.CRITICAL:
-                        targets.append(target)
-
+        for target, entry in candidates:
+            target.file_hash = hashes[entry.path]
+            targets.append(target)
         return targets
 
     def _analyze_file_for_cleanup(self, path: Path) -> Optional[CleanupTarget]:
         """Analyze a single file for cleanup potential."""
+        try:
+            target = self._classify_file(path)
+            if target is None:
+                return None
+
+            # Get file information
+            stat = path.stat()
+            target.size_bytes = stat.st_size
+            target.last_modified = datetime.fromtimestamp(stat.st_mtime_ns / 1e9)
+            target.file_hash = self._calculate_file_hash(path)
+            return target
+
+        except OSError:
+            # If we can't analyze the file, skip it
+            return None
+
+    def _classify_file(self, path: Path) -> Optional[CleanupTarget]:
+        """Risk-classify a file; None for critical or unanalyzable files."""
         try:
             # NEVER consider critical files
             rel_path = path.relative_to(self.root)
@@ -208,21 +233,14 @@ class UltraSafeCleanupEngine:
             if risk_level == CleanupRiskLevel.CRITICAL:
                 return None
 
-            # Get file information
-            stat = path.stat()
-            file_hash = self._calculate_file_hash(path)
-
             return CleanupTarget(
                 path=path,
                 risk_level=risk_level,
                 reason=self._get_cleanup_reason(path, risk_level),
-                size_bytes=stat.st_size,
-                last_modified=datetime.fromtimestamp(stat.st_mtime),
-                file_hash=file_hash,
             )
 
-        except (OSError, ValueError):
-            # If we can't analyze the file, skip it
+        except ValueError:
+            # Outside the project root
             return None
 
     def _get_cleanup_reason(self, path: Path, risk_level: CleanupRiskLevel) -> str:
@@ -258,11 +276,7 @@ class UltraSafeCleanupEngine:
 
     def _calculate_file_hash(self, path: Path) -> str:
         """Calculate SHA256 hash of file for integrity checking."""
-        try:
-            with open(path, "rb") as f:
-                return hashlib.sha256(f.read()).hexdigest()
-        except OSError:
-            return "unreadable"
+        return self.hash_cache.hash_path(path)
 
     def create_cleanup_proposal(self, targets: List[CleanupTarget]) -> CleanupOperation:
         """
@@ -479,6 +493,11 @@ class UltraSafeCleanupEngine:
                 errors.append(error_msg)
                 operation.execution_log.append(error_msg)
 
+        # Targets that could not be deleted must not share an inode with
+        # their backup objects
+        if errors and backup_manifest.get("snapshot"):
+            self.backup_engine.release_links(backup_manifest["snapshot"])
+
         # Validate system integrity
         safe_print("🔍 Validating system integrity after cleanup...")
         integrity_ok = self._validate_system_integrity()
@@ -509,48 +528,37 @@ class UltraSafeCleanupEngine:
         )
 
     def _create_backup(self, operation: CleanupOperation) -> Dict[str, Any]:
-        """Create a comprehensive backup of all targets."""
+        """Create a comprehensive backup of all targets.
+
+        Contents go to the shared backup object store; every target is about
+        to be deleted, so new content may be hardlinked rather than copied.
+        """
         backup_dir = (
             self.root / ".ai_onboard" / "ultra_safe_backups" / operation.operation_id
         )
         backup_dir.mkdir(parents=True, exist_ok=True)
 
+        existing = [t for t in operation.targets if t.path.exists()]
+        snapshot = self.backup_engine.snapshot(
+            (t.path for t in existing), allow_hardlink=True
+        )
+
         manifest: Dict[str, Any] = {
             "operation_id": operation.operation_id,
             "created_at": datetime.now().isoformat(),
-            "targets": [],
+            "targets": [
+                {
+                    "original_path": str(t.path.relative_to(self.root)),
+                    "file_hash": t.file_hash,
+                    "size_bytes": t.size_bytes,
+                }
+                for t in existing
+            ],
             "backup_location": str(backup_dir),
+            "snapshot": snapshot,
         }
-
-        for target in operation.targets:
-            if target.path.exists():
-                # Create backup path
-                rel_path = target.path.relative_to(self.root)
-                backup_path = backup_dir / rel_path.name
-
-                try:
-                    if target.path.is_file():
-                        shutil.copy2(target.path, backup_path)
-                    else:
-                        shutil.copytree(target.path, backup_path, dirs_exist_ok=True)
-
-                    manifest["targets"].append(
-                        {
-                            "original_path": str(rel_path),
-                            "backup_path": str(backup_path.relative_to(self.root)),
-                            "file_hash": target.file_hash,
-                            "size_bytes": target.size_bytes,
-                        }
-                    )
-
-                except Exception as e:
-                    manifest["targets"].append(
-                        {
-                            "original_path": str(rel_path),
-                            "error": str(e),
-                            "backup_failed": True,
-                        }
-                    )
+        for error in snapshot["errors"]:
+            manifest["targets"].append({"error": error, "backup_failed": True})
 
         # Save manifest
         manifest_path = backup_dir / "manifest.json"
@@ -595,6 +603,13 @@ class UltraSafeCleanupEngine:
         if not backup_dir.exists():
             return False
 
+        if "snapshot" in operation.backup_manifest:
+            result = self.backup_engine.restore(operation.backup_manifest["snapshot"])
+            for error in result["errors"]:
+                safe_print(f"❌ Rollback failed for {error}")
+            return not result["errors"]
+
+        # Backups written before the shared object store held full copies
         success_count = 0
         error_count = 0
 
@@ -6,18 +6,72 @@ making the planning process more adaptive to the actual project structure.
 """
 
 import os
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..base import utils
 
+CACHE_VERSION = 2
+
+# Vendored, generated and tool directories that are never walked
+PRUNED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".ai_onboard",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".tox",
+    ".venv",
+    "venv",
+    "node_modules",
+    "dist",
+    "build",
+}
+
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".jsx": "javascript",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+    ".cs": "csharp",
+    ".swift": "swift",
+    ".kt": "kotlin",
+}
+
+TEST_MARKERS = ("test_", "_test", ".test.", ".spec.")
+
+MAX_MODULES = 20
+
+# A directory modified this recently may change again within the same mtime
+# tick, so its listing is not trusted by the next run
+RACY_WINDOW_NS = 2_000_000_000
+
 
 class CodebaseAnalyzer:
-    """Analyzes existing codebase structure for intelligent planning."""
+    """Analyzes existing codebase structure for intelligent planning.
+
+    All structural facts come from one pruned walk that records a summary
+    per directory. The summaries are cached with each directory's
+    modification time: a later run stats every directory, reuses the
+    summaries of unchanged ones and lists only directories whose entries
+    changed.
+    """
 
     def __init__(self, root: Path):
         self.root = root
         self.analysis_cache_path = root / ".ai_onboard" / "codebase_analysis.json"
+        self.stats = {"scanned": 0, "reused": 0}
 
     def analyze_codebase_structure(self) -> Dict[str, Any]:
         """
@@ -26,54 +80,150 @@ class CodebaseAnalyzer:
         Returns:
             Comprehensive analysis of project structure
         """
-        # Check cache first
-        cached_analysis = self._load_cached_analysis()
-        if cached_analysis:
-            return cached_analysis
+        cache = self._load_cache()
+        directories, changed = self._scan(cache.get("directories", {}))
+        facts = self._aggregate(directories)
 
         analysis = {
-            "languages": self._detect_languages(),
+            "languages": facts["languages"],
             "frameworks": self._detect_frameworks(),
-            "modules": self._analyze_modules(),
-            "test_coverage": self._analyze_test_coverage(),
-            "complexity_score": self._calculate_complexity_score(),
-            "file_structure": self._analyze_file_structure(),
+            "modules": facts["modules"],
+            "test_coverage": facts["test_coverage"],
+            "complexity_score": 0.0,
+            "file_structure": facts["file_structure"],
             "dependencies": self._analyze_dependencies(),
         }
+        analysis["complexity_score"] = self._calculate_complexity_score(analysis)
 
-        # Cache the analysis
-        self._save_analysis_cache(analysis)
+        # Cache the directory summaries
+        if changed or cache.get("analysis") != analysis:
+            self._save_analysis_cache(analysis, directories)
 
         return analysis
 
-    def _detect_languages(self) -> List[str]:
-        """Detect programming languages used in the project."""
+    def _scan(
+        self, cached: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """Summaries of every walked directory, keyed by relative posix path.
+
+        Returns the summaries and whether any of them changed.
+        """
+        directories: Dict[str, Dict[str, Any]] = {}
+        changed = False
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.root, rel) if rel else str(self.root)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            summary = cached.get(rel)
+            if summary is not None and summary.get("mtime_ns") == mtime_ns:
+                self.stats["reused"] += 1
+            else:
+                summary = self._scan_directory(rel, path, mtime_ns)
+                self.stats["scanned"] += 1
+                changed = True
+            directories[rel] = summary
+            stack.extend(
+                f"{rel}/{name}" if rel else name for name in summary["subdirs"]
+            )
+        return directories, changed or len(directories) != len(cached)
+
+    def _scan_directory(self, rel: str, path: str, mtime_ns: int) -> Dict[str, Any]:
+        """List one directory and summarize its files."""
+        subdirs: List[str] = []
+        files = 0
+        test_files = 0
+        languages = set()
+        modules = set()
+        depth = rel.count("/") + 1 if rel else 0
+        prefix = f"{rel}/" if rel else ""
+
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            entries = []
+        for entry in entries:
+            name = entry.name
+            try:
+                if entry.is_dir():
+                    # Symlinked directories are listed but not followed
+                    if name not in PRUNED_DIRS and not entry.is_symlink():
+                        subdirs.append(name)
+                    continue
+            except OSError:
+                continue
+
+            files += 1
+            lower = name.lower()
+            if any(marker in lower for marker in TEST_MARKERS):
+                test_files += 1
+            language = LANGUAGE_EXTENSIONS.get(os.path.splitext(lower)[1])
+            if language:
+                languages.add(language)
+
+            # Top-level Python modules and all JavaScript modules
+            if name.endswith(".py") and depth <= 2:
+                module_name = (prefix + name).replace("/", ".").replace(".py", "")
+                if module_name not in ["setup", "test", "conftest"]:
+                    modules.add(module_name)
+            elif name.endswith(".js"):
+                modules.add((prefix + name).replace("/", ".").replace(".js", ""))
+
+        if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+            mtime_ns = None  # List it again next time
+        return {
+            "mtime_ns": mtime_ns,
+            "subdirs": sorted(subdirs),
+            "files": files,
+            "test_files": test_files,
+            "languages": sorted(languages),
+            # Only the first modules can reach the overall top list
+            "modules": sorted(modules)[:MAX_MODULES],
+        }
+
+    def _aggregate(self, directories: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine directory summaries into project-wide facts."""
+        total_files = 0
+        test_files = 0
+        max_depth = 0
         languages = set()
-        extensions = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".tsx": "typescript",
-            ".jsx": "javascript",
-            ".java": "java",
-            ".cpp": "cpp",
-            ".c": "c",
-            ".go": "go",
-            ".rs": "rust",
-            ".rb": "ruby",
-            ".php": "php",
-            ".cs": "csharp",
-            ".swift": "swift",
-            ".kt": "kotlin",
+        modules = set()
+        for rel, summary in directories.items():
+            total_files += summary["files"]
+            test_files += summary["test_files"]
+            languages.update(summary["languages"])
+            modules.update(summary["modules"])
+            if rel:
+                max_depth = max(max_depth, rel.count("/") + 1)
+
+        total_directories = max(len(directories) - 1, 0)
+        return {
+            "languages": sorted(languages),
+            "modules": sorted(modules)[:MAX_MODULES],
+            "test_coverage": (
+                test_files / total_files * 100 if total_files > 0 else 0.0
+            ),
+            "file_structure": {
+                "total_files": total_files,
+                "total_directories": total_directories,
+                "max_depth": max_depth,
+                "avg_files_per_directory": (
+                    total_files / total_directories if total_directories > 0 else 0.0
+                ),
+            },
         }
 
-        for root_dir, _, files in os.walk(self.root):
-            for file in files:
-                ext = Path(file).suffix.lower()
-                if ext in extensions:
-                    languages.add(extensions[ext])
+    def _facts(self) -> Dict[str, Any]:
+        directories, _ = self._scan(self._load_cache().get("directories", {}))
+        return self._aggregate(directories)
 
-        return sorted(list(languages))
+    def _detect_languages(self) -> List[str]:
+        """Detect programming languages used in the project."""
+        return self._facts()["languages"]
 
     def _detect_frameworks(self) -> List[str]:
         """Detect frameworks and libraries used in the project."""
@@ -100,58 +250,22 @@ class CodebaseAnalyzer:
 
     def _analyze_modules(self) -> List[str]:
         """Analyze project modules and components."""
-        modules = []
-
-        # Look for Python packages
-        for path in self.root.rglob("*.py"):
-            if path.parent.name != "__pycache__":
-                module_path = str(path.relative_to(self.root))
-                if module_path.count("/") <= 2:  # Top-level modules only
-                    module_name = module_path.replace("/", ".").replace(".py", "")
-                    if module_name not in ["setup", "test", "conftest"]:
-                        modules.append(module_name)
-
-        # Look for JavaScript/TypeScript modules
-        for path in self.root.rglob("*.js"):
-            if not any(x in str(path) for x in ["node_modules", "dist", "build"]):
-                module_name = (
-                    str(path.relative_to(self.root))
-                    .replace("/", ".")
-                    .replace(".js", "")
-                )
-                modules.append(module_name)
-
-        return sorted(list(set(modules)))[:20]  # Limit to top 20
+        return self._facts()["modules"]
 
     def _analyze_test_coverage(self) -> float:
         """Analyze test coverage based on file patterns."""
-        total_files = 0
-        test_files = 0
+        return self._facts()["test_coverage"]
 
-        for root_dir, _, files in os.walk(self.root):
-            # Skip common directories
-            if any(
-                skip in root_dir
-                for skip in [".git", "__pycache__", "node_modules", "dist", "build"]
-            ):
-                continue
-
-            for file in files:
-                total_files += 1
-                if any(
-                    test_pattern in file.lower()
-                    for test_pattern in ["test_", "_test", ".test.", ".spec."]
-                ):
-                    test_files += 1
-
-        return (test_files / total_files * 100) if total_files > 0 else 0.0
-
-    def _calculate_complexity_score(self) -> float:
+    def _calculate_complexity_score(
+        self, analysis: Optional[Dict[str, Any]] = None
+    ) -> float:
         """Calculate a complexity score based on project characteristics."""
+        if analysis is None:
+            analysis = {**self._facts(), "frameworks": self._detect_frameworks()}
         score = 0.0
 
         # Language complexity
-        languages = self._detect_languages()
+        languages = analysis["languages"]
         if "python" in languages:
             score += 0.3
         if "typescript" in languages:
@@ -160,44 +274,25 @@ class CodebaseAnalyzer:
             score += 0.1
 
         # Framework complexity
-        frameworks = self._detect_frameworks()
+        frameworks = analysis["frameworks"]
         if "react" in frameworks:
             score += 0.2
         if "django" in frameworks:
             score += 0.3
 
         # Module count
-        modules = self._analyze_modules()
+        modules = analysis["modules"]
         score += min(len(modules) * 0.1, 1.0)
 
         # Test coverage
-        test_coverage = self._analyze_test_coverage()
+        test_coverage = analysis["test_coverage"]
         score += test_coverage / 100 * 0.2
 
         return min(score, 1.0)
 
     def _analyze_file_structure(self) -> Dict[str, Any]:
         """Analyze the overall file structure."""
-        structure = {
-            "total_files": 0,
-            "total_directories": 0,
-            "max_depth": 0,
-            "avg_files_per_directory": 0.0,
-        }
-
-        for root_dir, dirs, files in os.walk(self.root):
-            structure["total_directories"] += len(dirs)
-            structure["total_files"] += len(files)
-
-            depth = len(Path(root_dir).relative_to(self.root).parts)
-            structure["max_depth"] = max(structure["max_depth"], depth)
-
-        if structure["total_directories"] > 0:
-            structure["avg_files_per_directory"] = (
-                structure["total_files"] / structure["total_directories"]
-            )
-
-        return structure
+        return self._facts()["file_structure"]
 
     def _analyze_dependencies(self) -> List[str]:
         """Analyze external dependencies."""
@@ -260,38 +355,31 @@ class CodebaseAnalyzer:
         """Check if a directory exists."""
         return (self.root / dirname).is_dir()
 
-    def _load_cached_analysis(self) -> Optional[Dict[str, Any]]:
-        """Load cached analysis if it exists and is recent."""
-        if not self.analysis_cache_path.exists():
-            return None
-
-        try:
-            cached_data = utils.read_json(self.analysis_cache_path)
-            cache_time = cached_data.get("cached_at")
-            if cache_time:
-                # Consider cache valid for 24 hours
-                from datetime import datetime, timedelta
-
-                cache_datetime = datetime.fromisoformat(
-                    cache_time.replace("Z", "+00:00")
-                )
-                if datetime.now(cache_datetime.tzinfo) - cache_datetime < timedelta(
-                    hours=24
-                ):
-                    analysis_data = cached_data.get("analysis")
-                    return analysis_data if isinstance(analysis_data, dict) else None
-        except Exception:
-            pass
-
-        return None
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the cached directory summaries, if they match this layout."""
+        cached_data = utils.read_json(self.analysis_cache_path, default=None)
+        if (
+            not isinstance(cached_data, dict)
+            or cached_data.get("version") != CACHE_VERSION
+            or not isinstance(cached_data.get("directories"), dict)
+        ):
+            return {}
+        return cached_data
 
-    def _save_analysis_cache(self, analysis: Dict[str, Any]) -> None:
+    def _save_analysis_cache(
+        self, analysis: Dict[str, Any], directories: Dict[str, Dict[str, Any]]
+    ) -> None:
         """Save analysis to cache."""
         cache_data = {
+            "version": CACHE_VERSION,
             "cached_at": utils.now_iso(),
             "analysis": analysis,
+            "directories": directories,
         }
-        utils.write_json(self.analysis_cache_path, cache_data)
+        try:
+            utils.write_json(self.analysis_cache_path, cache_data, compact=True)
+        except OSError as e:
+            print(f"Warning: Failed to save codebase analysis cache: {e}")
 
 
 def analyze_codebase_structure(root: Path) -> Dict[str, Any]:
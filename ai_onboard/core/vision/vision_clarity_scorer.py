@@ -9,11 +9,214 @@ This system provides detailed clarity scoring for:
 - Scope boundary clarity
 
 The clarity score is used to determine if a project vision is ready for AI agent work.
+
+Every scoring lexicon is compiled once into a shared ``LexiconEngine``, which
+scans each response one time for all the indicators read from it; the five
+dimension scorers then only count set intersections. Scans are cached by
+text, so re-scoring after each interactive answer (or bulk re-scoring with
+``score_many``) only scans responses it has not seen.
 """
 
+import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+# Lexicon name -> indicators. Indicators match anywhere in the lower-cased
+# response, including inside longer words ("aim" in "claim")
+LEXICONS: Dict[str, List[str]] = {
+    "problem": [
+        "problem",
+        "issue",
+        "challenge",
+        "difficulty",
+        "pain",
+        "frustration",
+        "inefficiency",
+        "bottleneck",
+        "obstacle",
+    ],
+    "problem_specifics": [
+        "what",
+        "who",
+        "when",
+        "where",
+        "why",
+        "how",
+        "specific",
+        "particular",
+        "exact",
+        "precise",
+    ],
+    "vision": [
+        "vision",
+        "goal",
+        "objective",
+        "aim",
+        "purpose",
+        "mission",
+        "target",
+        "outcome",
+        "result",
+        "achievement",
+    ],
+    "vision_actions": [
+        "will",
+        "can",
+        "able",
+        "provide",
+        "deliver",
+        "create",
+        "build",
+        "develop",
+        "achieve",
+        "enable",
+        "allow",
+    ],
+    "vision_outcomes": [
+        "better",
+        "faster",
+        "easier",
+        "more",
+        "less",
+        "reduce",
+        "increase",
+        "improve",
+        "enhance",
+        "optimize",
+        "streamline",
+    ],
+    "user": [
+        "user",
+        "customer",
+        "client",
+        "stakeholder",
+        "beneficiary",
+        "audience",
+        "recipient",
+        "consumer",
+        "end-user",
+        "person",
+    ],
+    "user_characteristics": [
+        "developer",
+        "manager",
+        "student",
+        "business",
+        "technical",
+        "non-technical",
+        "beginner",
+        "expert",
+        "enterprise",
+        "startup",
+    ],
+    "user_needs": [
+        "need",
+        "want",
+        "require",
+        "expect",
+        "desire",
+        "goal",
+        "objective",
+        "benefit",
+        "advantage",
+        "value",
+    ],
+    # "Multiple user types" is read from lists and conjunctions
+    "user_lists": [",", "and"],
+    "objective": [
+        "objective",
+        "goal",
+        "target",
+        "metric",
+        "measure",
+        "success",
+        "criteria",
+        "outcome",
+        "deliverable",
+        "result",
+    ],
+    "objective_measures": [
+        "measure",
+        "metric",
+        "count",
+        "percentage",
+        "time",
+        "number",
+        "quantity",
+        "rate",
+        "speed",
+        "accuracy",
+    ],
+    "objective_targets": [
+        "target",
+        "goal",
+        "aim",
+        "objective",
+        "standard",
+        "benchmark",
+        "threshold",
+        "requirement",
+    ],
+    "objective_time": ["time", "deadline", "schedule", "timeline", "duration"],
+    "objective_quality": ["quality", "standard", "requirement", "specification"],
+    "scope": [
+        "scope",
+        "boundary",
+        "limit",
+        "constraint",
+        "include",
+        "exclude",
+        "focus",
+        "range",
+        "extent",
+        "coverage",
+    ],
+    "scope_inclusions": [
+        "include",
+        "feature",
+        "functionality",
+        "capability",
+        "component",
+        "module",
+        "service",
+        "integration",
+        "support",
+    ],
+    "scope_exclusions": [
+        "exclude",
+        "not include",
+        "out of scope",
+        "not part of",
+        "separate",
+        "future",
+        "phase 2",
+        "later",
+    ],
+    "scope_rationale": ["because"],
+    "scope_phases": ["priority", "phase", "version", "release", "mvp"],
+}
+
+# Response key -> lexicons searched in that response
+FIELD_LEXICONS: Dict[str, Tuple[str, ...]] = {
+    "vc_01": ("problem", "problem_specifics"),
+    "vc_02": ("vision", "vision_actions", "vision_outcomes"),
+    "vc_03": ("user", "user_characteristics", "user_needs", "user_lists"),
+    "sc_01": (
+        "objective",
+        "objective_measures",
+        "objective_targets",
+        "objective_time",
+        "objective_quality",
+    ),
+    "sb_01": ("scope", "scope_inclusions", "scope_rationale", "scope_phases"),
+    "sb_02": ("scope", "scope_exclusions", "scope_rationale", "scope_phases"),
+}
+
+# str.isdigit also accepts non-ASCII digits such as superscripts; ASCII text
+# only needs the regex
+_ASCII_DIGIT = re.compile(r"[0-9]")
 
 
 class ClarityMetric(Enum):
@@ -49,88 +252,110 @@ class VisionClarityReport:
     summary: str = ""
 
 
+@dataclass(frozen=True)
+class TextFeatures:
+    """Everything the scorers need from one response, from a single scan."""
+
+    length: int
+    blank: bool
+    has_digit: bool
+    indicators: FrozenSet[str]
+
+
+class LexiconEngine:
+    """All scoring lexicons compiled once, merged per response field.
+
+    Each response is lower-cased and searched once for the deduplicated
+    indicators of every lexicon read from its field; results are memoized
+    by field and text.
+    """
+
+    def __init__(
+        self,
+        lexicons: Mapping[str, Iterable[str]],
+        field_lexicons: Mapping[str, Iterable[str]],
+        cache_size: int = 1024,
+    ):
+        self.lexicons: Dict[str, FrozenSet[str]] = {
+            name: frozenset(words) for name, words in lexicons.items()
+        }
+        self.fields: Dict[str, Tuple[str, ...]] = {
+            key: tuple(sorted(frozenset().union(*(self.lexicons[n] for n in names))))
+            for key, names in field_lexicons.items()
+        }
+        self.analyze = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, key: str, text: str) -> TextFeatures:
+        """Features of the response ``text`` given for field ``key``."""
+        text = text.lower()
+        return TextFeatures(
+            length=len(text),
+            blank=not text.strip(),
+            has_digit=_ASCII_DIGIT.search(text) is not None
+            or (not text.isascii() and any(char.isdigit() for char in set(text))),
+            indicators=frozenset(word for word in self.fields[key] if word in text),
+        )
+
+    def count(self, lexicon: str, *features: TextFeatures) -> int:
+        """Number of distinct ``lexicon`` indicators in any of ``features``."""
+        words = self.lexicons[lexicon]
+        if len(features) == 1:
+            return len(words & features[0].indicators)
+        return len(words & frozenset().union(*(f.indicators for f in features)))
+
+
+_lexicon_engine: Optional[LexiconEngine] = None
+
+
+def get_lexicon_engine() -> LexiconEngine:
+    """Get the shared engine compiled from ``LEXICONS``."""
+    global _lexicon_engine
+    if _lexicon_engine is None:
+        _lexicon_engine = LexiconEngine(LEXICONS, FIELD_LEXICONS)
+    return _lexicon_engine
+
+
 class VisionClarityScorer:
     """Advanced vision clarity scoring system."""
 
-    def __init__(self):
-        # Quality indicators for each metric
-        self.problem_indicators = [
-            r"problem",
-            r"issue",
-            r"challenge",
-            r"difficulty",
-            r"pain",
-            r"frustration",
-            r"inefficiency",
-            r"bottleneck",
-            r"obstacle",
-        ]
-
-        self.vision_indicators = [
-            r"vision",
-            r"goal",
-            r"objective",
-            r"aim",
-            r"purpose",
-            r"mission",
-            r"target",
-            r"outcome",
-            r"result",
-            r"achievement",
-        ]
-
-        self.user_indicators = [
-            r"user",
-            r"customer",
-            r"client",
-            r"stakeholder",
-            r"beneficiary",
-            r"audience",
-            r"recipient",
-            r"consumer",
-            r"end-user",
-            r"person",
-        ]
-
-        self.objective_indicators = [
-            r"objective",
-            r"goal",
-            r"target",
-            r"metric",
-            r"measure",
-            r"success",
-            r"criteria",
-            r"outcome",
-            r"deliverable",
-            r"result",
-        ]
-
-        self.scope_indicators = [
-            r"scope",
-            r"boundary",
-            r"limit",
-            r"constraint",
-            r"include",
-            r"exclude",
-            r"focus",
-            r"range",
-            r"extent",
-            r"coverage",
-        ]
+    def __init__(self, engine: Optional[LexiconEngine] = None):
+        self.engine = engine or get_lexicon_engine()
+
+    def analyze(self, responses: Mapping[str, Any]) -> Dict[str, TextFeatures]:
+        """Scan each scored response once, for all dimension scorers."""
+        analyze = self.engine.analyze
+        return {key: analyze(key, responses.get(key, "")) for key in self.engine.fields}
 
     def evaluate_problem_definition(self, responses: Dict[str, Any]) -> ClarityScore:
         """Evaluate clarity of problem definition."""
+        return self._problem_definition(self.analyze(responses))
+
+    def evaluate_vision_statement(self, responses: Dict[str, Any]) -> ClarityScore:
+        """Evaluate clarity of vision statement."""
+        return self._vision_statement(self.analyze(responses))
+
+    def evaluate_user_identification(self, responses: Dict[str, Any]) -> ClarityScore:
+        """Evaluate clarity of user/beneficiary identification."""
+        return self._user_identification(self.analyze(responses))
+
+    def evaluate_objective_definition(self, responses: Dict[str, Any]) -> ClarityScore:
+        """Evaluate clarity of objective definition."""
+        return self._objective_definition(self.analyze(responses))
+
+    def evaluate_scope_boundaries(self, responses: Dict[str, Any]) -> ClarityScore:
+        """Evaluate clarity of scope boundaries."""
+        return self._scope_boundaries(self.analyze(responses))
+
+    def _problem_definition(self, features: Dict[str, TextFeatures]) -> ClarityScore:
         score = 0.0
         confidence = 0.0
         issues = []
         strengths = []
         recommendations = []
 
-        # Get relevant responses
-        core_problem = responses.get("vc_01", "").lower()
-        vision_statement = responses.get("vc_02", "").lower()
+        core_problem = features["vc_01"]
 
-        if not core_problem.strip():
+        if core_problem.blank:
             issues.append("No core problem statement provided")
             return ClarityScore(
                 ClarityMetric.PROBLEM_DEFINITION,
@@ -141,28 +366,8 @@ class VisionClarityScorer:
                 recommendations,
             )
 
-        # Check for problem indicators
-        problem_matches = sum(
-            1 for indicator in self.problem_indicators if indicator in core_problem
-        )
-
-        # Check for specific problem details
-        specific_indicators = [
-            "what",
-            "who",
-            "when",
-            "where",
-            "why",
-            "how",
-            "specific",
-            "particular",
-            "exact",
-            "precise",
-        ]
-
-        specific_matches = sum(
-            1 for indicator in specific_indicators if indicator in core_problem
-        )
+        problem_matches = self.engine.count("problem", core_problem)
+        specific_matches = self.engine.count("problem_specifics", core_problem)
 
         # Calculate score based on indicators
         if problem_matches >= 2:
@@ -183,7 +388,7 @@ class VisionClarityScorer:
             issues.append("Problem description lacks specificity")
 
         # Check for quantification
-        if any(char.isdigit() for char in core_problem):
+        if core_problem.has_digit:
             score += 0.1
             strengths.append("Quantitative problem details included")
         else:
@@ -192,10 +397,10 @@ class VisionClarityScorer:
             )
 
         # Check length and detail
-        if len(core_problem) >= 50:
+        if core_problem.length >= 50:
             score += 0.2
             strengths.append("Detailed problem description provided")
-        elif len(core_problem) >= 20:
+        elif core_problem.length >= 20:
             score += 0.1
         else:
             issues.append("Problem description too brief")
@@ -212,18 +417,16 @@ class VisionClarityScorer:
             recommendations,
         )
 
-    def evaluate_vision_statement(self, responses: Dict[str, Any]) -> ClarityScore:
-        """Evaluate clarity of vision statement."""
+    def _vision_statement(self, features: Dict[str, TextFeatures]) -> ClarityScore:
         score = 0.0
         confidence = 0.0
         issues = []
         strengths = []
         recommendations = []
 
-        # Get relevant responses
-        vision_statement = responses.get("vc_02", "").lower()
+        vision_statement = features["vc_02"]
 
-        if not vision_statement.strip():
+        if vision_statement.blank:
             issues.append("No vision statement provided")
             return ClarityScore(
                 ClarityMetric.VISION_STATEMENT,
@@ -234,48 +437,9 @@ class VisionClarityScorer:
                 recommendations,
             )
 
-        # Check for vision indicators
-        vision_matches = sum(
-            1 for indicator in self.vision_indicators if indicator in vision_statement
-        )
-
-        # Check for action-oriented language
-        action_indicators = [
-            "will",
-            "can",
-            "able",
-            "provide",
-            "deliver",
-            "create",
-            "build",
-            "develop",
-            "achieve",
-            "enable",
-            "allow",
-        ]
-
-        action_matches = sum(
-            1 for indicator in action_indicators if indicator in vision_statement
-        )
-
-        # Check for measurable outcomes
-        measurable_indicators = [
-            "better",
-            "faster",
-            "easier",
-            "more",
-            "less",
-            "reduce",
-            "increase",
-            "improve",
-            "enhance",
-            "optimize",
-            "streamline",
-        ]
-
-        measurable_matches = sum(
-            1 for indicator in measurable_indicators if indicator in vision_statement
-        )
+        vision_matches = self.engine.count("vision", vision_statement)
+        action_matches = self.engine.count("vision_actions", vision_statement)
+        measurable_matches = self.engine.count("vision_outcomes", vision_statement)
 
         # Calculate score
         if vision_matches >= 2:
@@ -305,10 +469,10 @@ class VisionClarityScorer:
             )
 
         # Check length and specificity
-        if len(vision_statement) >= 100:
+        if vision_statement.length >= 100:
             score += 0.2
             strengths.append("Comprehensive vision statement")
-        elif len(vision_statement) >= 50:
+        elif vision_statement.length >= 50:
             score += 0.1
         else:
             issues.append("Vision statement too brief")
@@ -325,18 +489,16 @@ class VisionClarityScorer:
             recommendations,
         )
 
-    def evaluate_user_identification(self, responses: Dict[str, Any]) -> ClarityScore:
-        """Evaluate clarity of user/beneficiary identification."""
+    def _user_identification(self, features: Dict[str, TextFeatures]) -> ClarityScore:
         score = 0.0
         confidence = 0.0
         issues = []
         strengths = []
         recommendations = []
 
-        # Get relevant responses
-        user_statement = responses.get("vc_03", "").lower()
+        user_statement = features["vc_03"]
 
-        if not user_statement.strip():
+        if user_statement.blank:
             issues.append("No user identification provided")
             return ClarityScore(
                 ClarityMetric.USER_IDENTIFICATION,
@@ -347,46 +509,11 @@ class VisionClarityScorer:
                 recommendations,
             )
 
-        # Check for user indicators
-        user_matches = sum(
-            1 for indicator in self.user_indicators if indicator in user_statement
-        )
-
-        # Check for specific user characteristics
-        characteristic_indicators = [
-            "developer",
-            "manager",
-            "student",
-            "business",
-            "technical",
-            "non-technical",
-            "beginner",
-            "expert",
-            "enterprise",
-            "startup",
-        ]
-
-        characteristic_matches = sum(
-            1 for indicator in characteristic_indicators if indicator in user_statement
-        )
-
-        # Check for user needs/goals
-        need_indicators = [
-            "need",
-            "want",
-            "require",
-            "expect",
-            "desire",
-            "goal",
-            "objective",
-            "benefit",
-            "advantage",
-            "value",
-        ]
-
-        need_matches = sum(
-            1 for indicator in need_indicators if indicator in user_statement
+        user_matches = self.engine.count("user", user_statement)
+        characteristic_matches = self.engine.count(
+            "user_characteristics", user_statement
         )
+        need_matches = self.engine.count("user_needs", user_statement)
 
         # Calculate score
         if user_matches >= 2:
@@ -414,7 +541,7 @@ class VisionClarityScorer:
             issues.append("User needs and goals not clearly defined")
 
         # Check for multiple user types
-        if "," in user_statement or "and" in user_statement:
+        if self.engine.count("user_lists", user_statement):
             score += 0.2
             strengths.append("Multiple user types identified")
         else:
@@ -431,18 +558,17 @@ class VisionClarityScorer:
             recommendations,
         )
 
-    def evaluate_objective_definition(self, responses: Dict[str, Any]) -> ClarityScore:
-        """Evaluate clarity of objective definition."""
+    def _objective_definition(self, features: Dict[str, TextFeatures]) -> ClarityScore:
         score = 0.0
         confidence = 0.0
         issues = []
         strengths = []
         recommendations = []
 
-        # Get relevant responses from success criteria phase
-        success_criteria = responses.get("sc_01", "").lower()
+        # Success criteria phase
+        success_criteria = features["sc_01"]
 
-        if not success_criteria.strip():
+        if success_criteria.blank:
             issues.append("No success criteria defined")
             return ClarityScore(
                 ClarityMetric.OBJECTIVE_DEFINITION,
@@ -453,46 +579,9 @@ class VisionClarityScorer:
                 recommendations,
             )
 
-        # Check for objective indicators
-        objective_matches = sum(
-            1
-            for indicator in self.objective_indicators
-            if indicator in success_criteria
-        )
-
-        # Check for measurable elements
-        measurable_indicators = [
-            "measure",
-            "metric",
-            "count",
-            "percentage",
-            "time",
-            "number",
-            "quantity",
-            "rate",
-            "speed",
-            "accuracy",
-        ]
-
-        measurable_matches = sum(
-            1 for indicator in measurable_indicators if indicator in success_criteria
-        )
-
-        # Check for specific targets
-        target_indicators = [
-            "target",
-            "goal",
-            "aim",
-            "objective",
-            "standard",
-            "benchmark",
-            "threshold",
-            "requirement",
-        ]
-
-        target_matches = sum(
-            1 for indicator in target_indicators if indicator in success_criteria
-        )
+        objective_matches = self.engine.count("objective", success_criteria)
+        measurable_matches = self.engine.count("objective_measures", success_criteria)
+        target_matches = self.engine.count("objective_targets", success_criteria)
 
         # Calculate score
         if objective_matches >= 2:
@@ -519,24 +608,14 @@ class VisionClarityScorer:
             recommendations.append("Specify clear targets for success criteria")
 
         # Check for time-based criteria
-        time_indicators = ["time", "deadline", "schedule", "timeline", "duration"]
-        time_matches = sum(
-            1 for indicator in time_indicators if indicator in success_criteria
-        )
-
-        if time_matches >= 1:
+        if self.engine.count("objective_time", success_criteria) >= 1:
             score += 0.15
             strengths.append("Time-based criteria included")
         else:
             recommendations.append("Consider adding time-based success criteria")
 
         # Check for quality criteria
-        quality_indicators = ["quality", "standard", "requirement", "specification"]
-        quality_matches = sum(
-            1 for indicator in quality_indicators if indicator in success_criteria
-        )
-
-        if quality_matches >= 1:
+        if self.engine.count("objective_quality", success_criteria) >= 1:
             score += 0.1
             strengths.append("Quality criteria defined")
         else:
@@ -553,19 +632,18 @@ class VisionClarityScorer:
             recommendations,
         )
 
-    def evaluate_scope_boundaries(self, responses: Dict[str, Any]) -> ClarityScore:
-        """Evaluate clarity of scope boundaries."""
+    def _scope_boundaries(self, features: Dict[str, TextFeatures]) -> ClarityScore:
         score = 0.0
         confidence = 0.0
         issues = []
         strengths = []
         recommendations = []
 
-        # Get relevant responses from scope phase
-        in_scope = responses.get("sb_01", "").lower()
-        out_of_scope = responses.get("sb_02", "").lower()
+        # Scope phase
+        in_scope = features["sb_01"]
+        out_of_scope = features["sb_02"]
 
-        if not in_scope.strip() and not out_of_scope.strip():
+        if in_scope.blank and out_of_scope.blank:
             issues.append("No scope boundaries defined")
             return ClarityScore(
                 ClarityMetric.SCOPE_BOUNDARIES,
@@ -576,45 +654,9 @@ class VisionClarityScorer:
                 recommendations,
             )
 
-        # Check for scope indicators
-        scope_matches = sum(
-            1
-            for indicator in self.scope_indicators
-            if indicator in in_scope or indicator in out_of_scope
-        )
-
-        # Check for specific inclusions
-        inclusion_indicators = [
-            "include",
-            "feature",
-            "functionality",
-            "capability",
-            "component",
-            "module",
-            "service",
-            "integration",
-            "support",
-        ]
-
-        inclusion_matches = sum(
-            1 for indicator in inclusion_indicators if indicator in in_scope
-        )
-
-        # Check for specific exclusions
-        exclusion_indicators = [
-            "exclude",
-            "not include",
-            "out of scope",
-            "not part of",
-            "separate",
-            "future",
-            "phase 2",
-            "later",
-        ]
-
-        exclusion_matches = sum(
-            1 for indicator in exclusion_indicators if indicator in out_of_scope
-        )
+        scope_matches = self.engine.count("scope", in_scope, out_of_scope)
+        inclusion_matches = self.engine.count("scope_inclusions", in_scope)
+        exclusion_matches = self.engine.count("scope_exclusions", out_of_scope)
 
         # Calculate score
         if scope_matches >= 2:
@@ -642,21 +684,14 @@ class VisionClarityScorer:
             recommendations.append("Consider explicitly stating what's out of scope")
 
         # Check for rationale
-        if "because" in in_scope or "because" in out_of_scope:
+        if self.engine.count("scope_rationale", in_scope, out_of_scope):
             score += 0.1
             strengths.append("Scope rationale provided")
         else:
             recommendations.append("Consider explaining rationale for scope decisions")
 
         # Check for priority/phase information
-        phase_indicators = ["priority", "phase", "version", "release", "mvp"]
-        phase_matches = sum(
-            1
-            for indicator in phase_indicators
-            if indicator in in_scope or indicator in out_of_scope
-        )
-
-        if phase_matches >= 1:
+        if self.engine.count("scope_phases", in_scope, out_of_scope) >= 1:
             score += 0.1
             strengths.append("Scope prioritization indicated")
         else:
@@ -678,12 +713,13 @@ class VisionClarityScorer:
     def score_vision_clarity(self, responses: Dict[str, Any]) -> VisionClarityReport:
         """Score overall vision clarity across all metrics."""
 
-        # Evaluate each clarity metric
-        problem_score = self.evaluate_problem_definition(responses)
-        vision_score = self.evaluate_vision_statement(responses)
-        user_score = self.evaluate_user_identification(responses)
-        objective_score = self.evaluate_objective_definition(responses)
-        scope_score = self.evaluate_scope_boundaries(responses)
+        # Evaluate each clarity metric from a single scan of the responses
+        features = self.analyze(responses)
+        problem_score = self._problem_definition(features)
+        vision_score = self._vision_statement(features)
+        user_score = self._user_identification(features)
+        objective_score = self._objective_definition(features)
+        scope_score = self._scope_boundaries(features)
 
         # Calculate overall score (weighted average)
         scores = [problem_score, vision_score, user_score, objective_score, scope_score]
@@ -727,8 +763,23 @@ class VisionClarityScorer:
             summary=summary,
         )
 
+    def score_many(
+        self, candidates: Iterable[Dict[str, Any]]
+    ) -> List[VisionClarityReport]:
+        """Score a batch of candidate visions, in order.
+
+        Responses shared between candidates (e.g. unchanged answers across
+        revisions of a charter) are scanned only once.
+        """
+        return [self.score_vision_clarity(responses) for responses in candidates]
+
 
 def score_vision_clarity(responses: Dict[str, Any]) -> VisionClarityReport:
     """Convenience function to score vision clarity."""
     scorer = VisionClarityScorer()
     return scorer.score_vision_clarity(responses)
+
+
+def score_many(candidates: Iterable[Dict[str, Any]]) -> List[VisionClarityReport]:
+    """Convenience function to score a batch of candidate visions."""
+    return VisionClarityScorer().score_many(candidates)
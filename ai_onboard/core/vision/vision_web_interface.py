@@ -4,49 +4,158 @@ Vision Interrogation Web Interface: Interactive web - based interface for vision
 This module provides a modern, responsive web interface for the enhanced vision
 interrogation system, making it easy for users to define their project vision
 through guided questioning.
+
+The server handles each connection on its own thread with HTTP/1.1 keep-alive,
+gzip and ETag revalidation, and pushes alignment, gate and metrics updates to
+open pages over server-sent events (``/api/events``) instead of polling.
 """
 
+import gzip
+import hashlib
 import json
+import queue
 import threading
-import time
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from threading import Thread
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
 
+from ..base import utils
+from ..base.background_scheduler import get_background_scheduler
 from .enhanced_vision_interrogator import ProjectType, get_enhanced_vision_interrogator
 
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_HEARTBEAT_SECONDS = 15.0
+# Seconds between checks of the alignment / gate / metrics files
+EVENT_WATCH_INTERVAL = 2.0
+
+
+class VisionEventBroadcaster:
+    """Fan-out of dashboard events to server-sent-event subscribers.
+
+    Every subscriber gets its own bounded queue so a slow client can never
+    block publishers or other clients; when a queue is full the oldest event
+    is dropped. The latest event of each type is kept and replayed to new
+    subscribers so a freshly opened page starts from current state.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: List["queue.Queue[Optional[Tuple[int, str, str]]]"] = []
+        self._latest: Dict[str, Tuple[int, str, str]] = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def publish(self, event_type: str, data: Any) -> int:
+        """Publish an event to every subscriber, returning its event id."""
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        with self._lock:
+            event = (self._next_id, event_type, payload)
+            self._next_id += 1
+            self._latest[event_type] = event
+            subscribers = list(self._subscribers)
+
+        for q in subscribers:
+            self._offer(q, event)
+        return event[0]
+
+    def subscribe(self) -> "queue.Queue[Optional[Tuple[int, str, str]]]":
+        q: "queue.Queue[Optional[Tuple[int, str, str]]]" = queue.Queue(
+            maxsize=self.max_queue_size
+        )
+        with self._lock:
+            for event in sorted(self._latest.values()):
+                self._offer(q, event)
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[Optional[Tuple[int, str, str]]]") -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def close(self) -> None:
+        """Wake every subscriber with a sentinel so streams terminate."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for q in subscribers:
+            self._offer(q, None)
+
+    @staticmethod
+    def _offer(q: "queue.Queue[Any]", item: Any) -> None:
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class VisionWebServer(ThreadingHTTPServer):
+    """Thread-per-connection server sized for many local dashboard clients."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 512
+
 
 class VisionWebInterface:
     """Web interface for vision interrogation system."""
 
-    def __init__(self, root: Path, port: int = 8080):
+    def __init__(self, root: Path, port: int = 8080, host: str = "localhost"):
         self.root = root
+        self.host = host
         self.port = port
         self.interrogator = get_enhanced_vision_interrogator(root)
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[VisionWebServer] = None
         self.server_thread: Optional[Thread] = None
-
-    def start_web_interface(self) -> Dict[str, Any]:
+        self.events = VisionEventBroadcaster()
+        self.watch_job_id: Optional[str] = None
+        self._watched_mtimes: Dict[str, Optional[float]] = {}
+        self._page_cache: Optional[Dict[str, Any]] = None
+        # Handler threads run concurrently; interrogation updates are serialized
+        self._interrogation_lock = threading.Lock()
+
+    def start_web_interface(self, open_browser: bool = True) -> Dict[str, Any]:
         """Start the web interface server."""
         try:
             # Create custom request handler
             handler = self._create_request_handler()
 
-            # Start server in a separate thread
-            self.server = HTTPServer(("localhost", self.port), handler)
-            self.server_thread = threading.Thread(target=self.server.serve_forever)
-            assert self.server_thread is not None  # Just assigned above
-            self.server_thread.daemon = True
+            # The socket is bound and listening once the server is constructed,
+            # so requests queue up safely until serve_forever picks them up.
+            self.server = VisionWebServer((self.host, self.port), handler)
+            self.port = self.server.server_address[1]
+            self.server_thread = threading.Thread(
+                target=self.server.serve_forever,
+                name="vision-web-interface",
+                daemon=True,
+            )
             self.server_thread.start()
 
-            # Wait a moment for server to start
-            time.sleep(1)
+            # Push alignment, gate and metrics changes to SSE clients
+            self._prime_watched_files()
+            self.watch_job_id = get_background_scheduler().schedule_periodic(
+                f"vision_web_events:{id(self)}",
+                self._watch_for_updates,
+                EVENT_WATCH_INTERVAL,
+            )
 
-            # Open browser
-            url = f"http://localhost:{self.port}"
-            webbrowser.open(url)
+            url = f"http://{self.host}:{self.port}"
+            if open_browser:
+                webbrowser.open(url)
 
             return {
                 "status": "success",
@@ -60,7 +169,14 @@ class VisionWebInterface:
 
     def stop_web_interface(self) -> Dict[str, Any]:
         """Stop the web interface server."""
-        try:  # type: ignore[unreachable]
+        try:
+            if self.watch_job_id:
+                get_background_scheduler().cancel(self.watch_job_id)
+                self.watch_job_id = None
+
+            # Release SSE streams first so their handler threads exit promptly
+            self.events.close()
+
             if self.server:
                 self.server.shutdown()
                 self.server.server_close()
@@ -70,41 +186,130 @@ class VisionWebInterface:
         except Exception as e:
             return {"status": "error", "message": f"Failed to stop web interface: {e}"}
 
+    # ------------------------------------------------------------------
+    # Live updates
+    # ------------------------------------------------------------------
+
+    def _watched_files(self) -> Dict[str, List[Path]]:
+        ai_dir = self.root / ".ai_onboard"
+        return {
+            "alignment": [ai_dir / "alignment_report.json"],
+            "gate": [
+                ai_dir / "gates" / "gate_status.json",
+                ai_dir / "gates" / "current_gate.md",
+            ],
+            "metrics": [ai_dir / "metrics.jsonl"],
+        }
+
+    def _prime_watched_files(self) -> None:
+        for paths in self._watched_files().values():
+            for path in paths:
+                self._watched_mtimes[str(path)] = self._mtime(path)
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[float]:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _watch_for_updates(self) -> None:
+        """Publish an event for every watched source that changed on disk."""
+        if not self.events.subscriber_count():
+            # Still track mtimes so reconnecting clients are not flooded
+            self._prime_watched_files()
+            return
+
+        for event_type, paths in self._watched_files().items():
+            changed = False
+            for path in paths:
+                mtime = self._mtime(path)
+                if self._watched_mtimes.get(str(path)) != mtime:
+                    self._watched_mtimes[str(path)] = mtime
+                    changed = True
+            if changed:
+                self.events.publish(event_type, self._read_event_source(event_type))
+
+    def _read_event_source(self, event_type: str) -> Dict[str, Any]:
+        ai_dir = self.root / ".ai_onboard"
+        if event_type == "alignment":
+            report = utils.read_json(ai_dir / "alignment_report.json", default={})
+            return {"report": report}
+        if event_type == "gate":
+            status = utils.read_json(ai_dir / "gates" / "gate_status.json", default={})
+            return {
+                "gate_status": status,
+                "gate_pending": (ai_dir / "gates" / "current_gate.md").exists(),
+            }
+        return {"last_run": _read_last_jsonl_record(ai_dir / "metrics.jsonl")}
+
+    def _publish_vision_status(self) -> None:
+        try:
+            status = self.interrogator.get_enhanced_interrogation_status()
+        except Exception as e:
+            status = {"status": "error", "message": str(e)}
+        self.events.publish("alignment", {"vision": status})
+
+    # ------------------------------------------------------------------
+    # HTTP handling
+    # ------------------------------------------------------------------
+
+    def _get_main_page(self) -> Dict[str, Any]:
+        """Return the rendered main page with precomputed gzip body and ETag."""
+        if self._page_cache is None:
+            body = self._get_html_template().encode("utf-8")
+            self._page_cache = {
+                "body": body,
+                "gzip": gzip.compress(body, compresslevel=6),
+                "etag": _make_etag(body),
+            }
+        return self._page_cache
+
     def _create_request_handler(self):
         """Create custom HTTP request handler."""
+        interface = self
         interrogator = self.interrogator
+        events = self.events
 
         class VisionRequestHandler(BaseHTTPRequestHandler):
+            # HTTP/1.1 gives persistent (keep-alive) connections
+            protocol_version = "HTTP/1.1"
 
             def do_GET(self):
-                if self.path == "/":
+                route = _normalize_route(self.path)
+                if route == "/":
                     self._serve_main_page()
-                elif self.path == "/api / status":
+                elif route == "/api/status":
                     self._serve_status()
-                elif self.path == "/api / questions":
+                elif route == "/api/questions":
                     self._serve_questions()
-                elif self.path.startswith("/api / project - types"):
+                elif route.startswith("/api/project-types"):
                     self._serve_project_types()
+                elif route == "/api/events":
+                    self._serve_events()
                 else:
                     self._serve_404()
 
             def do_POST(self):
-                if self.path == "/api / start":
+                route = _normalize_route(self.path)
+                if route == "/api/start":
                     self._handle_start_interrogation()
-                elif self.path == "/api / submit":
+                elif route == "/api/submit":
                     self._handle_submit_response()
-                elif self.path == "/api / complete":
+                elif route == "/api/complete":
                     self._handle_complete_interrogation()
                 else:
                     self._serve_404()
 
             def _serve_main_page(self):
                 """Serve the main HTML page."""
-                html = self._generate_html()
-                self.send_response(200)
-                self.send_header("Content - type", "text / html")
-                self.end_headers()
-                self.wfile.write(html.encode("utf - 8"))
+                page = interface._get_main_page()
+                self._send_body(
+                    page["body"],
+                    "text/html; charset=utf-8",
+                    etag=page["etag"],
+                    gzipped=page["gzip"],
+                )
 
             def _serve_status(self):
                 """Serve interrogation status."""
@@ -124,53 +329,128 @@ class VisionWebInterface:
                 ]
                 self._send_json_response({"project_types": project_types})
 
+            def _serve_events(self):
+                """Stream dashboard updates as server-sent events."""
+                subscription = events.subscribe()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("X-Accel-Buffering", "no")
+                self.end_headers()
+                # The stream has no Content-Length, so it owns the connection
+                self.close_connection = True
+                try:
+                    self.wfile.write(b"retry: 3000\n\n")
+                    self.wfile.flush()
+                    while True:
+                        try:
+                            item = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                        except queue.Empty:
+                            self.wfile.write(b": keep-alive\n\n")
+                            self.wfile.flush()
+                            continue
+                        if item is None:
+                            break
+                        event_id, event_type, payload = item
+                        self.wfile.write(
+                            f"id: {event_id}\nevent: {event_type}\n"
+                            f"data: {payload}\n\n".encode("utf-8")
+                        )
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError, OSError):
+                    pass
+                finally:
+                    events.unsubscribe(subscription)
+
+            def _read_json_body(self) -> Dict[str, Any]:
+                content_length = int(self.headers.get("Content-Length") or 0)
+                post_data = self.rfile.read(content_length)
+                return json.loads(post_data.decode("utf-8") or "{}")
+
             def _handle_start_interrogation(self):
                 """Handle start interrogation request."""
-                content_length = int(self.headers["Content - Length"])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode("utf - 8"))
+                data = self._read_json_body()
 
                 project_type = ProjectType(data.get("project_type", "generic"))
-                result = interrogator.start_enhanced_interrogation(project_type)
-                self._send_json_response(result)
+                with interface._interrogation_lock:
+                    result = interrogator.start_enhanced_interrogation(project_type)
+                self._send_json_response(result, cacheable=False)
+                interface._publish_vision_status()
 
             def _handle_submit_response(self):
                 """Handle submit response request."""
-                content_length = int(self.headers["Content - Length"])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode("utf - 8"))
+                data = self._read_json_body()
 
                 phase = data.get("phase")
                 question_id = data.get("question_id")
                 response = data.get("response")
 
-                result = interrogator.submit_enhanced_response(
-                    phase, question_id, response
-                )
-                self._send_json_response(result)
+                with interface._interrogation_lock:
+                    result = interrogator.submit_enhanced_response(
+                        phase, question_id, response
+                    )
+                self._send_json_response(result, cacheable=False)
+                interface._publish_vision_status()
 
             def _handle_complete_interrogation(self):
                 """Handle complete interrogation request."""
-                result = interrogator.force_complete_interrogation()
-                self._send_json_response(result)
+                with interface._interrogation_lock:
+                    result = interrogator.force_complete_interrogation()
+                self._send_json_response(result, cacheable=False)
+                interface._publish_vision_status()
+
+            def _send_json_response(self, data, cacheable: bool = True):
+                """Send JSON response, with ETag revalidation for GETs."""
+                body = json.dumps(data, default=str).encode("utf-8")
+                self._send_body(
+                    body,
+                    "application/json",
+                    etag=_make_etag(body) if cacheable else None,
+                )
 
-            def _send_json_response(self, data):
-                """Send JSON response."""
-                self.send_response(200)
-                self.send_header("Content - type", "application / json")
+            def _send_body(
+                self,
+                body: bytes,
+                content_type: str,
+                status: int = 200,
+                etag: Optional[str] = None,
+                gzipped: Optional[bytes] = None,
+            ):
+                """Send a response with conditional GET and gzip support."""
+                if etag and etag in _parse_etags(self.headers.get("If-None-Match")):
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                accepts_gzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+                if accepts_gzip and len(body) >= GZIP_MIN_SIZE:
+                    body = gzipped if gzipped is not None else gzip.compress(body, 6)
+                    encoded = True
+                else:
+                    encoded = False
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Vary", "Accept-Encoding")
+                if encoded:
+                    self.send_header("Content-Encoding", "gzip")
+                if etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", "no-cache")
                 self.end_headers()
-                self.wfile.write(json.dumps(data).encode("utf - 8"))
+                self.wfile.write(body)
 
             def _serve_404(self):
                 """Serve 404 error."""
-                self.send_response(404)
-                self.send_header("Content - type", "text / plain")
-                self.end_headers()
-                self.wfile.write(b"Not Found")
+                self._send_body(b"Not Found", "text/plain", status=404)
 
-            def _generate_html(self):
-                """Generate the main HTML page."""
-                return self._get_html_template()
+            def log_message(self, format, *args):
+                """Keep request logging quiet; the dashboard is local-only."""
+
+        return VisionRequestHandler
 
     def _get_html_template(self) -> str:
         """Get the HTML template for the vision interrogation interface."""
@@ -527,6 +807,43 @@ class VisionWebInterface:
             async init() {
                 await this.loadStatus();
                 this.setupEventListeners();
+                this.connectEvents();
+            }
+
+            connectEvents() {
+                // Server-sent events replace polling for live updates
+                if (!window.EventSource) {
+                    return;
+                }
+                const source = new EventSource('/api/events');
+                source.addEventListener('alignment', (e) => {
+                    const data = JSON.parse(e.data);
+                    if (data.vision && data.vision.vision_quality_score !== undefined) {
+                        this.updateQualityScore(data.vision.vision_quality_score);
+                    }
+                });
+                source.addEventListener('gate', (e) => {
+                    const data = JSON.parse(e.data);
+                    if (data.gate_pending) {
+                        this.showError('A gate is waiting for your response');
+                    }
+                });
+                source.addEventListener('metrics', (e) => {
+                    const data = JSON.parse(e.data);
+                    if (data.last_run) {
+                        console.log('Validation run recorded:', data.last_run);
+                    }
+                });
+            }
+
+            updateQualityScore(score) {
+                const values = document.querySelectorAll('.status - value');
+                const label = (score * 100).toFixed(1) + '%';
+                values.forEach((el) => {
+                    if (el.textContent.trim().endsWith('%')) {
+                        el.textContent = label;
+                    }
+                });
             }
 
             setupEventListeners() {
@@ -813,6 +1130,45 @@ class VisionWebInterface:
         return None
 
 
+def _normalize_route(raw_path: str) -> str:
+    """Map a request path to its route key.
+
+    The bundled page historically requested paths such as ``/api / status``;
+    decoding and stripping whitespace lets those and ``/api/status`` share a
+    route.
+    """
+    path = unquote(raw_path.split("?", 1)[0])
+    return "".join(path.split()) or "/"
+
+
+def _make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _parse_etags(header: Optional[str]) -> List[str]:
+    if not header:
+        return []
+    return [tag.strip().replace("W/", "", 1) for tag in header.split(",")]
+
+
+def _read_last_jsonl_record(path: Path, tail_bytes: int = 65536) -> Optional[Dict]:
+    """Return the last JSON record of a JSONL file without reading all of it."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            return json.loads(line.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            continue
+    return None
+
+
 def start_vision_web_interface(root: Path, port: int = 8080) -> Dict[str, Any]:
     """Start the vision interrogation web interface."""
     interface = VisionWebInterface(root, port)
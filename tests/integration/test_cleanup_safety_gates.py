@@ -444,6 +444,38 @@ class TestIndividualSafetyGates(unittest.TestCase):
         self.assertIn("operation", manifest)
         self.assertIn("files", manifest)
 
+    def test_failed_backup_aborts_before_deleting(self):
+        """Test that no target is deleted when any of them cannot be backed up."""
+        gate = BackupExecuteGate(self.test_dir)
+        kept = self.test_dir / "kept.txt"
+        kept.write_text("backed up")
+        unreadable = self.test_dir / "unreadable.txt"
+        unreadable.write_text("cannot be backed up")
+        store = gate.backup_engine._store
+
+        def failing_store(src, *args):
+            if src == unreadable:
+                raise OSError("Permission denied")
+            return store(src, *args)
+
+        operation = CleanupOperation(
+            operation_type="delete",
+            targets=[kept, unreadable],
+            description="Partial backup",
+        )
+        framework = CleanupSafetyGateFramework(self.test_dir)
+        framework.gates = [gate]
+        with patch.object(gate.backup_engine, "_store", side_effect=failing_store):
+            success, message = framework.execute_cleanup_operation(operation)
+
+        self.assertFalse(success)
+        self.assertIn("Backup failed", message)
+        self.assertEqual(kept.read_text(), "backed up")
+        self.assertEqual(unreadable.read_text(), "cannot be backed up")
+        self.assertEqual(kept.stat().st_nlink, 1)
+        backups = self.test_dir / ".ai_onboard" / "backups"
+        self.assertEqual(list(backups.glob("*")), [])
+
 
 if __name__ == "__main__":
     # Set test mode to ensure consistent behavior
@@ -0,0 +1,119 @@
+"""
+Backup Engine Benchmark
+
+Backs up a directory of build artifacts the old way (a full copytree per
+backup and a full copy back on rollback) and through the backup engine:
+hardlinked, reflinked or streamed into the object store, deduplicated on a
+repeat backup, and restored by copying back only changed files.
+"""
+
+import os
+import shutil
+import time
+
+import pytest
+
+from ai_onboard.core.quality_safety.backup_engine import BackupEngine
+from ai_onboard.core.quality_safety.file_scan import FileHashCache, scan_tree
+
+DIRS = 40
+FILES_PER_DIR = 50
+FILE_SIZE = 32 * 1024
+CHANGED = 20
+
+
+def _tree(root):
+    payload = os.urandom(FILE_SIZE + DIRS * FILES_PER_DIR)
+    n = 0
+    for d in range(DIRS):
+        directory = root / "dist" / f"part{d}"
+        directory.mkdir(parents=True)
+        for f in range(FILES_PER_DIR):
+            (directory / f"chunk{f}.bin").write_bytes(payload[n : n + FILE_SIZE])
+            n += 1
+    past = time.time_ns() - 60_000_000_000
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            os.utime(os.path.join(dirpath, name), ns=(past, past))
+
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+@pytest.mark.performance
+def test_backup_paths(tmp_path):
+    """Link-based, deduplicated backups and changed-only restores."""
+    _tree(tmp_path)
+    target = tmp_path / "dist"
+    files = DIRS * FILES_PER_DIR
+    megabytes = files * FILE_SIZE / 1e6
+
+    # The cleanup scan hashes every target before any backup is taken
+    hash_cache = FileHashCache(tmp_path / ".ai_onboard" / "file_hashes.json")
+    _, hash_time = _timed(lambda: hash_cache.hash_files(scan_tree(target).files))
+
+    legacy_dir = tmp_path / ".ai_onboard" / "backups" / "legacy"
+    _, legacy_backup = _timed(lambda: shutil.copytree(target, legacy_dir / "dist"))
+
+    # Reflink (where supported) or streamed copy into a fresh store
+    copy_engine = BackupEngine(tmp_path, hash_cache, tmp_path / "copy_store")
+    _, copy_time = _timed(lambda: copy_engine.snapshot([target]))
+
+    # Hardlinks into another fresh store, as taken right before deletions
+    link_engine = BackupEngine(tmp_path, hash_cache, tmp_path / "link_store")
+    snapshot, link_time = _timed(
+        lambda: link_engine.snapshot([target], allow_hardlink=True)
+    )
+
+    # A repeat backup of unchanged content stores nothing new
+    dedup_engine = BackupEngine(tmp_path, hash_cache, tmp_path / "link_store")
+    _, dedup_time = _timed(lambda: dedup_engine.snapshot([target]))
+
+    # Roll back a deletion of the whole directory
+    shutil.rmtree(target)
+    _, legacy_full = _timed(lambda: shutil.copytree(legacy_dir / "dist", target))
+    shutil.rmtree(target)
+    restorer = BackupEngine(tmp_path, hash_cache, tmp_path / "link_store")
+    full, full_time = _timed(lambda: restorer.restore(snapshot))
+
+    # Roll back after a few files were changed
+    for d in range(CHANGED):
+        (target / f"part{d}" / "chunk0.bin").write_bytes(b"changed")
+    _, legacy_partial = _timed(
+        lambda: shutil.copytree(legacy_dir / "dist", target, dirs_exist_ok=True)
+    )
+    for d in range(CHANGED):
+        (target / f"part{d}" / "chunk0.bin").write_bytes(b"changed")
+    partial, partial_time = _timed(lambda: restorer.restore(snapshot))
+
+    print(
+        f"\n{files} files ({megabytes:.0f} MB), hashed by the scan in "
+        f"{hash_time * 1e3:.0f} ms\n"
+        f"  backup: full copy {legacy_backup * 1e3:.0f} ms, "
+        f"store {copy_time * 1e3:.0f} ms "
+        f"({copy_engine.stats['reflink']} reflinked, "
+        f"{copy_engine.stats['copy']} copied), "
+        f"hardlink {link_time * 1e3:.0f} ms "
+        f"({link_engine.stats['hardlink']} linked), "
+        f"repeat {dedup_time * 1e3:.0f} ms "
+        f"({dedup_engine.stats['deduplicated']} deduplicated)\n"
+        f"  restore deleted: full copy {legacy_full * 1e3:.0f} ms, "
+        f"engine {full_time * 1e3:.0f} ms; "
+        f"restore {CHANGED} changed: full copy {legacy_partial * 1e3:.0f} ms, "
+        f"engine {partial_time * 1e3:.0f} ms"
+    )
+
+    assert full == {"restored": files, "unchanged": 0, "errors": []}
+    assert partial == {
+        "restored": CHANGED,
+        "unchanged": files - CHANGED,
+        "errors": [],
+    }
+    assert dedup_engine.stats["deduplicated"] == files
+    if link_engine.stats["hardlink"]:
+        assert link_time < legacy_backup
+    assert dedup_time < legacy_backup
+    assert partial_time < legacy_partial
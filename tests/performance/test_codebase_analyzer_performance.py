@@ -0,0 +1,107 @@
+"""
+Codebase Analyzer Benchmark
+
+Analyzes a synthetic repository with vendored dependencies the old way
+(separate unpruned walks for languages, modules, test coverage, file
+structure and the complexity score) and with the single pruned walk, cold
+and warm.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_onboard.core.vision.codebase_analyzer import CodebaseAnalyzer
+
+PACKAGES = 20
+DIRS_PER_PACKAGE = 20
+FILES_PER_DIR = 40
+VENDORED_FILES = 10000
+
+
+def _tree(root):
+    for p in range(PACKAGES):
+        for d in range(DIRS_PER_PACKAGE):
+            directory = root / "src" / f"pkg{p}" / f"sub{d}"
+            directory.mkdir(parents=True)
+            for f in range(FILES_PER_DIR):
+                name = f"test_mod{f}.py" if f % 5 == 0 else f"mod{f}.py"
+                (directory / name).touch()
+    vendored = root / "node_modules"
+    for n in range(VENDORED_FILES // 100):
+        directory = vendored / f"lib{n}"
+        directory.mkdir(parents=True)
+        for f in range(100):
+            (directory / f"file{f}.js").touch()
+    (root / ".ai_onboard").mkdir()
+    past = time.time_ns() - 60_000_000_000
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(past, past))
+
+
+def _legacy(root: Path):
+    """The walks made by the previous implementation."""
+
+    def languages():
+        for _, _, files in os.walk(root):
+            for file in files:
+                Path(file).suffix.lower()
+
+    def modules():
+        list(root.rglob("*.py"))
+        list(root.rglob("*.js"))
+
+    def coverage():
+        for _, _, files in os.walk(root):
+            for file in files:
+                any(m in file.lower() for m in ["test_", "_test", ".test.", ".spec."])
+
+    def structure():
+        for root_dir, _, _ in os.walk(root):
+            len(Path(root_dir).relative_to(root).parts)
+
+    languages()
+    modules()
+    coverage()
+    structure()
+    # The complexity score repeated the first three passes
+    languages()
+    modules()
+    coverage()
+
+
+@pytest.mark.performance
+def test_single_pass_analysis(tmp_path):
+    """One pruned walk replaces several; a warm run only stats directories."""
+    _tree(tmp_path)
+    files = PACKAGES * DIRS_PER_PACKAGE * FILES_PER_DIR + VENDORED_FILES
+
+    started = time.perf_counter()
+    _legacy(tmp_path)
+    legacy = time.perf_counter() - started
+
+    cold_analyzer = CodebaseAnalyzer(tmp_path)
+    started = time.perf_counter()
+    cold_analysis = cold_analyzer.analyze_codebase_structure()
+    cold = time.perf_counter() - started
+
+    warm_analyzer = CodebaseAnalyzer(tmp_path)
+    started = time.perf_counter()
+    warm_analysis = warm_analyzer.analyze_codebase_structure()
+    warm = time.perf_counter() - started
+
+    print(
+        f"\n{files} files: legacy walks {legacy * 1e3:.0f} ms, "
+        f"single pass {cold * 1e3:.0f} ms, warm {warm * 1e3:.1f} ms "
+        f"({warm_analyzer.stats['reused']} directories reused)"
+    )
+
+    assert warm_analysis == cold_analysis
+    assert cold_analysis["file_structure"]["total_files"] == (
+        PACKAGES * DIRS_PER_PACKAGE * FILES_PER_DIR
+    )
+    assert warm_analyzer.stats["scanned"] == 0
+    assert cold * 3 < legacy
+    assert warm * 10 < legacy
@@ -0,0 +1,51 @@
+"""
+KPI Ingestion Benchmark
+
+Updating KPIs for a metric must not depend on how many metrics have been
+collected: aggregates are incremental and KPI saves are batched.
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.continuous_improvement_analytics import (
+    ContinuousImprovementAnalytics,
+    Metric,
+    MetricType,
+)
+
+
+@pytest.mark.performance
+def test_kpi_update_cost_is_flat(tmp_path):
+    """Metric 20000 updates its KPIs as fast as metric 2000."""
+    analytics = ContinuousImprovementAnalytics(tmp_path)
+    names = ["learning_event", "knowledge_added", "user satisfaction", "cpu"]
+    timings = []
+
+    for n in range(20000):
+        metric = Metric(
+            metric_id=f"m{n}",
+            metric_type=MetricType.GAUGE,
+            name=names[n % len(names)],
+            value=50.0 + n % 50,
+            timestamp=datetime.now(),
+        )
+        analytics.metrics.append(metric)
+        started = time.perf_counter()
+        analytics._check_metric_alerts(metric)
+        analytics._update_related_kpis(metric)
+        timings.append(time.perf_counter() - started)
+    analytics.close()
+
+    chunk = 2000
+    means = [
+        sum(timings[i : i + chunk]) / chunk for i in range(chunk, len(timings), chunk)
+    ]
+    print(
+        "\nKPI update per chunk (us): " + " ".join(f"{m * 1e6:.1f}" for m in means)
+    )
+    assert analytics.kpis["learning_rate"].current_value == 5000
+    assert means[-1] < means[0] * 2
+
@@ -0,0 +1,46 @@
+"""
+Conversation Memory Benchmark
+
+Adding a message to a long conversation must cost the same as adding one to
+a short conversation: retention, the context window and saving are all
+bounded per message.
+"""
+
+import time
+
+import pytest
+
+from ai_onboard.core.ai_integration.conversation_memory_system import (
+    ConversationMemoryManager,
+)
+
+MESSAGES = [
+    "We decide to use a postgres database. The api is important and should be fast.",
+    "I prefer a simple design. Would like a clean timeline for the project.",
+    "ok, thanks",
+]
+
+
+@pytest.mark.performance
+def test_per_message_overhead_is_flat(tmp_path):
+    """Message 4000 costs about as much as message 500."""
+    manager = ConversationMemoryManager(tmp_path)
+    cid = manager.start_conversation("bench", "I want to build a blog platform")
+    timings = []
+
+    for n in range(4000):
+        started = time.perf_counter()
+        manager.add_message_to_conversation(cid, f"{MESSAGES[n % 3]} ({n})")
+        timings.append(time.perf_counter() - started)
+    manager.close()
+
+    chunk = 500
+    means = [
+        sum(timings[i : i + chunk]) / chunk for i in range(chunk, len(timings), chunk)
+    ]
+    print(
+        "\nadd_message_to_conversation per chunk (us): "
+        + " ".join(f"{m * 1e6:.1f}" for m in means)
+    )
+    assert len(manager.active_conversations[cid].memory_segments) <= 50
+    assert means[-1] < means[0] * 2
@@ -0,0 +1,54 @@
+"""
+Health History Benchmark
+
+Health summaries are served from rollups, so their cost does not grow with
+the number of recorded samples, and capturing a snapshot no longer blocks on
+CPU sampling.
+"""
+
+import time
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.health_history import HealthHistory
+from ai_onboard.core.continuous_improvement.system_health_monitor import (
+    SystemHealthMonitor,
+)
+
+
+def _time_summaries(history, since, repeat=200):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        history.summarize(since)
+    return (time.perf_counter() - started) / repeat
+
+
+@pytest.mark.performance
+def test_summary_cost_is_independent_of_sample_count():
+    """A 24 hour summary over a month of samples costs as much as over a day."""
+    day = 24 * 3600
+    results = {}
+    for days in (1, 30):
+        history = HealthHistory()
+        for second in range(0, days * day, 10):
+            history.add(float(second), 90.0, "good")
+        results[days] = _time_summaries(history, days * day - day + 0.5)
+
+    print(
+        "\nsummarize(24h) per call (us): "
+        + " ".join(f"{days}d={t * 1e6:.1f}" for days, t in results.items())
+    )
+    assert results[30] < results[1] * 3
+
+
+@pytest.mark.performance
+def test_capture_does_not_block(tmp_path):
+    """Capturing a snapshot takes well under the old one second CPU sample."""
+    monitor = SystemHealthMonitor(tmp_path)
+    started = time.perf_counter()
+    for _ in range(5):
+        monitor._record_snapshot(monitor._capture_health_snapshot())
+    elapsed = (time.perf_counter() - started) / 5
+
+    print(f"\n_capture_health_snapshot per call: {elapsed * 1e3:.2f} ms")
+    assert elapsed < 0.5
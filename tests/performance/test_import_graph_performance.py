@@ -0,0 +1,83 @@
+"""
+Import Graph Benchmark
+
+Risk assessment of a reorganization plan that moves every file of a
+500-module project answers each change from the import graph instead of
+walking and parsing the whole tree.
+"""
+
+import time
+
+import pytest
+
+from ai_onboard.core.quality_safety.import_graph import ImportGraph
+from ai_onboard.core.quality_safety.risk_assessment_framework import (
+    OrganizationChange,
+    RiskAssessmentFramework,
+)
+
+MODULES = 500
+
+
+def _project(root):
+    for package in range(10):
+        directory = root / "app" / f"pkg{package}"
+        directory.mkdir(parents=True)
+        (directory / "__init__.py").write_text("")
+        for n in range(MODULES // 10):
+            imports = [
+                f"from ..pkg{(package + k) % 10} import mod{(n + k) % 50}"
+                for k in range(1, 4)
+            ]
+            (directory / f"mod{n}.py").write_text(
+                "\n".join(imports + ["import os", "", f"VALUE = {n}", ""])
+            )
+    (root / "app" / "__init__.py").write_text("")
+    return [
+        str(root / "app" / f"pkg{p}" / f"mod{n}.py")
+        for p in range(10)
+        for n in range(MODULES // 10)
+    ]
+
+
+@pytest.mark.performance
+def test_reorganization_plan_assessment(tmp_path):
+    """Each change in a 500-file plan is assessed in milliseconds."""
+    files = _project(tmp_path)
+    changes = [
+        OrganizationChange(
+            change_id=f"move_{n}",
+            change_type="file_move",
+            description=f"Move {path}",
+            affected_files=[path],
+        )
+        for n, path in enumerate(files)
+    ]
+
+    started = time.perf_counter()
+    graph = ImportGraph(tmp_path)
+    graph.refresh()
+    graph.save()
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ImportGraph(tmp_path).refresh()
+    warm_refresh = time.perf_counter() - started
+
+    framework = RiskAssessmentFramework(tmp_path)
+    started = time.perf_counter()
+    results = framework.assess_change_risks(changes)
+    elapsed = time.perf_counter() - started
+    per_change = elapsed / len(changes)
+
+    print(
+        f"\n{len(files)} modules: graph build {build * 1e3:.1f} ms, "
+        f"warm refresh {warm_refresh * 1e3:.1f} ms, "
+        f"{len(changes)} changes in {elapsed * 1e3:.1f} ms "
+        f"({per_change * 1e3:.2f} ms per change)"
+    )
+
+    assert len(results) == len(changes)
+    dependents = results[0].dependency_analysis["reverse_dependencies"]
+    assert len(dependents) == 3
+    assert per_change < 0.02
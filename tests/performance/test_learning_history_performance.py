@@ -0,0 +1,48 @@
+"""
+Learning History Benchmark
+
+Fetching the newest learning events reads segments backward from the tail,
+so its cost does not depend on how many events the history holds.
+"""
+
+import json
+import time
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.learning_persistence import (
+    LearningPersistenceManager,
+)
+
+
+def _fill(manager, events):
+    """Write ``events`` events into today's segment in bulk."""
+    now = time.time()
+    segment = manager.history.segment_path(manager.history.segment_key(now))
+    line = {"event_type": "pattern_learned", "event_data": {"pattern_id": "p"}}
+    with open(segment, "a", encoding="utf-8") as f:
+        for n in range(events):
+            f.write(json.dumps(dict(line, timestamp=now - 1 + n * 1e-7)) + "\n")
+
+
+def _time_newest(manager, repeat=50):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        assert len(manager.get_learning_history(100)) == 100
+    return (time.perf_counter() - started) / repeat
+
+
+@pytest.mark.performance
+def test_newest_events_cost_is_independent_of_history_size(tmp_path):
+    """The last 100 of 500k events cost as much as the last 100 of 1k."""
+    results = {}
+    for events in (1_000, 500_000):
+        manager = LearningPersistenceManager(tmp_path / str(events))
+        _fill(manager, events)
+        results[events] = _time_newest(manager)
+
+    print(
+        "\nget_learning_history(100) per call (ms): "
+        + " ".join(f"{n}={t * 1e3:.2f}" for n, t in results.items())
+    )
+    assert results[500_000] < results[1_000] * 3
@@ -0,0 +1,46 @@
+"""
+Policy Engine Microbenchmark
+
+Compares a cold policy load (parse and merge every rule file) with warm
+evaluation against the memoized, compiled policy, which is what the
+per-operation safety checks pay on every call.
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_onboard.core.quality_safety import policy_engine
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+CHANGE = {
+    "operation": "cleanup",
+    "deletes": ["build/debug_run.json", "docs/old/notes.md"],
+    "modifies": ["config/settings.yaml"],
+    "lines": 120,
+}
+
+
+@pytest.mark.performance
+def test_compiled_policy_evaluation_beats_cold_load():
+    """Warm checks must be far cheaper than re-loading the policy."""
+    iterations = 20
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        policy_engine.clear_cache()
+        policy_engine._merge_sources(policy_engine._policy_sources(REPO_ROOT)[1])
+    cold = (time.perf_counter() - start) / iterations
+
+    policy_engine.clear_cache()
+    policy_engine.check(REPO_ROOT, CHANGE)
+    start = time.perf_counter()
+    for _ in range(iterations * 50):
+        result = policy_engine.check(REPO_ROOT, CHANGE)
+    warm = (time.perf_counter() - start) / (iterations * 50)
+
+    print(f"\ncold load: {cold * 1000:.2f}ms  warm check: {warm * 1000:.3f}ms")
+    assert result["decision"] in policy_engine.ACTION_ORDER
+    assert warm * 10 < cold
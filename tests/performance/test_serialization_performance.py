@@ -0,0 +1,229 @@
+"""
+Serialization Benchmark
+
+Saves and loads a multi-megabyte pattern store and metrics log the old way
+(hand-written dataclass to dict conversion, indented stdlib JSON) and through
+the serialization layer (direct dataclass encoding, compact JSON or binary
+records, orjson when installed).
+"""
+
+import json
+import random
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_onboard.core.base import serialization, utils
+from ai_onboard.core.continuous_improvement.continuous_improvement_analytics import (
+    Metric,
+    MetricType,
+)
+from ai_onboard.core.orchestration.pattern_recognition_system import ErrorPattern
+
+PATTERNS = 4000
+METRICS = 30000
+
+
+def _patterns():
+    rng = random.Random(7)
+    patterns = {}
+    for n in range(PATTERNS):
+        pattern_id = f"pattern_{n:05d}"
+        patterns[pattern_id] = ErrorPattern(
+            pattern_id=pattern_id,
+            pattern_type=rng.choice(["import_error", "type_error", "cli_error"]),
+            signature=f"{n:x}" * 4,
+            description=f"Recurring failure number {n} in module_{n % 97}",
+            examples=[
+                {
+                    "error_message": f"ModuleNotFoundError: no module x{n}_{k}",
+                    "context": {"file": f"pkg/mod_{k}.py", "line": rng.randint(1, 900)},
+                    "timestamp": 1_700_000_000.0 + n * 60 + k,
+                }
+                for k in range(10)
+            ],
+            frequency=rng.randint(1, 500),
+            first_seen=1_700_000_000.0 + n,
+            last_seen=1_700_100_000.0 + n,
+            confidence=rng.random(),
+            prevention_rules=["Check import paths", "Verify package installation"],
+            related_patterns={f"pattern_{(n + d) % PATTERNS:05d}" for d in (1, 2, 3)},
+        )
+    return patterns
+
+
+def _metrics():
+    start = datetime(2025, 1, 1)
+    return [
+        Metric(
+            metric_id=f"metric_{n}",
+            metric_type=MetricType.TIMER,
+            name="response_time",
+            value=n * 0.5,
+            timestamp=start + timedelta(seconds=n),
+            tags={"agent": f"agent_{n % 13}"},
+            metadata={"operation": "validate", "ok": n % 7 != 0},
+        )
+        for n in range(METRICS)
+    ]
+
+
+def _legacy_pattern_dict(pattern):
+    return {
+        "pattern_id": pattern.pattern_id,
+        "pattern_type": pattern.pattern_type,
+        "signature": pattern.signature,
+        "description": pattern.description,
+        "examples": pattern.examples[-10:],
+        "frequency": pattern.frequency,
+        "first_seen": pattern.first_seen,
+        "last_seen": pattern.last_seen,
+        "confidence": pattern.confidence,
+        "prevention_rules": pattern.prevention_rules,
+        "related_patterns": list(pattern.related_patterns),
+    }
+
+
+def _legacy_metric_dict(metric):
+    return {
+        "metric_id": metric.metric_id,
+        "metric_type": metric.metric_type.value,
+        "name": metric.name,
+        "value": metric.value,
+        "timestamp": metric.timestamp.isoformat(),
+        "tags": metric.tags,
+        "metadata": metric.metadata,
+    }
+
+
+def _best_of(runs, func):
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.performance
+def test_pattern_store_round_trip(tmp_path):
+    """A multi-megabyte pattern store saves several times faster and loads faster."""
+    patterns = _patterns()
+    legacy_path = tmp_path / "legacy.json"
+    compact_path = tmp_path / "compact.json"
+    binary_path = tmp_path / "binary.json"
+
+    def legacy_save():
+        data = {pid: _legacy_pattern_dict(p) for pid, p in patterns.items()}
+        legacy_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    def legacy_load():
+        data = json.loads(legacy_path.read_text(encoding="utf-8"))
+        return {pid: ErrorPattern(**d) for pid, d in data.items()}
+
+    def save(path, **kwargs):
+        utils.write_json(path, patterns_with_recent_examples(patterns), **kwargs)
+
+    def load(path):
+        # Bypass the read cache so every run decodes the file
+        data = serialization.load_bytes(path.read_bytes())
+        return {
+            pid: serialization.structure(ErrorPattern, d) for pid, d in data.items()
+        }
+
+    results = {
+        "legacy": (_best_of(3, legacy_save), _best_of(3, legacy_load)),
+        "compact": (
+            _best_of(3, lambda: save(compact_path, compact=True)),
+            _best_of(3, lambda: load(compact_path)),
+        ),
+        "binary": (
+            _best_of(3, lambda: save(binary_path, binary=True)),
+            _best_of(3, lambda: load(binary_path)),
+        ),
+    }
+    sizes = {
+        "legacy": legacy_path.stat().st_size,
+        "compact": compact_path.stat().st_size,
+        "binary": binary_path.stat().st_size,
+    }
+
+    backend = "orjson" if serialization.orjson is not None else "stdlib"
+    print(f"\n{PATTERNS} patterns ({backend}):")
+    for name, (save_time, load_time) in results.items():
+        print(
+            f"  {name:8s} {sizes[name] / 1e6:5.1f} MB  "
+            f"save {save_time * 1e3:7.1f} ms  load {load_time * 1e3:7.1f} ms"
+        )
+
+    assert sizes["legacy"] > 2_000_000
+    assert load(compact_path) == patterns_with_recent_examples(patterns)
+    assert sizes["compact"] < sizes["legacy"] * 0.8
+    legacy_save_time, legacy_load_time = results["legacy"]
+    assert results["compact"][0] < legacy_save_time
+    if serialization.orjson is not None:
+        assert results["compact"][0] * 3 < legacy_save_time
+        assert results["compact"][1] < legacy_load_time
+
+
+def patterns_with_recent_examples(patterns):
+    return {pid: replace(p, examples=p.examples[-10:]) for pid, p in patterns.items()}
+
+
+@pytest.mark.performance
+def test_metrics_log_round_trip(tmp_path):
+    """A metrics log encodes and decodes faster line by line."""
+    metrics = _metrics()
+    legacy_path = tmp_path / "legacy.jsonl"
+    path = tmp_path / "metrics.jsonl"
+
+    def legacy_save():
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            for metric in metrics:
+                json.dump(_legacy_metric_dict(metric), f, separators=(",", ":"))
+                f.write("\n")
+
+    def legacy_load():
+        loaded = []
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            for line in f:
+                data = json.loads(line)
+                loaded.append(
+                    Metric(
+                        metric_id=data["metric_id"],
+                        metric_type=MetricType(data["metric_type"]),
+                        name=data["name"],
+                        value=data["value"],
+                        timestamp=datetime.fromisoformat(data["timestamp"]),
+                        tags=data.get("tags", {}),
+                        metadata=data.get("metadata", {}),
+                    )
+                )
+        return loaded
+
+    def save():
+        with open(path, "wb") as f:
+            for metric in metrics:
+                f.write(serialization.dumps(metric) + b"\n")
+
+    def load():
+        return [
+            serialization.structure(Metric, data)
+            for data in serialization.load_lines(path.read_bytes())
+        ]
+
+    legacy = (_best_of(3, legacy_save), _best_of(3, legacy_load))
+    new = (_best_of(3, save), _best_of(3, load))
+    print(
+        f"\n{METRICS} metrics ({path.stat().st_size / 1e6:.1f} MB): "
+        f"legacy save {legacy[0] * 1e3:.1f} ms load {legacy[1] * 1e3:.1f} ms, "
+        f"new save {new[0] * 1e3:.1f} ms load {new[1] * 1e3:.1f} ms"
+    )
+
+    assert load() == metrics
+    assert path.read_bytes() == legacy_path.read_bytes()
+    if serialization.orjson is not None:
+        assert new[0] * 2 < legacy[0]
+        assert new[1] < legacy[1]
@@ -0,0 +1,113 @@
+"""
+Smart Debugger Benchmark
+
+Classifies a stream of errors against a few hundred learned patterns the old
+way (read the patterns file and run uncompiled case-insensitive searches over
+every pattern for each error) and through the compiled pattern index.
+"""
+
+import json
+import random
+import re
+import time
+
+import pytest
+
+from ai_onboard.core.legacy_cleanup.smart_debugger import (
+    CompiledPatternIndex,
+    SmartDebugger,
+)
+
+ERROR_TYPES = 30
+PATTERNS_PER_TYPE = 10
+ERRORS = 5000
+
+
+def _patterns():
+    return [
+        {
+            "id": f"pattern_{t}_{n}",
+            "error_type": f"Error{t}",
+            "message_patterns": [
+                rf"failure {n} in module_{t}_\w+",
+                rf"code E{t}{n}\d+",
+            ],
+            "context_patterns": [rf"line \d+ of file_{n}\.py"],
+            "success_rate": (n % 5) / 5,
+        }
+        for t in range(ERROR_TYPES)
+        for n in range(PATTERNS_PER_TYPE)
+    ]
+
+
+def _errors():
+    rng = random.Random(3)
+    errors = []
+    for _ in range(ERRORS):
+        t = rng.randrange(ERROR_TYPES)
+        n = rng.randrange(PATTERNS_PER_TYPE)
+        message = f"Failure {n} in module_{t}_core: code E{t}{n}42"
+        errors.append((f"Error{t}", f"{message} at line 7 of file_{n}.py"))
+    return errors
+
+
+def _legacy_match(path, error_type, error_message):
+    patterns = json.loads(path.read_text(encoding="utf-8"))
+    best_match = None
+    best_confidence = 0.0
+    for pattern in patterns.get("patterns", []):
+        confidence = 0.0
+        if pattern.get("error_type") == error_type:
+            confidence += 0.4
+        for msg_pattern in pattern.get("message_patterns", []):
+            if re.search(msg_pattern, error_message, re.IGNORECASE):
+                confidence += 0.3
+                break
+        for ctx_pattern in pattern.get("context_patterns", []):
+            if re.search(ctx_pattern, str(error_message), re.IGNORECASE):
+                confidence += 0.2
+                break
+        confidence = min(confidence + pattern.get("success_rate", 0.5) * 0.1, 1.0)
+        if confidence > best_confidence and confidence > 0.7:
+            best_confidence = confidence
+            best_match = {"pattern_id": pattern["id"], "confidence": confidence}
+    return best_match
+
+
+@pytest.mark.performance
+def test_error_stream_classification(tmp_path):
+    """The compiled index classifies an error stream many times faster."""
+    debugger = SmartDebugger(tmp_path)
+    debugger._save_patterns({"patterns": _patterns()})
+    errors = _errors()
+    sample = errors[:50]
+
+    started = time.perf_counter()
+    legacy = [_legacy_match(debugger.patterns_path, t, m) for t, m in sample]
+    legacy_per_error = (time.perf_counter() - started) / len(sample)
+
+    index = CompiledPatternIndex(debugger.patterns_path)
+    started = time.perf_counter()
+    single = [index.best_match(t, m) for t, m in errors]
+    single_per_error = (time.perf_counter() - started) / len(errors)
+
+    started = time.perf_counter()
+    batch = index.best_matches(errors)
+    batch_per_error = (time.perf_counter() - started) / len(errors)
+
+    print(
+        f"\n{ERROR_TYPES * PATTERNS_PER_TYPE} patterns: "
+        f"legacy {legacy_per_error * 1e6:.1f} us/error, "
+        f"index {single_per_error * 1e6:.1f} us/error, "
+        f"batched {batch_per_error * 1e6:.1f} us/error"
+    )
+
+    assert [
+        (m["pattern_id"], round(m["confidence"], 6)) if m else None for m in legacy
+    ] == [
+        (m["pattern_id"], round(m["confidence"], 6)) if m else None
+        for m in single[: len(sample)]
+    ]
+    assert batch == single
+    assert index.stats["loads"] == 1
+    assert single_per_error * 10 < legacy_per_error
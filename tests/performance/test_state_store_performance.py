@@ -0,0 +1,38 @@
+"""
+State Store Benchmark
+
+A burst of state saves, run log events and telemetry records turns into a
+handful of file writes instead of one per call.
+"""
+
+import time
+
+import pytest
+
+from ai_onboard.core.base import runlog, state, telemetry
+from ai_onboard.core.base.state_store import get_state_store
+
+
+@pytest.mark.performance
+def test_busy_session_coalesces_writes(tmp_path):
+    """3000 bookkeeping calls cost a few file writes."""
+    store = get_state_store()
+    store.flush_all()
+    before = dict(store.stats)
+
+    started = time.perf_counter()
+    for n in range(1000):
+        state.save(tmp_path, {"state": "executing", "step": n})
+        runlog.write_event(tmp_path, "step", {"n": n})
+        telemetry.record_run(tmp_path, {"summary": {"pass": True}, "results": []})
+    elapsed = time.perf_counter() - started
+    store.flush_all()
+
+    writes = store.stats["files_written"] - before["files_written"]
+    print(
+        f"\n3000 calls in {elapsed * 1e3:.1f} ms "
+        f"({elapsed / 3000 * 1e6:.1f} us per call), {writes} file writes"
+    )
+    assert state.load(tmp_path)["step"] == 999
+    assert len(telemetry.read_metrics(tmp_path)) == 1000
+    assert writes <= 20
@@ -0,0 +1,45 @@
+"""
+Tracing Overhead Microbenchmark
+
+Instrumented hot paths (agent operations, tool orchestration, validation
+stages) always pass through ``span`` and ``traced``. Measures what that costs
+when tracing is off, against recording every span.
+"""
+
+import time
+
+import pytest
+
+from ai_onboard.core.base import tracing
+
+ITERATIONS = 100_000
+
+
+def _per_span_ns(work):
+    start = time.perf_counter_ns()
+    for _ in range(ITERATIONS):
+        work()
+    return (time.perf_counter_ns() - start) / ITERATIONS
+
+
+@pytest.mark.performance
+def test_disabled_tracing_is_near_free(tmp_path):
+    """Disabled spans must cost a fraction of recorded ones."""
+
+    def nested_spans():
+        with tracing.span("outer"):
+            with tracing.span("inner"):
+                pass
+
+    tracing.configure(enabled=False)
+    disabled = _per_span_ns(nested_spans) / 2
+
+    tracing.configure(tmp_path, max_events=ITERATIONS * 2)
+    try:
+        enabled = _per_span_ns(nested_spans) / 2
+    finally:
+        tracing.configure(enabled=False)
+
+    print(f"\ndisabled: {disabled:.0f}ns/span  recorded: {enabled:.0f}ns/span")
+    assert disabled * 3 < enabled
+    assert disabled < 5_000
@@ -0,0 +1,98 @@
+"""
+Ultra-Safe Cleanup Scan Benchmark
+
+Scans a synthetic project holding build artifacts, caches and a large git
+directory the old way (an unpruned rglob per scan path and whole-file reads
+for every hash) and through the shared pruned walk with streamed, parallel,
+cached hashing, cold and warm.
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from ai_onboard.core.quality_safety.ultra_safe_cleanup import (
+    CleanupRiskLevel,
+    UltraSafeCleanupEngine,
+)
+
+TARGET_DIRS = 40
+FILES_PER_DIR = 25
+FILE_SIZE = 64 * 1024
+SOURCE_FILES = 2000
+GIT_OBJECTS = 5000
+
+
+def _tree(root):
+    payload = os.urandom(FILE_SIZE)
+    for d in range(TARGET_DIRS):
+        directory = root / "build" / f"part{d}"
+        directory.mkdir(parents=True)
+        for f in range(FILES_PER_DIR):
+            (directory / f"artifact{f}.tmp").write_bytes(payload[f:] + bytes(f))
+    for n in range(SOURCE_FILES):
+        directory = root / "src" / f"pkg{n % 50}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"mod{n}.py").write_text("x = 1\n")
+    for n in range(GIT_OBJECTS):
+        directory = root / ".git" / "objects" / f"{n % 256:02x}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{n:038x}").write_bytes(b"blob")
+    past = time.time_ns() - 60_000_000_000
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            os.utime(os.path.join(dirpath, name), ns=(past, past))
+
+
+def _legacy_scan(engine):
+    """The previous scan: rglob every scan path, read whole files to hash."""
+    root = engine.root
+    targets = []
+    for scan_path in (root, root / ".ai_onboard" / "backups"):
+        if not scan_path.exists():
+            continue
+        for path in scan_path.rglob("*"):
+            if path.is_file():
+                target = engine._classify_file(path)
+                if target and target.risk_level != CleanupRiskLevel.CRITICAL:
+                    path.stat()
+                    with open(path, "rb") as f:
+                        target.file_hash = hashlib.sha256(f.read()).hexdigest()
+                    targets.append(target)
+    return targets
+
+
+@pytest.mark.performance
+def test_cleanup_scan(tmp_path):
+    """One walk with cached streamed hashes; warm scans read no file data."""
+    _tree(tmp_path)
+    megabytes = TARGET_DIRS * FILES_PER_DIR * FILE_SIZE / 1e6
+
+    started = time.perf_counter()
+    legacy = _legacy_scan(UltraSafeCleanupEngine(tmp_path))
+    legacy_time = time.perf_counter() - started
+
+    cold_engine = UltraSafeCleanupEngine(tmp_path)
+    started = time.perf_counter()
+    cold = cold_engine.scan_for_cleanup_targets()
+    cold_time = time.perf_counter() - started
+
+    warm_engine = UltraSafeCleanupEngine(tmp_path)
+    started = time.perf_counter()
+    warm = warm_engine.scan_for_cleanup_targets()
+    warm_time = time.perf_counter() - started
+
+    print(
+        f"\n{len(cold)} targets ({megabytes:.0f} MB): "
+        f"legacy {legacy_time * 1e3:.0f} ms, cold {cold_time * 1e3:.0f} ms, "
+        f"warm {warm_time * 1e3:.0f} ms "
+        f"(warm read {warm_engine.hash_cache.stats['bytes_read']} bytes)"
+    )
+
+    expected = {t.path: t.file_hash for t in legacy}
+    assert {t.path: t.file_hash for t in cold} == expected
+    assert {t.path: t.file_hash for t in warm} == expected
+    assert warm_engine.hash_cache.stats["bytes_read"] == 0
+    assert warm_time * 2 < legacy_time
@@ -0,0 +1,105 @@
+"""
+User Preference Learning Benchmark
+
+Per-interaction learning cost must not grow with a user's history. The
+streaming learner state is driven through 100k interactions directly, and the
+full record_user_interaction path (learners, pattern detection, storage) is
+timed well past the point where the bounded history window fills up.
+
+Set AI_ONBOARD_PREF_BENCH_INTERACTIONS to run the full path for longer.
+"""
+
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_onboard.core.ai_integration.user_preference_learning import (
+    InteractionType,
+    UserInteraction,
+    UserPreferenceLearningSystem,
+)
+from ai_onboard.core.ai_integration.user_preference_streams import UserStreamState
+
+TYPES = list(InteractionType)
+
+
+def _context(n):
+    return {"command": f"cmd{n % 3}", "command_type": "build", "error_type": "io"}
+
+
+def _chunk_means(timings, chunks):
+    size = len(timings) // chunks
+    return [sum(timings[i * size : (i + 1) * size]) / size for i in range(chunks)]
+
+
+@pytest.mark.performance
+def test_streaming_state_is_flat_over_100k_interactions():
+    """Updating the learner state costs the same at 1k and 100k interactions."""
+    total = 100_000
+    history = deque(maxlen=1000)
+    scores = deque(maxlen=100)
+    state = UserStreamState(history.maxlen)
+    start_ts = datetime(2024, 1, 1)
+    timings = []
+
+    for n in range(total):
+        interaction = UserInteraction(
+            interaction_id=f"i{n}",
+            user_id="bench",
+            interaction_type=TYPES[n % len(TYPES)],
+            timestamp=start_ts + timedelta(seconds=n),
+            context=_context(n),
+            duration=1.0,
+            outcome={"approved": True},
+        )
+        started = time.perf_counter()
+        evicted = history[0] if len(history) == history.maxlen else None
+        history.append(interaction)
+        state.interactions.add(interaction, evicted)
+        evicted_score = scores[0] if len(scores) == scores.maxlen else None
+        scores.append(0.8)
+        state.add_satisfaction(0.8, evicted_score)
+        timings.append(time.perf_counter() - started)
+
+    means = _chunk_means(timings[2000:], 10)
+    print(
+        "\nstreaming update per chunk (us): "
+        + " ".join(f"{m * 1e6:.1f}" for m in means)
+    )
+    assert state.in_sync_with(history, scores)
+    assert means[-1] < means[0] * 2
+
+
+@pytest.mark.performance
+def test_record_interaction_latency_is_flat(tmp_path):
+    """Full interaction recording does not slow down as history grows."""
+    total = int(os.environ.get("AI_ONBOARD_PREF_BENCH_INTERACTIONS", "3000"))
+    (tmp_path / ".ai_onboard").mkdir()
+    system = UserPreferenceLearningSystem(tmp_path)
+    timings = []
+
+    for n in range(total):
+        started = time.perf_counter()
+        system.record_user_interaction(
+            "bench",
+            TYPES[n % len(TYPES)],
+            _context(n),
+            duration=1.0,
+            outcome={"approved": True},
+            satisfaction_score=0.5 + (n % 5) / 10,
+        )
+        timings.append(time.perf_counter() - started)
+
+    # Compare once the 1000-interaction history window is full
+    means = _chunk_means(timings[1000:], 4)
+    print(
+        f"\nrecord_user_interaction per chunk over {total} interactions (ms): "
+        + " ".join(f"{m * 1e3:.3f}" for m in means)
+    )
+    profile = system.user_profiles["bench"]
+    assert profile.total_interactions == total
+    assert len(profile.behavior_patterns) <= 4
+    assert means[-1] < means[0] * 2
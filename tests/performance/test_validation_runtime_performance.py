@@ -0,0 +1,91 @@
+"""
+Staged Validation Benchmark
+
+Runs validation with I/O-bound stand-ins for each stage, sequentially the
+old way and through the stage runner, and compares end-to-end latency with
+the slowest dependency chain.
+"""
+
+import time
+
+import pytest
+
+from ai_onboard.core.base import telemetry
+from ai_onboard.core.monitoring_analytics import validation_runtime
+
+# Seconds each stage blocks on I/O
+DELAYS = {
+    "alignment": 0.12,
+    "charter": 0.05,
+    "engine": 0.08,
+    "project_status": 0.10,
+    "wbs_status": 0.06,
+    "progress": 0.15,
+}
+
+
+def _io(name, value=None):
+    time.sleep(DELAYS[name])
+    return value if value is not None else {name: True}
+
+
+class _Engine:
+    class analytics:
+        @staticmethod
+        def get_project_status():
+            return _io("project_status")
+
+    class wbs:
+        @staticmethod
+        def get_status():
+            return _io("wbs_status")
+
+
+class _Dashboard:
+    def generate_dashboard(self):
+        return _io("progress")
+
+
+@pytest.mark.performance
+def test_staged_validation_latency(tmp_path, monkeypatch):
+    """Latency approaches the slowest chain instead of the sum of stages."""
+    monkeypatch.setattr(validation_runtime, "preview", lambda r: _io("alignment"))
+    monkeypatch.setattr(validation_runtime, "load_charter", lambda r: _io("charter"))
+    monkeypatch.setattr(
+        validation_runtime,
+        "get_unified_project_management_engine",
+        lambda r: _io("engine", _Engine),
+    )
+    monkeypatch.setattr(
+        validation_runtime, "get_legacy_progress_dashboard", lambda r: _Dashboard()
+    )
+    monkeypatch.setattr(telemetry, "record_run", lambda root, res: None)
+
+    started = time.perf_counter()
+    engine = validation_runtime.get_unified_project_management_engine(tmp_path)
+    validation_runtime.preview(tmp_path)
+    validation_runtime.load_charter(tmp_path)
+    engine.analytics.get_project_status()
+    engine.wbs.get_status()
+    validation_runtime.get_legacy_progress_dashboard(tmp_path).generate_dashboard()
+    sequential = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = validation_runtime.run(tmp_path)
+    staged = time.perf_counter() - started
+
+    critical = max(
+        DELAYS["engine"] + DELAYS["project_status"],
+        DELAYS["alignment"],
+        DELAYS["progress"],
+    )
+    print(
+        f"\nSequential {sequential * 1e3:.0f} ms, staged {staged * 1e3:.0f} ms "
+        f"(slowest chain {critical * 1e3:.0f} ms)"
+    )
+    for name, stage in report["stages"].items():
+        print(f"  {name}: wall {stage['wall_ms']:.1f} ms, cpu {stage['cpu_ms']:.2f} ms")
+
+    assert all(s["status"] == "ok" for s in report["stages"].values())
+    assert staged < critical + 0.1
+    assert staged * 2 < sequential
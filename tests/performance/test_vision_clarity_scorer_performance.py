@@ -0,0 +1,91 @@
+"""
+Vision Clarity Scoring Benchmark
+
+Replays an interactive interrogation, where every answer re-scores the whole
+vision, with and without the lexicon engine's scan cache, and bulk-scores a
+set of historical visions with ``score_many``.
+"""
+
+import random
+import time
+
+import pytest
+
+from ai_onboard.core.vision.vision_clarity_scorer import (
+    FIELD_LEXICONS,
+    LEXICONS,
+    LexiconEngine,
+    VisionClarityScorer,
+)
+
+ANSWERS = 60
+ANSWER_WORDS = 500
+VOCABULARY = (
+    "the users need a faster way to build and deliver reliable services "
+    "because current tools have problems with timeline and quality standards"
+).split()
+
+
+def _answers():
+    rng = random.Random(11)
+    keys = list(FIELD_LEXICONS)
+    return [
+        (keys[n % len(keys)], " ".join(rng.choices(VOCABULARY, k=ANSWER_WORDS)))
+        for n in range(ANSWERS)
+    ]
+
+
+def _interrogate(scorer, answers):
+    responses = {}
+    start = time.perf_counter()
+    for key, text in answers:
+        responses[key] = text
+        report = scorer.score_vision_clarity(responses)
+    return time.perf_counter() - start, report
+
+
+@pytest.mark.performance
+def test_interactive_rescoring_only_scans_new_answers():
+    """Cached scans must make per-answer re-scoring much cheaper."""
+    answers = _answers()
+
+    uncached, expected = _interrogate(
+        VisionClarityScorer(LexiconEngine(LEXICONS, FIELD_LEXICONS, cache_size=0)),
+        answers,
+    )
+    cached, report = _interrogate(
+        VisionClarityScorer(LexiconEngine(LEXICONS, FIELD_LEXICONS)), answers
+    )
+
+    print(f"\nuncached: {uncached * 1000:.1f}ms  cached: {cached * 1000:.1f}ms")
+    assert report == expected
+    assert cached * 2 < uncached
+
+
+@pytest.mark.performance
+def test_score_many_scales_linearly():
+    """Bulk scoring time must grow with the number of visions, not faster."""
+    rng = random.Random(5)
+
+    def visions(count):
+        return [
+            {
+                key: " ".join(rng.choices(VOCABULARY, k=50)) + f" {n}"
+                for key in FIELD_LEXICONS
+            }
+            for n in range(count)
+        ]
+
+    small, large = visions(200), visions(2000)
+    scorer = VisionClarityScorer(LexiconEngine(LEXICONS, FIELD_LEXICONS))
+
+    start = time.perf_counter()
+    scorer.score_many(small)
+    small_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reports = scorer.score_many(large)
+    large_time = time.perf_counter() - start
+
+    print(f"\n200: {small_time * 1000:.1f}ms  2000: {large_time * 1000:.1f}ms")
+    assert len(reports) == 2000
+    assert large_time < small_time * 20
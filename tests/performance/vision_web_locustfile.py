@@ -0,0 +1,119 @@
+"""
+Load Testing for the Vision Web Interface
+
+Simulates many local dashboard clients against a loopback VisionWebInterface
+instance: page loads with ETag revalidation, status/question polling and
+long-lived server-sent-event subscriptions.
+
+Start a loopback instance and run Locust against it:
+
+    python tests/performance/vision_web_locustfile.py --port 8765
+    locust -f tests/performance/vision_web_locustfile.py \
+        --host http://127.0.0.1:8765 --headless -u 300 -r 50 -t 60s
+"""
+
+import time
+from pathlib import Path
+
+from locust import between, events, task
+from locust.contrib.fasthttp import FastHttpUser
+
+
+class VisionDashboardUser(FastHttpUser):
+    """Simulates a browser tab with the vision dashboard open."""
+
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        """Cache validators the way a browser would."""
+        self.etags = {}
+
+    def _conditional_get(self, path: str, name: str):
+        headers = {"Accept-Encoding": "gzip"}
+        if path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+
+        with self.client.get(
+            path, headers=headers, name=name, catch_response=True
+        ) as response:
+            if response.status_code in (200, 304):
+                etag = response.headers.get("ETag")
+                if etag:
+                    self.etags[path] = etag
+                response.success()
+            else:
+                response.failure(f"{name} failed: {response.status_code}")
+
+    @task(2)
+    def load_dashboard(self):
+        """Load the main page (mostly served as 304 after the first visit)."""
+        self._conditional_get("/", "page")
+
+    @task(5)
+    def poll_status(self):
+        """Fetch interrogation status."""
+        self._conditional_get("/api/status", "status")
+
+    @task(2)
+    def fetch_project_types(self):
+        """Fetch the static project type list."""
+        self._conditional_get("/api/project-types", "project-types")
+
+    @task(1)
+    def subscribe_to_events(self):
+        """Open the SSE stream and read the first frame."""
+        with self.client.get(
+            "/api/events", name="events", stream=True, catch_response=True
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"events failed: {response.status_code}")
+                return
+            first_chunk = response.stream.read(16)
+            if first_chunk.startswith(b"retry:"):
+                response.success()
+            else:
+                response.failure("events stream did not start")
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    """Announce the target instance."""
+    print("🚀 Starting Vision Web Interface load test")
+    print(f"Target: {environment.host}")
+
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **kwargs):
+    """Summarize throughput and latency."""
+    print("✅ Vision Web Interface load test completed")
+    print(f"Total requests: {environment.stats.total.num_requests}")
+    print(f"Average response time: {environment.stats.total.avg_response_time:.2f}ms")
+    print(f"Requests per second: {environment.stats.total.total_rps:.2f}")
+
+
+def run_loopback_server(root: Path, port: int = 8765):
+    """Run a VisionWebInterface on the loopback interface for load testing."""
+    from ai_onboard.core.vision.vision_web_interface import VisionWebInterface
+
+    interface = VisionWebInterface(root, port=port, host="127.0.0.1")
+    result = interface.start_web_interface(open_browser=False)
+    print(result["message"])
+    print("Press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Server stopped")
+        interface.stop_web_interface()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Loopback Vision Web Interface")
+    parser.add_argument("--root", default=".", help="Project root to serve")
+    parser.add_argument("--port", type=int, default=8765, help="Server port")
+
+    args = parser.parse_args()
+    run_loopback_server(Path(args.root).resolve(), args.port)
@@ -0,0 +1,114 @@
+"""
+Tests for automatic progress detection.
+
+This module tests incremental commit scanning against a persisted
+high-water mark, streaming git log parsing and cached task matching.
+"""
+
+import json
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from ai_onboard.core.base.utils import write_json
+from ai_onboard.core.project_management.automatic_progress_detector import (
+    AutomaticProgressDetector,
+    GitCommitAnalyzer,
+    iter_git_log,
+)
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    )
+
+
+def _commit(repo, filename, message):
+    path = repo / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(message)
+    _git(repo, "add", filename)
+    _git(repo, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "Dev")
+    _commit(tmp_path, "docs/readme.md", "Task T17 complete | docs")
+    _commit(tmp_path, "src/app.py", "Initial app")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def no_tool_tracking():
+    with patch(
+        "ai_onboard.core.project_management.automatic_progress_detector"
+        ".track_tool_usage"
+    ):
+        yield
+
+
+class TestGitLogStreaming:
+    """Test parsing of the streamed git log."""
+
+    def test_commits_include_subjects_and_files(self, repo):
+        commits = list(iter_git_log(repo))
+
+        assert [c["subject"] for c in commits] == ["initial app", "task t17 complete | docs"]
+        assert commits[1]["files"] == ["docs/readme.md"]
+        assert len(commits[0]["hash"]) == 40
+
+    def test_range_only_returns_new_commits(self, repo):
+        head = list(iter_git_log(repo))[0]["hash"]
+        _commit(repo, "src/extra.py", "Add extra")
+
+        assert [c["subject"] for c in iter_git_log(repo, head)] == ["add extra"]
+
+
+class TestTaskMatching:
+    """Test precompiled task matching."""
+
+    def test_matches_are_cached_per_commit(self, repo):
+        analyzer = GitCommitAnalyzer(repo)
+        commit = {"hash": "abc", "subject": "task t5 complete"}
+
+        first = analyzer.match_commit(commit)
+        commit["subject"] = "unrelated"
+
+        assert "t5" in first
+        assert analyzer.match_commit(commit) is first
+
+
+class TestIncrementalDetection:
+    """Test the persisted high-water mark."""
+
+    def test_second_run_only_reads_new_commits(self, repo):
+        detector = AutomaticProgressDetector(repo)
+
+        first = detector.detect_completed_work()
+        second = detector.detect_completed_work()
+        _commit(repo, "ui/interface.py", "Implement ui")
+        third = detector.detect_completed_work()
+
+        assert first["commits_analyzed"] == 2
+        assert second["commits_analyzed"] == 0
+        assert second["commit_completions"] == first["commit_completions"]
+        assert third["commits_analyzed"] == 1
+        assert "T18" in third["active_tasks"]
+        assert "T17" in third["active_tasks"]
+
+    def test_unknown_high_water_mark_falls_back_to_full_scan(self, repo):
+        detector = AutomaticProgressDetector(repo)
+        detector.detect_completed_work()
+        state = json.loads(detector.state_file.read_text())
+        state["last_sha"] = "0" * 40  # e.g. pruned after a history rewrite
+        write_json(detector.state_file, state)
+
+        result = detector.detect_completed_work()
+
+        assert result["commits_analyzed"] == 2
+        assert result["last_processed_sha"] == list(iter_git_log(repo))[0]["hash"]
@@ -0,0 +1,169 @@
+"""
+Tests for the shared background scheduler.
+
+This module tests job registration, periodic and one-shot execution,
+coalescing of overdue runs, per-job statistics and shutdown behaviour.
+"""
+
+import threading
+import time
+
+import pytest
+
+from ai_onboard.core.base.background_scheduler import BackgroundScheduler
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+@pytest.fixture
+def scheduler():
+    sched = BackgroundScheduler(name="test-scheduler")
+    yield sched
+    sched.shutdown()
+
+
+class TestScheduling:
+    """Test periodic and one-shot job execution."""
+
+    def test_periodic_job_runs_repeatedly(self, scheduler):
+        calls = []
+        scheduler.schedule_periodic(
+            "tick", lambda: calls.append(1), 0.01, jitter=0.0, initial_delay=0.0
+        )
+
+        assert _wait_for(lambda: len(calls) >= 3)
+        assert scheduler.get_stats()["jobs"]["tick"]["runs"] >= 3
+
+    def test_one_shot_job_runs_once_and_is_removed(self, scheduler):
+        calls = []
+        scheduler.schedule_once("once", lambda: calls.append(1), 0.0)
+
+        assert _wait_for(lambda: calls == [1])
+        assert _wait_for(lambda: not scheduler.has_job("once"))
+        time.sleep(0.05)
+        assert calls == [1]
+
+    def test_jobs_share_a_single_worker_thread(self, scheduler):
+        threads = set()
+        for i in range(5):
+            scheduler.schedule_periodic(
+                f"job-{i}",
+                lambda: threads.add(threading.current_thread().name),
+                0.01,
+                initial_delay=0.0,
+            )
+
+        assert _wait_for(lambda: len(threads) >= 1)
+        time.sleep(0.05)
+        assert threads == {"test-scheduler"}
+
+    def test_cancel_stops_job(self, scheduler):
+        calls = []
+        scheduler.schedule_periodic(
+            "tick", lambda: calls.append(1), 0.01, initial_delay=0.0
+        )
+        assert _wait_for(lambda: calls)
+
+        assert scheduler.cancel("tick") is True
+        count = len(calls)
+        time.sleep(0.05)
+        assert len(calls) <= count + 1
+        assert scheduler.cancel("tick") is False
+
+    def test_invalid_interval_rejected(self, scheduler):
+        with pytest.raises(ValueError):
+            scheduler.schedule_periodic("bad", lambda: None, 0)
+
+
+class TestStatsAndCoalescing:
+    """Test per-job statistics and overdue run coalescing."""
+
+    def test_failures_are_recorded_and_job_keeps_running(self, scheduler):
+        def boom():
+            raise RuntimeError("kaboom")
+
+        scheduler.schedule_periodic("boom", boom, 0.01, initial_delay=0.0)
+
+        assert _wait_for(lambda: scheduler.get_stats()["jobs"]["boom"]["runs"] >= 2)
+        stats = scheduler.get_stats()["jobs"]["boom"]
+        assert stats["failures"] == stats["runs"]
+        assert "kaboom" in stats["last_error"]
+
+    def test_overdue_runs_are_coalesced(self, scheduler):
+        calls = []
+        gate = threading.Event()
+
+        # A slow job blocks the worker long enough for "fast" to miss ticks
+        scheduler.schedule_once("slow", lambda: gate.wait(0.2), 0.0)
+        scheduler.schedule_periodic(
+            "fast", lambda: calls.append(1), 0.02, jitter=0.0, initial_delay=0.0
+        )
+
+        assert _wait_for(lambda: len(calls) >= 1)
+        stats = scheduler.get_stats()["jobs"]["fast"]
+        assert stats["coalesced_runs"] >= 1
+        # Missed ticks were not replayed back to back
+        assert len(calls) <= 3
+
+    def test_throttle_stretches_intervals(self, scheduler):
+        calls = []
+        scheduler.set_throttle(100.0)
+        scheduler.schedule_periodic(
+            "tick", lambda: calls.append(1), 0.01, jitter=0.0, initial_delay=0.0
+        )
+
+        assert _wait_for(lambda: calls)
+        time.sleep(0.1)
+        assert len(calls) == 1
+        assert scheduler.get_stats()["throttle"] == 100.0
+
+
+class TestShutdown:
+    """Test clean shutdown."""
+
+    def test_shutdown_stops_worker_and_clears_jobs(self):
+        sched = BackgroundScheduler(name="shutdown-test")
+        sched.schedule_periodic("tick", lambda: None, 0.01, initial_delay=0.0)
+        assert sched.running
+
+        sched.shutdown()
+
+        assert not sched.running
+        assert sched.get_stats()["job_count"] == 0
+        assert not any(t.name == "shutdown-test" for t in threading.enumerate())
+
+    def test_resubmitting_after_shutdown_keeps_a_single_worker(self, scheduler):
+        release = threading.Event()
+        started = threading.Event()
+        workers = []
+
+        def slow():
+            started.set()
+            release.wait(2.0)
+
+        scheduler.schedule_once("slow", slow, 0.0)
+        assert started.wait(2.0)
+        scheduler.shutdown(wait=False)
+        scheduler.schedule_periodic(
+            "tick",
+            lambda: workers.append(threading.current_thread()),
+            0.01,
+            jitter=0.0,
+            initial_delay=0.0,
+        )
+        release.set()
+
+        assert _wait_for(lambda: len(workers) >= 5)
+        time.sleep(0.05)
+        assert len(set(workers)) == 1
+        assert _wait_for(
+            lambda: sum(t.name == "test-scheduler" for t in threading.enumerate())
+            == 1
+        )
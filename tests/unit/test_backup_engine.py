@@ -0,0 +1,167 @@
+"""
+Tests for the deduplicated, link-based backup engine.
+
+This module tests snapshot and restore round trips, content deduplication,
+hardlinked backups and their release, restoring only changed files, and the
+cleanup systems' backups built on the engine.
+"""
+
+import os
+import shutil
+import time
+
+import pytest
+
+from ai_onboard.core.quality_safety.backup_engine import BackupEngine
+from ai_onboard.core.quality_safety.cleanup_safety_gates import (
+    BackupExecuteGate,
+    CleanupOperation as GateOperation,
+    _restore_backup,
+)
+from ai_onboard.core.quality_safety.ultra_safe_cleanup import (
+    CleanupOperation,
+    CleanupRiskLevel,
+    CleanupTarget,
+    UltraSafeCleanupEngine,
+)
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    past = time.time_ns() - 60_000_000_000
+    os.utime(path, ns=(past, past))
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "build/a.txt", "alpha")
+    _write(tmp_path, "build/nested/b.txt", "beta")
+    _write(tmp_path, "build/copy_of_a.txt", "alpha")
+    (tmp_path / "build" / "empty").mkdir()
+    _write(tmp_path, "notes.log", "log")
+    return tmp_path
+
+
+def _objects(root):
+    store = root / ".ai_onboard" / "backup_objects"
+    return [p for p in store.rglob("*") if p.is_file()]
+
+
+class TestBackupEngine:
+    """Test snapshots, deduplication and restore."""
+
+    def test_round_trip_restores_files_directories_and_metadata(self, project):
+        os.chmod(project / "notes.log", 0o600)
+        engine = BackupEngine(project)
+        snapshot = engine.snapshot([project / "build", project / "notes.log"])
+        mtime = (project / "notes.log").stat().st_mtime_ns
+
+        shutil.rmtree(project / "build")
+        (project / "notes.log").unlink()
+        result = BackupEngine(project).restore(snapshot)
+
+        assert result == {"restored": 4, "unchanged": 0, "errors": []}
+        assert (project / "build/nested/b.txt").read_text() == "beta"
+        assert (project / "build/empty").is_dir()
+        assert (project / "notes.log").stat().st_mode & 0o777 == 0o600
+        assert (project / "notes.log").stat().st_mtime_ns == mtime
+
+    def test_identical_contents_are_stored_once(self, project):
+        engine = BackupEngine(project)
+        engine.snapshot([project / "build"])
+        assert len(_objects(project)) == 2
+        assert engine.stats["deduplicated"] == 1
+
+        second = BackupEngine(project)
+        snapshot = second.snapshot([project / "build"])
+        assert second.stats["deduplicated"] == 3
+        assert {e["method"] for e in snapshot["files"]} == {"deduplicated"}
+        assert len(_objects(project)) == 2
+
+    def test_restore_writes_only_changed_files(self, project):
+        snapshot = BackupEngine(project).snapshot([project / "build"])
+        _write(project, "build/a.txt", "changed")
+        (project / "build/nested/b.txt").unlink()
+
+        result = BackupEngine(project).restore(snapshot)
+
+        assert result == {"restored": 2, "unchanged": 1, "errors": []}
+        assert (project / "build/a.txt").read_text() == "alpha"
+
+    def test_hardlinked_objects_are_released_when_sources_survive(self, project):
+        source = project / "notes.log"
+        engine = BackupEngine(project)
+        snapshot = engine.snapshot([source], allow_hardlink=True)
+        obj = engine._object_path(snapshot["files"][0]["digest"])
+
+        if snapshot["files"][0]["method"] != "hardlink":
+            pytest.skip("filesystem cloned the file instead of linking it")
+        assert os.path.samefile(source, obj)
+
+        assert engine.release_links(snapshot) == 1
+        assert not os.path.samefile(source, obj)
+        source.write_text("edited in place")
+        assert obj.read_text() == "log"
+
+    def test_missing_objects_are_reported(self, project):
+        engine = BackupEngine(project)
+        snapshot = engine.snapshot([project / "notes.log"])
+        shutil.rmtree(project / ".ai_onboard" / "backup_objects")
+        (project / "notes.log").unlink()
+
+        result = engine.restore(snapshot)
+
+        assert result["restored"] == 0
+        assert "missing backup object" in result["errors"][0]
+
+
+class TestCleanupBackups:
+    """Test the cleanup systems' backups and rollbacks."""
+
+    def test_ultra_safe_backup_and_rollback(self, project):
+        engine = UltraSafeCleanupEngine(project)
+        targets = [
+            CleanupTarget(project / "notes.log", CleanupRiskLevel.SAFE, "log"),
+            CleanupTarget(project / "build/a.txt", CleanupRiskLevel.SAFE, "tmp"),
+        ]
+        operation = CleanupOperation("op1", targets, {})
+        operation.backup_manifest = engine._create_backup(operation)
+        for target in targets:
+            target.path.unlink()
+
+        assert engine._rollback_operation(operation)
+        assert (project / "notes.log").read_text() == "log"
+        assert (project / "build/a.txt").read_text() == "alpha"
+
+    def test_gate_backup_rolls_back_directories(self, project):
+        gate = BackupExecuteGate(project)
+        backup_id = gate._create_backup(
+            GateOperation("delete", [project / "build"], "remove build")
+        )
+        shutil.rmtree(project / "build")
+
+        gate._rollback(backup_id)
+
+        assert (project / "build/nested/b.txt").read_text() == "beta"
+        assert (project / "build/empty").is_dir()
+
+    def test_legacy_gate_manifests_still_restore(self, project):
+        backup = project / "legacy_copy.txt"
+        shutil.copy2(project / "notes.log", backup)
+        (project / "notes.log").unlink()
+        manifest = {
+            "files": [
+                {
+                    "original": str(project / "notes.log"),
+                    "backup": str(backup),
+                    "type": "file",
+                }
+            ]
+        }
+
+        _restore_backup(project, manifest)
+
+        assert (project / "notes.log").read_text() == "log"
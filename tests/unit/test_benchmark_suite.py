@@ -0,0 +1,232 @@
+"""
+Tests for the scale benchmark suite.
+
+This module tests synthetic repository and telemetry generation, case
+selection and timing, result comparison and the bench CLI commands.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+
+import pytest
+
+from ai_onboard.cli.commands_bench import add_bench_commands, handle_bench_commands
+from ai_onboard.core.base import telemetry
+from ai_onboard.core.monitoring_analytics import benchmark_suite
+from ai_onboard.core.monitoring_analytics.benchmark_suite import (
+    BenchmarkCase,
+    RepoSpec,
+    compare_results,
+    generate_repository,
+    generate_telemetry,
+    run_case,
+    select_cases,
+)
+
+
+def _digest(root):
+    sha = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        sha.update(path.relative_to(root).as_posix().encode())
+        sha.update(path.read_bytes())
+    return sha.hexdigest()
+
+
+def _result(*samples):
+    ordered = sorted(samples)
+    return {
+        "status": "ok",
+        "samples_ms": list(samples),
+        "median_ms": ordered[len(ordered) // 2],
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+    }
+
+
+def _run(results):
+    return {"version": benchmark_suite.RESULTS_VERSION, "results": results}
+
+
+class TestSyntheticData:
+    """Test repository and telemetry generation."""
+
+    def test_repositories_are_deterministic(self, tmp_path):
+        spec = RepoSpec(files=250, import_density=2.5, duplicate_ratio=0.2, seed=7)
+        first = generate_repository(tmp_path / "a", spec)
+        second = generate_repository(tmp_path / "b", spec)
+
+        assert first == second
+        assert _digest(tmp_path / "a") == _digest(tmp_path / "b")
+
+        generate_repository(tmp_path / "c", RepoSpec(files=250, seed=8))
+        assert _digest(tmp_path / "c") != _digest(tmp_path / "a")
+
+    def test_repository_shape_follows_spec(self, tmp_path):
+        spec = RepoSpec(files=300, import_density=3.0, duplicate_ratio=0.25)
+        summary = generate_repository(tmp_path, spec)
+
+        assert len(list(tmp_path.rglob("*.py"))) == 300
+        assert summary["packages"] == 3
+        assert summary["modules"] == 297
+        assert 0.15 < summary["duplicates"] / summary["modules"] < 0.35
+        assert summary["imports"] == pytest.approx(3.0 * 297, rel=0.05)
+        module = (tmp_path / "pkg0002" / "mod000250.py").read_text()
+        assert "import pkg" in module
+        compile(module, "mod000250.py", "exec")
+        stat = (tmp_path / "pkg0002").stat()
+        assert stat.st_mtime_ns == benchmark_suite.FIXED_MTIME_NS
+
+    def test_matching_repositories_are_reused(self, tmp_path):
+        spec = RepoSpec(files=120)
+        generate_repository(tmp_path, spec)
+        module = tmp_path / "pkg0000" / "mod000001.py"
+        module.write_text("edited")
+
+        generate_repository(tmp_path, spec)
+        assert module.read_text() == "edited"
+
+        generate_repository(tmp_path, RepoSpec(files=120, seed=1))
+        assert module.read_text() != "edited"
+
+    def test_foreign_directories_are_not_overwritten(self, tmp_path):
+        (tmp_path / "keep.txt").write_text("mine")
+
+        with pytest.raises(ValueError):
+            generate_repository(tmp_path, RepoSpec(files=10))
+        assert (tmp_path / "keep.txt").read_text() == "mine"
+
+    def test_telemetry_history_length(self, tmp_path):
+        generate_telemetry(tmp_path, 500)
+
+        assert len(telemetry.read_metrics(tmp_path)) == 500
+        lines = (tmp_path / ".ai_onboard" / "unified_metrics.jsonl").read_text()
+        assert len(lines.splitlines()) == 500
+
+
+class TestCases:
+    """Test case selection and timing."""
+
+    def test_selection_defaults_prefixes_and_unknown_names(self):
+        default = [c.name for c in select_cases()]
+        assert "duplicate_detector" not in default
+        assert "cli_startup" in default
+
+        assert [c.name for c in select_cases(only=["import_graph"])] == [
+            "import_graph.cold",
+            "import_graph.warm",
+        ]
+        assert "duplicate_detector" in [
+            c.name for c in select_cases(only=["duplicate_detector"])
+        ]
+        assert "import_graph.warm" not in [
+            c.name for c in select_cases(skip=["import_graph"])
+        ]
+        with pytest.raises(ValueError):
+            select_cases(only=["nope"])
+
+    def test_run_case_resets_before_every_sample(self, tmp_path):
+        calls = []
+
+        @contextlib.contextmanager
+        def setup(root):
+            calls.append("setup")
+            yield lambda: calls.append("run")
+            calls.append("teardown")
+
+        case = BenchmarkCase("probe", setup, reset=lambda root: calls.append("reset"))
+        result = run_case(case, tmp_path, repeat=2, warmup=1)
+
+        assert calls == ["setup"] + ["reset", "run"] * 3 + ["teardown"]
+        assert result["status"] == "ok"
+        assert len(result["samples_ms"]) == 2
+
+    def test_run_case_reports_failures(self, tmp_path):
+        def fail():
+            raise RuntimeError("boom")
+
+        case = BenchmarkCase("broken", benchmark_suite._simple(lambda root: fail))
+        result = run_case(case, tmp_path, repeat=1, warmup=0)
+
+        assert result["status"] == "failed"
+        assert result["error"] == "RuntimeError: boom"
+
+    def test_suite_results_round_trip(self, tmp_path):
+        report = benchmark_suite.run_suite(
+            tmp_path / "work",
+            [RepoSpec(files=50)],
+            telemetry_records=100,
+            repeat=2,
+            warmup=0,
+            only=["telemetry.read_metrics"],
+        )
+
+        assert list(report["results"]) == ["telemetry.read_metrics[50]"]
+        assert report["repos"]["50"]["files"] == 50
+        path = benchmark_suite.save_results(report, tmp_path / "out" / "run.json")
+        assert benchmark_suite.load_results(path) == report
+
+    def test_workdirs_hidden_from_analyzers_are_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            benchmark_suite.run_suite(
+                tmp_path / ".ai_onboard" / "work", [RepoSpec(files=10)]
+            )
+
+
+class TestCompare:
+    """Test regression detection."""
+
+    def test_statuses(self):
+        baseline = _run(
+            {
+                "slower": _result(100, 101, 102),
+                "faster": _result(100, 101, 102),
+                "steady": _result(100, 101, 102),
+                "noisy": _result(100, 150, 200),
+                "tiny": _result(0.1, 0.1, 0.1),
+                "gone": _result(1, 1, 1),
+                "broken": _result(10, 10, 10),
+            }
+        )
+        current = _run(
+            {
+                "slower": _result(130, 131, 132),
+                "faster": _result(50, 51, 52),
+                "steady": _result(105, 106, 107),
+                "noisy": _result(150, 160, 170),
+                "tiny": _result(0.5, 0.5, 0.5),
+                "added": _result(1, 1, 1),
+                "broken": {"status": "failed", "error": "RuntimeError: boom"},
+            }
+        )
+
+        statuses = {
+            e["case"]: e["status"] for e in compare_results(baseline, current, 0.1)
+        }
+
+        assert statuses == {
+            "slower": "regression",
+            "faster": "improvement",
+            "steady": "unchanged",
+            "noisy": "unchanged",
+            "tiny": "unchanged",
+            "gone": "missing",
+            "added": "new",
+            "broken": "failed",
+        }
+
+    def test_cli_compare_flags_regressions(self, tmp_path, capsys):
+        parser = argparse.ArgumentParser()
+        add_bench_commands(parser.add_subparsers(dest="cmd"))
+        base = tmp_path / "base.json"
+        slow = tmp_path / "slow.json"
+        base.write_text(json.dumps(_run({"case[1k]": _result(100, 100, 100)})))
+        slow.write_text(json.dumps(_run({"case[1k]": _result(200, 200, 200)})))
+
+        args = parser.parse_args(["bench", "compare", str(base), str(slow)])
+        assert handle_bench_commands(args, tmp_path) == 1
+        assert "1 regression(s)" in capsys.readouterr().out
+
+        args = parser.parse_args(["bench", "compare", str(base), str(base)])
+        assert handle_bench_commands(args, tmp_path) == 0
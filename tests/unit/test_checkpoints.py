@@ -12,6 +12,8 @@ from ai_onboard.core.base.checkpoints import (
     _ckpt_dir,
     _normalize_scope,
     create,
+    delete,
+    gc,
     list,
     restore,
 )
@@ -250,3 +252,80 @@ class TestIntegration:
 
         # Verify file was restored
         assert test_file.read_text() == "Integration test content"
+
+
+class TestContentAddressedStore:
+    """Test blob deduplication, differential restore and garbage collection."""
+
+    def _blobs(self, root):
+        objects = root / ".ai_onboard" / "checkpoints" / "objects"
+        return sorted(p for p in objects.glob("*/*") if p.is_file())
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        """Test that duplicate files and repeated checkpoints share blobs."""
+        (tmp_path / "a.txt").write_text("same")
+        (tmp_path / "b.txt").write_text("same")
+
+        first = create(tmp_path, ["*.txt"], "first")
+        second = create(tmp_path, ["*.txt"], "second")
+
+        assert first["files"] == 2
+        assert first["new_blobs"] == 1
+        assert second["new_blobs"] == 0
+        assert len(self._blobs(tmp_path)) == 1
+
+    def test_directory_scope_snapshots_contained_files(self, tmp_path):
+        """Test that directories in scope are walked for files."""
+        (tmp_path / "pkg" / "sub").mkdir(parents=True)
+        (tmp_path / "pkg" / "a.py").write_text("a = 1")
+        (tmp_path / "pkg" / "sub" / "b.py").write_text("b = 2")
+
+        ckpt = create(tmp_path, ["pkg"], "dir")
+        (tmp_path / "pkg" / "sub" / "b.py").write_text("b = 3")
+
+        result = restore(tmp_path, ckpt["id"])
+
+        assert ckpt["files"] == 2
+        assert result["restored"] == 1
+        assert result["unchanged"] == 1
+        assert (tmp_path / "pkg" / "sub" / "b.py").read_text() == "b = 2"
+
+    def test_restore_recreates_deleted_files(self, tmp_path):
+        """Test restoring a file that was removed after the checkpoint."""
+        target = tmp_path / "gone.txt"
+        target.write_text("keep me")
+        ckpt = create(tmp_path, ["gone.txt"], "before delete")
+        target.unlink()
+
+        result = restore(tmp_path, ckpt["id"], link_mode="hardlink")
+
+        assert result == {"restored": 1, "unchanged": 0, "errors": []}
+        assert target.read_text() == "keep me"
+
+    def test_gc_reclaims_unreferenced_blobs(self, tmp_path):
+        """Test that deleting a checkpoint lets gc drop its unique blobs."""
+        f = tmp_path / "f.txt"
+        f.write_text("v1")
+        old = create(tmp_path, ["f.txt"], "v1")
+        f.write_text("v2")
+        create(tmp_path, ["f.txt"], "v2")
+        assert len(self._blobs(tmp_path)) == 2
+
+        assert gc(tmp_path)["removed"] == 0
+        assert delete(tmp_path, old["id"]) is True
+        result = gc(tmp_path)
+
+        assert result["removed"] == 1
+        assert len(self._blobs(tmp_path)) == 1
+        assert [c["reason"] for c in list(tmp_path)] == ["v2"]
+
+    def test_legacy_full_copy_checkpoint_still_restores(self, tmp_path):
+        """Test restoring a checkpoint written by the old files/ layout."""
+        legacy = tmp_path / ".ai_onboard" / "checkpoints" / "ckpt_legacy" / "files"
+        legacy.mkdir(parents=True)
+        (legacy / "old.txt").write_text("legacy content")
+
+        result = restore(tmp_path, "ckpt_legacy")
+
+        assert result == {"restored": 1, "errors": []}
+        assert (tmp_path / "old.txt").read_text() == "legacy content"
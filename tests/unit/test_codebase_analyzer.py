@@ -0,0 +1,135 @@
+"""
+Tests for the single-pass codebase analyzer.
+
+This module tests the facts produced by the pruned walk, reuse of cached
+directory summaries, and incremental rescans of changed directories.
+"""
+
+import os
+import time
+
+import pytest
+
+from ai_onboard.core.vision import codebase_analyzer
+from ai_onboard.core.vision.codebase_analyzer import CodebaseAnalyzer
+
+
+def _write(root, rel, text=""):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _age(root):
+    """Move every directory's mtime out of the racy window."""
+    past = time.time_ns() - 60_000_000_000
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(past, past))
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "app/__init__.py")
+    _write(tmp_path, "app/core.py")
+    _write(tmp_path, "app/deep/nested/module.py")
+    _write(tmp_path, "setup.py")
+    _write(tmp_path, "tests/test_core.py")
+    _write(tmp_path, "web/index.js")
+    _write(tmp_path, "web/index.test.js")
+    _write(tmp_path, "node_modules/react/index.js")
+    _write(tmp_path, ".git/objects/pack.py")
+    _write(tmp_path, "requirements.txt", "django>=4\nrequests==2.0\n")
+    (tmp_path / ".ai_onboard").mkdir()
+    _age(tmp_path)
+    return tmp_path
+
+
+class TestAnalysis:
+    """Test the facts produced by one walk."""
+
+    def test_facts_skip_vendored_directories(self, project):
+        analysis = CodebaseAnalyzer(project).analyze_codebase_structure()
+
+        assert analysis["languages"] == ["javascript", "python"]
+        assert analysis["modules"] == [
+            "app.__init__",
+            "app.core",
+            "tests.test_core",
+            "web.index",
+            "web.index.test",
+        ]
+        assert analysis["file_structure"] == {
+            "total_files": 8,
+            "total_directories": 5,
+            "max_depth": 3,
+            "avg_files_per_directory": 8 / 5,
+        }
+        assert analysis["test_coverage"] == pytest.approx(2 / 8 * 100)
+        assert analysis["dependencies"] == ["python:django", "python:requests"]
+        assert list(analysis) == [
+            "languages",
+            "frameworks",
+            "modules",
+            "test_coverage",
+            "complexity_score",
+            "file_structure",
+            "dependencies",
+        ]
+
+    def test_helpers_agree_with_full_analysis(self, project):
+        analyzer = CodebaseAnalyzer(project)
+        analysis = analyzer.analyze_codebase_structure()
+
+        assert analyzer._detect_languages() == analysis["languages"]
+        assert analyzer._analyze_modules() == analysis["modules"]
+        assert analyzer._analyze_file_structure() == analysis["file_structure"]
+        assert analyzer._calculate_complexity_score() == analysis["complexity_score"]
+
+
+class TestIncrementalCache:
+    """Test that only changed directories are listed again."""
+
+    def test_warm_run_lists_nothing(self, project):
+        first = CodebaseAnalyzer(project)
+        analysis = first.analyze_codebase_structure()
+        assert first.stats["scanned"] == 6
+
+        second = CodebaseAnalyzer(project)
+        assert second.analyze_codebase_structure() == analysis
+        assert second.stats == {"scanned": 0, "reused": 6}
+
+    def test_changed_directory_is_rescanned(self, project):
+        CodebaseAnalyzer(project).analyze_codebase_structure()
+        _write(project, "app/deep/nested/lib.rs")
+        _write(project, "app/deep/nested/more/test_more.py")
+        _age(project / "app/deep/nested")
+
+        analyzer = CodebaseAnalyzer(project)
+        analysis = analyzer.analyze_codebase_structure()
+
+        assert analyzer.stats == {"scanned": 2, "reused": 5}
+        assert analysis["languages"] == ["javascript", "python", "rust"]
+        assert analysis["file_structure"]["max_depth"] == 4
+        assert analysis["file_structure"]["total_files"] == 10
+
+    def test_removed_directory_leaves_the_analysis(self, project):
+        CodebaseAnalyzer(project).analyze_codebase_structure()
+        (project / "web/index.js").unlink()
+        (project / "web/index.test.js").unlink()
+        (project / "web").rmdir()
+        _age(project)
+
+        analysis = CodebaseAnalyzer(project).analyze_codebase_structure()
+
+        assert analysis["languages"] == ["python"]
+        assert analysis["file_structure"]["total_directories"] == 4
+
+    def test_recent_directories_are_not_trusted(self, project, monkeypatch):
+        monkeypatch.setattr(codebase_analyzer, "RACY_WINDOW_NS", 10**18)
+        CodebaseAnalyzer(project).analyze_codebase_structure()
+
+        analyzer = CodebaseAnalyzer(project)
+        analyzer.analyze_codebase_structure()
+
+        assert analyzer.stats["reused"] == 0
@@ -0,0 +1,134 @@
+"""
+Tests for continuous improvement analytics.
+
+This module tests the windowed KPI aggregates, metric to KPI routing,
+bounded KPI history and write-behind KPI saving.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.continuous_improvement_analytics import (
+    ContinuousImprovementAnalytics,
+)
+from ai_onboard.core.continuous_improvement.kpi_aggregates import WindowedAggregate
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    analytics = ContinuousImprovementAnalytics(tmp_path)
+    analytics.kpi_save_delay = 0
+    return analytics
+
+
+class TestWindowedAggregate:
+    """Test the bucketed sliding window."""
+
+    def test_count_sum_and_mean(self):
+        aggregate = WindowedAggregate(window=60, buckets=6)
+        for timestamp, value in ((0, 1.0), (15, 2.0), (30, 6.0)):
+            aggregate.add(value, timestamp)
+
+        assert aggregate.value("count", 30) == 3
+        assert aggregate.value("sum", 30) == 9.0
+        assert aggregate.value("mean", 30) == 3.0
+
+    def test_values_leave_the_window(self):
+        aggregate = WindowedAggregate(window=60, buckets=6)
+        aggregate.add(1.0, 0)
+        aggregate.add(2.0, 55)
+
+        assert aggregate.value("sum", 65) == 2.0
+        assert aggregate.value("count", 500) == 0
+        assert aggregate.value("mean", 500) == 0.0
+
+    def test_late_values_inside_the_window_are_kept(self):
+        aggregate = WindowedAggregate(window=60, buckets=6)
+        aggregate.add(1.0, 100)
+
+        assert aggregate.add(5.0, 50)
+        assert not aggregate.add(5.0, 10)
+        assert aggregate.value("sum", 100) == 6.0
+
+
+class TestKPIUpdates:
+    """Test KPIs maintained from routed metrics."""
+
+    def test_metrics_are_routed_once_per_name(self, analytics):
+        assert analytics._route_metric("Learning Rate") == (
+            ["learning_rate"],
+            ["learning_rate"],
+        )
+        assert analytics._route_metric("learning_event") == ([], ["learning_rate"])
+        assert "Learning Rate" in analytics._metric_routes
+
+    def test_count_and_mean_kpis(self, analytics):
+        for _ in range(3):
+            analytics.collect_metric("learning_event", 1.0)
+        analytics.collect_metric("user satisfaction", 60.0)
+        analytics.collect_metric("user satisfaction", 80.0)
+
+        assert analytics.kpis["learning_rate"].current_value == 3
+        assert analytics.kpis["learning_rate"].trend == "up"
+        assert analytics.kpis["user_satisfaction"].current_value == 70.0
+        assert analytics._calculate_system_health_score() == 85.0
+
+    def test_aggregates_are_rebuilt_from_stored_metrics(self, analytics, tmp_path):
+        analytics.collect_metric("knowledge_added", 1.0)
+        analytics.collect_metric("knowledge_added", 1.0)
+        old = analytics.metrics[0]
+        old.timestamp = datetime.now() - timedelta(hours=30)
+        analytics.metrics_path.write_text(
+            "\n".join(
+                json.dumps(
+                    {
+                        "metric_id": m.metric_id,
+                        "metric_type": m.metric_type.value,
+                        "name": m.name,
+                        "value": m.value,
+                        "timestamp": m.timestamp.isoformat(),
+                    }
+                )
+                for m in analytics.metrics
+            )
+        )
+
+        reloaded = ContinuousImprovementAnalytics(tmp_path)
+
+        assert reloaded._calculate_knowledge_growth_rate() == 1
+
+    def test_kpi_saves_are_coalesced(self, tmp_path):
+        analytics = ContinuousImprovementAnalytics(tmp_path)
+        analytics.kpi_save_delay = 60
+        for _ in range(10):
+            analytics.collect_metric("learning_event", 1.0)
+
+        assert not analytics.kpis_path.exists()
+        assert analytics.flush()
+        saved = json.loads(analytics.kpis_path.read_text())
+        assert saved["learning_rate"]["current_value"] == 10
+        assert not analytics.flush()
+        analytics.close()
+
+    def test_kpi_history_is_bounded(self, analytics):
+        analytics.kpi_history_limit = 5
+        for _ in range(12):
+            analytics.collect_metric("learning_event", 1.0)
+
+        history = analytics.kpis["learning_rate"].historical_values
+        assert [v for _, v in history] == [8, 9, 10, 11, 12]
+        saved = json.loads(analytics.kpis_path.read_text())
+        assert len(saved["learning_rate"]["historical_values"]) == 5
+
+    def test_kpi_history_outside_the_window_is_dropped(self, analytics, tmp_path):
+        analytics.collect_metric("learning_event", 1.0)
+        saved = json.loads(analytics.kpis_path.read_text())
+        old = (datetime.now() - timedelta(hours=30)).isoformat()
+        saved["learning_rate"]["historical_values"][:0] = [[old, 0.0]] * 3
+        analytics.kpis_path.write_text(json.dumps(saved))
+
+        reloaded = ContinuousImprovementAnalytics(tmp_path)
+
+        assert len(reloaded.kpis["learning_rate"].historical_values) == 1
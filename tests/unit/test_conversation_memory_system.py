@@ -0,0 +1,121 @@
+"""
+Tests for conversation memory management.
+
+This module tests the segment index used for retention and relevance,
+the precompiled keyword extraction and write-behind saving.
+"""
+
+import json
+import time
+
+import pytest
+
+from ai_onboard.core.ai_integration.conversation_memory_system import (
+    ConversationMemoryManager,
+    MemorySegmentIndex,
+)
+from ai_onboard.core.base.shared_types import MemorySegment
+
+
+def _segment(n, importance=0.5, relevance=0.5, expires_at=None):
+    return MemorySegment(
+        segment_id=f"s{n}",
+        session_id="session",
+        user_id="alice",
+        timestamp=float(n),
+        start_message_index=n,
+        end_message_index=n,
+        importance_score=importance,
+        relevance_to_current_context=relevance,
+        expires_at=expires_at,
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConversationMemoryManager(tmp_path)
+    manager.save_delay = 0
+    return manager
+
+
+class TestMemorySegmentIndex:
+    """Test the bounded importance and relevance index."""
+
+    def test_least_important_oldest_segment_is_evicted(self):
+        index = MemorySegmentIndex(capacity=3)
+        keep = _segment(0, importance=1.0)
+        index.add(keep)
+        old = _segment(1)
+        index.add(old)
+        index.add(_segment(2))
+
+        evicted = index.add(_segment(3))
+
+        assert evicted == [old]
+        assert keep in index and len(index) == 3
+
+    def test_most_relevant_follows_accesses(self):
+        index = MemorySegmentIndex(capacity=10)
+        a, b, c = _segment(0, relevance=0.2), _segment(1), _segment(2)
+        for segment in (a, b, c):
+            index.add(segment)
+
+        assert index.most_relevant(2) == [c, b]
+        index.touch(b, accessed_at=time.time())
+        assert index.most_relevant(2) == [b, c]
+
+    def test_expired_segments_are_dropped(self):
+        index = MemorySegmentIndex(capacity=10)
+        expired = _segment(0, expires_at=100.0)
+        index.add(expired)
+        index.add(_segment(1))
+
+        assert index.expire(now=200.0) == [expired]
+        assert len(index) == 1
+
+
+class TestConversationMemoryManager:
+    """Test message handling on top of the index."""
+
+    def test_memory_is_bounded_and_keeps_critical_segments(self, manager):
+        manager.max_memory_segments = 10
+        cid = manager.start_conversation("alice", "I want to build a blog")
+        for n in range(100):
+            manager.add_message_to_conversation(cid, f"Message number {n}")
+
+        conversation = manager.active_conversations[cid]
+        assert len(conversation.memory_segments) == 10
+        assert conversation.memory_segments[0].segment_id == f"{cid}_initial"
+        assert conversation.memory_segments[-1].segment_id == f"{cid}_msg_100"
+
+    def test_keyword_extraction(self, manager):
+        message = "We decide to go with the user database. Would like it fast."
+
+        assert manager._extract_key_topics(message) == ["user", "data"]
+        assert manager._extract_user_preferences(message) == {
+            "like": True,
+            "would like": True,
+        }
+        assert manager._extract_decisions(message) == [
+            "We decide to go with the user database"
+        ] * 2
+        assert manager._determine_conversation_stage("please review", "x") == "review"
+
+    def test_saves_are_coalesced(self, tmp_path):
+        manager = ConversationMemoryManager(tmp_path)
+        manager.save_delay = 60
+        cid = manager.start_conversation("alice", "I want to build a blog")
+        for n in range(20):
+            manager.add_message_to_conversation(cid, f"Message {n}")
+        path = manager.storage_dir / f"{cid}.json"
+
+        assert not path.exists()
+        assert manager.flush() == 1
+        assert json.loads(path.read_text())["conversation_id"] == cid
+        assert manager.flush() == 0
+        manager.close()
+
+    def test_immediate_save_when_delay_disabled(self, manager):
+        cid = manager.start_conversation("alice", "I want to build a blog")
+
+        assert (manager.storage_dir / f"{cid}.json").exists()
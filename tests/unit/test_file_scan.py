@@ -0,0 +1,160 @@
+"""
+Tests for the shared file scan and the cached, streamed file hashes.
+
+This module tests the pruned walk, streamed hashing, hash cache reuse and
+invalidation, and cleanup target scanning on top of both.
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from ai_onboard.core.quality_safety import file_scan
+from ai_onboard.core.quality_safety.file_scan import (
+    FileHashCache,
+    hash_file,
+    scan_tree,
+)
+from ai_onboard.core.quality_safety.ultra_safe_cleanup import (
+    CleanupRiskLevel,
+    UltraSafeCleanupEngine,
+)
+
+
+def _write(root, rel, data=b"x"):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    past = time.time_ns() - 60_000_000_000
+    os.utime(path, ns=(past, past))
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    _write(root, "pkg/module.py", b"print('hi')\n")
+    _write(root, "pkg/__pycache__/module.cpython-311.pyc", b"\x00" * 100)
+    _write(root, "build/lib/out.tmp", b"tmp")
+    _write(root, ".ai_onboard/logs/run.log", b"log line\n")
+    _write(root, ".git/objects/ab/cdef.tmp", b"object")
+    return root
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "file_hashes.json"
+
+
+class TestScanTree:
+    """Test the single pruned walk."""
+
+    def test_lists_files_once_and_prunes_vcs(self, project):
+        scan = scan_tree(project)
+        rel = sorted(e.path.relative_to(project).as_posix() for e in scan.files)
+
+        assert rel == [
+            ".ai_onboard/logs/run.log",
+            "build/lib/out.tmp",
+            "pkg/__pycache__/module.cpython-311.pyc",
+            "pkg/module.py",
+        ]
+        sizes = {e.path.name: e.size for e in scan.files}
+        assert sizes["module.cpython-311.pyc"] == 100
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unsupported")
+    def test_reports_broken_symlinks(self, project):
+        try:
+            os.symlink(project / "missing", project / "dangling")
+            os.symlink(project / "pkg", project / "pkg_link")
+        except OSError:
+            pytest.skip("symlinks not permitted")
+
+        scan = scan_tree(project)
+
+        assert scan.broken_symlinks == [project / "dangling"]
+        assert not any("pkg_link" in str(e.path.parent) for e in scan.files)
+
+
+class TestFileHashCache:
+    """Test streamed hashing and cache reuse."""
+
+    def test_streamed_hash_matches_sha256(self, tmp_path):
+        data = os.urandom(3 * 1024 + 17)
+        path = _write(tmp_path, "blob.bin", data)
+
+        assert hash_file(path, chunk_size=1024) == hashlib.sha256(data).hexdigest()
+
+    def test_unchanged_files_are_not_read_again(self, project, cache_path):
+        entries = scan_tree(project).files
+
+        first = FileHashCache(cache_path)
+        hashes = first.hash_files(entries)
+        assert first.stats["hashed"] == len(entries)
+
+        second = FileHashCache(cache_path)
+        assert second.hash_files(entries) == hashes
+        assert second.stats == {"hits": len(entries), "hashed": 0, "bytes_read": 0}
+
+    def test_changed_and_recent_files_are_rehashed(
+        self, project, cache_path, monkeypatch
+    ):
+        FileHashCache(cache_path).hash_files(scan_tree(project).files)
+        changed = _write(project, "pkg/module.py", b"print('changed')\n")
+
+        cache = FileHashCache(cache_path)
+        hashes = cache.hash_files(scan_tree(project).files)
+        assert cache.stats["hashed"] == 1
+        assert hashes[changed] == hashlib.sha256(b"print('changed')\n").hexdigest()
+
+        monkeypatch.setattr(file_scan, "RACY_WINDOW_NS", 10**18)
+        changed.write_bytes(b"recent")
+        FileHashCache(cache_path).hash_files(scan_tree(project).files)
+        cache = FileHashCache(cache_path)
+        cache.hash_files(scan_tree(project).files)
+        assert cache.stats["hashed"] == 1
+
+    def test_prune_drops_untracked_entries(self, project, cache_path):
+        entries = scan_tree(project).files
+        cache = FileHashCache(cache_path)
+        cache.hash_files(entries)
+
+        cache.hash_files(entries[:1], prune=True)
+
+        assert len(FileHashCache(cache_path)._load()) == 1
+
+    def test_unreadable_files(self, tmp_path):
+        assert FileHashCache().hash_path(tmp_path / "missing") == file_scan.UNREADABLE
+
+
+class TestCleanupScan:
+    """Test cleanup target scanning on the shared walk."""
+
+    def test_targets_match_per_file_analysis(self, project):
+        engine = UltraSafeCleanupEngine(project)
+        targets = engine.scan_for_cleanup_targets()
+
+        expected = []
+        for entry in engine.last_scan.files:
+            target = engine._analyze_file_for_cleanup(entry.path)
+            if target and target.risk_level != CleanupRiskLevel.CRITICAL:
+                expected.append(target)
+
+        assert targets == expected
+        assert {t.path.name for t in targets} == {
+            "module.cpython-311.pyc",
+            "out.tmp",
+            "run.log",
+        }
+        assert all(t.file_hash and t.file_hash != "unreadable" for t in targets)
+
+    def test_repeated_scans_reuse_hashes(self, project):
+        UltraSafeCleanupEngine(project).scan_for_cleanup_targets()
+
+        engine = UltraSafeCleanupEngine(project)
+        engine.scan_for_cleanup_targets()
+
+        assert engine.hash_cache.stats["hashed"] == 0
+        assert engine.hash_cache.stats["hits"] == 3
@@ -0,0 +1,112 @@
+"""
+Tests for the tiered health history.
+
+This module tests raw, minute and hourly rollups, summaries that merge
+them, and non-blocking CPU sampling.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.health_history import (
+    CpuSampler,
+    HealthHistory,
+)
+from ai_onboard.core.continuous_improvement.system_health_monitor import (
+    HealthStatus,
+    SystemHealthMonitor,
+    SystemHealthSnapshot,
+)
+
+DAY = 24 * 3600.0
+
+
+def _history_with_samples(start, end, step):
+    history = HealthHistory()
+    timestamp = start
+    while timestamp < end:
+        history.add(timestamp, timestamp % 100, "good", 1)
+        timestamp += step
+    return history
+
+
+class TestHealthHistory:
+    """Test summaries composed from the tiers."""
+
+    def test_recent_summary_uses_exact_samples(self):
+        history = HealthHistory()
+        for n, (score, status) in enumerate([(90, "excellent"), (40, "critical")]):
+            history.add(1000.0 + n * 10, score, status, issues=n)
+
+        rollup = history.summarize(1000.0)
+
+        assert rollup.count == 2
+        assert (rollup.score_min, rollup.score_max, rollup.mean) == (40, 90, 65)
+        assert rollup.status_counts == {"excellent": 1, "critical": 1}
+        assert rollup.issue_count == 1
+        assert (rollup.last_score, rollup.last_status) == (40, "critical")
+        assert history.summarize(1005.0).count == 1
+
+    def test_summaries_match_a_full_scan(self):
+        start, end, step = 10 * DAY, 12 * DAY, 10.0
+        history = _history_with_samples(start, end, step)
+        last = end - step
+
+        for hours in (0.25, 1, 5, 23):
+            since = last - hours * 3600 + 1
+            rollup = history.summarize(since)
+            # Past the raw hour the window starts at the enclosing minute
+            first = since if hours <= 1 else since // 60 * 60
+            expected = [
+                t % 100 for t in range(int(start), int(end), int(step)) if t >= first
+            ]
+            assert rollup.count == len(expected)
+            assert rollup.score_sum == pytest.approx(sum(expected))
+            assert rollup.score_min == min(expected)
+
+    def test_memory_is_bounded_by_the_tiers(self):
+        history = _history_with_samples(0.0, 40 * DAY, 60.0)
+
+        assert history.total_samples == 40 * 24 * 60
+        assert len(history.raw) == 61
+        assert history.summarize(0.0).count == 30 * 24 * 60
+
+    def test_cpu_sampler_reports_busy_share_between_calls(self):
+        Times = namedtuple("Times", "user system idle iowait")
+        readings = iter([Times(10, 10, 80, 0), Times(40, 20, 120, 20)])
+
+        class FakePsutil:
+            @staticmethod
+            def cpu_times():
+                return next(readings)
+
+        sampler = CpuSampler(FakePsutil)
+
+        assert sampler.sample() == pytest.approx(20.0)
+        assert sampler.sample() == pytest.approx(40.0)
+
+
+def test_monitor_summary_comes_from_history(tmp_path):
+    monitor = SystemHealthMonitor(tmp_path)
+    now = datetime.now()
+    for minutes, score in ((120, 50.0), (30, 80.0), (1, 100.0)):
+        monitor._record_snapshot(
+            SystemHealthSnapshot(
+                timestamp=now - timedelta(minutes=minutes),
+                overall_status=HealthStatus.GOOD,
+                health_score=score,
+                metrics={},
+                active_issues=[],
+                recent_actions=[],
+                recommendations=[],
+            )
+        )
+
+    summary = monitor.get_health_summary(hours=1)
+
+    assert summary["total_snapshots"] == 2
+    assert summary["avg_health_score"] == 90.0
+    assert summary["current_health_score"] == 100.0
+    assert len(monitor.health_snapshots) == 2
@@ -0,0 +1,145 @@
+"""
+Tests for the persistent import graph.
+
+This module tests import resolution (absolute, relative and from-imports),
+forward and reverse adjacency, transitive impact, string references,
+incremental refresh and persistence.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ai_onboard.core.quality_safety.import_graph import ImportGraph, get_import_graph
+
+
+def _write(root: Path, rel: str, text: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _touch_later(path: Path, text: str) -> None:
+    """Rewrite a file so its modification time visibly changes."""
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "pkg/__init__.py", "")
+    _write(tmp_path, "pkg/core.py", "VALUE = 1\n")
+    _write(tmp_path, "pkg/helpers.py", "from .core import VALUE\n")
+    _write(tmp_path, "pkg/sub/__init__.py", "from .. import helpers\n")
+    _write(tmp_path, "pkg/sub/deep.py", "from ..helpers import VALUE\nimport json\n")
+    _write(tmp_path, "app.py", "import pkg.sub.deep\n")
+    _write(tmp_path, "docs/guide.md", "See [core](pkg/core.py) for details.\n")
+    _write(tmp_path, "config.yaml", "entry: app.py\n")
+    return tmp_path
+
+
+class TestQueries:
+    """Test adjacency and reference queries."""
+
+    def test_forward_and_reverse_edges(self, project):
+        graph = ImportGraph(project)
+        graph.refresh()
+
+        assert graph.imports_of(project / "pkg/helpers.py") == {project / "pkg/core.py"}
+        assert graph.importers("pkg.core") == {project / "pkg/helpers.py"}
+        assert graph.importers(project / "pkg/helpers.py") == {
+            project / "pkg/sub/__init__.py",
+            project / "pkg/sub/deep.py",
+        }
+        assert graph.raw_imports(project / "pkg/sub/deep.py") == [
+            "json",
+            "pkg.helpers",
+            "pkg.helpers.VALUE",
+        ]
+
+    def test_impact_set_is_transitive(self, project):
+        graph = ImportGraph(project)
+        graph.refresh()
+
+        assert graph.impact_set("pkg.core") == {
+            project / "pkg/helpers.py",
+            project / "pkg/sub/__init__.py",
+            project / "pkg/sub/deep.py",
+            project / "app.py",
+        }
+        assert graph.impact_set("pkg.core", max_depth=1) == {project / "pkg/helpers.py"}
+        assert graph.impact_set("missing.module") == set()
+
+    def test_references_by_name(self, project):
+        graph = ImportGraph(project)
+        graph.refresh()
+
+        assert project / "docs/guide.md" in graph.references(project / "pkg/core.py")
+        assert graph.references(project / "app.py") == {project / "config.yaml"}
+
+
+class TestIncrementalUpdates:
+    """Test that only changed files are parsed again."""
+
+    def test_refresh_parses_only_changed_files(self, project):
+        graph = ImportGraph(project)
+        assert graph.refresh() == 8
+        assert graph.refresh() == 0
+
+        _touch_later(project / "app.py", "import pkg.core\n")
+        parsed = graph.stats["parsed"]
+        assert graph.refresh() == 1
+        assert graph.stats["parsed"] == parsed + 1
+        assert project / "app.py" in graph.importers("pkg.core")
+
+    def test_new_module_rebinds_parent_imports(self, project):
+        graph = ImportGraph(project)
+        graph.refresh()
+        _write(project, "consumer.py", "from pkg import extra\n")
+        graph.update_files([project / "consumer.py"])
+        assert graph.imports_of(project / "consumer.py") == {
+            project / "pkg/__init__.py"
+        }
+
+        _write(project, "pkg/extra.py", "")
+        graph.update_files([project / "pkg/extra.py"])
+        assert graph.imports_of(project / "consumer.py") == {
+            project / "pkg/__init__.py",
+            project / "pkg/extra.py",
+        }
+
+    def test_deleted_files_leave_the_graph(self, project):
+        graph = ImportGraph(project)
+        graph.refresh()
+        (project / "pkg/helpers.py").unlink()
+
+        assert graph.refresh() == 1
+        assert graph.importers("pkg.core") == set()
+        assert graph.imports_of(project / "pkg/sub/deep.py") == {
+            project / "pkg/__init__.py"
+        }
+
+
+class TestPersistence:
+    """Test that the graph is reused between runs."""
+
+    def test_saved_graph_needs_no_parsing(self, project):
+        graph = ImportGraph(project)
+        graph.refresh()
+        assert graph.save()
+        assert not graph.save()
+
+        reloaded = ImportGraph(project)
+        assert reloaded.refresh() == 0
+        assert reloaded.stats["parsed"] == 0
+        assert reloaded.importers("pkg.core") == {project / "pkg/helpers.py"}
+
+    def test_shared_graph_refreshes_on_access(self, project):
+        graph = get_import_graph(project)
+        _write(project, "late.py", "import pkg.core\n")
+
+        assert get_import_graph(project) is graph
+        assert project / "late.py" in graph.importers("pkg.core")
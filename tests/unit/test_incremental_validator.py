@@ -0,0 +1,202 @@
+"""
+Tests for incremental validation of cleanup edits.
+
+This module tests in-process compilation of modified files, import
+resolution for modified files and their importers, the warm validation
+worker, and batched unused-import removal in AutomatedCodeCleanup.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ai_onboard.core.legacy_cleanup.code_cleanup_automation import (
+    AutomatedCodeCleanup,
+)
+from ai_onboard.core.quality_safety.code_quality_analyzer import (
+    CodeQualityAnalysisResult,
+    CodeQualityIssue,
+)
+from ai_onboard.core.quality_safety.import_graph import ImportGraph
+from ai_onboard.core.quality_safety.incremental_validator import (
+    IncrementalValidator,
+    ValidationWorker,
+)
+
+
+def _write(root: Path, rel: str, text: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _edit(path: Path, text: str) -> None:
+    """Rewrite a file so its modification time visibly changes."""
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path, "pkg/__init__.py", "")
+    _write(tmp_path, "pkg/core.py", "def helper():\n    return 1\n")
+    _write(tmp_path, "pkg/api.py", "import os\nfrom .core import helper\n")
+    _write(tmp_path, "pkg/consumer.py", "from pkg.api import helper\n")
+    _write(tmp_path, "pkg/other.py", "import json\n")
+    return tmp_path
+
+
+def _validator(root: Path, deep: bool = False) -> IncrementalValidator:
+    graph = ImportGraph(root)
+    graph.refresh()
+    return IncrementalValidator(root, graph=graph, deep=deep)
+
+
+class TestIncrementalValidator:
+    """Test what an edit is validated against."""
+
+    def test_clean_edit_checks_only_affected_modules(self, project):
+        validator = _validator(project)
+        _edit(project / "pkg/api.py", "from .core import helper\n")
+
+        report = validator.validate([project / "pkg/api.py"])
+
+        assert report.passed, report.errors
+        assert report.files_compiled == 1
+        assert report.modules_checked == ["pkg.api", "pkg.consumer"]
+
+    def test_removed_re_export_breaks_importer(self, project):
+        validator = _validator(project)
+        _edit(project / "pkg/api.py", "import os\n")
+
+        report = validator.validate([project / "pkg/api.py"])
+
+        assert not report.passed
+        assert report.errors == [
+            "pkg/consumer.py:1: Cannot import name 'helper' from 'pkg.api'"
+        ]
+
+    def test_syntax_and_missing_modules_are_reported(self, project):
+        validator = _validator(project)
+        _edit(project / "pkg/other.py", "import pkg.missing\ndef broken(:\n")
+        report = validator.validate([project / "pkg/other.py"])
+        assert not report.passed
+        assert "SyntaxError" in report.errors[0]
+
+        _edit(project / "pkg/other.py", "import pkg.missing\nimport json\n")
+        report = validator.validate([project / "pkg/other.py"])
+        assert report.errors == ["pkg/other.py:1: No module named 'pkg.missing'"]
+
+    def test_dynamic_and_conditional_names_are_accepted(self, project):
+        _write(
+            project,
+            "pkg/compat.py",
+            "try:\n    import tomllib as toml\nexcept ImportError:\n"
+            "    toml = None\nfrom .core import *\n",
+        )
+        validator = _validator(project)
+        _edit(project / "pkg/other.py", "from pkg.compat import toml, anything\n")
+
+        assert validator.validate([project / "pkg/other.py"]).passed
+
+    def test_check_source_compiles_in_memory(self, project):
+        validator = IncrementalValidator(project)
+        assert validator.check_source(project / "x.py", "x = 1\n") is None
+        assert "IndentationError" in validator.check_source(
+            project / "x.py", "if x:\n# nothing\n"
+        )
+
+
+class TestValidationWorker:
+    """Test the warm worker used for deep checks."""
+
+    def test_worker_stays_warm_and_sees_edits(self, project):
+        worker = ValidationWorker(project, timeout=30)
+        try:
+            assert worker.check(["pkg.consumer"]) == {}
+            process = worker._process
+
+            _edit(project / "pkg/core.py", "raise RuntimeError('boom')\n")
+            errors = worker.check(["pkg.consumer"])
+
+            assert worker._process is process
+            assert errors == {"pkg.consumer": "RuntimeError: boom"}
+        finally:
+            worker.close()
+
+
+def _issues(path: Path, lines):
+    return [
+        CodeQualityIssue(
+            file_path=str(path),
+            line_number=line,
+            issue_type="unused_import",
+            severity="medium",
+            message=f"Unused import: {name}",
+        )
+        for name, line in lines
+    ]
+
+
+class TestBatchedCleanup:
+    """Test unused import removal through AutomatedCodeCleanup."""
+
+    def test_rewrites_are_batched_backed_up_and_validated(self, project):
+        module = _write(
+            project,
+            "pkg/module.py",
+            "import os, sys\nfrom typing import (\n    Dict,\n    List,\n)\n"
+            "VALUE = 1\n",
+        )
+        guarded = _write(
+            project,
+            "pkg/guarded.py",
+            "try:\n    import yaml\nexcept ImportError:\n    yaml = None\n",
+        )
+        analysis = CodeQualityAnalysisResult(
+            issues=_issues(module, [("os", 1), ("sys", 1), ("typing", 2)])
+            + _issues(guarded, [("yaml", 2)])
+        )
+
+        cleanup = AutomatedCodeCleanup(project)
+        result = cleanup.remove_unused_imports(analysis, dry_run=False)
+
+        assert module.read_text(encoding="utf-8") == "VALUE = 1\n"
+        assert guarded.read_text(encoding="utf-8").startswith("try:\n    import yaml")
+        assert result.files_modified == 1
+        assert result.issues_resolved == 3
+        assert len(result.errors) == 1 and "Skipped" in result.errors[0]
+        assert result.validation_passed
+        assert result.modules_validated == ["pkg.module"]
+
+        backup = Path(result.backups_created[0])
+        assert backup.parts[-2:] == ("pkg", "module.py")
+        assert backup.read_text(encoding="utf-8").startswith("import os, sys")
+
+    def test_broken_importer_fails_validation(self, project):
+        analysis = CodeQualityAnalysisResult(
+            issues=_issues(project / "pkg/api.py", [("helper", 2)])
+        )
+
+        result = AutomatedCodeCleanup(project).remove_unused_imports(
+            analysis, dry_run=False
+        )
+
+        assert result.files_modified == 1
+        assert not result.validation_passed
+        assert "pkg/consumer.py" in result.validation_errors[0]
+
+    def test_dry_run_writes_nothing(self, project):
+        original = (project / "pkg/api.py").read_text(encoding="utf-8")
+        analysis = CodeQualityAnalysisResult(
+            issues=_issues(project / "pkg/api.py", [("os", 1)])
+        )
+
+        result = AutomatedCodeCleanup(project).remove_unused_imports(analysis)
+
+        assert result.issues_resolved == 1
+        assert result.backups_created == []
+        assert (project / "pkg/api.py").read_text(encoding="utf-8") == original
@@ -0,0 +1,103 @@
+"""
+Tests for segmented learning history.
+
+This module tests daily segments, newest-first tail reads, retention by
+whole segments and migration from the single-file history.
+"""
+
+import json
+import time
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.learning_history import SegmentedHistory
+from ai_onboard.core.continuous_improvement.learning_persistence import (
+    LearningPersistenceManager,
+)
+
+DAY = 86400.0
+BASE = 1_700_000_000.0 // DAY * DAY
+
+
+def _event(timestamp, n=0):
+    return {"timestamp": timestamp, "event_type": "pattern_learned", "n": n}
+
+
+@pytest.fixture
+def history(tmp_path):
+    return SegmentedHistory(tmp_path / "history")
+
+
+class TestSegmentedHistory:
+    """Test the segment files and sidecar index."""
+
+    def test_events_are_partitioned_by_day(self, history):
+        history.extend([_event(BASE + 10), _event(BASE + DAY + 10)])
+
+        assert len(history.segments()) == 2
+        first = history.segments()[0]
+        assert history._index[first] == {
+            "count": 1,
+            "bytes": history.segment_path(first).stat().st_size,
+        }
+
+    def test_newest_streams_across_segments(self, history, monkeypatch):
+        monkeypatch.setattr(
+            "ai_onboard.core.continuous_improvement.learning_history.READ_BLOCK_SIZE",
+            64,
+        )
+        history.extend(_event(BASE + n * 3600, n) for n in range(60))
+
+        newest = history.newest(30)
+
+        assert [e["n"] for e in newest] == list(range(59, 29, -1))
+        assert history.newest(0) == []
+
+    def test_out_of_order_segments_are_sorted_on_read(self, history):
+        history.extend(
+            [_event(BASE + 30, 1), _event(BASE + 10, 2), _event(BASE + 20, 3)]
+        )
+
+        assert [e["n"] for e in history.newest(3)] == [1, 3, 2]
+        assert SegmentedHistory(history.directory)._index
+
+    def test_torn_tail_is_skipped(self, history):
+        history.append(_event(BASE, 1))
+        with open(history.segment_path(history.segments()[0]), "a") as f:
+            f.write('{"timestamp": 1')
+
+        assert [e["n"] for e in history.newest(5)] == [1]
+
+    def test_retention_drops_whole_segments(self, history):
+        history.extend(_event(BASE + day * DAY + 60, day) for day in range(3))
+        history.append(_event(BASE + DAY + 120, 9))
+
+        assert history.drop_before(BASE + 2 * DAY + 3600) == 3
+        assert [e["n"] for e in history.newest(10)] == [2]
+
+
+class TestLearningPersistenceHistory:
+    """Test the manager on top of segmented history."""
+
+    def test_legacy_history_is_migrated(self, tmp_path):
+        legacy = tmp_path / ".ai_onboard" / "learning" / "learning_history.jsonl"
+        legacy.parent.mkdir(parents=True)
+        now = time.time()
+        legacy.write_text(
+            "\n".join(json.dumps(_event(now - n, n)) for n in range(5)) + "\n"
+        )
+
+        manager = LearningPersistenceManager(tmp_path)
+
+        assert not legacy.exists()
+        assert [e["n"] for e in manager.get_learning_history(3)] == [0, 1, 2]
+
+    def test_recorded_events_are_returned_newest_first(self, tmp_path):
+        manager = LearningPersistenceManager(tmp_path)
+        for n in range(3):
+            manager.record_learning_event("pattern_learned", {"n": n})
+
+        history = manager.get_learning_history(2)
+
+        assert [e["event_data"]["n"] for e in history] == [2, 1]
+        assert manager.cleanup_old_data(max_age_days=90) == 0
@@ -0,0 +1,133 @@
+"""
+Tests for the low-overhead operation profiler.
+
+This module tests the log-linear latency histogram, per-operation
+aggregation, background flushing and the lightweight monitor_operation path
+of the performance optimizer.
+"""
+
+import json
+import time
+
+import pytest
+
+from ai_onboard.core.continuous_improvement.operation_profiler import (
+    LatencyHistogram,
+    OperationProfiler,
+)
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    prof = OperationProfiler(tmp_path, flush_interval=0)
+    yield prof
+    prof.close()
+
+
+class TestLatencyHistogram:
+    """Test histogram recording and percentiles."""
+
+    def test_small_values_are_exact(self):
+        hist = LatencyHistogram()
+        for value in range(1, 11):
+            hist.record(value)
+
+        assert hist.count == 10
+        assert hist.percentile(50) == 5
+        assert hist.percentile(100) == 10
+        assert (hist.min, hist.max) == (1, 10)
+
+    def test_large_values_have_bounded_relative_error(self):
+        hist = LatencyHistogram(significant_bits=6)
+        values = [1_000 * i for i in range(1, 1001)]
+        for value in values:
+            hist.record(value)
+
+        for q in (50, 90, 99):
+            exact = values[int(q / 100 * len(values)) - 1]
+            assert abs(hist.percentile(q) - exact) / exact < 2 ** -5
+        assert len(hist.counts) < 200
+
+    def test_merge_combines_counts(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(5)
+        b.record(50_000)
+
+        a.merge(b)
+
+        assert a.count == 2
+        assert (a.min, a.max) == (5, 50_000)
+
+
+class TestOperationProfiler:
+    """Test per-operation aggregation and flushing."""
+
+    def test_profile_records_wall_and_cpu_time(self, profiler):
+        with profiler.profile("sleep"):
+            time.sleep(0.01)
+
+        stats = profiler.get_stats("sleep")
+        assert stats["count"] == 1
+        assert stats["wall_ns"]["max"] >= 10_000_000
+        assert stats["cpu_ns"]["max"] < stats["wall_ns"]["max"]
+
+    def test_errors_are_counted_and_propagated(self, profiler):
+        with pytest.raises(ValueError):
+            with profiler.profile("boom"):
+                raise ValueError("x")
+
+        assert profiler.get_stats("boom")["errors"] == 1
+
+    def test_memory_tracing_is_opt_in(self, profiler):
+        with profiler.profile("plain"):
+            pass
+        profiler.enable_memory_tracing()
+        with profiler.profile("alloc"):
+            data = [0] * 100_000
+
+        assert len(data) == 100_000
+        assert "alloc_bytes" not in profiler.get_stats("plain")
+        assert profiler.get_stats("alloc")["alloc_bytes"]["max"] >= 100_000 * 8
+
+    def test_flush_writes_only_when_dirty(self, profiler):
+        assert profiler.flush() is False
+        with profiler.profile("op"):
+            pass
+
+        assert profiler.flush() is True
+        data = json.loads(profiler.output_path.read_text())
+        assert data["operations"]["op"]["count"] == 1
+        assert profiler.flush() is False
+
+    def test_instrumentation_overhead_is_microseconds(self, profiler):
+        n = 20_000
+        start = time.perf_counter()
+        for _ in range(n):
+            with profiler.profile("hot"):
+                pass
+        per_call = (time.perf_counter() - start) / n
+
+        assert per_call < 50e-6
+
+
+class TestMonitorOperation:
+    """Test the lightweight monitor_operation path."""
+
+    def test_monitor_operation_uses_profiler(self, tmp_path):
+        from ai_onboard.core.continuous_improvement.performance_optimizer import (
+            PerformanceMetric,
+            PerformanceOptimizer,
+        )
+
+        optimizer = PerformanceOptimizer(tmp_path)
+        start = time.perf_counter()
+        for _ in range(100):
+            with optimizer.monitor_operation("unit_op"):
+                pass
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert optimizer.get_operation_stats("unit_op")["count"] == 100
+        profile = optimizer.performance_profiles["op_unit_op"]
+        assert PerformanceMetric.EXECUTION_TIME in profile.current_metrics
+        optimizer.operation_profiler.close()
@@ -8,7 +8,31 @@ that manages quality gates and policy enforcement.
 from pathlib import Path
 from unittest.mock import patch
 
-from ai_onboard.core.quality_safety.policy_engine import _merge, _read_policy_file, load
+import pytest
+
+from ai_onboard.core.quality_safety import policy_engine
+from ai_onboard.core.quality_safety.policy_engine import (
+    _glob_to_regex,
+    _merge,
+    _read_policy_file,
+    check,
+    compile_policy,
+    load,
+)
+
+RULES_JSON = """{
+  "rules": [
+    {"id": "protect-core", "action": "block", "severity": "critical",
+     "conditions": {"any": [{"deletes_globs": ["src/**", "setup.py"]}]}},
+    {"id": "config-edit", "action": "require_approval",
+     "conditions": {"modifies_globs": ["**/*.yaml"]}},
+    {"id": "big-change", "action": "warn",
+     "conditions": {"any": [{"files_gt": 10}, {"lines_gt": 500}]}},
+    {"id": "cleanup-logs", "action": "warn",
+     "conditions": {"all": [{"operation": "cleanup"},
+                            {"deletes_globs": ["**/*.log"]}]}}
+  ]
+}"""
 
 
 class TestReadPolicyFile:
@@ -137,3 +161,105 @@ class TestIntegration:
         assert isinstance(result, dict)
         assert "rules" in result
         assert "scoring" in result
+
+
+@pytest.fixture
+def policy_root(tmp_path):
+    """A project with a manifest pointing at a JSON base policy."""
+    policy_engine.clear_cache()
+    (tmp_path / ".ai_onboard").mkdir()
+    (tmp_path / "base.json").write_text(RULES_JSON)
+    (tmp_path / "ai_onboard.json").write_text('{"policies": {"base": "base.json"}}')
+    yield tmp_path
+    policy_engine.clear_cache()
+
+
+class TestPolicyCaching:
+    """Test memoization of the merged policy."""
+
+    def test_unchanged_sources_are_not_reparsed(self, policy_root):
+        first = load(policy_root)
+        with patch.object(policy_engine, "_read_policy_file") as mock_read:
+            second = load(policy_root)
+
+        assert second == first
+        mock_read.assert_not_called()
+
+    def test_returned_policy_is_a_private_copy(self, policy_root):
+        load(policy_root)["rules"].clear()
+
+        assert len(load(policy_root)["rules"]) == 4
+
+    def test_changed_source_is_reloaded(self, policy_root, monkeypatch):
+        load(policy_root)
+        (policy_root / "base.json").write_text('{"rules": [{"id": "only"}]}')
+
+        assert len(load(policy_root)["rules"]) == 4
+        monkeypatch.setattr(policy_engine, "SOURCE_RECHECK_SECONDS", 0)
+        assert [r["id"] for r in load(policy_root)["rules"]] == ["only"]
+
+    def test_warm_loads_do_not_resolve_sources(self, policy_root, monkeypatch):
+        load(policy_root)
+        with patch.object(policy_engine, "_policy_sources") as mock_sources:
+            load(policy_root)
+            monkeypatch.setattr(policy_engine, "SOURCE_RECHECK_SECONDS", 0)
+            load(policy_root)
+
+        mock_sources.assert_not_called()
+
+    def test_manifest_change_is_seen_at_once(self, policy_root):
+        load(policy_root)
+        (policy_root / "other.json").write_text('{"rules": [{"id": "other"}]}')
+        (policy_root / "ai_onboard.json").write_text(
+            '{"policies": {"base": "other.json"}}'
+        )
+
+        assert [r["id"] for r in load(policy_root)["rules"]] == ["other"]
+
+    def test_disk_cache_survives_process_cache_reset(self, policy_root):
+        expected = load(policy_root)
+        assert (policy_root / ".ai_onboard" / "policy_cache.json").exists()
+
+        policy_engine.clear_cache()
+        with patch.object(policy_engine, "_read_policy_file") as mock_read:
+            result = load(policy_root)
+
+        assert result == expected
+        mock_read.assert_not_called()
+
+
+class TestCompiledPolicy:
+    """Test rule compilation and evaluation."""
+
+    def test_glob_translation(self):
+        import re
+
+        rx = re.compile(_glob_to_regex("**/*.py") + r"\Z")
+        assert rx.match("a.py")
+        assert rx.match("pkg/sub/a.py")
+        assert not rx.match("a.pyc")
+        assert re.match(_glob_to_regex("src/*") + r"\Z", "src/a")
+        assert not re.match(_glob_to_regex("src/*") + r"\Z", "src/a/b")
+
+    def test_compiled_policy_is_cached_and_immutable(self, policy_root):
+        compiled = compile_policy(policy_root)
+
+        assert compile_policy(policy_root) is compiled
+        assert len(compiled.rules) == 4
+        with pytest.raises(TypeError):
+            compiled.dispatch["delete"] = ()
+
+    def test_most_restrictive_action_wins(self, policy_root):
+        result = check(
+            policy_root, {"deletes": ["./src/core/a.py"], "modifies": ["x.yaml"]}
+        )
+
+        assert result["decision"] == "block"
+        assert {h["rule"] for h in result["hits"]} == {"protect-core", "config-edit"}
+
+    def test_rules_dispatch_by_change_kind(self, policy_root):
+        assert check(policy_root, {"modifies": ["src/a.py"]})["decision"] == "allow"
+        assert check(policy_root, {"lines": 900})["decision"] == "warn"
+        cleanup = {"operation": "cleanup", "deletes": ["logs/run.log"]}
+        assert check(policy_root, cleanup)["hits"][0]["rule"] == "cleanup-logs"
+        assert check(policy_root, {"deletes": ["logs/run.log"]})["decision"] == "allow"
@@ -8,7 +8,20 @@ system events and operations for debugging and monitoring.
 import json
 from pathlib import Path
 
+import pytest
+
 from ai_onboard.core.base.runlog import _path, write_event
+from ai_onboard.core.base.state_store import get_state_store
+
+
+@pytest.fixture(autouse=True)
+def write_through():
+    """Write events through to the file instead of coalescing them."""
+    store = get_state_store()
+    durability = store.durability
+    store.configure(durability="flush")
+    yield
+    store.configure(durability=durability)
 
 
 class TestRunlogPath:
@@ -0,0 +1,218 @@
+"""
+Tests for the compact serialization layer.
+
+This module tests encoding of dataclasses, enums and other non-JSON types,
+the standard library fallback, rebuilding dataclasses with ``structure``,
+the length-prefixed binary record format and utils.write_json integration.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+from ai_onboard.core.base import serialization, utils
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class Leaf:
+    name: str
+    color: Color
+    created: datetime
+
+
+@dataclass
+class Tree:
+    tree_id: str
+    leaves: List[Leaf] = field(default_factory=list)
+    by_name: Dict[str, Leaf] = field(default_factory=dict)
+    tags: Set[str] = field(default_factory=set)
+    parent: Optional[Leaf] = None
+    where: Path = Path(".")
+
+
+def _tree() -> Tree:
+    when = datetime(2025, 1, 2, 3, 4, 5)
+    leaf = Leaf("a", Color.RED, when)
+    return Tree(
+        tree_id="t1",
+        leaves=[leaf, Leaf("b", Color.BLUE, when)],
+        by_name={"a": leaf},
+        tags={"x"},
+        parent=leaf,
+        where=Path("some/dir"),
+    )
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+class TestEncoding:
+    """Test compact encoding of dataclasses and other types."""
+
+    def test_dataclasses_and_enums_encode_directly(self, backend):
+        data = json.loads(serialization.dumps(_tree()))
+
+        assert data["leaves"][1] == {
+            "name": "b",
+            "color": "blue",
+            "created": "2025-01-02T03:04:05",
+        }
+        assert data["tags"] == ["x"]
+        assert data["where"] == str(Path("some/dir"))
+
+    def test_output_is_compact_unless_indented(self, backend):
+        compact = serialization.dumps({"a": [1, 2], "b": {"c": None}})
+        assert compact == b'{"a":[1,2],"b":{"c":null}}'
+        assert b"\n" in serialization.dumps({"a": 1}, indent=2)
+
+    def test_backends_agree(self, backend):
+        tree = {"t": _tree(), "n": 1.5, "u": "café"}
+        assert serialization.loads(serialization.dumps(tree)) == json.loads(
+            json.dumps(serialization.to_builtin(tree))
+        )
+
+    def test_non_string_keys(self, backend):
+        data = serialization.loads(serialization.dumps({1: "a", Color.RED: "b"}))
+        assert data == {"1": "a", "red": "b"}
+
+    def test_unknown_types_raise(self, backend):
+        with pytest.raises(TypeError):
+            serialization.dumps({"x": object()})
+
+
+class TestNumbers:
+    """Test that numbers round-trip exactly as with the standard library."""
+
+    def test_non_finite_floats_match_stdlib(self, backend):
+        data = {"score": float("nan"), "hi": float("inf"), "lo": -float("inf")}
+
+        encoded = serialization.dumps(data)
+
+        assert encoded == b'{"score":NaN,"hi":Infinity,"lo":-Infinity}'
+        decoded = serialization.loads(encoded)
+        assert decoded["score"] != decoded["score"]
+        assert decoded["hi"] == float("inf") and decoded["lo"] == -float("inf")
+
+    def test_non_finite_floats_inside_dataclasses(self, backend):
+        @dataclass
+        class Sample:
+            value: float
+            note: Optional[str] = None
+
+        encoded = serialization.dumps([Sample(float("nan"))])
+
+        assert encoded == b'[{"value":NaN,"note":null}]'
+
+    def test_nulls_without_non_finite_floats_stay_null(self, backend):
+        assert serialization.dumps({"a": None, "b": 1.5}) == b'{"a":null,"b":1.5}'
+
+    def test_wide_integers_round_trip(self, backend):
+        data = {"big": 2**70, "neg": -(2**64), "edge": 2**64 - 1, "ns": 2**62}
+
+        assert serialization.loads(serialization.dumps(data)) == data
+        assert serialization.loads(json.dumps(data)) == data
+        assert serialization.loads(memoryview(json.dumps(data).encode())) == data
+
+    def test_wide_integers_in_lines_and_records(self, backend):
+        small = {"ratio": 0.00025383813065349425, "n": -(2**63)}
+        wide = {"id": 10**30}
+
+        lines = serialization.dumps(small) + b"\n" + serialization.dumps(wide)
+        records = serialization.dumps_records({"small": small, "wide": wide})
+
+        assert serialization.load_lines(lines) == [small, wide]
+        assert serialization.loads_records(records) == {"small": small, "wide": wide}
+
+    def test_stdlib_files_with_nan_read_back(self, tmp_path, backend):
+        path = tmp_path / "state.json"
+        path.write_text(json.dumps({"score": float("nan"), "keep": [1, 2]}))
+
+        assert utils.read_json(path, default={})["keep"] == [1, 2]
+        assert serialization.load_file(path)["keep"] == [1, 2]
+
+    def test_invalid_json_still_raises(self, backend):
+        with pytest.raises(ValueError):
+            serialization.loads(b"{not json")
+
+
+class TestStructure:
+    """Test rebuilding dataclasses from decoded data."""
+
+    def test_round_trip(self, backend):
+        tree = _tree()
+        rebuilt = serialization.structure(
+            Tree, serialization.loads(serialization.dumps(tree))
+        )
+        assert rebuilt == tree
+        assert isinstance(rebuilt.tags, set)
+        assert rebuilt.leaves[0].color is Color.RED
+
+    def test_missing_fields_use_defaults(self):
+        rebuilt = serialization.structure(Tree, {"tree_id": "t2"})
+        assert rebuilt == Tree(tree_id="t2")
+
+
+class TestBinaryRecords:
+    """Test the length-prefixed binary record format."""
+
+    def test_round_trip_and_partial_load(self, backend):
+        store = {"a": {"x": 1}, "b": [_tree()], "c": "text"}
+        payload = serialization.dumps_records(store)
+
+        assert payload.startswith(serialization.BINARY_MAGIC)
+        assert serialization.loads_records(payload) == json.loads(
+            json.dumps(serialization.to_builtin(store))
+        )
+        assert serialization.loads_records(payload, keys=["c"]) == {"c": "text"}
+
+    def test_truncated_store_is_rejected(self):
+        payload = serialization.dumps_records({"a": "x" * 100})
+        with pytest.raises(ValueError):
+            serialization.loads_records(payload[:-10])
+
+    def test_files_in_either_format(self, tmp_path):
+        path = tmp_path / "store.bin"
+        serialization.dump_file(path, {"k": [1, 2]}, binary=True)
+        assert serialization.load_file(path) == {"k": [1, 2]}
+
+        serialization.dump_file(path, {"k": [3]})
+        assert path.read_bytes() == b'{"k":[3]}'
+        assert serialization.load_file(path) == {"k": [3]}
+        assert serialization.load_file(tmp_path / "missing", default={}) == {}
+
+
+class TestUtilsIntegration:
+    """Test that utils reads and writes through the serialization layer."""
+
+    def test_compact_write_json(self, tmp_path):
+        path = tmp_path / "machine.json"
+        utils.write_json(path, {"tree": _tree()}, compact=True)
+
+        assert b"\n" not in path.read_bytes()
+        assert utils.read_json(path)["tree"]["leaves"][0]["color"] == "red"
+
+    def test_default_write_json_stays_readable(self, tmp_path):
+        path = tmp_path / "human.json"
+        utils.write_json(path, {"a": 1})
+        assert path.read_text(encoding="utf-8") == '{\n  "a": 1\n}'
+
+    def test_read_json_accepts_binary_stores(self, tmp_path):
+        path = tmp_path / "big.json"
+        utils.write_json(path, {"a": 1, "b": [2]}, binary=True)
+        assert utils.read_json(path) == {"a": 1, "b": [2]}
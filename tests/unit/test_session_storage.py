@@ -0,0 +1,151 @@
+"""
+Tests for session storage.
+
+This module tests the journaled session index, delta saves of session
+bodies and catching up with changes made by another storage manager.
+"""
+
+import json
+import time
+
+import pytest
+
+from ai_onboard.core.base.session_storage import (
+    GENERATION_FIELD,
+    SessionStorageManager,
+)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SessionStorageManager(tmp_path)
+
+
+def _save(storage, session_id, user_id="alice", last_activity=None, **kwargs):
+    context = storage.create_session_context(
+        session_id,
+        user_id,
+        storage.project_root,
+        last_activity=last_activity or time.time(),
+        **kwargs,
+    )
+    storage.save_session(context)
+    return context
+
+
+class TestSessionIndex:
+    """Test the in-memory, journaled index."""
+
+    def test_saves_append_to_the_journal(self, storage):
+        _save(storage, "s1")
+        _save(storage, "s2")
+
+        lines = storage.journal_file.read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["s1", "s2"]
+        assert json.loads(storage.index_file.read_text()) == {}
+
+    def test_list_sessions_orders_by_activity_per_user(self, storage):
+        _save(storage, "old", last_activity=100.0)
+        _save(storage, "new", last_activity=300.0)
+        _save(storage, "other", user_id="bob", last_activity=200.0)
+
+        assert [s["session_id"] for s in storage.list_sessions("alice")] == [
+            "new",
+            "old",
+        ]
+        assert [s["session_id"] for s in storage.list_sessions(limit=2)] == [
+            "new",
+            "other",
+        ]
+
+    def test_journal_is_compacted_into_snapshot(self, storage):
+        storage.journal_compact_threshold = 5
+        for n in range(6):
+            _save(storage, f"s{n}")
+
+        snapshot = json.loads(storage.index_file.read_text())
+        assert len(snapshot) == 5
+        assert len(storage.journal_file.read_text().splitlines()) == 1
+        assert len(SessionStorageManager(storage.project_root).list_sessions()) == 6
+
+    def test_other_managers_changes_are_picked_up(self, storage, tmp_path):
+        _save(storage, "s1", last_activity=100.0)
+        other = SessionStorageManager(tmp_path)
+        _save(other, "s2")
+
+        assert other.cleanup_expired_sessions(max_age_hours=1) == 1
+        assert [s["session_id"] for s in storage.list_sessions()] == ["s2"]
+
+
+class TestSessionBodies:
+    """Test compact bodies with delta saves."""
+
+    def test_only_changed_fields_are_appended(self, storage):
+        context = _save(storage, "s1")
+        body = storage._get_session_file("s1").read_text()
+        context.resolved_intents.append("deploy")
+        storage.save_session(context)
+
+        assert storage._get_session_file("s1").read_text() == body
+        delta = storage._get_delta_file("s1").read_text().splitlines()
+        generation = json.loads(body)[GENERATION_FIELD]
+        assert [json.loads(line) for line in delta] == [
+            {GENERATION_FIELD: generation, "resolved_intents": ["deploy"]}
+        ]
+        loaded = SessionStorageManager(storage.project_root).load_session("s1")
+        assert loaded.resolved_intents == ["deploy"]
+
+    def test_deltas_are_folded_into_the_body(self, storage):
+        storage.delta_compact_threshold = 3
+        context = _save(storage, "s1")
+        for n in range(3):
+            context.risk_factors.append(f"risk{n}")
+            storage.save_session(context)
+
+        assert not storage._get_delta_file("s1").exists()
+        body = json.loads(storage._get_session_file("s1").read_text())
+        assert body["risk_factors"] == ["risk0", "risk1", "risk2"]
+
+    def test_deltas_of_an_interrupted_fold_are_not_replayed(self, storage):
+        storage.delta_compact_threshold = 2
+        context = _save(storage, "s1")
+        context.risk_factors.append("old")
+        storage.save_session(context)
+        stale = storage._get_delta_file("s1").read_text()
+
+        context.risk_factors[:] = ["new"]
+        storage.save_session(context)
+        # The process died after writing the body, before removing the deltas
+        storage._get_delta_file("s1").write_text(stale)
+
+        loaded = SessionStorageManager(storage.project_root).load_session("s1")
+        assert loaded.risk_factors == ["new"]
+
+    def test_body_writes_leave_no_temporary_files(self, storage):
+        storage.delta_compact_threshold = 1
+        context = _save(storage, "s1")
+        context.risk_factors.append("x")
+        storage.save_session(context)
+
+        assert not list(storage.sessions_dir.glob("*.tmp"))
+        assert not list(storage.sessions_dir.glob(".*.tmp"))
+
+    def test_torn_delta_line_is_ignored(self, storage):
+        context = _save(storage, "s1")
+        context.user_corrections.append("fix")
+        storage.save_session(context)
+        with open(storage._get_delta_file("s1"), "a") as f:
+            f.write('{"user_corrections": ["par')
+
+        loaded = SessionStorageManager(storage.project_root).load_session("s1")
+        assert loaded.user_corrections == ["fix"]
+
+    def test_delete_removes_body_deltas_and_index_entry(self, storage):
+        context = _save(storage, "s1")
+        context.risk_factors.append("x")
+        storage.save_session(context)
+
+        assert storage.delete_session("s1")
+        assert not storage._get_session_file("s1").exists()
+        assert not storage._get_delta_file("s1").exists()
+        assert storage.list_sessions() == []
@@ -0,0 +1,166 @@
+"""
+Tests for the SmartDebugger pattern index and session log.
+
+This module tests that compiled, bucketed pattern matching scores exactly
+like per-pattern scoring, that the index reloads when the patterns file
+changes, batch analysis, and the append-only learning session log.
+"""
+
+import json
+import os
+
+import pytest
+
+from ai_onboard.core.legacy_cleanup.smart_debugger import (
+    CompiledPatternIndex,
+    SmartDebugger,
+)
+
+PATTERNS = [
+    {
+        "id": "pattern_1",
+        "error_type": "ImportError",
+        "message_patterns": [r"no module named '(\w+)'"],
+        "context_patterns": [r"site-packages"],
+        "success_rate": 0.5,
+    },
+    {
+        "id": "pattern_2",
+        "error_type": "ImportError",
+        "message_patterns": [r"cannot import name"],
+        "context_patterns": [],
+        "success_rate": 1.0,
+    },
+    {
+        "id": "pattern_3",
+        "error_type": "KeyError",
+        "message_patterns": ["[invalid", r"missing"],
+        "context_patterns": [r"'\w+'"],
+        "success_rate": 0.9,
+    },
+]
+
+ERRORS = [
+    ("ImportError", "No module named 'yaml' in site-packages"),
+    ("ImportError", "ImportError: cannot import name 'x'"),
+    ("ImportError", "something else"),
+    ("KeyError", "'missing'"),
+    ("ValueError", "No module named 'yaml'"),
+]
+
+
+def _write_patterns(path, patterns):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"patterns": patterns}), encoding="utf-8")
+
+
+@pytest.fixture
+def debugger(tmp_path):
+    debugger = SmartDebugger(tmp_path)
+    debugger._save_patterns({"patterns": PATTERNS})
+    return debugger
+
+
+class TestCompiledPatternIndex:
+    """Test matching against the compiled index."""
+
+    def test_matches_per_pattern_scoring(self, debugger):
+        for error_type, message in ERRORS:
+            expected = None
+            for pattern in PATTERNS:
+                confidence = debugger._calculate_pattern_confidence(
+                    pattern, error_type, message
+                )
+                if confidence > 0.7 and (
+                    expected is None or confidence > expected[1]
+                ):
+                    expected = (pattern["id"], confidence)
+
+            match = debugger._find_pattern_match(error_type, message)
+            actual = (match["pattern_id"], match["confidence"]) if match else None
+            assert actual == (
+                pytest.approx(expected) if expected is not None else None
+            )
+
+    def test_invalid_regexes_are_skipped(self, debugger):
+        match = debugger._find_pattern_match("KeyError", "'missing'")
+
+        assert match["pattern_id"] == "pattern_3"
+        assert match["confidence"] == pytest.approx(0.4 + 0.3 + 0.2 + 0.09)
+
+    def test_batch_matches_single_lookups(self, debugger):
+        index = debugger.pattern_index
+        batch = index.best_matches(ERRORS)
+        assert batch == [index.best_match(t, m) for t, m in ERRORS]
+        assert [m["pattern_id"] if m else None for m in batch] == [
+            "pattern_1",
+            "pattern_2",
+            None,
+            "pattern_3",
+            None,
+        ]
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        path = tmp_path / "patterns.json"
+        _write_patterns(path, PATTERNS[:1])
+        index = CompiledPatternIndex(path, check_interval=0)
+
+        assert index.best_match(*ERRORS[1]) is None
+        index.best_match(*ERRORS[0])
+        assert index.stats["loads"] == 1
+
+        _write_patterns(path, PATTERNS)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+        assert index.best_match(*ERRORS[1])["pattern_id"] == "pattern_2"
+        assert index.stats["loads"] == 2
+
+    def test_saving_patterns_invalidates_the_index(self, debugger):
+        debugger.pattern_index.check_interval = 3600
+        assert debugger._find_pattern_match(*ERRORS[1]) is not None
+
+        debugger._save_patterns({"patterns": PATTERNS[:1]})
+
+        assert debugger._find_pattern_match(*ERRORS[1]) is None
+
+
+class TestSessionLog:
+    """Test batch analysis and the append-only learning sessions."""
+
+    def test_analyze_errors_appends_each_session(self, debugger):
+        errors = [{"type": t, "message": m} for t, m in ERRORS]
+
+        results = debugger.analyze_errors(errors)
+
+        assert [r["pattern_id"] for r in results] == [
+            "pattern_1",
+            "pattern_2",
+            None,
+            "pattern_3",
+            None,
+        ]
+        assert results[0] == {
+            **debugger.analyze_error(errors[0]),
+            "enhanced_analysis": results[0]["enhanced_analysis"],
+        }
+        log_lines = debugger.debug_log_path.read_text(encoding="utf-8").splitlines()
+        assert len(log_lines) == len(errors) + 1
+        assert not debugger.learning_path.exists()
+        assert len(debugger._load_learning_data()["sessions"]) == len(errors) + 1
+
+    def test_learning_data_combines_legacy_and_appended_sessions(self, debugger):
+        debugger.learning_path.write_text(
+            json.dumps({"sessions": [{"ts": "legacy"}], "improvements": [1]}),
+            encoding="utf-8",
+        )
+        debugger.analyze_error({"type": "KeyError", "message": "'k'"})
+        with open(debugger.learning_sessions_path, "ab") as f:
+            f.write(b'{"ts": "partial"')
+
+        data = debugger._load_learning_data()
+
+        assert [s["ts"] for s in data["sessions"]][0] == "legacy"
+        assert len(data["sessions"]) == 2
+        assert data["improvements"] == [1]
+        assert debugger.get_debugging_stats()["total_sessions"] == 2
@@ -0,0 +1,200 @@
+"""
+Tests for the concurrent stage runner and staged validation.
+
+This module tests dependency ordering, concurrent execution, per-stage
+timeouts and failures, ``only``/``skip`` selection, and the stage timings
+recorded by validation runs.
+"""
+
+import threading
+import time
+
+import pytest
+
+from ai_onboard.core.base import telemetry
+from ai_onboard.core.base.state_store import get_state_store
+from ai_onboard.core.monitoring_analytics import validation_runtime
+from ai_onboard.core.monitoring_analytics.stage_runner import Stage, StageRunner
+
+
+def _stages(log):
+    def record(name, value):
+        def func(deps):
+            log.append(name)
+            return (value, deps)
+
+        return func
+
+    return [
+        Stage("a", record("a", 1)),
+        Stage("b", record("b", 2), depends_on=("a",)),
+        Stage("c", record("c", 3), depends_on=("a",)),
+        Stage("d", record("d", 4), depends_on=("b", "c")),
+        Stage("e", record("e", 5)),
+    ]
+
+
+class TestStageRunner:
+    """Test scheduling, failures and selection."""
+
+    def test_dependencies_receive_values_in_order(self):
+        log = []
+        results = StageRunner(_stages(log)).run()
+
+        assert list(results) == ["a", "b", "c", "d", "e"]
+        assert all(r.status == "ok" for r in results.values())
+        assert log.index("a") < log.index("b") < log.index("d")
+        assert log.index("c") < log.index("d")
+        value, deps = results["d"].value
+        assert value == 4
+        assert deps == {"b": results["b"].value, "c": results["c"].value}
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait(_):
+            barrier.wait()
+            return True
+
+        stages = [Stage(name, wait) for name in ("x", "y", "z")]
+        results = StageRunner(stages).run()
+
+        assert all(r.value is True for r in results.values())
+
+    def test_failure_and_timeout_use_defaults_and_skip_dependents(self):
+        release = threading.Event()
+
+        def boom(_):
+            raise RuntimeError("broken")
+
+        stages = [
+            Stage("slow", lambda _: release.wait(5), timeout=0.05, default="late"),
+            Stage("bad", boom, default={}),
+            Stage("after_bad", lambda deps: "ran", depends_on=("bad",), default=0),
+            Stage("fine", lambda _: "ok"),
+        ]
+        try:
+            results = StageRunner(stages).run()
+        finally:
+            release.set()
+
+        assert results["slow"].status == "timeout"
+        assert results["slow"].value == "late"
+        assert results["bad"].status == "failed"
+        assert results["bad"].error == "RuntimeError: broken"
+        assert results["after_bad"].status == "skipped"
+        assert results["after_bad"].value == 0
+        assert results["fine"].value == "ok"
+
+    def test_only_pulls_in_dependencies_and_skip_drops_dependents(self):
+        runner = StageRunner(_stages([]))
+
+        assert runner.select(only=["d"]) == ["a", "b", "c", "d"]
+        assert runner.select(skip=["b"]) == ["a", "c", "e"]
+        assert runner.select(only=["d"], skip=["c"]) == ["a", "b"]
+
+        results = runner.run(only=["e"])
+        assert [n for n, r in results.items() if r.status == "ok"] == ["e"]
+        assert results["a"].status == "skipped"
+
+    def test_invalid_definitions_are_rejected(self):
+        with pytest.raises(ValueError):
+            StageRunner([Stage("a", lambda _: 1, depends_on=("missing",))])
+        with pytest.raises(ValueError):
+            StageRunner(_stages([])).select(only=["nope"])
+        cycle = [
+            Stage("a", lambda _: 1, depends_on=("b",)),
+            Stage("b", lambda _: 1, depends_on=("a",)),
+        ]
+        with pytest.raises(ValueError):
+            StageRunner(cycle).run()
+
+    def test_records_wall_and_cpu_time(self):
+        def spin(_):
+            end = time.perf_counter() + 0.03
+            while time.perf_counter() < end:
+                pass
+
+        results = StageRunner([Stage("spin", spin)]).run()
+        timing = results["spin"].to_dict()
+
+        assert timing["status"] == "ok"
+        assert timing["wall_ms"] >= 30
+        assert timing["cpu_ms"] > 0
+        assert "error" not in timing
+
+
+class _Engine:
+    class analytics:
+        @staticmethod
+        def get_project_status():
+            return {"status": "green"}
+
+    class wbs:
+        @staticmethod
+        def get_status():
+            raise RuntimeError("no wbs")
+
+
+@pytest.fixture
+def staged(monkeypatch):
+    monkeypatch.setattr(validation_runtime, "preview", lambda root: {"ok": True})
+    monkeypatch.setattr(validation_runtime, "load_charter", lambda root: {"c": 1})
+    monkeypatch.setattr(
+        validation_runtime, "get_unified_project_management_engine", lambda r: _Engine
+    )
+
+    class Dashboard:
+        def generate_dashboard(self):
+            return {"progress": 50}
+
+    monkeypatch.setattr(
+        validation_runtime, "get_legacy_progress_dashboard", lambda root: Dashboard()
+    )
+    records = []
+    monkeypatch.setattr(telemetry, "record_run", lambda root, res: records.append(res))
+    return records
+
+
+class TestValidationRun:
+    """Test the staged validation report."""
+
+    def test_report_sections_and_stage_timings(self, tmp_path, staged):
+        report = validation_runtime.run(tmp_path)
+
+        assert report["alignment"] == {"ok": True}
+        assert report["charter"] == {"c": 1}
+        assert report["project_status"] == {"status": "green"}
+        assert report["wbs_status"] == {}
+        assert report["progress"] == {"progress": 50}
+        assert report["results"][0]["component"] == "self_improvement"
+        assert list(report["stages"]) == list(validation_runtime.STAGES)
+        assert report["stages"]["wbs_status"]["status"] == "failed"
+        assert staged == [report]
+
+    def test_selection(self, tmp_path, staged):
+        report = validation_runtime.run(tmp_path, only=["project_status"])
+
+        assert report["project_status"] == {"status": "green"}
+        assert report["alignment"] == {}
+        assert report["stages"]["engine"]["status"] == "ok"
+        assert report["stages"]["charter"]["status"] == "skipped"
+
+        report = validation_runtime.run(tmp_path, skip=["engine"])
+        assert report["project_status"] == {}
+        assert report["charter"] == {"c": 1}
+
+    def test_telemetry_records_stage_timings(self, tmp_path):
+        telemetry.record_run(
+            tmp_path,
+            {
+                "results": [],
+                "stages": {"charter": {"status": "ok", "wall_ms": 1.5, "cpu_ms": 1.0}},
+            },
+        )
+        metrics = tmp_path / ".ai_onboard" / "metrics.jsonl"
+        get_state_store().flush(metrics)
+        lines = metrics.read_text().splitlines()
+        assert '"stages":{"charter":{"status":"ok","wall_ms":1.5,"cpu_ms":1.0}}' in (
+            lines[-1]
+        )
@@ -0,0 +1,190 @@
+"""
+Tests for the write-coalescing state store.
+
+This module tests coalesced document and append writes, the flush policy,
+durability modes, read-your-writes through utils.read_json and crash
+consistency of atomic replacement.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_onboard.core.base import state, utils
+from ai_onboard.core.base.state_store import Durability, StateStore, get_state_store
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def store():
+    store = StateStore(flush_interval=60, max_pending=100)
+    yield store
+    store.flush_all()
+
+
+class TestCoalescing:
+    """Test per-file dirty tracking and the flush policy."""
+
+    def test_document_writes_are_coalesced(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        for n in range(50):
+            store.write_json(path, {"n": n})
+
+        assert not path.exists()
+        assert json.loads(store.pending_document(path)) == {"n": 49}
+        assert store.flush_all() == 1
+        assert json.loads(path.read_text()) == {"n": 49}
+        assert store.stats["files_written"] == 1
+
+    def test_appends_are_written_in_order_with_one_open(self, store, tmp_path):
+        path = tmp_path / "log.jsonl"
+        for n in range(5):
+            store.append_jsonl(path, {"n": n})
+
+        assert store.flush(path)
+        assert [json.loads(line)["n"] for line in path.read_text().splitlines()] == [
+            0,
+            1,
+            2,
+            3,
+            4,
+        ]
+        assert not store.flush(path)
+
+    def test_count_policy_flushes(self, store, tmp_path):
+        store.max_pending = 10
+        for n in range(10):
+            store.append_jsonl(tmp_path / "log.jsonl", {"n": n})
+
+        assert not store.has_pending()
+        assert len((tmp_path / "log.jsonl").read_text().splitlines()) == 10
+
+    def test_interval_policy_flushes(self, tmp_path):
+        store = StateStore(flush_interval=0.05)
+        store.write_json(tmp_path / "state.json", {"ok": True})
+
+        deadline = time.time() + 5
+        while store.has_pending() and time.time() < deadline:
+            time.sleep(0.01)
+        assert json.loads((tmp_path / "state.json").read_text()) == {"ok": True}
+
+    @pytest.mark.parametrize("mode", ["flush", "fsync"])
+    def test_write_through_modes(self, tmp_path, mode):
+        store = StateStore(durability=mode)
+        store.write_json(tmp_path / "state.json", {"mode": mode})
+
+        assert store.durability is Durability(mode)
+        assert json.loads((tmp_path / "state.json").read_text()) == {"mode": mode}
+
+
+class TestUtilsIntegration:
+    """Test deferred writes seen through utils and state."""
+
+    def test_deferred_writes_are_read_back(self, tmp_path):
+        state.save(tmp_path, {"state": "planned"})
+
+        assert state.load(tmp_path)["state"] == "planned"
+        utils._json_cache.clear()
+        assert state.load(tmp_path)["state"] == "planned"
+
+    def test_synchronous_write_supersedes_deferred_write(self, tmp_path):
+        path = tmp_path / "state.json"
+        utils.write_json_deferred(path, {"v": 1})
+        utils.write_json(path, {"v": 2})
+        get_state_store().flush(path)
+
+        assert json.loads(path.read_text()) == {"v": 2}
+
+    def test_synchronous_write_is_not_overwritten_by_a_running_flush(
+        self, store, tmp_path, monkeypatch
+    ):
+        path = tmp_path / "state.json"
+        store.write_json(path, {"v": 1})
+        taken, release = threading.Event(), threading.Event()
+        write = store._write
+
+        def slow_write(documents, appends):
+            taken.set()
+            release.wait(2.0)
+            return write(documents, appends)
+
+        monkeypatch.setattr(store, "_write", slow_write)
+        flusher = threading.Thread(target=store.flush_all)
+        flusher.start()
+        assert taken.wait(2.0)
+        writer = threading.Thread(
+            target=store.replace_document, args=(path, b'{"v":2}')
+        )
+        writer.start()
+        time.sleep(0.05)
+        release.set()
+        flusher.join()
+        writer.join()
+
+        assert json.loads(path.read_text()) == {"v": 2}
+
+
+WRITER = textwrap.dedent(
+    """
+    import sys
+    from pathlib import Path
+    from ai_onboard.core.base.state_store import StateStore
+
+    target = Path(sys.argv[1])
+    store = StateStore(durability=sys.argv[2], flush_interval=0.001, max_pending=5)
+    padding = "x" * 20000
+    version = 0
+    while True:
+        version += 1
+        store.write_json(target / "state.json", {"v": version, "pad": padding})
+        store.append_jsonl(target / "log.jsonl", {"v": version})
+        if version == 1:
+            # Both files exist before the parent starts its kill window
+            store.flush_all()
+        if sys.argv[2] != "none" or version == 1:
+            print(version, flush=True)
+    """
+)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses SIGKILL")
+@pytest.mark.parametrize("mode", ["none", "flush"])
+def test_crash_leaves_complete_files(tmp_path, mode):
+    """Killing a writer mid-flush never leaves a torn document."""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    process = subprocess.Popen(
+        [sys.executable, "-c", WRITER, str(tmp_path), mode],
+        stdout=subprocess.PIPE,
+        env=env,
+        text=True,
+    )
+    # Block on the first acknowledged write, however slow the child starts
+    first = process.stdout.readline()
+    assert first, "writer exited before its first write"
+    acknowledged = int(first)
+    deadline = time.time() + 0.5
+    while time.time() < deadline:
+        if mode == "none":
+            time.sleep(0.05)
+        else:
+            acknowledged = int(process.stdout.readline())
+    process.send_signal(signal.SIGKILL)
+    process.wait()
+
+    document = json.loads((tmp_path / "state.json").read_text())
+    assert document["v"] >= acknowledged
+    assert len(document["pad"]) == 20000
+
+    lines = (tmp_path / "log.jsonl").read_text().split("\n")
+    complete = [json.loads(line)["v"] for line in lines[:-1]]
+    assert complete == list(range(1, len(complete) + 1))
+    assert complete[-1] >= acknowledged
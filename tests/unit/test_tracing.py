@@ -0,0 +1,229 @@
+"""
+Tests for the span tracer.
+
+This module tests span nesting across threads and asyncio tasks, sampling,
+the disabled fast path and the Chrome trace-event export.
+"""
+
+import asyncio
+import contextvars
+import json
+import sys
+import threading
+
+import pytest
+
+from ai_onboard.core.base import tracing
+from ai_onboard.core.monitoring_analytics.stage_runner import Stage, StageRunner
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    yield tracing.configure(tmp_path)
+    tracing.configure(enabled=False)
+
+
+def _spans(tracer):
+    return {e["name"]: e for e in tracer.events() if e["ph"] == "X"}
+
+
+def _contains(outer, inner):
+    return (
+        outer["tid"] == inner["tid"]
+        and outer["ts"] <= inner["ts"]
+        and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    )
+
+
+class TestSpans:
+    """Test span recording and nesting."""
+
+    def test_disabled_tracing_records_nothing(self):
+        tracing.configure(enabled=False)
+
+        @tracing.traced()
+        def work():
+            return 42
+
+        with tracing.span("outer") as outer:
+            outer.set(ignored=True)
+            assert tracing.current_span() is None
+        assert work() == 42
+        assert tracing.get_tracer() is None
+        assert tracing.flush() is None
+
+    def test_nested_spans_and_attributes(self, tracer):
+        @tracing.traced()
+        def helper():
+            assert tracing.current_span().name.endswith("helper")
+
+        with tracing.span("outer", size=3) as outer:
+            with tracing.span("inner", category="io"):
+                helper()
+            outer.set(result="ok")
+
+        spans = _spans(tracer)
+        assert spans["outer"]["args"] == {"size": 3, "result": "ok"}
+        assert spans["inner"]["cat"] == "io"
+        assert _contains(spans["outer"], spans["inner"])
+        helper_span = next(s for n, s in spans.items() if n.endswith("helper"))
+        assert _contains(spans["inner"], helper_span)
+        assert tracing.current_span() is None
+
+    def test_exceptions_are_recorded_and_propagated(self, tracer):
+        with pytest.raises(KeyError):
+            with tracing.span("broken"):
+                raise KeyError("x")
+
+        assert _spans(tracer)["broken"]["args"] == {"error": "KeyError"}
+
+    def test_threads_continue_the_copied_context(self, tracer):
+        seen = {}
+
+        def worker():
+            seen["parent"] = tracing.current_span().name
+            with tracing.span("worker"):
+                pass
+
+        with tracing.span("request"):
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(worker,)
+            )
+            thread.start()
+            thread.join()
+
+        spans = _spans(tracer)
+        assert seen["parent"] == "request"
+        assert spans["worker"]["tid"] != spans["request"]["tid"]
+        names = {e["args"]["name"] for e in tracer.events() if e["ph"] == "M"}
+        assert thread.name in names
+
+    def test_async_tasks_keep_separate_stacks(self, tracer):
+        parents = {}
+
+        @tracing.traced("task")
+        async def task(label):
+            await asyncio.sleep(0)
+            with tracing.span(label):
+                parents[label] = tracing.current_span().name
+                await asyncio.sleep(0)
+
+        async def main():
+            with tracing.span("gather"):
+                await asyncio.gather(task("a"), task("b"))
+
+        asyncio.run(main())
+
+        assert parents == {"a": "a", "b": "b"}
+        assert len([e for e in tracer.events() if e["name"] == "task"]) == 2
+
+    def test_spans_survive_concurrent_reconfiguration(self, tmp_path):
+        errors = []
+        done = threading.Event()
+
+        @tracing.traced()
+        def work():
+            with tracing.span("inner"):
+                pass
+
+        def spin():
+            try:
+                while not done.is_set():
+                    work()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=spin) for _ in range(4)]
+        # Switch threads as often as possible to hit the window between a
+        # span's check and its use of the tracer
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(500):
+                tracing.configure(tmp_path, max_events=10)
+                tracing.configure(enabled=False)
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+            sys.setswitchinterval(switch_interval)
+            tracing.configure(enabled=False)
+
+        assert errors == []
+
+    def test_stage_runner_spans_nest_under_the_caller(self, tracer):
+        stages = [Stage("first", lambda inputs: 1)]
+
+        with tracing.span("validate"):
+            StageRunner(stages).run()
+
+        spans = _spans(tracer)
+        assert spans["stage.first"]["cat"] == "stage"
+        assert spans["stage.first"]["ts"] >= spans["validate"]["ts"]
+
+
+class TestSampling:
+    """Test per-trace sampling and the event bound."""
+
+    def test_unsampled_roots_hide_their_subtree(self, tmp_path):
+        tracer = tracing.configure(tmp_path, sample_rate=0.5)
+        try:
+            for _ in range(200):
+                with tracing.span("root"):
+                    with tracing.span("child"):
+                        pass
+            roots = [e for e in tracer.events() if e["name"] == "root"]
+            children = [e for e in tracer.events() if e["name"] == "child"]
+        finally:
+            tracing.configure(enabled=False)
+
+        assert 40 < len(roots) < 160
+        assert len(children) == len(roots)
+        assert tracer.stats["unsampled"] == 200 - len(roots)
+
+    def test_buffer_is_bounded(self, tmp_path):
+        tracer = tracing.configure(tmp_path, max_events=5)
+        try:
+            for _ in range(8):
+                with tracing.span("s"):
+                    pass
+        finally:
+            tracing.configure(enabled=False)
+
+        assert tracer.stats == {"recorded": 5, "dropped": 3, "unsampled": 0}
+
+
+class TestExport:
+    """Test the trace file."""
+
+    def test_flush_writes_chrome_trace_events(self, tracer, tmp_path):
+        with tracing.span("outer"):
+            pass
+
+        path = tracing.flush()
+        assert path.parent == tmp_path / ".ai_onboard" / "traces"
+        document = json.loads(path.read_text())
+        assert document["displayTimeUnit"] == "ms"
+        events = document["traceEvents"]
+        assert events[0]["ph"] == "M"
+        span = events[-1]
+        assert span["ph"] == "X" and span["name"] == "outer"
+        assert span["dur"] >= 0 and span["tdur"] >= 0
+        assert tracing.flush() is None
+
+    def test_environment_variable(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.chdir(tmp_path)
+        try:
+            monkeypatch.setenv("AI_ONBOARD_TRACE", "0.25")
+            tracing._configure_from_env()
+            assert tracing.get_tracer().sample_rate == 0.25
+
+            tracing.configure(enabled=False)
+            monkeypatch.setenv("AI_ONBOARD_TRACE", "loud")
+            tracing._configure_from_env()
+            assert tracing.get_tracer() is None
+            assert "Unknown AI_ONBOARD_TRACE" in capsys.readouterr().out
+        finally:
+            tracing.configure(enabled=False)
@@ -0,0 +1,260 @@
+"""
+Tests for user preference storage backends.
+
+This module tests the SQLite profile store: legacy JSON migration,
+incremental interaction recording and round-tripping through the
+preference learning system.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from ai_onboard.core.ai_integration.user_preference_learning import (
+    InteractionType,
+    PreferenceCategory,
+    UserPreferenceLearningSystem,
+)
+from ai_onboard.core.ai_integration.user_preference_store import (
+    JsonUserPreferenceStore,
+    SqliteUserPreferenceStore,
+    UserPreferenceStore,
+    create_user_preference_store,
+)
+
+
+def _legacy_profile(n_interactions=3):
+    now = datetime.now().isoformat()
+    return {
+        "experience_level": "intermediate",
+        "preferences": {},
+        "behavior_patterns": [],
+        "interaction_history": [
+            {
+                "interaction_id": f"interaction_{i}",
+                "interaction_type": "command_execution",
+                "timestamp": now,
+                "context": {"command": "status"},
+            }
+            for i in range(n_interactions)
+        ],
+        "satisfaction_scores": [0.9],
+        "feedback_history": [{"feedback": "nice"}],
+        "last_activity": now,
+        "total_interactions": n_interactions,
+        "average_satisfaction": 0.9,
+        "created_at": now,
+    }
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / ".ai_onboard").mkdir()
+    return tmp_path
+
+
+class TestSqliteStore:
+    """Test the SQLite backend directly."""
+
+    def test_uses_wal_mode(self, root):
+        store = SqliteUserPreferenceStore(root / ".ai_onboard" / "prefs.db")
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        store.close()
+
+        assert mode == "wal"
+
+    def test_legacy_json_is_imported_once(self, root):
+        legacy = root / ".ai_onboard" / "user_profiles.json"
+        legacy.write_text(
+            json.dumps({"alice": _legacy_profile(), "broken": {"usage": []}})
+        )
+
+        store = create_user_preference_store(root)
+        profiles = store.load_profiles()
+        store.close()
+
+        assert isinstance(store, SqliteUserPreferenceStore)
+        assert list(profiles) == ["alice"]
+        assert len(profiles["alice"]["interaction_history"]) == 3
+        assert profiles["alice"]["feedback_history"] == [{"feedback": "nice"}]
+
+        # A later change to the JSON file is not re-imported
+        legacy.write_text(json.dumps({"bob": _legacy_profile()}))
+        store = create_user_preference_store(root)
+        assert list(store.load_profiles()) == ["alice"]
+        store.close()
+
+    def test_history_is_bounded_on_load(self, root):
+        store = SqliteUserPreferenceStore(
+            root / ".ai_onboard" / "prefs.db", history_limit=2
+        )
+        store.save_all({"alice": _legacy_profile(5)})
+
+        history = store.load_profiles()["alice"]["interaction_history"]
+        store.close()
+
+        assert [i["interaction_id"] for i in history] == [
+            "interaction_3",
+            "interaction_4",
+        ]
+
+    def test_version_1_databases_gain_the_stats_column(self, root):
+        db = root / ".ai_onboard" / "user_preferences.db"
+        conn = sqlite3.connect(str(db))
+        conn.execute(
+            "CREATE TABLE users (user_id TEXT PRIMARY KEY,"
+            " experience_level TEXT NOT NULL, last_activity TEXT,"
+            " total_interactions INTEGER NOT NULL DEFAULT 0,"
+            " average_satisfaction REAL NOT NULL DEFAULT 0.0, created_at TEXT,"
+            " satisfaction_scores TEXT NOT NULL DEFAULT '[]')"
+        )
+        conn.execute("INSERT INTO users (user_id, experience_level) VALUES ('a', 'x')")
+        conn.commit()
+        conn.close()
+
+        store = SqliteUserPreferenceStore(db)
+
+        assert "satisfaction_stats" not in store.load_profiles()["a"]
+        store.save_all({"a": dict(_legacy_profile(0), satisfaction_stats={"count": 1})})
+        assert store.load_profiles()["a"]["satisfaction_stats"] == {"count": 1}
+        store.close()
+
+    def test_json_backend_is_available(self, root):
+        store = create_user_preference_store(root, backend="json")
+
+        assert isinstance(store, JsonUserPreferenceStore)
+        assert store.load_profiles() == {}
+        assert not store.incremental
+
+    def test_json_store_records_interactions_like_sqlite(self, root):
+        stores = [
+            JsonUserPreferenceStore(root / "profiles.json", history_limit=2),
+            SqliteUserPreferenceStore(root / "profiles.db", history_limit=2),
+        ]
+        state = _legacy_profile(0)
+        del state["interaction_history"], state["preferences"]
+        del state["behavior_patterns"], state["feedback_history"]
+        for store in stores:
+            for n in range(3):
+                store.record_interaction(
+                    "alice",
+                    dict(state, total_interactions=n + 1),
+                    {"interaction_id": f"i{n}", "timestamp": f"2025-01-0{n + 1}"},
+                    {f"pref{n}": {"preference_key": f"pref{n}"}},
+                    [{"pattern": n}],
+                    n,
+                    [{"feedback": n}] if n == 0 else [],
+                    0 if n == 0 else 1,
+                )
+
+        json_profiles, sqlite_profiles = (store.load_profiles() for store in stores)
+        assert json_profiles == sqlite_profiles
+        profile = json_profiles["alice"]
+        assert [i["interaction_id"] for i in profile["interaction_history"]] == [
+            "i1",
+            "i2",
+        ]
+        assert len(profile["behavior_patterns"]) == 3
+        assert profile["total_interactions"] == 3
+
+    def test_stores_must_implement_the_interface(self):
+        class PartialStore(UserPreferenceStore):
+            def load_profiles(self):
+                return {}
+
+        with pytest.raises(TypeError):
+            UserPreferenceStore()
+        with pytest.raises(TypeError):
+            PartialStore()
+
+
+class TestIncrementalRecording:
+    """Test that interactions are appended rather than rewritten."""
+
+    def test_interactions_append_rows_and_survive_reload(self, root):
+        system = UserPreferenceLearningSystem(root)
+        for n in range(15):
+            system.record_user_interaction(
+                "alice",
+                InteractionType.COMMAND_EXECUTION,
+                {"command": f"cmd{n % 3}"},
+                satisfaction_score=0.8,
+                feedback="ok" if n == 0 else None,
+            )
+
+        db = root / ".ai_onboard" / "user_preferences.db"
+        conn = sqlite3.connect(str(db))
+        assert conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0] == 15
+        assert conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0] == 1
+        conn.close()
+        assert not (root / ".ai_onboard" / "user_profiles.json").exists()
+
+        reloaded = UserPreferenceLearningSystem(root)
+        profile = reloaded.user_profiles["alice"]
+        assert profile.total_interactions == 15
+        assert len(profile.interaction_history) == 15
+        assert len(profile.feedback_history) == 1
+        assert set(profile.preferences) == set(
+            system.user_profiles["alice"].preferences
+        )
+
+    @pytest.mark.parametrize("backend", ["sqlite", "json"])
+    def test_system_wide_patterns_come_from_the_store(self, root, backend):
+        system = UserPreferenceLearningSystem(root)
+        system.config["storage_backend"] = backend
+        system.store = create_user_preference_store(root, backend=backend)
+        for user_id in ("alice", "bob"):
+            system.record_user_interaction(
+                user_id, InteractionType.COMMAND_EXECUTION, {"command": "status"}
+            )
+
+        patterns = system.get_system_wide_patterns()
+
+        assert patterns is not None
+        assert patterns["total_users"] == 2
+
+    def test_only_changed_preferences_are_upserted(self, root):
+        system = UserPreferenceLearningSystem(root)
+        system.record_user_interaction(
+            "alice", InteractionType.COMMAND_EXECUTION, {"command": "a"}
+        )
+        profile = system.user_profiles["alice"]
+        system._update_user_preference(
+            "alice",
+            PreferenceCategory.WORKFLOW_PREFERENCES,
+            "style",
+            "fast",
+            0.6,
+            "test",
+            ["test"],
+        )
+        system._update_user_preference(
+            "alice",
+            PreferenceCategory.COMMUNICATION_STYLE,
+            "tone",
+            "terse",
+            0.6,
+            "test",
+            ["test"],
+        )
+        system._persist_interaction(profile, profile.interaction_history[-1])
+
+        calls = []
+        original = system.store.record_interaction
+
+        def spy(user_id, user_state, interaction, preferences, *args):
+            calls.append(preferences)
+            return original(user_id, user_state, interaction, preferences, *args)
+
+        system.store.record_interaction = spy
+        system._persist_interaction(profile, profile.interaction_history[-1])
+        pref = next(
+            p for p in profile.preferences.values() if p.preference_key == "style"
+        )
+        pref.preference_value = "careful"
+        system._persist_interaction(profile, profile.interaction_history[-1])
+
+        assert calls[0] == {}
+        assert [v["preference_value"] for v in calls[1].values()] == ["careful"]
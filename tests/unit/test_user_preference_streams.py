@@ -0,0 +1,222 @@
+"""
+Tests for streaming preference learning.
+
+This module tests the constant-time learner primitives and checks that the
+incrementally maintained state matches a full recomputation from history.
+"""
+
+import random
+import statistics
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_onboard.core.ai_integration import user_preference_learning
+from ai_onboard.core.ai_integration.user_preference_learning import (
+    InteractionType,
+    PreferenceCategory,
+    UserBehaviorPattern,
+    UserInteraction,
+    UserPreferenceLearningSystem,
+)
+from ai_onboard.core.ai_integration.user_preference_store import (
+    create_user_preference_store,
+)
+from ai_onboard.core.ai_integration.user_preference_streams import (
+    DecayedCounter,
+    InteractionWindowStats,
+    RunningStats,
+)
+
+
+def _interaction(n, rng):
+    itype = rng.choice(list(InteractionType))
+    return UserInteraction(
+        interaction_id=f"i{n}",
+        user_id="alice",
+        interaction_type=itype,
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=n),
+        context={
+            "command": rng.choice(["status", "build", "test"]),
+            "command_type": rng.choice(["read", "write"]),
+            "error_type": rng.choice(["io", "timeout"]),
+            "note": rng.choice(["please explain", "keep it simple", "cleanup", ""]),
+        },
+        duration=rng.random() * 10,
+        outcome={"approved": rng.random() < 0.5, "auto_recovery": rng.random() < 0.3},
+    )
+
+
+@pytest.fixture
+def system(tmp_path):
+    (tmp_path / ".ai_onboard").mkdir()
+    return UserPreferenceLearningSystem(tmp_path)
+
+
+class TestPrimitives:
+    """Test the running statistics primitives."""
+
+    def test_running_stats_match_statistics_module(self):
+        values = [random.Random(1).uniform(0, 1) for _ in range(50)]
+        values = [v * i for i, v in enumerate(values)]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+
+    def test_decayed_counter_halves_every_half_life(self):
+        counter = DecayedCounter(half_life=10.0)
+        counter.add(4.0, now=0.0)
+
+        assert counter.value_at(10.0) == pytest.approx(2.0)
+        assert counter.add(1.0, now=20.0) == pytest.approx(2.0)
+
+
+class TestInteractionWindowStats:
+    """Test that incremental updates equal a full rebuild."""
+
+    def test_incremental_state_matches_rebuild_after_evictions(self):
+        rng = random.Random(7)
+        history = deque(maxlen=50)
+        stats = InteractionWindowStats(history.maxlen)
+        for n in range(500):
+            interaction = _interaction(n, rng)
+            evicted = history[0] if len(history) == history.maxlen else None
+            history.append(interaction)
+            stats.add(interaction, evicted)
+
+        rebuilt = InteractionWindowStats.rebuild(history, history.maxlen)
+
+        assert stats.in_sync_with(history)
+        assert +stats.type_counts == +rebuilt.type_counts
+        assert +stats.flag_counts == +rebuilt.flag_counts
+        assert stats.error_types == rebuilt.error_types
+        assert sum(stats.type_counts.values()) == len(history)
+
+    def test_sequences_leave_the_window(self):
+        stats = InteractionWindowStats(window=6)
+        rng = random.Random(0)
+        commands = [InteractionType.COMMAND_EXECUTION] * 2
+        for n, itype in enumerate(commands + [InteractionType.FEEDBACK_PROVIDED]):
+            interaction = _interaction(n, rng)
+            interaction.interaction_type = itype
+            stats.add(interaction)
+
+        assert len(stats.sequences) == 1
+        for n in range(3, 9):
+            interaction = _interaction(n, rng)
+            interaction.interaction_type = InteractionType.FEEDBACK_PROVIDED
+            stats.add(interaction)
+
+        assert len(stats.sequences) == 0
+        assert stats.most_common_sequence() is None
+
+
+class TestStreamingLearning:
+    """Test the learning system on top of the streaming state."""
+
+    def test_behavior_patterns_are_upserted(self, system):
+        for n in range(60):
+            system.record_user_interaction(
+                "alice",
+                InteractionType.COMMAND_EXECUTION
+                if n % 3
+                else InteractionType.FEEDBACK_PROVIDED,
+                {"command": f"cmd{n % 3}"},
+                satisfaction_score=0.8,
+            )
+
+        patterns = system.user_profiles["alice"].behavior_patterns
+        types = [p.pattern_type for p in patterns]
+        assert len(types) == len(set(types))
+        assert "command_sequence" in types
+
+    def test_satisfaction_average_uses_running_window(self, system):
+        for n in range(150):
+            system.record_user_interaction(
+                "alice",
+                InteractionType.COMMAND_EXECUTION,
+                {"command": "status"},
+                satisfaction_score=(n % 10) / 10,
+            )
+
+        profile = system.user_profiles["alice"]
+        assert profile.average_satisfaction == pytest.approx(
+            statistics.mean(profile.satisfaction_scores)
+        )
+        summary = system.get_user_profile_summary("alice")
+        assert summary["satisfaction_stats"]["count"] == 150
+
+    @pytest.mark.parametrize("backend", ["sqlite", "json"])
+    def test_satisfaction_stats_cover_every_score(
+        self, tmp_path, monkeypatch, backend
+    ):
+        monkeypatch.setattr(
+            user_preference_learning,
+            "create_user_preference_store",
+            lambda root, _: create_user_preference_store(root, backend),
+        )
+        (tmp_path / ".ai_onboard").mkdir()
+        system = UserPreferenceLearningSystem(tmp_path)
+        scores = [(n % 7) / 7 for n in range(150)]
+        for score in scores:
+            system.record_user_interaction(
+                "alice",
+                InteractionType.COMMAND_EXECUTION,
+                {"command": "status"},
+                satisfaction_score=score,
+            )
+        system.compact_learning_state()
+
+        reloaded = UserPreferenceLearningSystem(tmp_path)
+        reloaded.compact_learning_state()
+        stats = reloaded.get_user_profile_summary("alice")["satisfaction_stats"]
+
+        assert stats["count"] == 150
+        assert stats["mean"] == pytest.approx(statistics.mean(scores))
+        assert stats["variance"] == pytest.approx(statistics.variance(scores))
+
+    def test_preference_evidence_decays(self, system):
+        system.record_user_interaction(
+            "alice", InteractionType.COMMAND_EXECUTION, {"command": "status"}
+        )
+        system.config["evidence_half_life_days"] = 1.0
+        args = (PreferenceCategory.WORKFLOW_PREFERENCES, "style", "fast", 0.6, "")
+        system._update_user_preference("alice", *args, ["test"])
+        pref = next(
+            p
+            for p in system.user_profiles["alice"].preferences.values()
+            if p.preference_key == "style"
+        )
+        pref.last_updated -= timedelta(days=1)
+        system._update_user_preference("alice", *args, ["test"])
+
+        assert pref.evidence_count == 2
+        assert pref.evidence_weight == pytest.approx(1.5, rel=1e-3)
+        assert pref.sources == ["test"]
+
+    def test_compaction_collapses_duplicate_patterns(self, system):
+        system.record_user_interaction(
+            "alice", InteractionType.COMMAND_EXECUTION, {"command": "status"}
+        )
+        profile = system.user_profiles["alice"]
+        for n in range(5):
+            profile.behavior_patterns.append(
+                UserBehaviorPattern(
+                    pattern_id=f"p{n}",
+                    user_id="alice",
+                    pattern_type="rapid_interaction",
+                    description="",
+                    frequency=0.8,
+                    confidence=0.7,
+                    conditions={},
+                    detected_at=datetime(2024, 1, 1 + n),
+                )
+            )
+
+        system.compact_learning_state("alice")
+
+        assert [p.pattern_id for p in profile.behavior_patterns] == ["p4"]
@@ -0,0 +1,134 @@
+"""
+Tests for vision clarity scoring.
+
+This module tests the compiled lexicon engine, the dimension scores it
+feeds and batch scoring.
+"""
+
+from ai_onboard.core.vision.vision_clarity_scorer import (
+    FIELD_LEXICONS,
+    LEXICONS,
+    ClarityMetric,
+    LexiconEngine,
+    VisionClarityScorer,
+    get_lexicon_engine,
+    score_many,
+    score_vision_clarity,
+)
+
+CLEAR_VISION = {
+    "vc_01": "The specific problem: developers lose 3 hours a week to a slow, "
+    "frustrating review bottleneck and nobody knows why or where it happens",
+    "vc_02": "Our vision and goal is a tool that will provide faster reviews and "
+    "enable teams to reduce wait times, improve quality and achieve better "
+    "outcomes",
+    "vc_03": "Users are developers and engineering managers at startups, who need "
+    "faster feedback and want clear value",
+    "sc_01": "Success criteria: measure review time as a metric, target a 50% "
+    "reduction within the timeline, meeting our quality standard",
+    "sb_01": "In scope: include the review feature, integration with the existing "
+    "service and support for phase one because it is the MVP",
+    "sb_02": "Out of scope: we exclude billing, which is separate future work for "
+    "phase 2 and later releases",
+}
+
+
+class TestLexiconEngine:
+    """Test the compiled lexicons."""
+
+    def test_indicators_match_inside_words_like_substring_search(self):
+        engine = LexiconEngine(LEXICONS, FIELD_LEXICONS)
+
+        features = engine.analyze("vc_02", "We CLAIM a timeline")
+
+        assert "aim" in features.indicators
+        assert engine.count("vision", features) == 1
+        assert not features.blank and not features.has_digit
+
+    def test_fields_are_searched_for_their_own_lexicons_only(self):
+        engine = get_lexicon_engine()
+
+        problem = engine.analyze("vc_01", "problem with the user")
+        users = engine.analyze("vc_03", "problem with the user")
+
+        assert engine.count("problem", problem) == 1
+        assert engine.count("user", problem) == 0
+        assert engine.count("user", users) == 1
+
+    def test_counts_union_several_responses(self):
+        engine = get_lexicon_engine()
+        in_scope = engine.analyze("sb_01", "scope and focus")
+        out_of_scope = engine.analyze("sb_02", "focus and limit")
+
+        assert engine.count("scope", in_scope, out_of_scope) == 3
+
+    def test_non_ascii_digits_count_as_quantities(self):
+        engine = get_lexicon_engine()
+
+        assert engine.analyze("vc_01", "costs €5").has_digit
+        assert engine.analyze("vc_01", "area in m²").has_digit
+        assert not engine.analyze("vc_01", "naïve café").has_digit
+
+    def test_scans_are_cached_by_text(self):
+        engine = LexiconEngine(LEXICONS, FIELD_LEXICONS)
+        scorer = VisionClarityScorer(engine)
+
+        scorer.score_vision_clarity(CLEAR_VISION)
+        scorer.score_vision_clarity(dict(CLEAR_VISION, vc_01="new problem"))
+
+        info = engine.analyze.cache_info()
+        assert info.misses == len(FIELD_LEXICONS) + 1
+        assert info.hits == len(FIELD_LEXICONS) - 1
+
+
+class TestScoring:
+    """Test the dimension scores and reports."""
+
+    def test_clear_vision_is_ready(self):
+        report = score_vision_clarity(CLEAR_VISION)
+
+        assert report.is_ready_for_ai
+        assert report.critical_issues == []
+        assert set(report.detailed_scores) == set(ClarityMetric)
+
+    def test_report_matches_individual_evaluations(self):
+        scorer = VisionClarityScorer()
+        responses = dict(CLEAR_VISION, sb_02="")
+        report = scorer.score_vision_clarity(responses)
+
+        assert report.detailed_scores[
+            ClarityMetric.SCOPE_BOUNDARIES
+        ] == scorer.evaluate_scope_boundaries(responses)
+        assert report.detailed_scores[
+            ClarityMetric.USER_IDENTIFICATION
+        ] == scorer.evaluate_user_identification(responses)
+
+    def test_missing_responses_score_zero(self):
+        report = score_vision_clarity({})
+
+        assert report.overall_score == 0.0
+        assert not report.is_ready_for_ai
+        assert "No core problem statement provided" in report.critical_issues
+        assert "No scope boundaries defined" in report.critical_issues
+
+    def test_problem_definition_details(self):
+        score = VisionClarityScorer().evaluate_problem_definition(
+            {"vc_01": "An issue"}
+        )
+
+        assert score.score == 0.2
+        assert score.issues == [
+            "Limited problem indicators found",
+            "Problem description lacks specificity",
+            "Problem description too brief",
+        ]
+
+    def test_score_many_keeps_order(self):
+        candidates = [CLEAR_VISION, {}, dict(CLEAR_VISION, vc_02="")]
+
+        reports = score_many(candidates)
+
+        assert [r.overall_score for r in reports] == [
+            score_vision_clarity(c).overall_score for c in candidates
+        ]
+        assert reports[0].is_ready_for_ai and not reports[2].is_ready_for_ai
@@ -0,0 +1,138 @@
+"""
+Tests for the vision web interface server.
+
+This module tests the threaded HTTP server behind the vision dashboard:
+keep-alive, gzip and ETag handling, server-sent events and concurrency.
+"""
+
+import gzip
+import http.client
+import threading
+
+import pytest
+
+from ai_onboard.core.vision.vision_web_interface import (
+    VisionEventBroadcaster,
+    VisionWebInterface,
+    _normalize_route,
+)
+
+
+@pytest.fixture
+def web_interface(tmp_path):
+    interface = VisionWebInterface(tmp_path, port=0)
+    result = interface.start_web_interface(open_browser=False)
+    assert result["status"] == "success"
+    yield interface
+    interface.stop_web_interface()
+
+
+def _connect(interface, timeout=10):
+    return http.client.HTTPConnection("localhost", interface.port, timeout=timeout)
+
+
+class TestRouting:
+    """Test request path normalization."""
+
+    def test_legacy_spaced_paths_match_clean_routes(self):
+        assert _normalize_route("/api%20/%20status") == "/api/status"
+        assert _normalize_route("/api / project - types") == "/api/project-types"
+        assert _normalize_route("/api/status?x=1") == "/api/status"
+        assert _normalize_route("/") == "/"
+
+
+class TestConditionalAndCompressedResponses:
+    """Test keep-alive, gzip and ETag revalidation."""
+
+    def test_main_page_is_gzipped_when_accepted(self, web_interface):
+        conn = _connect(web_interface)
+        conn.request("GET", "/", headers={"Accept-Encoding": "gzip"})
+        response = conn.getresponse()
+        body = response.read()
+
+        assert response.status == 200
+        assert response.getheader("Content-Encoding") == "gzip"
+        assert b"<!DOCTYPE html>" in gzip.decompress(body)
+
+    def test_etag_revalidation_returns_304(self, web_interface):
+        conn = _connect(web_interface)
+        conn.request("GET", "/api/project-types")
+        first = conn.getresponse()
+        first.read()
+        etag = first.getheader("ETag")
+        assert etag
+
+        # Same connection is reused (keep-alive)
+        conn.request("GET", "/api/project-types", headers={"If-None-Match": etag})
+        second = conn.getresponse()
+
+        assert second.status == 304
+        assert second.read() == b""
+
+    def test_unknown_route_returns_404(self, web_interface):
+        conn = _connect(web_interface)
+        conn.request("GET", "/nope")
+        response = conn.getresponse()
+
+        assert response.status == 404
+        assert response.read() == b"Not Found"
+
+
+class TestServerSentEvents:
+    """Test the live update channel."""
+
+    def test_broadcaster_replays_latest_and_drops_oldest(self):
+        broadcaster = VisionEventBroadcaster(max_queue_size=2)
+        broadcaster.publish("gate", {"n": 0})
+
+        subscription = broadcaster.subscribe()
+        for n in range(1, 4):
+            broadcaster.publish("metrics", {"n": n})
+
+        items = [subscription.get_nowait() for _ in range(2)]
+        assert [item[1] for item in items] == ["metrics", "metrics"]
+        assert '"n": 3' in items[-1][2]
+
+    def test_watched_file_change_is_pushed_to_stream(self, web_interface, tmp_path):
+        conn = _connect(web_interface, timeout=5)
+        conn.request("GET", "/api/events")
+        response = conn.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+        assert response.fp.readline() == b"retry: 3000\n"
+        response.fp.readline()
+
+        metrics = tmp_path / ".ai_onboard" / "metrics.jsonl"
+        metrics.parent.mkdir(exist_ok=True)
+        metrics.write_text('{"ts": "now", "pass": true}\n')
+        web_interface._watch_for_updates()
+
+        lines = [response.fp.readline() for _ in range(3)]
+        assert lines[1] == b"event: metrics\n"
+        assert b'"pass": true' in lines[2]
+
+
+class TestConcurrency:
+    """Test that many clients are served concurrently."""
+
+    def test_hundreds_of_concurrent_clients(self, web_interface):
+        failures = []
+
+        def client():
+            try:
+                conn = _connect(web_interface)
+                for _ in range(3):
+                    conn.request("GET", "/api/status")
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        failures.append(response.status)
+            except Exception as e:  # pragma: no cover - reported below
+                failures.append(e)
+
+        threads = [threading.Thread(target=client) for _ in range(200)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert failures == []